@@ -0,0 +1,366 @@
+# benchmarks/crawl_benchmark.py
+# -*- coding: utf-8 -*-
+
+"""
+Offline benchmark for ``AiohttpCrawler`` and ``PlaywrightCrawler``.
+
+Starts a ``SyntheticOrigin`` on 127.0.0.1 and runs every combination of
+crawler, concurrency and scenario against it, measuring throughput,
+p50/p95/p99 latency (from the moment the crawler takes a URL until its
+result, success or failure, is yielded), the crawlers' per-phase timings,
+process and browser memory, and retries (requests seen by the origin minus
+URLs, plus the retry policy's counters and budget usage). The results are written as a JSON report; pass an earlier report as
+``--baseline`` to print throughput and p95 changes between runs.
+
+Run from the repository root:
+
+    python -m benchmarks.crawl_benchmark --crawler aiohttp --concurrency 5 10 20
+    python -m benchmarks.crawl_benchmark --crawler playwright --scenarios static scroll
+    python -m benchmarks.crawl_benchmark --baseline benchmark_results/crawl_before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiohttp
+
+from benchmarks.origin_server import (
+    ALL_SCENARIOS,
+    SCENARIO_SCROLL,
+    OriginConfig,
+    SyntheticOrigin,
+)
+from src.core.concurrency import AdaptiveConcurrencyController
+from src.core.crawler import (
+    ADAPTIVE_MAX_CONCURRENCY_FACTOR,
+    AiohttpCrawler,
+    PlaywrightCrawler,
+    ResourceMonitor,
+)
+from src.core.metrics import FetchMetrics, LatencyHistogram
+from src.core.rate_limiter import DomainRateLimit, DomainRateLimiter
+from src.core.retry_policy import DEFAULT_RETRY_BUDGET_RATIO, RetryBudget, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+CRAWLER_AIOHTTP = "aiohttp"
+CRAWLER_PLAYWRIGHT = "playwright"
+
+# Infinite scroll needs a browser; aiohttp would only fetch the empty shell
+DEFAULT_SCENARIOS = {
+    CRAWLER_AIOHTTP: [s for s in ALL_SCENARIOS if s != SCENARIO_SCROLL],
+    CRAWLER_PLAYWRIGHT: list(ALL_SCENARIOS),
+}
+DEFAULT_OUTPUT_DIR = "benchmark_results"
+
+
+def _error_summary(errors: List[str], limit: int = 3) -> Dict[str, int]:
+    """Most common error messages (truncated) with their counts."""
+    return dict(Counter(error[:80] for error in errors).most_common(limit))
+
+
+async def _timed_source(urls: List[str], started: Dict[str, float]) -> AsyncIterator[str]:
+    """Feed URLs to the crawler, noting when each one is taken."""
+    for url in urls:
+        started[url] = time.perf_counter()
+        yield url
+
+
+def _build_concurrency(concurrency: int, adaptive: bool) -> AdaptiveConcurrencyController:
+    # All scenarios share one origin, so the domain limit must match the global
+    # one or it would cap every run at the default per-domain limit
+    max_limit = concurrency * ADAPTIVE_MAX_CONCURRENCY_FACTOR if adaptive else concurrency
+    return AdaptiveConcurrencyController(
+        initial_limit=concurrency,
+        max_limit=max_limit,
+        initial_domain_limit=concurrency,
+        max_domain_limit=max_limit,
+    )
+
+
+async def run_case(
+    origin: SyntheticOrigin,
+    crawler_name: str,
+    scenario: str,
+    concurrency: int,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    """Crawl ``args.pages`` URLs of one scenario and return its measurements."""
+    run_id = f"{crawler_name}-c{concurrency}-{scenario}"
+    urls = origin.urls(scenario, args.pages, run_id=run_id)
+    metrics = FetchMetrics()
+    controller = _build_concurrency(concurrency, args.adaptive)
+    rate_limiter = DomainRateLimiter(
+        default_limit=DomainRateLimit(rate=args.rate, burst=args.burst)
+    )
+    monitor = ResourceMonitor(check_interval=args.sample_interval)
+    retry_policy = RetryPolicy(budget=RetryBudget(ratio=args.retry_budget), metrics=metrics)
+
+    errors: List[str] = []
+    content_bytes = 0
+    started: Dict[str, float] = {}
+    latency = LatencyHistogram()
+
+    def _collect(result: Dict[str, str]) -> None:
+        nonlocal content_bytes
+        taken = started.get(result["original_url"])
+        if taken is not None:
+            latency.record((time.perf_counter() - taken) * 1000.0)
+        if result["error"]:
+            errors.append(result["error"])
+        else:
+            content_bytes += len(result["content"])
+
+    elapsed = 0.0
+    pool_stats: Optional[Dict[str, Any]] = None
+
+    await monitor.start_monitoring()
+    try:
+        if crawler_name == CRAWLER_AIOHTTP:
+            crawler = AiohttpCrawler(
+                max_concurrent_requests=concurrency,
+                request_timeout=args.timeout,
+                max_retries=args.max_retries,
+                rate_limiter=rate_limiter,
+                metrics=metrics,
+                concurrency=controller,
+                retry_policy=retry_policy,
+            )
+            start = time.perf_counter()
+            async for result in crawler.process_urls(_timed_source(urls, started)):
+                _collect(result)
+            elapsed = time.perf_counter() - start
+        else:
+            async with PlaywrightCrawler(
+                headless=True,
+                max_concurrent_pages=concurrency,
+                page_timeout=int(args.timeout * 1000),
+                max_retries=args.max_retries,
+                rate_limiter=rate_limiter,
+                metrics=metrics,
+                concurrency=controller,
+                retry_policy=retry_policy,
+                browser_args={"args": ["--disable-dev-shm-usage", "--no-sandbox"]},
+            ) as crawler:
+                # Browser start-up is not part of the measured crawl
+                start = time.perf_counter()
+                async for result in crawler.process_urls(
+                    _timed_source(urls, started), scroll_pages=scenario == SCENARIO_SCROLL
+                ):
+                    _collect(result)
+                elapsed = time.perf_counter() - start
+                pool_stats = crawler.get_pool_stats()
+    finally:
+        await monitor.stop_monitoring()
+
+    requests = origin.hits_for(urls)
+    report = {
+        "crawler": crawler_name,
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "pages": len(urls),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_pages_per_s": round(len(urls) / elapsed, 2) if elapsed else None,
+        "succeeded": len(urls) - len(errors),
+        "failed": len(errors),
+        "errors": _error_summary(errors),
+        "content_mb": round(content_bytes / (1024 * 1024), 2),
+        "requests": requests,
+        "retries": max(0, requests - len(urls)),
+        "retry_counters": metrics.get_counters(),
+        "retry_budget": retry_policy.get_stats()["budget"],
+        "latency": latency.to_dict(),
+        "phases": metrics.get_summary(),
+        "memory": {k: round(v, 1) for k, v in monitor.get_summary().items()},
+        "final_concurrency": controller.get_stats()["global"],
+    }
+    if pool_stats is not None:
+        report["browser_pool"] = {
+            k: v for k, v in pool_stats.items() if k not in ("contexts", "concurrency")
+        }
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every crawler / concurrency / scenario combination and build the report."""
+    origin_config = OriginConfig(
+        page_bytes=args.page_kb * 1024,
+        slow_ttfb_seconds=args.slow_ttfb,
+        huge_bytes=args.huge_mb * 1024 * 1024,
+        flaky_failures=args.flaky_failures,
+        redirect_hops=args.redirect_hops,
+    )
+    crawlers = [CRAWLER_AIOHTTP, CRAWLER_PLAYWRIGHT] if args.crawler == "both" else [args.crawler]
+
+    results = []
+    async with SyntheticOrigin(origin_config) as origin:
+        logger.info(f"Synthetic origin listening on {origin.base_url}")
+        for crawler_name in crawlers:
+            scenarios = args.scenarios or DEFAULT_SCENARIOS[crawler_name]
+            for concurrency in args.concurrency:
+                for scenario in scenarios:
+                    logger.info(f"Running {crawler_name} / {scenario} / concurrency {concurrency}")
+                    try:
+                        case = await run_case(origin, crawler_name, scenario, concurrency, args)
+                    except Exception as e:
+                        logger.exception(f"Benchmark case {crawler_name}/{scenario} failed")
+                        case = {
+                            "crawler": crawler_name,
+                            "scenario": scenario,
+                            "concurrency": concurrency,
+                            "error": str(e),
+                        }
+                    results.append(case)
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "aiohttp": aiohttp.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "pages": args.pages,
+            "concurrency": args.concurrency,
+            "adaptive": args.adaptive,
+            "timeout": args.timeout,
+            "max_retries": args.max_retries,
+            "retry_budget": args.retry_budget,
+            "rate": args.rate,
+            "burst": args.burst,
+            "origin": asdict(origin_config),
+        },
+        "results": results,
+    }
+
+
+def _case_key(case: Dict[str, Any]) -> tuple:
+    return case.get("crawler"), case.get("scenario"), case.get("concurrency")
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Throughput and p95 latency changes for the cases present in both reports."""
+    previous = {_case_key(case): case for case in baseline.get("results", [])}
+    rows = []
+    for case in current.get("results", []):
+        before = previous.get(_case_key(case))
+        if not before or "error" in case or "error" in before:
+            continue
+        row = {
+            "crawler": case["crawler"],
+            "scenario": case["scenario"],
+            "concurrency": case["concurrency"],
+        }
+        for field, value_of in (
+            ("throughput_pages_per_s", lambda c: c.get("throughput_pages_per_s")),
+            ("p95_ms", lambda c: c.get("latency", {}).get("p95_ms")),
+        ):
+            old, new = value_of(before), value_of(case)
+            row[field] = {"before": old, "after": new}
+            if old and new is not None:
+                row[field]["change_pct"] = round((new - old) / old * 100.0, 1)
+        rows.append(row)
+    return rows
+
+
+def _print_results(report: Dict[str, Any]) -> None:
+    header = f"{'crawler':<11}{'scenario':<11}{'conc':>5}{'pages/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'fail':>6}{'retry':>7}{'peakMB':>8}"
+    print(header)
+    print("-" * len(header))
+    for case in report["results"]:
+        if "error" in case:
+            print(f"{case['crawler']:<11}{case['scenario']:<11}{case['concurrency']:>5}  ERROR: {case['error']}")
+            continue
+        latency = case["latency"]
+        memory = case["memory"]
+        peak_mb = memory.get("max_memory_mb", 0) + memory.get("max_child_memory_mb", 0)
+        print(
+            f"{case['crawler']:<11}{case['scenario']:<11}{case['concurrency']:>5}"
+            f"{case['throughput_pages_per_s'] or 0:>10.1f}"
+            f"{latency.get('p50_ms', 0):>9.0f}{latency.get('p95_ms', 0):>9.0f}{latency.get('p99_ms', 0):>9.0f}"
+            f"{case['failed']:>6}{case['retries']:>7}{peak_mb:>8.0f}"
+        )
+
+
+def _print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print("\nChange vs. baseline:")
+    for row in rows:
+        throughput = row["throughput_pages_per_s"].get("change_pct")
+        p95 = row["p95_ms"].get("change_pct")
+        print(
+            f"  {row['crawler']:<11}{row['scenario']:<11}c={row['concurrency']:<4}"
+            f"pages/s {'n/a' if throughput is None else f'{throughput:+.1f}%':>8}   "
+            f"p95 {'n/a' if p95 is None else f'{p95:+.1f}%':>8}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline crawler benchmark against a synthetic origin")
+    parser.add_argument("--crawler", choices=[CRAWLER_AIOHTTP, CRAWLER_PLAYWRIGHT, "both"], default=CRAWLER_AIOHTTP)
+    parser.add_argument("--scenarios", nargs="+", choices=ALL_SCENARIOS, help="Default: all scenarios the crawler supports")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[5, 10, 20])
+    parser.add_argument("--pages", type=int, default=100, help="URLs per scenario")
+    parser.add_argument("--fixed", dest="adaptive", action="store_false", help="Pin concurrency instead of letting AIMD grow it")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument(
+        "--retry-budget",
+        type=float,
+        default=DEFAULT_RETRY_BUDGET_RATIO,
+        help="Share of requests that may be retried per case (flaky needs flaky-failures x pages)",
+    )
+    parser.add_argument("--rate", type=float, default=1000.0, help="Token-bucket rate for the origin (requests/s)")
+    parser.add_argument("--burst", type=int, default=1000)
+    parser.add_argument("--page-kb", type=int, default=50)
+    parser.add_argument("--slow-ttfb", type=float, default=1.0, help="Seconds before a slow page sends headers")
+    parser.add_argument("--huge-mb", type=int, default=8)
+    parser.add_argument("--flaky-failures", type=int, default=2, help="500s returned per flaky URL before it succeeds")
+    parser.add_argument("--redirect-hops", type=int, default=3)
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="Seconds between memory samples")
+    parser.add_argument("--output", help=f"Report path (default: {DEFAULT_OUTPUT_DIR}/crawl_<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Keep the crawlers' per-request logging")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.verbose:
+        # Per-request INFO logging would dominate the measured time
+        for name in ("src.core.crawler", "src.core.concurrency", "src.core.rate_limiter"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = asyncio.run(run_benchmark(args))
+
+    output = args.output
+    if not output:
+        os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"crawl_{stamp}.json")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["comparison"] = compare_reports(json.load(f), report)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    _print_results(report)
+    if report.get("comparison"):
+        _print_comparison(report["comparison"])
+    print(f"\nReport written to {output}")
+    return 0 if all("error" not in case for case in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
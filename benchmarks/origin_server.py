@@ -0,0 +1,263 @@
+# benchmarks/origin_server.py
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic aiohttp origin server for offline crawler benchmarks.
+
+Serves deterministic pages on 127.0.0.1 so ``AiohttpCrawler`` and
+``PlaywrightCrawler`` can be measured without touching the network:
+
+- ``/static/{id}``: plain article page with a UTF-8 charset header
+- ``/slow/{id}``: same page, headers sent only after ``slow_ttfb_seconds``
+- ``/huge/{id}``: streamed body of ``huge_bytes`` (exceeds the crawler body cap by default)
+- ``/flaky/{id}``: answers 500 for the first ``flaky_failures`` requests per URL, then 200
+- ``/redirect/{hops}/{id}``: 302 chain of ``hops`` hops ending on a static page
+- ``/nocharset/{id}``: GB18030 body with neither a charset header nor a meta tag
+- ``/scroll/{id}``: page that appends ``scroll_batch_size`` items per scroll via
+  ``/scroll-more/{id}`` (only meaningful for Playwright), ``scroll_batches`` times
+
+Every request is counted per path in ``hits``, so retries can be derived as
+``hits - unique URLs`` after a run.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+SCENARIO_STATIC = "static"
+SCENARIO_SLOW = "slow"
+SCENARIO_HUGE = "huge"
+SCENARIO_FLAKY = "flaky"
+SCENARIO_REDIRECT = "redirect"
+SCENARIO_NOCHARSET = "nocharset"
+SCENARIO_SCROLL = "scroll"
+
+ALL_SCENARIOS = (
+    SCENARIO_STATIC,
+    SCENARIO_SLOW,
+    SCENARIO_HUGE,
+    SCENARIO_FLAKY,
+    SCENARIO_REDIRECT,
+    SCENARIO_NOCHARSET,
+    SCENARIO_SCROLL,
+)
+
+_PARAGRAPH = (
+    "SmartInfo benchmark paragraph with enough text to look like an article body. "
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor. "
+)
+_PARAGRAPH_ZH = "这是用于测试编码检测的中文段落，内容没有任何实际意义。"
+
+
+@dataclass
+class OriginConfig:
+    """Shape of the synthetic pages."""
+
+    page_bytes: int = 50 * 1024  # Approximate size of static / slow / redirect pages
+    links_per_page: int = 20
+    slow_ttfb_seconds: float = 1.0
+    huge_bytes: int = 8 * 1024 * 1024
+    huge_chunk_bytes: int = 64 * 1024
+    flaky_failures: int = 2
+    redirect_hops: int = 3
+    scroll_batches: int = 5
+    scroll_batch_size: int = 10
+
+
+class SyntheticOrigin:
+    """
+    Local origin server for the benchmark scenarios.
+
+    async with SyntheticOrigin() as origin:
+        urls = origin.urls(SCENARIO_STATIC, 100)
+    """
+
+    def __init__(self, config: Optional[OriginConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or OriginConfig()
+        self.host = host
+        self.port = port
+        self.hits: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self._page_cache: Dict[str, bytes] = {}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        """Start serving; with port 0 a free port is picked. Returns the base URL."""
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/static/{id}", self._static),
+                web.get("/slow/{id}", self._slow),
+                web.get("/huge/{id}", self._huge),
+                web.get("/flaky/{id}", self._flaky),
+                web.get("/redirect/{hops}/{id}", self._redirect),
+                web.get("/nocharset/{id}", self._nocharset),
+                web.get("/scroll/{id}", self._scroll),
+                web.get("/scroll-more/{id}", self._scroll_more),
+            ]
+        )
+        app.middlewares.append(self._count_hits)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def urls(self, scenario: str, count: int, run_id: str = "") -> List[str]:
+        """``count`` distinct URLs for a scenario; ``run_id`` keeps runs from sharing hit counters."""
+        prefix = f"{run_id}-" if run_id else ""
+        if scenario == SCENARIO_REDIRECT:
+            return [
+                f"{self.base_url}/redirect/{self.config.redirect_hops}/{prefix}{i}"
+                for i in range(count)
+            ]
+        if scenario not in ALL_SCENARIOS:
+            raise ValueError(f"Unknown scenario: {scenario}")
+        return [f"{self.base_url}/{scenario}/{prefix}{i}" for i in range(count)]
+
+    def hits_for(self, urls: List[str]) -> int:
+        """Requests received for the given URLs (redirect hops not included)."""
+        prefix_len = len(self.base_url)
+        return sum(self.hits[url[prefix_len:]] for url in urls)
+
+    # --- Middleware ---
+    @web.middleware
+    async def _count_hits(self, request: web.Request, handler):
+        self.hits[request.path] += 1
+        return await handler(request)
+
+    # --- Page builders ---
+    def _article(self, page_id: str, paragraph: str = _PARAGRAPH, charset_meta: bool = True) -> str:
+        cfg = self.config
+        links = "\n".join(
+            f'<li><a href="/static/{page_id}-link-{i}">Related article {i} for {page_id}</a></li>'
+            for i in range(cfg.links_per_page)
+        )
+        repeats = max(1, cfg.page_bytes // len(paragraph.encode("utf-8")))
+        body = "\n".join(f"<p>{paragraph}</p>" for _ in range(repeats))
+        meta = '<meta charset="utf-8">' if charset_meta else ""
+        return (
+            f"<!DOCTYPE html><html><head>{meta}<title>Article {page_id}</title></head>"
+            f"<body><nav><ul>{links}</ul></nav><article><h1>Article {page_id}</h1>"
+            f"{body}</article></body></html>"
+        )
+
+    def _static_bytes(self, page_id: str) -> bytes:
+        # Page bodies only differ by id; build each once so the server stays cheap
+        cached = self._page_cache.get(page_id)
+        if cached is None:
+            cached = self._page_cache[page_id] = self._article(page_id).encode("utf-8")
+        return cached
+
+    # --- Handlers ---
+    async def _static(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self._static_bytes(request.match_info["id"]),
+            content_type="text/html",
+            charset="utf-8",
+        )
+
+    async def _slow(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.config.slow_ttfb_seconds)
+        return await self._static(request)
+
+    async def _huge(self, request: web.Request) -> web.StreamResponse:
+        cfg = self.config
+        response = web.StreamResponse(headers={"Content-Type": "text/html; charset=utf-8"})
+        # No Content-Length: the crawler has to enforce its cap while streaming
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        chunk = (_PARAGRAPH * (cfg.huge_chunk_bytes // len(_PARAGRAPH) + 1)).encode("utf-8")
+        chunk = chunk[: cfg.huge_chunk_bytes]
+        await response.write(b"<!DOCTYPE html><html><body><p>")
+        sent = 0
+        try:
+            while sent < cfg.huge_bytes:
+                await response.write(chunk)
+                sent += len(chunk)
+            await response.write(b"</p></body></html>")
+            await response.write_eof()
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass  # The client aborted the download, which is the expected outcome
+        return response
+
+    async def _flaky(self, request: web.Request) -> web.Response:
+        if self.hits[request.path] <= self.config.flaky_failures:
+            return web.Response(status=500, text="Synthetic failure")
+        return await self._static(request)
+
+    async def _redirect(self, request: web.Request) -> web.Response:
+        hops = int(request.match_info["hops"])
+        page_id = request.match_info["id"]
+        target = f"/redirect/{hops - 1}/{page_id}" if hops > 1 else f"/static/{page_id}"
+        raise web.HTTPFound(target)
+
+    async def _nocharset(self, request: web.Request) -> web.Response:
+        page_id = request.match_info["id"]
+        html = self._article(page_id, paragraph=_PARAGRAPH_ZH, charset_meta=False)
+        return web.Response(
+            body=html.encode("gb18030"),
+            headers={"Content-Type": "text/html"},  # Deliberately no charset
+        )
+
+    async def _scroll(self, request: web.Request) -> web.Response:
+        cfg = self.config
+        page_id = request.match_info["id"]
+        html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>Feed {page_id}</title></head>
+<body><h1>Feed {page_id}</h1><ul id="feed"></ul><div id="sentinel" style="height:1px"></div>
+<script>
+let batch = 0, loading = false;
+async function loadMore() {{
+  if (loading || batch >= {cfg.scroll_batches}) return;
+  loading = true;
+  const resp = await fetch("/scroll-more/{page_id}?batch=" + batch);
+  const items = await resp.json();
+  const feed = document.getElementById("feed");
+  for (const item of items) {{
+    const li = document.createElement("li");
+    li.innerHTML = '<a href="' + item.url + '">' + item.title + '</a>';
+    li.style.height = "120px";
+    feed.appendChild(li);
+  }}
+  batch += 1;
+  loading = false;
+}}
+new IntersectionObserver(entries => {{
+  if (entries.some(e => e.isIntersecting)) loadMore();
+}}).observe(document.getElementById("sentinel"));
+</script></body></html>"""
+        return web.Response(text=html, content_type="text/html", charset="utf-8")
+
+    async def _scroll_more(self, request: web.Request) -> web.Response:
+        cfg = self.config
+        page_id = request.match_info["id"]
+        batch = int(request.query.get("batch", "0"))
+        items = [
+            {
+                "url": f"/static/{page_id}-scroll-{batch}-{i}",
+                "title": f"Scrolled item {batch}-{i} of {page_id}",
+            }
+            for i in range(cfg.scroll_batch_size)
+        ]
+        return web.Response(text=json.dumps(items), content_type="application/json")
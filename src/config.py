@@ -33,6 +33,10 @@ CONFIG_KEY_FETCH_FREQUENCY = "fetch_frequency"
 CONFIG_KEY_EMBEDDING_MODEL = "embedding_model"
 CONFIG_KEY_UI_THEME = "ui_theme"
 CONFIG_KEY_LANGUAGE = "language"
+# Source pages fetched with the browser return only their visible links instead of HTML
+CONFIG_KEY_BROWSER_LINK_EXTRACTION = "browser_link_extraction"
+# Processes source pages are fetched in, sharded by domain (1: in-process, 0: one per CPU core)
+CONFIG_KEY_CRAWL_PROCESSES = "crawl_processes"
 
 
 class AppConfig:
@@ -45,6 +49,8 @@ class AppConfig:
         CONFIG_KEY_EMBEDDING_MODEL: "sentence-transformers/all-MiniLM-L6-v2",
         CONFIG_KEY_UI_THEME: "light",
         CONFIG_KEY_LANGUAGE: "zh_CN",
+        CONFIG_KEY_BROWSER_LINK_EXTRACTION: True,
+        CONFIG_KEY_CRAWL_PROCESSES: 1,
     }
 
     def __init__(self):
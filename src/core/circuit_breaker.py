@@ -0,0 +1,307 @@
+# src/core/circuit_breaker.py
+# -*- coding: utf-8 -*-
+
+"""
+Per-domain circuit breaker for the crawlers.
+
+After ``failure_threshold`` consecutive failures (connection errors,
+timeouts, 5xx) a domain's circuit opens and every fetch for it fails
+immediately instead of burning retries and backoff. Once the cooldown has
+passed the circuit goes half-open and lets a single probe request through:
+success closes it again, failure re-opens it with a doubled cooldown (up to
+``max_cooldown_seconds``).
+
+Open circuits are saved to a small JSON file, so the next run (including
+after a restart) skips domains that are known to be dead until their
+cooldown expires. The breaker is thread-safe and may be shared by all workers.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.rate_limiter import domain_of
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+CIRCUIT_STATE_FILE_NAME = "circuit_breakers.json"
+CIRCUIT_OPEN_ERROR_PREFIX = "Circuit open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN_SECONDS = 300.0
+DEFAULT_MAX_COOLDOWN_SECONDS = 6 * 3600.0
+# A half-open probe that never reports back (e.g. cancelled) is given up after this
+DEFAULT_PROBE_TIMEOUT_SECONDS = 120.0
+
+CircuitListener = Callable[[str, str], None]
+
+
+def is_circuit_open_error(error: Optional[str]) -> bool:
+    """Whether a crawl result error means the fetch was skipped by an open circuit."""
+    return bool(error) and error.startswith(CIRCUIT_OPEN_ERROR_PREFIX)
+
+
+@dataclass
+class _Circuit:
+    state: str = STATE_CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    cooldown: float = 0.0
+    probe_started_at: float = 0.0
+    last_error: str = ""
+
+    @property
+    def retry_at(self) -> float:
+        return self.opened_at + self.cooldown
+
+
+class DomainCircuitBreaker:
+    """Closed / open / half-open circuit per domain, optionally persisted to JSON."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        max_cooldown_seconds: float = DEFAULT_MAX_COOLDOWN_SECONDS,
+        probe_timeout_seconds: float = DEFAULT_PROBE_TIMEOUT_SECONDS,
+        state_path: Optional[str] = None,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max(cooldown_seconds, max_cooldown_seconds)
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.state_path = state_path
+        self._circuits: Dict[str, _Circuit] = {}
+        self._listeners: List[CircuitListener] = []
+        self._lock = threading.Lock()
+        # Serializes saves, so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+
+    # --- Listeners ---
+    def add_listener(self, listener: CircuitListener) -> None:
+        """Call ``listener(domain, state)`` on every state change (from any thread)."""
+        self._listeners.append(listener)
+
+    def _notify(self, domain: str, state: str) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(domain, state)
+            except Exception as e:
+                logger.error(f"Circuit breaker listener failed: {e}")
+
+    # --- Request gating ---
+    def allow_request(self, url: str) -> bool:
+        """
+        Whether a request to the URL's domain may go out now. When the cooldown
+        of an open circuit has passed, the caller becomes the half-open probe.
+        """
+        domain = domain_of(url)
+        changed = False
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            if circuit is None or circuit.state == STATE_CLOSED:
+                return True
+            now = time.time()
+            if circuit.state == STATE_OPEN:
+                if now < circuit.retry_at:
+                    return False
+                circuit.state = STATE_HALF_OPEN
+                circuit.probe_started_at = now
+                changed = True
+            elif now - circuit.probe_started_at < self.probe_timeout_seconds:
+                return False  # Half-open: another request is already probing
+            else:
+                circuit.probe_started_at = now
+        if changed:
+            logger.info(f"Circuit for {domain} half-open, sending a probe request.")
+            self._notify(domain, STATE_HALF_OPEN)
+        return True
+
+    def record_success(self, url: str) -> None:
+        """A request to the URL's domain got a usable answer."""
+        domain = domain_of(url)
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            if circuit is None:
+                return
+            was_closed = circuit.state == STATE_CLOSED
+            del self._circuits[domain]
+        if not was_closed:
+            logger.info(f"Circuit for {domain} closed again.")
+            self._save()
+            self._notify(domain, STATE_CLOSED)
+
+    def record_failure(self, url: str, error: str = "") -> None:
+        """A request to the URL's domain failed in a way that suggests the site is down."""
+        domain = domain_of(url)
+        opened = False
+        with self._lock:
+            circuit = self._circuits.setdefault(domain, _Circuit())
+            circuit.consecutive_failures += 1
+            circuit.last_error = error[:200]
+            now = time.time()
+            if circuit.state == STATE_HALF_OPEN:
+                # The probe failed: back off longer before the next probe
+                circuit.state = STATE_OPEN
+                circuit.opened_at = now
+                circuit.cooldown = min(circuit.cooldown * 2, self.max_cooldown_seconds)
+                opened = True
+            elif (
+                circuit.state == STATE_CLOSED
+                and circuit.consecutive_failures >= self.failure_threshold
+            ):
+                circuit.state = STATE_OPEN
+                circuit.opened_at = now
+                circuit.cooldown = self.cooldown_seconds
+                opened = True
+            cooldown = circuit.cooldown
+            failures = circuit.consecutive_failures
+        if opened:
+            logger.warning(
+                f"Circuit for {domain} opened after {failures} failures, "
+                f"skipping it for {cooldown:.0f}s. Last error: {error}"
+            )
+            self._save()
+            self._notify(domain, STATE_OPEN)
+
+    def open_error(self, url: str) -> str:
+        """Error message for a fetch skipped because the domain's circuit is open."""
+        domain = domain_of(url)
+        retry_at = self.retry_at(url)
+        when = time.strftime("%H:%M", time.localtime(retry_at)) if retry_at else "later"
+        return f"{CIRCUIT_OPEN_ERROR_PREFIX} for {domain}, retry after {when}"
+
+    def retry_at(self, url: str) -> Optional[float]:
+        """When the open circuit of the URL's domain allows a probe, or None if not open."""
+        with self._lock:
+            circuit = self._circuits.get(domain_of(url))
+            if circuit is None or circuit.state == STATE_CLOSED:
+                return None
+            return circuit.retry_at
+
+    def get_open_circuits(self) -> Dict[str, Dict[str, Any]]:
+        """Open and half-open circuits: domain -> state, retry_at, failures, last_error."""
+        with self._lock:
+            return {
+                domain: {
+                    "state": circuit.state,
+                    "retry_at": circuit.retry_at,
+                    "failures": circuit.consecutive_failures,
+                    "last_error": circuit.last_error,
+                }
+                for domain, circuit in self._circuits.items()
+                if circuit.state != STATE_CLOSED
+            }
+
+    def reset(self, domain: Optional[str] = None) -> None:
+        """Close one domain's circuit, or all of them."""
+        with self._lock:
+            if domain is None:
+                domains = list(self._circuits)
+                self._circuits.clear()
+            else:
+                domains = [domain] if self._circuits.pop(domain, None) else []
+        if domains:
+            self._save()
+            for name in domains:
+                self._notify(name, STATE_CLOSED)
+
+    # --- Mirroring (crawl shards in other processes) ---
+    def export_circuit(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Picklable state of a domain's circuit, or None when it is closed."""
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            return asdict(circuit) if circuit else None
+
+    def apply_circuit(self, domain: str, fields: Optional[Dict[str, Any]]) -> None:
+        """
+        Take over a domain's circuit as exported by another breaker (None closes
+        it), then save and notify the listeners like a local state change.
+        """
+        circuit = _Circuit(**fields) if fields else None
+        with self._lock:
+            previous = self._circuits.get(domain)
+            if circuit is None:
+                self._circuits.pop(domain, None)
+            else:
+                self._circuits[domain] = circuit
+        state = circuit.state if circuit else STATE_CLOSED
+        self._save()
+        if state != (previous.state if previous else STATE_CLOSED):
+            self._notify(domain, state)
+
+    # --- Persistence ---
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Restore open circuits from ``path`` (default: ``state_path``). Returns how
+        many were loaded. A breaker without ``state_path`` can load another one's
+        state without ever writing to it.
+        """
+        path = path or self.state_path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read circuit breaker state {path}: {e}")
+            return 0
+
+        loaded = 0
+        with self._lock:
+            for domain, fields in data.get("circuits", {}).items():
+                try:
+                    circuit = _Circuit(**fields)
+                except TypeError:
+                    continue
+                # A probe interrupted by the last shutdown is due again right away
+                if circuit.state == STATE_HALF_OPEN:
+                    circuit.state = STATE_OPEN
+                    circuit.probe_started_at = 0.0
+                if circuit.state == STATE_OPEN:
+                    self._circuits[domain] = circuit
+                    loaded += 1
+        if loaded:
+            logger.info(f"Loaded {loaded} open circuit(s) from {path}")
+        return loaded
+
+    def _save(self) -> None:
+        if not self.state_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                data = {
+                    "saved_at": time.time(),
+                    "circuits": {
+                        domain: asdict(circuit)
+                        for domain, circuit in self._circuits.items()
+                        if circuit.state != STATE_CLOSED
+                    },
+                }
+            tmp_path = None
+            try:
+                state_dir = os.path.dirname(self.state_path) or "."
+                os.makedirs(state_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.state_path)
+                tmp_path = None
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Could not save circuit breaker state to {self.state_path}: {e}")
+            finally:
+                # Don't leave a half-written temp file behind in the state directory
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
@@ -0,0 +1,264 @@
+# src/core/concurrency.py
+# -*- coding: utf-8 -*-
+
+"""
+AIMD adaptive concurrency control for the crawlers.
+
+``AdaptiveConcurrencyController`` replaces a fixed ``asyncio.Semaphore``. It
+keeps one global limit and one limit per domain. Each limit grows by about
+one slot per "round trip" (additive increase) while it is saturated and the
+recent error rate and p95 latency stay healthy. It is cut multiplicatively
+on timeouts and 429/503 responses, and when the error rate or the p95
+latency rises well above its baseline.
+
+Only requests started after a cut can trigger the next cut, so one burst of
+timeouts halves the limit once instead of once per request.
+
+The controller is bound to the event loop of its first use; create one per
+crawler / worker thread.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from src.core.rate_limiter import domain_of
+
+logger = logging.getLogger(__name__)
+
+# Outcomes reported for a finished request
+OUTCOME_SUCCESS = "success"  # The origin answered normally (including 4xx such as 404)
+OUTCOME_ERROR = "error"  # Connection errors and 5xx responses; counted in the error rate
+OUTCOME_OVERLOAD = "overload"  # Timeouts and 429/503; cut the limit immediately
+
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_SAMPLE_WINDOW = 50  # Recent requests used for p95 latency and error rate
+DEFAULT_EVAL_INTERVAL = 10  # Re-evaluate latency / error rate every N samples
+DEFAULT_MAX_ERROR_RATE = 0.2
+DEFAULT_LATENCY_TOLERANCE = 2.0  # Cut when p95 exceeds the baseline p95 by this factor
+BASELINE_DRIFT = 0.05  # Lets the baseline rise slowly when an origin gets permanently slower
+MIN_SAMPLES_FOR_LATENCY = 10
+
+
+class AdaptiveLimit:
+    """One AIMD-controlled concurrency limit."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        sample_window: int = DEFAULT_SAMPLE_WINDOW,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        # Bumped on every cut; samples from requests started before it are ignored for cuts
+        self.epoch = 0
+        self._latencies: Deque[float] = deque(maxlen=sample_window)
+        self._errors: Deque[bool] = deque(maxlen=sample_window)
+        self._since_eval = 0
+        self._baseline_p95: Optional[float] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self.stats = {"increases": 0, "decreases": 0}
+
+    @property
+    def current(self) -> int:
+        """Number of requests currently allowed to run at once."""
+        return int(self.limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> int:
+        """Wait for a free slot. Returns the epoch the request started in."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.current)
+            self.in_flight += 1
+            return self.epoch
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def _p95(self) -> float:
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def _decrease(self, reason: str) -> None:
+        new_limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        if new_limit < self.limit:
+            logger.info(
+                f"Concurrency limit '{self.name}' cut {self.current} -> {int(new_limit)} ({reason})"
+            )
+            self.stats["decreases"] += 1
+        self.limit = new_limit
+        self.epoch += 1
+        # Judge the new limit on fresh samples only
+        self._errors.clear()
+        self._latencies.clear()
+        self._since_eval = 0
+
+    def _increase(self) -> None:
+        if self.limit >= self.max_limit:
+            return
+        before = self.current
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        if self.current > before:
+            self.stats["increases"] += 1
+
+    def record(self, latency: float, outcome: str, epoch: int) -> None:
+        """Feed the result of one request started in ``epoch`` into the controller."""
+        stale = epoch < self.epoch
+        if outcome == OUTCOME_OVERLOAD:
+            if not stale:
+                self._decrease("timeout / throttled")
+            return
+
+        self._errors.append(outcome == OUTCOME_ERROR)
+        if outcome == OUTCOME_SUCCESS:
+            self._latencies.append(latency)
+        self._since_eval += 1
+
+        if self._since_eval >= DEFAULT_EVAL_INTERVAL:
+            self._since_eval = 0
+            error_rate = sum(self._errors) / len(self._errors)
+            if error_rate > self.max_error_rate and not stale:
+                self._decrease(f"error rate {error_rate:.0%}")
+                return
+            if len(self._latencies) >= MIN_SAMPLES_FOR_LATENCY:
+                p95 = self._p95()
+                if self._baseline_p95 is None:
+                    self._baseline_p95 = p95
+                elif p95 > self._baseline_p95 * self.latency_tolerance and not stale:
+                    self._decrease(
+                        f"p95 {p95 * 1000:.0f}ms vs baseline {self._baseline_p95 * 1000:.0f}ms"
+                    )
+                    return
+                else:
+                    self._baseline_p95 = min(self._baseline_p95 * (1 + BASELINE_DRIFT), p95)
+
+        # Additive increase only while the limit is actually the bottleneck
+        if outcome == OUTCOME_SUCCESS and self.in_flight >= self.current - 1:
+            self._increase()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current,
+            "in_flight": self.in_flight,
+            "baseline_p95_ms": (
+                round(self._baseline_p95 * 1000, 1) if self._baseline_p95 is not None else None
+            ),
+            **self.stats,
+        }
+
+
+class ConcurrencySlot:
+    """A held global + domain slot; report outcomes on it before it is released."""
+
+    def __init__(self, domain: str, global_epoch: int, domain_epoch: int):
+        self.domain = domain
+        self.global_epoch = global_epoch
+        self.domain_epoch = domain_epoch
+        self.started = time.monotonic()
+        self.reports: List[Tuple[float, str]] = []
+
+    def report(self, outcome: str) -> None:
+        """Record one request attempt; the next attempt is timed from now."""
+        now = time.monotonic()
+        self.reports.append((now - self.started, outcome))
+        self.started = now
+
+
+class AdaptiveConcurrencyController:
+    """
+    Global and per-domain AIMD concurrency limits used in place of a semaphore.
+
+    Timeouts and 429/503 cut only the limit of the domain they came from; the
+    global limit treats them as errors and reacts to the overall error rate
+    and p95 latency, so one struggling origin does not throttle all others.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        max_limit: int = 40,
+        min_limit: int = 1,
+        initial_domain_limit: int = 4,
+        max_domain_limit: int = 8,
+    ):
+        self.global_limit = AdaptiveLimit("global", initial_limit, min_limit, max_limit)
+        self.initial_domain_limit = initial_domain_limit
+        self.max_domain_limit = max_domain_limit
+        self.min_limit = min_limit
+        self._domains: Dict[str, AdaptiveLimit] = {}
+
+    @property
+    def max_limit(self) -> int:
+        return self.global_limit.max_limit
+
+    def _domain_limit(self, domain: str) -> AdaptiveLimit:
+        limit = self._domains.get(domain)
+        if limit is None:
+            limit = self._domains[domain] = AdaptiveLimit(
+                domain,
+                min(self.initial_domain_limit, self.max_domain_limit),
+                self.min_limit,
+                self.max_domain_limit,
+            )
+        return limit
+
+    async def acquire(self, url: str) -> ConcurrencySlot:
+        """Wait for a domain slot, then a global slot, for the URL."""
+        domain = domain_of(url)
+        domain_limit = self._domain_limit(domain)
+        domain_epoch = await domain_limit.acquire()
+        try:
+            global_epoch = await self.global_limit.acquire()
+        except BaseException:
+            await domain_limit.release()
+            raise
+        return ConcurrencySlot(domain, global_epoch, domain_epoch)
+
+    async def release(self, slot: ConcurrencySlot) -> None:
+        """Feed the slot's reported outcomes into both limits and free the slot."""
+        domain_limit = self._domain_limit(slot.domain)
+        for latency, outcome in slot.reports:
+            domain_limit.record(latency, outcome, slot.domain_epoch)
+            global_outcome = OUTCOME_ERROR if outcome == OUTCOME_OVERLOAD else outcome
+            self.global_limit.record(latency, global_outcome, slot.global_epoch)
+        await self.global_limit.release()
+        await domain_limit.release()
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[ConcurrencySlot]:
+        """``async with controller.slot(url) as slot:`` -- call ``slot.report()`` inside."""
+        held = await self.acquire(url)
+        try:
+            yield held
+        finally:
+            await self.release(held)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limits and AIMD counters, globally and per domain."""
+        return {
+            "global": self.global_limit.get_stats(),
+            "domains": {domain: limit.get_stats() for domain, limit in self._domains.items()},
+        }
@@ -0,0 +1,200 @@
+# src/core/cpu_executor.py
+# -*- coding: utf-8 -*-
+
+"""
+Process pool for the CPU-bound steps of page processing.
+
+HTML cleaning, link extraction and trafilatura metadata extraction are pure
+Python / lxml work that holds the GIL. Run inline in ``ProcessorWorker``'s
+event loop they block every other task of that loop (LLM streaming, sub-article
+downloads) while a large page is parsed, and sub-articles are extracted one
+after another on a single core.
+
+``CpuExecutor`` runs such calls in a ``ProcessPoolExecutor``:
+
+- workers are spawned (not forked: the parent runs Qt and other threads) and
+  import the heavy modules (lxml, trafilatura, the cleaning utilities) when
+  they start; ``start()`` spawns and warms all of them ahead of the first call
+- at most ``max_pending`` calls per event loop are queued or running; further
+  callers wait for a slot instead of piling HTML up in the pool's call queue
+- each call's queue wait and run time are recorded in ``FetchMetrics``
+  (``cpu_wait`` and the phase given by the caller) when one is given
+
+Functions and their arguments must be picklable (module-level functions,
+plain data). If the pool breaks (a worker died), it is replaced and the call
+is retried once in the new pool; the call is never run in the parent, where a
+page that crashes the parser would take the application down.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.core.metrics import PHASE_CPU_WAIT, FetchMetrics
+
+logger = logging.getLogger(__name__)
+
+# At most this many workers when the worker count is automatic
+MAX_AUTO_CPU_WORKERS = 8
+# Queued or running calls per worker (per event loop)
+PENDING_CALLS_PER_WORKER = 2
+# Imported by every worker when it starts
+WARM_UP_MODULES = (
+    "lxml.etree",
+    "trafilatura",
+    "src.utils.html_utils",
+    "src.core.link_extraction",
+)
+
+
+def resolve_cpu_worker_count(configured: Optional[int] = None) -> int:
+    """Worker count: ``configured`` if positive, else one per CPU core but one (capped)."""
+    if configured and configured > 0:
+        return configured
+    return max(1, min((os.cpu_count() or 2) - 1, MAX_AUTO_CPU_WORKERS))
+
+
+def _warm_up_worker(modules: Tuple[str, ...]) -> None:
+    """Pool initializer: import the heavy modules once per worker."""
+    import importlib
+
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"CPU worker could not preload {module}: {e}")
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _timed_call(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float]:
+    """Run ``fn`` in a worker; returns its result and run time in milliseconds."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+class CpuExecutor:
+    """
+    Runs CPU-bound calls in warm worker processes with a bounded number of
+    pending calls. ``run()`` may be awaited from any event loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        metrics: Optional[FetchMetrics] = None,
+        warm_up_modules: Tuple[str, ...] = WARM_UP_MODULES,
+    ):
+        self.max_workers = resolve_cpu_worker_count(max_workers)
+        self.max_pending = max_pending or self.max_workers * PENDING_CALLS_PER_WORKER
+        # Optional per-domain wait / run timings
+        self.metrics = metrics
+        self.warm_up_modules = warm_up_modules
+        # Spawn, not fork: the parent runs Qt and other threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Event loop -> semaphore bounding that loop's pending calls
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats = {"calls": 0, "failures": 0, "pool_restarts": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=self._ctx,
+                    initializer=_warm_up_worker,
+                    initargs=(self.warm_up_modules,),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self._stats["pool_restarts"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> None:
+        """Spawn the workers and let them import the heavy modules before the first call."""
+        executor = self._get_executor()
+        try:
+            for _ in range(self.max_workers):
+                executor.submit(_ready)
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.error(f"Could not start CPU workers: {e}")
+            self._discard_executor(executor)
+            return
+        logger.info(f"Started {self.max_workers} CPU worker processes")
+
+    def _slots_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+            return slots
+
+    def _record(self, url: str, phase: str, milliseconds: float) -> None:
+        if self.metrics:
+            self.metrics.record_url(url, phase, milliseconds)
+
+    async def run(self, url: str, phase: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process and return its result; exceptions
+        raised by ``fn`` are re-raised. ``url`` and ``phase`` label the timings.
+        """
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        async with self._slots_for(loop):
+            try:
+                try:
+                    executor = self._get_executor()
+                    result, run_ms = await loop.run_in_executor(executor, _timed_call, fn, args)
+                except BrokenProcessPool as e:
+                    logger.error(f"CPU worker pool broke during {phase} for {url}: {e}; retrying")
+                    self._discard_executor(executor)
+                    executor = self._get_executor()
+                    result, run_ms = await loop.run_in_executor(executor, _timed_call, fn, args)
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_executor(executor)
+                with self._lock:
+                    self._stats["failures"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._stats["calls"] += 1
+
+        total_ms = (time.perf_counter() - queued_at) * 1000.0
+        self._record(url, phase, run_ms)
+        self._record(url, PHASE_CPU_WAIT, max(0.0, total_ms - run_ms))
+        return result
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the workers; queued calls are cancelled."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("CPU worker processes stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        return stats
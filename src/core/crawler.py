@@ -1,26 +1,79 @@
 # src/core/crawler.py
 # -*- coding: utf-8 -*-
 import asyncio
+import codecs
 import logging
 import random
+import re
 import time
 import os
-from typing import List, Dict, Optional, AsyncGenerator, Any, Set, Union, Tuple
+from contextlib import nullcontext
+from typing import List, Dict, Optional, AsyncGenerator, Any, Set, Union, Tuple, Iterable
+from urllib.parse import urlsplit
 from dataclasses import dataclass, field
-from urllib.parse import urlparse
 
 # Third-party imports
 from playwright.async_api import (
     async_playwright,
     Page,
     Browser,
+    BrowserContext,
     Playwright,
+    Route,
     Error as PlaywrightError,
     TimeoutError as PlaywrightTimeoutError,
 )
 import aiohttp
 import charset_normalizer
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from src.core.http_cache import HttpCache
+from src.core.html_store import RawHtmlStore
+from src.core.circuit_breaker import DomainCircuitBreaker
+from src.core.concurrency import (
+    AdaptiveConcurrencyController,
+    OUTCOME_ERROR,
+    OUTCOME_OVERLOAD,
+    OUTCOME_SUCCESS,
+)
+from src.core.metrics import (
+    FetchMetrics,
+    PHASE_CONTENT,
+    PHASE_DECODE,
+    PHASE_DOMCONTENTLOADED,
+    PHASE_DOWNLOAD,
+    PHASE_GOTO,
+    PHASE_NETWORKIDLE,
+    PHASE_SCROLL,
+    PHASE_SETTLE,
+    PHASE_TOTAL,
+)
+from src.core.link_extraction import (
+    CONTENT_FORMAT_LINKS,
+    encode_links,
+    extract_page_links,
+)
+from src.core.readiness import (
+    ReadinessProfile,
+    WAIT_DOMCONTENTLOADED,
+    WAIT_NETWORKIDLE,
+    settle_page,
+)
+from src.core.retry_policy import RETRY_NON_RETRYABLE, RetryFailure, RetryPolicy, classify_error
+from src.core.session_manager import CrawlerSessionManager
+from src.core.dns_cache import CachingResolver, PersistentDnsCache
+from src.core.scheduler import UrlSource, sliding_window
+from src.core.rate_limiter import (
+    DomainRateLimiter,
+    RateLimitedError,
+    THROTTLE_STATUS_CODES,
+    parse_retry_after,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -29,16 +82,170 @@ logger = logging.getLogger(__name__)
 
 # Constants for performance tuning
 DEFAULT_MAX_RETRY_ATTEMPTS = 3
-DEFAULT_RETRY_BASE_DELAY = 1.0  # Base delay in seconds
-DEFAULT_JITTER_FACTOR = 0.1
 DEFAULT_MAX_CONCURRENT_REQUESTS = 10
+# Response body limits for the aiohttp crawler
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024  # Abort downloads larger than 5MB
+DEFAULT_ALLOWED_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+CHARSET_SNIFF_BYTES = 4096  # BOM / <meta charset> are looked for in this prefix
+CHARSET_DETECT_BYTES = 64 * 1024  # charset_normalizer fallback only sees this prefix
+# Browser recycling: contexts are replaced after this many pages or when the
+# browser's average memory per pooled context exceeds the limit (Chromium does
+# not attribute renderer processes to contexts, so no single context can be
+# measured), and the whole browser is restarted at an idle point once it
+# exceeds its memory budget
+DEFAULT_MAX_PAGES_PER_CONTEXT = 50
+DEFAULT_MAX_AVERAGE_CONTEXT_MEMORY_MB = 300
+DEFAULT_BROWSER_MEMORY_BUDGET_MB = 1500
+MEMORY_CHECK_INTERVAL = 10.0  # Seconds between child-process memory samples
+# Adaptive concurrency may grow the aiohttp limit up to this multiple of
+# max_concurrent_requests; Playwright never exceeds its context pool size
+ADAPTIVE_MAX_CONCURRENCY_FACTOR = 4
+# Browser request blocking, applied once per context. The main frame's navigation is never blocked.
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+DEFAULT_BLOCKED_DOMAINS = (
+    # Analytics / tag managers
+    "google-analytics.com",
+    "googletagmanager.com",
+    "hm.baidu.com",
+    "cnzz.com",
+    "umeng.com",
+    "growingio.com",
+    "sensorsdata.cn",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+    "mixpanel.com",
+    "newrelic.com",
+    "nr-data.net",
+    # Ads / social widgets
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "pos.baidu.com",
+    "cpro.baidu.com",
+    "connect.facebook.net",
+)
+PAGE_RESET_TIMEOUT_MS = 3000  # Navigating a pooled page back to about:blank
+# The main document's ETag / Last-Modified only validate a rendered page that loaded
+# no data of its own; such pages are re-rendered at least this often regardless
+DEFAULT_RENDERED_CACHE_MAX_AGE_SECONDS = 24 * 3600
+DATA_RESOURCE_TYPES = ("xhr", "fetch", "websocket", "eventsource")
+
+# ---- Process Memory Utilities ----
+def get_child_process_memory_mb() -> Optional[float]:
+    """
+    Total RSS in MB of all child processes of this process (the Playwright
+    driver and the Chromium processes it spawns). Returns None without psutil.
+    """
+    if psutil is None:
+        return None
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for child in children:
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue  # Process exited or is not accessible
+    return total / (1024 * 1024)
+
+
+# ---- Decoding Utilities ----
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-:.]+)""", re.IGNORECASE
+)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Legacy Chinese encodings are decoded with their superset to avoid mojibake
+_ENCODING_SUPERSETS = {"gb2312": "gb18030", "gbk": "gb18030", "x-gbk": "gb18030"}
+
+
+def _normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """Return a usable codec name for a declared charset, or None if it is unknown."""
+    if not name:
+        return None
+    name = name.strip().strip("\"'").lower()
+    name = _ENCODING_SUPERSETS.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def sniff_html_encoding(raw_content: bytes, header_charset: Optional[str] = None) -> str:
+    """
+    Determine the encoding of an HTML body: Content-Type charset, then BOM,
+    then <meta charset> in the first few KB, and only then charset_normalizer
+    on a bounded prefix. Falls back to UTF-8.
+    """
+    encoding = _normalize_encoding(header_charset)
+    if encoding:
+        return encoding
+
+    prefix = raw_content[:CHARSET_SNIFF_BYTES]
+    for bom, bom_encoding in _BOMS:
+        if prefix.startswith(bom):
+            return bom_encoding
+
+    meta_match = _META_CHARSET_RE.search(prefix)
+    if meta_match:
+        encoding = _normalize_encoding(meta_match.group(1).decode("ascii", "ignore"))
+        if encoding:
+            return encoding
+
+    best = charset_normalizer.from_bytes(raw_content[:CHARSET_DETECT_BYTES]).best()
+    if best and _normalize_encoding(best.encoding):
+        return _normalize_encoding(best.encoding)
+    return "utf-8"
+
+
+class UnacceptableResponseError(Exception):
+    """A response that is not worth retrying (wrong content type, too large)."""
+
+
+def _task_error_result(url: str, error: BaseException) -> Dict[str, str]:
+    """Build the result dict for a URL whose fetch task raised unexpectedly."""
+    return {
+        "original_url": url,
+        "final_url": url,
+        "content": "",
+        "error": f"Task execution failed: {error}",
+    }
 
-# ---- Retry Utilities ----
-def calculate_backoff(attempt: int, base_delay: float = DEFAULT_RETRY_BASE_DELAY) -> float:
-    """Calculate exponential backoff with jitter"""
-    delay = base_delay * (2 ** attempt)
-    jitter = delay * DEFAULT_JITTER_FACTOR
-    return delay + random.uniform(-jitter, jitter)
+
+def _outcome_for_status(status: int) -> str:
+    """Classify an HTTP error status for the adaptive concurrency controller."""
+    if status in THROTTLE_STATUS_CODES:
+        return OUTCOME_OVERLOAD
+    if status >= 500:
+        return OUTCOME_ERROR
+    return OUTCOME_SUCCESS  # 404 and friends say nothing about origin load
+
+
+def _circuit_open_result(url: str, breaker: DomainCircuitBreaker) -> Dict[str, str]:
+    """Build the result dict for a URL skipped because its domain's circuit is open."""
+    error = breaker.open_error(url)
+    logger.info(f"Skipping {url}: {error}")
+    return {"original_url": url, "final_url": url, "content": "", "error": error}
+
+
+def _phase_timer(metrics: Optional[FetchMetrics], url: str, phase: str):
+    """Time a block as a fetch phase, or do nothing when metrics are disabled."""
+    return metrics.timer(url, phase) if metrics else nullcontext()
 
 
 # --- Aiohttp Crawler Class ---
@@ -54,11 +261,31 @@ class AiohttpCrawler:
         user_agent: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
         max_retries: int = DEFAULT_MAX_RETRY_ATTEMPTS,
+        http_cache: Optional[HttpCache] = None,
+        html_store: Optional[RawHtmlStore] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        session_manager: Optional[CrawlerSessionManager] = None,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        allowed_content_types: Optional[Tuple[str, ...]] = DEFAULT_ALLOWED_CONTENT_TYPES,
+        metrics: Optional[FetchMetrics] = None,
+        concurrency: Optional[AdaptiveConcurrencyController] = None,
+        circuit_breaker: Optional[DomainCircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        dns_cache: Optional[PersistentDnsCache] = None,
     ):
         self.max_concurrent_requests = max_concurrent_requests
         self.request_timeout = request_timeout
         self.max_retries = max_retries
-        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        # Optional conditional-GET cache (ETag / Last-Modified)
+        self.http_cache = http_cache
+        # Optional content-addressed store that keeps a copy of every fetched page
+        self.html_store = html_store
+        # AIMD concurrency limits (global and per domain) instead of a fixed semaphore;
+        # max_concurrent_requests is the starting point
+        self.concurrency = concurrency or AdaptiveConcurrencyController(
+            initial_limit=max_concurrent_requests,
+            max_limit=max_concurrent_requests * ADAPTIVE_MAX_CONCURRENCY_FACTOR,
+        )
         self.user_agent = user_agent or "SmartInfo/1.0"
         self.headers = headers or {}
         if "User-Agent" not in self.headers and self.user_agent:
@@ -67,32 +294,26 @@ class AiohttpCrawler:
         # Add connection pooling settings
         self.conn_timeout = aiohttp.ClientTimeout(total=None)
         self.tcp_connector = None  # Will be initialized when session is created
+        # Optional long-lived shared session; when set, its connection pool is reused
+        self.session_manager = session_manager
+        # Downloads are aborted beyond this size; other content types are never read
+        self.max_body_bytes = max_body_bytes
+        self.allowed_content_types = allowed_content_types
+        # Optional per-domain phase timings (dns/connect/ttfb via TraceConfig, download, decode)
+        self.metrics = metrics
         
-        # Track processed domains to implement per-domain rate limiting
-        self.domain_timestamps = {}
-        self.domain_locks: Dict[str, asyncio.Lock] = {}
+        # Per-domain token-bucket rate limiting (may be shared with other crawlers)
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        # Optional per-domain circuit breaker: dead domains fail fast instead of retrying
+        self.circuit_breaker = circuit_breaker
+        # Which failures are retried, backoff / Retry-After waits and the run's retry budget
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Optional DNS cache kept across runs (the session manager's one by default)
+        self.dns_cache = dns_cache or (session_manager.dns_cache if session_manager else None)
 
     async def _enforce_domain_rate_limit(self, url: str) -> None:
         """Enforce rate limiting per domain to avoid overloading servers"""
-        domain = urlparse(url).netloc
-        
-        # Get or create a lock for this domain to enforce per-domain serialization
-        lock = self.domain_locks.get(domain)
-        if lock is None:
-            lock = asyncio.Lock()
-            self.domain_locks[domain] = lock
-
-        async with lock:
-            last_access = self.domain_timestamps.get(domain, 0)
-            now = time.time()
-            
-            # If we've accessed this domain recently, wait a bit
-            if now - last_access < 1.0:  # 1 second between requests to same domain
-                delay = 1.0 - (now - last_access)
-                await asyncio.sleep(delay)
-                
-            # Update the last access time
-            self.domain_timestamps[domain] = time.time()
+        await self.rate_limiter.acquire(url)
 
     async def _fetch_single(
         self,
@@ -100,169 +321,297 @@ class AiohttpCrawler:
         url: str,
     ) -> Dict[str, str]:
         """Fetch the raw HTML content of a single URL with retries."""
+        breaker = self.circuit_breaker
+        if breaker and not breaker.allow_request(url):
+            return _circuit_open_result(url, breaker)
+
         # Enforce rate limiting
         await self._enforce_domain_rate_limit(url)
         
         html_content = ""
         error_message = ""
+        # Retry category of the final failure, so callers can tell transient errors apart
+        error_category = ""
         final_url = url
         fetch_start_time = time.time()
+
+        # Look up validators from a previous fetch to send a conditional GET
+        cached = self.http_cache.get(url) if self.http_cache else None
+        request_headers = dict(self.headers)
+        if cached:
+            request_headers.update(cached.conditional_headers())
         
-        # Use semaphore to limit concurrent requests
-        async with self.semaphore:
-            retry_attempt = 0
-            while retry_attempt <= self.max_retries:
-                try:
-                    logger.info(f"[Worker] Fetching: {url} (Attempt {retry_attempt+1})")
-                    
-                    # Improved request with proper timeout handling
-                    async with session.get(
-                        url,
-                        timeout=aiohttp.ClientTimeout(total=self.request_timeout),
-                        allow_redirects=True,
-                        ssl=False,  # Skip SSL verification for better performance
-                    ) as response:
-                        response.raise_for_status()
-                        final_url = str(response.url)
-
-                        # Stream the content instead of loading it all at once
-                        chunks = []
+        self.retry_policy.record_request(url)
+        retry_attempt = 0
+        while True:
+            failure: Optional[RetryFailure] = None
+            # Hold an adaptive concurrency slot for the attempt only, not for the backoff
+            slot = await self.concurrency.acquire(url)
+            try:
+                logger.info(f"[Worker] Fetching: {url} (Attempt {retry_attempt+1})")
+                
+                # Improved request with proper timeout handling
+                async with session.get(
+                    url,
+                    headers=request_headers,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                    allow_redirects=True,
+                    ssl=False,  # Skip SSL verification for better performance
+                ) as response:
+                    if response.status == 304 and cached:
+                        # Unchanged since the last fetch, serve the cached body
+                        html_content = self.http_cache.load_content(url)
+                        if html_content is None:
+                            # The body is gone or corrupt; fetch the page unconditionally
+                            logger.info(f"[Worker] Cached body of {url} unusable, fetching again")
+                            cached = None
+                            request_headers = dict(self.headers)
+                            slot.report(OUTCOME_SUCCESS)
+                            continue
+                        final_url = cached.final_url
+                        self.http_cache.mark_not_modified(url)
+                        error_message = ""
+                        logger.info(f"[Worker] Not modified, served from cache: {url}")
+                        slot.report(OUTCOME_SUCCESS)
+                        if breaker:
+                            breaker.record_success(url)
+                        break
+
+                    if response.status in THROTTLE_STATUS_CODES:
+                        # Pause the whole domain for Retry-After before retrying
+                        self.rate_limiter.penalize(
+                            url, parse_retry_after(response.headers.get("Retry-After"))
+                        )
+
+                    response.raise_for_status()
+                    final_url = str(response.url)
+
+                    # Reject binaries / documents before reading any of the body
+                    self._check_response_headers(response)
+
+                    # Stream the content, aborting as soon as the size cap is exceeded
+                    chunks = []
+                    received = 0
+                    with _phase_timer(self.metrics, url, PHASE_DOWNLOAD):
                         async for chunk in response.content.iter_chunked(8192):
+                            received += len(chunk)
+                            if self.max_body_bytes and received > self.max_body_bytes:
+                                raise UnacceptableResponseError(
+                                    f"Body exceeds {self.max_body_bytes} bytes, download aborted"
+                                )
                             chunks.append(chunk)
-                            
-                        raw_content = b''.join(chunks)
+                        
+                    raw_content = b''.join(chunks)
 
-                        # Attempt to decode the content more efficiently
-                        encoding = response.charset
-                        try:
-                            if encoding:
-                                html_content = raw_content.decode(encoding, errors="replace")
-                            else:
-                                # Use faster charset detection
-                                matches = charset_normalizer.from_bytes(raw_content).best()
-                                if matches:
-                                    detected_encoding = matches.encoding
-                                    html_content = raw_content.decode(detected_encoding, errors="replace")
-                                else:
-                                    html_content = raw_content.decode("utf-8", errors="replace")
-                                    
-                        except Exception as decode_err:
-                            error_message = f"Decoding error: {decode_err}"
-                            logger.error(f"Error decoding {url}: {decode_err}")
-                            return {
-                                "original_url": url,
-                                "final_url": final_url,
-                                "content": "",
-                                "error": error_message,
-                            }
-
-                    fetch_duration = time.time() - fetch_start_time
-                    logger.info(
-                        f"[Worker] Successfully fetched: {final_url} in {fetch_duration:.2f} seconds"
-                    )
-                    # Success - break out of retry loop
-                    break
-                    
-                except aiohttp.ClientResponseError as e:
-                    error_message = f"HTTP error: {e.status} {e.message}"
-                    logger.error(f"HTTP error for {url}: {e.status} - {e.message}")
-                except asyncio.TimeoutError:
-                    error_message = f"Request timed out (>{self.request_timeout} seconds)"
-                    logger.error(f"Request timed out for {url}")
-                except aiohttp.ClientError as e:
-                    error_message = f"Client error: {e}"
-                    logger.error(f"Client error for {url}: {e}")
-                except Exception as e:
-                    error_message = f"Unexpected error: {e}"
-                    logger.exception(f"Unexpected error while fetching {url}")
-                    
-                # Handle retries
-                retry_attempt += 1
-                if retry_attempt <= self.max_retries:
-                    backoff = calculate_backoff(retry_attempt - 1)
-                    logger.info(f"Retrying {url} in {backoff:.2f} seconds (attempt {retry_attempt}/{self.max_retries})")
-                    await asyncio.sleep(backoff)
-                    
+                    # Cheap sniffing on a prefix instead of detecting over the whole body
+                    with _phase_timer(self.metrics, url, PHASE_DECODE):
+                        encoding = sniff_html_encoding(raw_content, response.charset)
+                        html_content = raw_content.decode(encoding, errors="replace")
+
+                    if self.http_cache:
+                        self.http_cache.store(
+                            url,
+                            final_url,
+                            html_content,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"),
+                        )
+
+                fetch_duration = time.time() - fetch_start_time
+                if self.metrics:
+                    self.metrics.record_url(url, PHASE_TOTAL, fetch_duration * 1000.0)
+                logger.info(
+                    f"[Worker] Successfully fetched: {final_url} in {fetch_duration:.2f} seconds"
+                )
+                error_message = ""
+                slot.report(OUTCOME_SUCCESS)
+                if breaker:
+                    breaker.record_success(url)
+                # Success - break out of retry loop
+                break
+                
+            except UnacceptableResponseError as e:
+                # Retrying would download the same unusable response again
+                error_message = str(e)
+                error_category = RETRY_NON_RETRYABLE
+                logger.warning(f"Skipping {url}: {e}")
+                slot.report(OUTCOME_SUCCESS)  # The origin itself is healthy
+                if breaker:
+                    breaker.record_success(url)
+                break
+            except aiohttp.ClientResponseError as e:
+                error_message = f"HTTP error: {e.status} {e.message}"
+                logger.error(f"HTTP error for {url}: {e.status} - {e.message}")
+                slot.report(_outcome_for_status(e.status))
+                if breaker and e.status != 429:
+                    # 5xx means the site is struggling; 4xx still proves it is up
+                    if e.status >= 500:
+                        breaker.record_failure(url, error_message)
+                    else:
+                        breaker.record_success(url)
+                failure = classify_error(e)
+            except asyncio.TimeoutError as e:
+                error_message = f"Request timed out (>{self.request_timeout} seconds)"
+                logger.error(f"Request timed out for {url}")
+                slot.report(OUTCOME_OVERLOAD)
+                if breaker:
+                    breaker.record_failure(url, error_message)
+                failure = classify_error(e)
+            except aiohttp.ClientError as e:
+                error_message = f"Client error: {e}"
+                logger.error(f"Client error for {url}: {e}")
+                slot.report(OUTCOME_ERROR)
+                if breaker:
+                    breaker.record_failure(url, error_message)
+                if isinstance(e, aiohttp.ClientConnectorError):
+                    # Cached addresses may be stale; resolve again on the next attempt
+                    self._forget_host(url)
+                failure = classify_error(e)
+            except Exception as e:
+                error_message = f"Unexpected error: {e}"
+                logger.exception(f"Unexpected error while fetching {url}")
+                slot.report(OUTCOME_ERROR)
+                failure = classify_error(e)
+            finally:
+                await self.concurrency.release(slot)
+                
+            # Handle retries: permanent errors, exhausted attempts or budget end the loop
+            decision = self.retry_policy.decide(url, failure, retry_attempt, self.max_retries)
+            if not decision.retry:
+                logger.info(f"Not retrying {url}: {decision.reason}")
+                error_category = failure.category if failure else ""
+                break
+            if breaker and not breaker.allow_request(url):
+                # The domain was declared dead meanwhile; stop retrying
+                error_message = breaker.open_error(url)
+                error_category = failure.category if failure else ""
+                break
+            retry_attempt += 1
+            logger.info(f"Retrying {url} in {decision.delay:.2f} seconds (attempt {retry_attempt}/{self.max_retries})")
+            await asyncio.sleep(decision.delay)
+            # Respect any pause the server requested for this domain
+            await self._enforce_domain_rate_limit(url)
+                
         result = {
             "original_url": url,
             "final_url": final_url,
             "content": html_content,
             "error": error_message,
+            "error_category": error_category,
+            "content_hash": (
+                self.html_store.put(html_content)
+                if self.html_store and html_content
+                else ""
+            ),
         }
             
         return result
 
+    def _check_response_headers(self, response: aiohttp.ClientResponse) -> None:
+        """Raise UnacceptableResponseError for non-HTML or oversized responses."""
+        content_type = response.content_type  # Lower-cased, without parameters
+        if (
+            self.allowed_content_types
+            and response.headers.get("Content-Type")
+            and content_type not in self.allowed_content_types
+        ):
+            raise UnacceptableResponseError(f"Unsupported content type: {content_type}")
+        if self.max_body_bytes and response.content_length is not None:
+            if response.content_length > self.max_body_bytes:
+                raise UnacceptableResponseError(
+                    f"Content-Length {response.content_length} exceeds {self.max_body_bytes} bytes"
+                )
+
+    def _forget_host(self, url: str) -> None:
+        """Drop cached DNS results of a URL's host."""
+        if self.session_manager:
+            self.session_manager.forget_host(url)
+        elif self.dns_cache is not None:
+            host = urlsplit(url).hostname
+            if host:
+                self.dns_cache.forget(host)
+
+    def _create_connector(self, limit: int = 100) -> aiohttp.TCPConnector:
+        """Connector for sessions this crawler creates itself."""
+        return aiohttp.TCPConnector(
+            resolver=CachingResolver(self.dns_cache) if self.dns_cache is not None else None,
+            limit=limit,
+            ttl_dns_cache=300,  # 5 minutes DNS cache TTL
+            enable_cleanup_closed=True,
+            force_close=False,  # Keep connections open for reuse
+        )
+
+    def _trace_configs(self) -> Optional[List[aiohttp.TraceConfig]]:
+        """Trace configs for sessions this crawler creates itself."""
+        return [self.metrics.create_trace_config()] if self.metrics else None
+
+    async def fetch_url(self, url: str) -> Dict[str, str]:
+        """Fetch a single URL, over the shared session when a session manager is set."""
+        if self.session_manager:
+            session = await self.session_manager.get_session()
+            return await self._fetch_single(session, url)
+        async with aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=self.conn_timeout,
+            connector=self._create_connector(),
+            trace_configs=self._trace_configs(),
+        ) as session:
+            return await self._fetch_single(session, url)
+
     async def process_urls(
         self,
-        urls: List[str],
-        batch_size: Optional[int] = None,
+        urls: UrlSource,
+        max_in_flight: Optional[int] = None,
     ) -> AsyncGenerator[Dict[str, str], None]:
-        """Process a list of URLs and yield results containing raw HTML.
+        """Process URLs and yield results containing raw HTML as each fetch completes.
         
         Args:
-            urls: List of URLs to process
-            batch_size: Optional batch size to process URLs in chunks
+            urls: URLs to process; an async iterable (e.g. UrlFeed) may keep adding URLs mid-run
+            max_in_flight: Number of fetches scheduled at once (defaults to the adaptive
+                concurrency ceiling; the controller decides how many actually run)
         """
-        if not urls:
+        if isinstance(urls, (list, tuple, set)) and not urls:
             return  # Empty URL list, return immediately
             
-        # Determine batch size if not provided
-        if batch_size is None:
-            batch_size = min(len(urls), self.max_concurrent_requests * 2)
+        max_in_flight = max_in_flight or self.concurrency.max_limit
             
+        if self.session_manager:
+            # Reuse the shared session's pooled connections, it outlives this call
+            session = await self.session_manager.get_session()
+            async for result in self._process_with_session(session, urls, max_in_flight):
+                yield result
+            return
+
         # Create session with connection pooling
-        self.tcp_connector = aiohttp.TCPConnector(
-            limit=self.max_concurrent_requests,
-            ttl_dns_cache=300,  # 5 minutes DNS cache TTL
-            enable_cleanup_closed=True,
-            force_close=False,  # Keep connections open for reuse
-        )
+        self.tcp_connector = self._create_connector(limit=self.concurrency.max_limit)
         
         async with aiohttp.ClientSession(
             headers=self.headers,
             timeout=self.conn_timeout,
             connector=self.tcp_connector,
+            trace_configs=self._trace_configs(),
         ) as session:
-            # Process URLs in batches for better resource management
-            for i in range(0, len(urls), batch_size):
-                batch = urls[i:i+batch_size]
-                tasks = [
-                    asyncio.create_task(
-                        self._fetch_single(session, url),
-                        name=f"fetch_{url[:50]}",
-                    )
-                    for url in batch
-                ]
-                
-                # Process completed tasks
-                for future in asyncio.as_completed(tasks):
-                    try:
-                        result = await future
-                        yield result
-                        if isinstance(result, dict) and result.get("error"):
-                            logger.warning(
-                                f"Error processing URL {result.get('original_url', 'unknown')}: {result['error']}"
-                            )
-                    except Exception as e:
-                        task_name = future.get_name() if hasattr(future, "get_name") else "unknown_task"
-                        logger.error(f"Task {task_name} raised an exception: {e}", exc_info=True)
-                        
-                        # Extract URL from task name
-                        original_url = (
-                            task_name.replace("fetch_", "")
-                            if task_name.startswith("fetch_")
-                            else "unknown_url"
-                        )
-                        yield {
-                            "original_url": original_url,
-                            "final_url": original_url,
-                            "content": "",
-                            "error": f"Task execution failed: {e}",
-                        }
-                        
-                # Small pause between batches to avoid overwhelming resources
-                if i + batch_size < len(urls):
-                    await asyncio.sleep(0.5)
+            async for result in self._process_with_session(session, urls, max_in_flight):
+                yield result
+
+    async def _process_with_session(
+        self,
+        session: aiohttp.ClientSession,
+        urls: UrlSource,
+        max_in_flight: int,
+    ) -> AsyncGenerator[Dict[str, str], None]:
+        """Fetch URLs over the given session, keeping max_in_flight requests running."""
+        async for result in sliding_window(
+            urls,
+            lambda url: self._fetch_single(session, url),
+            max_in_flight,
+            _task_error_result,
+        ):
+            if result.get("error"):
+                logger.warning(
+                    f"Error processing URL {result.get('original_url', 'unknown')}: {result['error']}"
+                )
+            yield result
 
 # ---- Playwright Crawler Class ----
 class PlaywrightCrawler:
@@ -286,14 +635,39 @@ class PlaywrightCrawler:
             user_agent: Optional[str] = None,
             user_agent_rotation: bool = True, 
             max_retries: int = DEFAULT_MAX_RETRY_ATTEMPTS,
+            http_cache: Optional[HttpCache] = None,
+            html_store: Optional[RawHtmlStore] = None,
+            rate_limiter: Optional[DomainRateLimiter] = None,
+            max_pages_per_context: int = DEFAULT_MAX_PAGES_PER_CONTEXT,
+            max_average_context_memory_mb: float = DEFAULT_MAX_AVERAGE_CONTEXT_MEMORY_MB,
+            browser_memory_budget_mb: float = DEFAULT_BROWSER_MEMORY_BUDGET_MB,
+            metrics: Optional[FetchMetrics] = None,
+            concurrency: Optional[AdaptiveConcurrencyController] = None,
+            circuit_breaker: Optional[DomainCircuitBreaker] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            block_stylesheets: bool = False,
+            blocked_domains: Optional[Iterable[str]] = None,
+            extract_links: bool = False,
+            rendered_cache_max_age: float = DEFAULT_RENDERED_CACHE_MAX_AGE_SECONDS,
         ):
             self.headless = headless
             self.page_timeout = page_timeout
             self.max_retries = max_retries
+            # Optional conditional-GET cache holding the rendered HTML of unchanged pages.
+            # Only pages that loaded no XHR / fetch data are cached (the document's
+            # validators say nothing about that data), and for at most rendered_cache_max_age
+            self.http_cache = http_cache
+            self.rendered_cache_max_age = rendered_cache_max_age
+            # Optional content-addressed store that keeps a copy of every fetched page
+            self.html_store = html_store
             self.browser_args = browser_args or {}
             self.user_agent = user_agent
             self.user_agent_rotation = user_agent_rotation
-            self.semaphore = asyncio.Semaphore(max_concurrent_pages)
+            # AIMD page concurrency (global and per domain), capped at the context pool size
+            self.concurrency = concurrency or AdaptiveConcurrencyController(
+                initial_limit=max(1, max_concurrent_pages // 2),
+                max_limit=max_concurrent_pages,
+            )
             self.pw_instance: Optional[Playwright] = None
             self.browser: Optional[Browser] = None
             self._start_lock = asyncio.Lock()
@@ -303,10 +677,42 @@ class PlaywrightCrawler:
             self.context_pool = []
             self.context_pool_size = max_concurrent_pages
             self.context_pool_lock = asyncio.Lock()
+
+            # Context / browser recycling to keep Chromium memory bounded
+            self.max_pages_per_context = max_pages_per_context
+            self.max_average_context_memory_mb = max_average_context_memory_mb
+            self.browser_memory_budget_mb = browser_memory_budget_mb
+            self._browser_memory_mb: Optional[float] = None
+            self._last_memory_check = 0.0
+            self._pool_stats = {
+                "pages_served": 0,
+                "pages_created": 0,
+                "pages_reused": 0,
+                "contexts_recycled": 0,
+                "browser_restarts": 0,
+            }
+
+            # Subresources blocked by the context-level route handler
+            self.blocked_resource_types = set(DEFAULT_BLOCKED_RESOURCE_TYPES)
+            if block_stylesheets:
+                self.blocked_resource_types.add("stylesheet")
+            self.blocked_domains = tuple(
+                domain.lower().lstrip(".")
+                for domain in (DEFAULT_BLOCKED_DOMAINS if blocked_domains is None else blocked_domains)
+            )
+            self._route_stats = {"allowed": 0, "blocked_by_type": {}, "blocked_by_domain": 0}
             
-            # Track processed domains to implement per-domain rate limiting
-            self.domain_timestamps = {}
-            self.domain_locks: Dict[str, asyncio.Lock] = {}
+            # Per-domain token-bucket rate limiting (may be shared with other crawlers)
+            self.rate_limiter = rate_limiter or DomainRateLimiter()
+            # Optional per-domain phase timings (goto, domcontentloaded, scroll, networkidle, content)
+            self.metrics = metrics
+            # Optional per-domain circuit breaker: dead domains fail fast instead of retrying
+            self.circuit_breaker = circuit_breaker
+            # Which failures are retried, backoff / Retry-After waits and the run's retry budget
+            self.retry_policy = retry_policy or RetryPolicy()
+            # Return only the page's visible links (JSON, see link_extraction) instead of
+            # its HTML. The http_cache then holds link lists, so don't share it with HTML mode.
+            self.extract_links = extract_links
 
             # Initialize user agent list for rotation
             self.user_agents = self._initialize_user_agents(user_agent)
@@ -356,64 +762,283 @@ class PlaywrightCrawler:
         
         return random.choice(self.user_agents)
     
+    async def _create_context_item(self, index: int, js_enabled: bool = True) -> Dict[str, Any]:
+        """Create a browser context with its own user agent and viewport."""
+        # Get a user agent - either the fixed one or a random one if rotation is enabled
+        user_agent = self._get_random_user_agent()
+        
+        # Create device descriptor with a unique fingerprint
+        viewport = {"width": 1280, "height": 720}
+        if index % 3 == 1:  # Small variation in viewport sizes
+            viewport = {"width": 1366, "height": 768}
+        elif index % 3 == 2:
+            viewport = {"width": 1920, "height": 1080}
+        
+        # Create a context with this user agent and viewport
+        context = await self.browser.new_context(
+            user_agent=user_agent,
+            viewport=viewport,
+            java_script_enabled=js_enabled,
+            # Add a small amount of randomization to make each context slightly different
+            # locale=random.choice(["en-US", "en-GB", "en-CA"]),
+            # timezone_id=random.choice(["America/New_York", "Europe/London", "Asia/Shanghai"]),
+        )
+        # Store the user agent with the context
+        item = {
+            "context": context, 
+            "page": None,  # Reused for every URL fetched in this context
+            "in_use": False,
+            "js_enabled": js_enabled,
+            "user_agent": user_agent,
+            "viewport": viewport,
+            "index": index,
+            "pages_served": 0,
+            "created_at": time.time(),
+            # XHR / fetch requests made by the page currently being fetched
+            "data_requests": 0,
+        }
+
+        async def route_request(route: Route) -> None:
+            await self._route_request(route, item)
+
+        # Registered once here instead of on every page
+        await context.route("**/*", route_request)
+        return item
+
+    def _is_blocked_domain(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return any(
+            host == domain or host.endswith("." + domain) for domain in self.blocked_domains
+        )
+
+    async def _route_request(self, route: Route, context_item: Dict[str, Any]) -> None:
+        """
+        Context-level route handler: abort media, fonts and tracker requests,
+        and count the data requests of the context's page.
+        """
+        request = route.request
+        try:
+            # Ad iframes are navigations too; only the page's own navigation is exempt
+            if not (request.is_navigation_request() and request.frame.parent_frame is None):
+                resource_type = request.resource_type
+                if resource_type in self.blocked_resource_types:
+                    by_type = self._route_stats["blocked_by_type"]
+                    by_type[resource_type] = by_type.get(resource_type, 0) + 1
+                    await route.abort("blockedbyclient")
+                    return
+                if self.blocked_domains and self._is_blocked_domain(request.url):
+                    self._route_stats["blocked_by_domain"] += 1
+                    await route.abort("blockedbyclient")
+                    return
+                if resource_type in DATA_RESOURCE_TYPES:
+                    context_item["data_requests"] += 1
+            self._route_stats["allowed"] += 1
+            await route.continue_()
+        except PlaywrightError as e:
+            # The page or context went away while the request was intercepted
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+
+    async def _get_page(self, context_item: Dict[str, Any]) -> Page:
+        """The context's pooled page, created on first use."""
+        page = context_item.get("page")
+        if page is not None and not page.is_closed():
+            self._pool_stats["pages_reused"] += 1
+            return page
+        context: BrowserContext = context_item["context"]
+        page = await context.new_page()
+        page.set_default_timeout(self.page_timeout)
+        context_item["page"] = page
+        self._pool_stats["pages_created"] += 1
+        return page
+
+    async def _reset_page(self, context_item: Dict[str, Any]) -> None:
+        """
+        Navigate the context's page to about:blank so it can serve the next URL
+        (stops the previous page's scripts and frees its DOM). A page that
+        cannot be reset is closed and replaced on next use.
+        """
+        page = context_item.get("page")
+        if page is None:
+            return
+        try:
+            if not page.is_closed():
+                await page.goto("about:blank", timeout=PAGE_RESET_TIMEOUT_MS)
+                return
+        except Exception as e:
+            logger.warning(f"Could not reset pooled page, closing it: {str(e).splitlines()[0]}")
+            try:
+                await page.close()
+            except Exception:
+                pass
+        context_item["page"] = None
+
     async def _initialize_context_pool(self):
         """Initialize a pool of browser contexts with diverse user agents for performance"""
         async with self.context_pool_lock:
             logger.info(f"Initializing context pool with {self.context_pool_size} contexts")
             for i in range(self.context_pool_size):
-                # Get a user agent - either the fixed one or a random one if rotation is enabled
-                user_agent = self._get_random_user_agent()
-                
-                # Create device descriptor with a unique fingerprint
-                viewport = {"width": 1280, "height": 720}
-                if i % 3 == 1:  # Small variation in viewport sizes
-                    viewport = {"width": 1366, "height": 768}
-                elif i % 3 == 2:
-                    viewport = {"width": 1920, "height": 1080}
-                
-                # Create a context with this user agent and viewport
-                context = await self.browser.new_context(
-                    user_agent=user_agent,
-                    viewport=viewport,
-                    java_script_enabled=True,
-                    # Add a small amount of randomization to make each context slightly different
-                    # locale=random.choice(["en-US", "en-GB", "en-CA"]),
-                    # timezone_id=random.choice(["America/New_York", "Europe/London", "Asia/Shanghai"]),
-                )
-                
-                # Store the user agent with the context
-                self.context_pool.append({
-                    "context": context, 
-                    "in_use": False,
-                    "user_agent": user_agent,
-                    "viewport": viewport
-                })
+                self.context_pool.append(await self._create_context_item(i))
                 
             logger.info("Context pool initialized with diverse browser profiles")
 
-    async def _get_context_from_pool(self):
+    async def _get_context_from_pool(self, js_enabled: bool = True):
         """Get an available context from the pool or create a new one if needed"""
         async with self.context_pool_lock:
             # Try to find an available context
             for item in self.context_pool:
-                if not item["in_use"]:
+                if not item["in_use"] and item.get("js_enabled", True) == js_enabled:
                     item["in_use"] = True
                     return item
             
             # If all contexts are in use, create a new one
-            logger.info("All contexts in use, creating a new one")
-            context = await self.browser.new_context(user_agent=self.user_agent)
-            new_item = {"context": context, "in_use": True}
+            logger.info(f"No free context (JavaScript {'on' if js_enabled else 'off'}), creating a new one")
+            new_item = await self._create_context_item(len(self.context_pool), js_enabled)
+            new_item["in_use"] = True
             self.context_pool.append(new_item)
             return new_item
 
-    async def _return_context_to_pool(self, context_item):
-        """Return a context to the pool"""
+    async def _return_context_to_pool(self, context_item, page_served: bool = True):
+        """
+        Return a context to the pool, replacing it if it has served too many pages
+        or the browser's average memory per context is over the limit. The average
+        is not a measure of this context: while it stays high, every context that
+        is returned gets recycled until the re-measured average drops.
+        """
+        self._sample_browser_memory()
         async with self.context_pool_lock:
-            for item in self.context_pool:
-                if item["context"] == context_item["context"]:
+            for position, item in enumerate(self.context_pool):
+                if item["context"] != context_item["context"]:
+                    continue
+                if page_served:
+                    item["pages_served"] += 1
+                    self._pool_stats["pages_served"] += 1
+
+                reason = None
+                if item["pages_served"] >= self.max_pages_per_context:
+                    reason = f"served {item['pages_served']} pages"
+                else:
+                    average_mb = self._average_memory_per_context_mb()
+                    if average_mb is not None and average_mb > self.max_average_context_memory_mb:
+                        reason = f"~{average_mb:.0f}MB per context on average"
+
+                if reason and self.browser and self.browser.is_connected():
+                    logger.info(f"Recycling browser context #{item['index']} ({reason})")
+                    try:
+                        await item["context"].close()
+                    except Exception as e:
+                        logger.warning(f"Error closing recycled context: {e}")
+                    try:
+                        self.context_pool[position] = await self._create_context_item(
+                            item["index"], item.get("js_enabled", True)
+                        )
+                        self._pool_stats["contexts_recycled"] += 1
+                    except Exception as e:
+                        logger.error(f"Failed to replace recycled context: {e}")
+                        self.context_pool.pop(position)
+                    # Memory has to be re-measured after the context was released
+                    self._last_memory_check = 0.0
+                else:
                     item["in_use"] = False
-                    break
+                break
+
+    def _sample_browser_memory(self, force: bool = False) -> Optional[float]:
+        """Measure the RSS of the browser process tree, at most every MEMORY_CHECK_INTERVAL seconds."""
+        now = time.time()
+        if force or now - self._last_memory_check >= MEMORY_CHECK_INTERVAL:
+            self._last_memory_check = now
+            self._browser_memory_mb = get_child_process_memory_mb()
+        return self._browser_memory_mb
+
+    def _average_memory_per_context_mb(self) -> Optional[float]:
+        """
+        Average browser memory per pooled context. Chromium does not attribute
+        renderer processes to contexts, so the process tree total is spread evenly.
+        """
+        if self._browser_memory_mb is None or not self.context_pool:
+            return None
+        return self._browser_memory_mb / len(self.context_pool)
+
+    async def _restart_browser(self, reason: str, failed_browser: Optional[Browser] = None):
+        """
+        Close all contexts and the browser, then launch a fresh one (Playwright itself keeps running).
+
+        ``failed_browser`` is the browser the caller saw fail. When several pages
+        lose the browser together, only the first caller restarts it; the others
+        find it already replaced (or being relaunched) and just use the new one.
+        """
+        async with self._start_lock:
+            restarted_by_other = (
+                failed_browser is not None
+                and self.browser is not failed_browser
+                and (self.browser is None or self.browser.is_connected())
+            )
+            if restarted_by_other:
+                logger.info(f"Browser was already restarted by another page ({reason})")
+            else:
+                logger.warning(f"Restarting browser: {reason}")
+                async with self.context_pool_lock:
+                    for item in self.context_pool:
+                        try:
+                            await item["context"].close()
+                        except Exception as e:
+                            logger.debug(f"Error closing context during restart: {e}")
+                    self.context_pool = []
+                if self.browser:
+                    try:
+                        await self.browser.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing browser during restart: {e}")
+                    self.browser = None
+                self._browser_initialized = False
+                self._pool_stats["browser_restarts"] += 1
+        await self._ensure_browser_started()
+        if not restarted_by_other:
+            self._sample_browser_memory(force=True)
+
+    async def recycle_browser_if_over_budget(self) -> bool:
+        """
+        Restart the browser if its process tree exceeds the memory budget.
+        Only done while no page is being fetched; call it between crawl runs.
+        """
+        if not self._browser_initialized or not self.browser:
+            return False
+        memory_mb = self._sample_browser_memory(force=True)
+        if memory_mb is None or memory_mb <= self.browser_memory_budget_mb:
+            return False
+        if any(item["in_use"] for item in self.context_pool):
+            return False
+        await self._restart_browser(
+            f"{memory_mb:.0f}MB exceeds budget of {self.browser_memory_budget_mb:.0f}MB"
+        )
+        return True
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Context pool health: pages served / reused, recycles, restarts, memory and blocked requests."""
+        now = time.time()
+        stats: Dict[str, Any] = dict(self._pool_stats)
+        stats["browser_memory_mb"] = (
+            round(self._browser_memory_mb, 1) if self._browser_memory_mb is not None else None
+        )
+        average_mb = self._average_memory_per_context_mb()
+        stats["avg_context_memory_mb"] = round(average_mb, 1) if average_mb is not None else None
+        stats["contexts"] = [
+            {
+                "index": item.get("index"),
+                "in_use": item["in_use"],
+                "pages_served": item.get("pages_served", 0),
+                "age_seconds": round(now - item.get("created_at", now), 1),
+            }
+            for item in self.context_pool
+        ]
+        stats["requests"] = {
+            "allowed": self._route_stats["allowed"],
+            "blocked": sum(self._route_stats["blocked_by_type"].values())
+            + self._route_stats["blocked_by_domain"],
+            "blocked_by_type": dict(self._route_stats["blocked_by_type"]),
+            "blocked_by_domain": self._route_stats["blocked_by_domain"],
+        }
+        stats["concurrency"] = self.concurrency.get_stats()
+        return stats
 
     async def _ensure_browser_started(self):
         """Use a lock to ensure Playwright and the browser are started (if not already running)."""
@@ -499,35 +1124,87 @@ class PlaywrightCrawler:
 
     async def _enforce_domain_rate_limit(self, url: str) -> None:
         """Enforce rate limiting per domain to avoid overloading servers"""
-        domain = urlparse(url).netloc
-        
-        # Get or create a lock for this domain to enforce per-domain serialization
-        lock = self.domain_locks.get(domain)
-        if lock is None:
-            lock = asyncio.Lock()
-            self.domain_locks[domain] = lock
-
-        async with lock:
-            last_access = self.domain_timestamps.get(domain, 0)
-            now = time.time()
-            
-            # If we've accessed this domain recently, wait a bit
-            if now - last_access < 1.0:  # 1 second between requests to same domain
-                delay = 1.0 - (now - last_access)
-                await asyncio.sleep(delay)
-                
-            # Update the last access time
-            self.domain_timestamps[domain] = time.time()
+        await self.rate_limiter.acquire(url)
+
+    async def _revalidate_from_cache(self, context, url: str) -> Optional[Dict[str, str]]:
+        """
+        Send a lightweight conditional GET through the context's request API.
+        If the page is unchanged (304), return the cached rendered HTML so the
+        browser page, scrolling and network idle wait can be skipped entirely.
+        """
+        cached = self.http_cache.get(url) if self.http_cache else None
+        if not cached:
+            return None
+        # stored_at is the render time here: 304s don't refresh it (see below)
+        if (
+            self.rendered_cache_max_age
+            and time.time() - cached.stored_at > self.rendered_cache_max_age
+        ):
+            return None
+        headers = cached.conditional_headers()
+        if not headers:
+            return None
+        try:
+            response = await context.request.get(
+                url,
+                headers=headers,
+                timeout=self.page_timeout,
+                fail_on_status_code=False,
+            )
+            status = response.status
+            retry_after = response.headers.get("retry-after")
+            await response.dispose()
+        except PlaywrightError as e:
+            logger.debug(f"Conditional request failed for {url}: {e}")
+            return None
+
+        if status in THROTTLE_STATUS_CODES:
+            self.rate_limiter.penalize(url, parse_retry_after(retry_after))
+            await self._enforce_domain_rate_limit(url)
+            return None
+
+        if status != 304:
+            return None
+
+        # Decompress the rendered page only now that it is known to be current
+        content = self.http_cache.load_content(url)
+        if content is None:
+            return None
+        self.http_cache.mark_not_modified(url, refresh=False)
+        logger.info(f"[Worker] Not modified, served from cache: {url}")
+        result = {
+            "original_url": url,
+            "final_url": cached.final_url,
+            "content": content,
+            "error": "",
+            "content_hash": self.html_store.put(content) if self.html_store else "",
+        }
+        if self.extract_links:
+            result["content_format"] = CONTENT_FORMAT_LINKS
+        return result
 
     async def _fetch_single(
         self,
         url: str,
         scroll_page: bool = True,
         max_retries: Optional[int] = None,
+        readiness: Optional[ReadinessProfile] = None,
     ) -> Dict[str, str]:
-        """Fetch the raw HTML content of a single URL with optimized resource handling."""
+        """
+        Fetch the raw HTML content of a single URL with optimized resource handling.
+
+        ``readiness`` is the source's page readiness profile (wait strategy,
+        scroll limit, JavaScript on/off); without one the DOM quiescence
+        defaults are used. Successful fetches include a ``readiness``
+        observation for ``ReadinessProfile.learn``.
+        """
         if max_retries is None:
             max_retries = self.max_retries
+        profile = readiness or ReadinessProfile()
+
+        breaker = self.circuit_breaker
+        if breaker and not breaker.allow_request(url):
+            return _circuit_open_result(url, breaker)
             
         # Enforce rate limiting
         await self._enforce_domain_rate_limit(url)
@@ -547,110 +1224,213 @@ class PlaywrightCrawler:
         html_content = ""
         error_message = ""
         final_url = url
+        observation: Optional[Dict[str, Any]] = None
         fetch_start_time = time.time()
         
-        # Use semaphore for concurrency control
-        async with self.semaphore:
-            logger.info(f"Starting fetch for {url}")
-            context_item = None
-            page = None
-            
-            for attempt in range(max_retries):
-                try:
-                    # Get a context from the pool
-                    if not context_item:
-                        context_item = await self._get_context_from_pool()
-                    
-                    # Create a new page in the context
-                    page = await context_item["context"].new_page()
-                    page.set_default_timeout(self.page_timeout)
-                    
-                    # Set performance optimizations for the page
-                    await page.route("**/*.{png,jpg,jpeg,gif,svg,woff,woff2,ttf,eot}", 
-                                     lambda route: route.abort())
-                    
-                    # Configure efficient page loading
-                    await page.goto(url, 
-                                   wait_until="domcontentloaded", 
-                                   timeout=self.page_timeout)
-                    final_url = page.url
-                    
-                    if scroll_page:
-                        await self._scroll_page(page)
+        logger.info(f"Starting fetch for {url}")
+        context_item = None
+        page = None
+        
+        if self.http_cache:
+            # Adaptive (AIMD) concurrency control, per domain and overall
+            async with self.concurrency.slot(url) as slot:
+                context_item = await self._get_context_from_pool(profile.js_enabled)
+                cached_result = await self._revalidate_from_cache(context_item["context"], url)
+                if cached_result:
+                    slot.report(OUTCOME_SUCCESS)
+            if cached_result:
+                if breaker:
+                    breaker.record_success(url)
+                await self._return_context_to_pool(context_item, page_served=False)
+                return cached_result
 
-                    try:
-                        # Shorter network idle timeout
-                        await page.wait_for_load_state("networkidle", timeout=5000)
-                    except PlaywrightTimeoutError:
-                        logger.warning(f"Network idle wait timed out for {final_url}. Continuing.")
-                    except PlaywrightError as e:
-                        logger.warning(f"Network idle wait failed for {final_url}: {e}. Continuing.")
-                        
-                    # Get HTML content efficiently
-                    html_content = await page.content()
+        self.retry_policy.record_request(url)
+        attempts = 0
+        for attempt in range(max_retries):
+            attempts = attempt + 1
+            failure: Optional[RetryFailure] = None
+            attempt_browser = self.browser
+            # Hold an adaptive concurrency slot for the attempt only, not for the backoff
+            slot = await self.concurrency.acquire(url)
+            try:
+                # Get a context from the pool
+                if not context_item:
+                    context_item = await self._get_context_from_pool(profile.js_enabled)
+                # The browser this attempt runs on, in case it has to be restarted
+                attempt_browser = context_item["context"].browser
+                
+                # Reuse the context's page; resource blocking is set up on the context
+                page = await self._get_page(context_item)
+                context_item["data_requests"] = 0
+                
+                # Configure efficient page loading; navigation is split at the
+                # response commit so goto and DOMContentLoaded are timed separately
+                with _phase_timer(self.metrics, url, PHASE_GOTO):
+                    response = await page.goto(url, 
+                                   wait_until="commit", 
+                                   timeout=self.page_timeout)
+                with _phase_timer(self.metrics, url, PHASE_DOMCONTENTLOADED):
+                    await page.wait_for_load_state(
+                        "domcontentloaded", timeout=self.page_timeout
+                    )
+                final_url = page.url
 
-                    fetch_duration = time.time() - fetch_start_time
-                    logger.info(
-                        f"[Worker] Successfully fetched: {final_url} in {fetch_duration:.2f} seconds"
+                if response is not None and response.status in THROTTLE_STATUS_CODES:
+                    raise RateLimitedError(
+                        response.status,
+                        parse_retry_after(response.headers.get("retry-after")),
                     )
-                    error_message = ""
-                    break  # Success
-                    
-                except PlaywrightTimeoutError as e:
-                    error_message = f"Timeout error for {url}: {str(e).splitlines()[0]}"
-                    logger.error(f"{error_message} (Attempt {attempt+1}/{max_retries})")
-                except PlaywrightError as e:
-                    error_message = f"Playwright error for {url}: {str(e).splitlines()[0]}"
-                    logger.error(f"{error_message} (Attempt {attempt+1}/{max_retries})")
-                    
-                    # Check for browser disconnection and try to recover
-                    if "Target closed" in str(e) or "Browser closed" in str(e):
-                        logger.warning("Browser connection lost, attempting to recover...")
-                        self._browser_initialized = False
-                        try:
-                            await self._ensure_browser_started()
-                            context_item = None  # Force getting a new context
-                        except Exception as init_err:
-                            logger.error(f"Failed to recover browser: {init_err}")
-                            
-                except Exception as e:
-                    error_message = f"Unexpected error for {url}: {e}"
-                    logger.error(f"{error_message} (Attempt {attempt+1}/{max_retries})")
-                finally:
-                    # Clean up page resources
-                    if page:
-                        try:
-                            if not page.is_closed():
-                                await page.close()
-                        except Exception as e:
-                            logger.warning(f"Error closing page for {url}: {e}")
-                        page = None
                 
-                # Handle retries with exponential backoff
-                if attempt < max_retries - 1:
-                    backoff = calculate_backoff(attempt)
-                    logger.info(f"Retrying {url} in {backoff:.2f} seconds (attempt {attempt+1}/{max_retries})")
-                    await asyncio.sleep(backoff)
+                observation = await self._wait_until_ready(page, url, profile, scroll_page)
                     
-            # Return context to pool
-            if context_item:
-                await self._return_context_to_pool(context_item)
-                
-            if error_message:
+                # Get HTML content efficiently, or just the visible links in link mode
+                with _phase_timer(self.metrics, url, PHASE_CONTENT):
+                    if self.extract_links:
+                        html_content = encode_links(await extract_page_links(page))
+                    else:
+                        html_content = await page.content()
+
+                if self.http_cache and response is not None:
+                    if context_item["data_requests"]:
+                        # Content loaded by scripts can change while the document
+                        # still answers 304; never serve this page from the cache
+                        self.http_cache.delete(url)
+                    else:
+                        self.http_cache.store(
+                            url,
+                            final_url,
+                            html_content,
+                            etag=response.headers.get("etag"),
+                            last_modified=response.headers.get("last-modified"),
+                        )
+
                 fetch_duration = time.time() - fetch_start_time
-                logger.error(
-                    f"Failed to process {url} after {max_retries} attempts, took {fetch_duration:.2f} seconds."
+                if self.metrics:
+                    self.metrics.record_url(url, PHASE_TOTAL, fetch_duration * 1000.0)
+                logger.info(
+                    f"[Worker] Successfully fetched: {final_url} in {fetch_duration:.2f} seconds"
                 )
+                error_message = ""
+                slot.report(OUTCOME_SUCCESS)
+                if breaker:
+                    breaker.record_success(url)
+                break  # Success
                 
+            except RateLimitedError as e:
+                error_message = f"Rate limited for {url}: {e}"
+                logger.warning(f"{error_message} (Attempt {attempt+1}/{max_retries})")
+                self.rate_limiter.penalize(url, e.retry_after)
+                slot.report(OUTCOME_OVERLOAD)
+                failure = classify_error(e)
+            except PlaywrightTimeoutError as e:
+                error_message = f"Timeout error for {url}: {str(e).splitlines()[0]}"
+                logger.error(f"{error_message} (Attempt {attempt+1}/{max_retries})")
+                slot.report(OUTCOME_OVERLOAD)
+                if breaker:
+                    breaker.record_failure(url, error_message)
+                failure = classify_error(e)
+            except PlaywrightError as e:
+                error_message = f"Playwright error for {url}: {str(e).splitlines()[0]}"
+                logger.error(f"{error_message} (Attempt {attempt+1}/{max_retries})")
+                slot.report(OUTCOME_ERROR)
+                if breaker and "net::ERR_" in str(e):
+                    # DNS / connection failures of the site, not of our browser
+                    breaker.record_failure(url, error_message)
+                failure = classify_error(e)
+                
+                # Check for browser disconnection and try to recover
+                if "Target closed" in str(e) or "Browser closed" in str(e):
+                    logger.warning("Browser connection lost, attempting to recover...")
+                    try:
+                        await self._restart_browser("connection lost", attempt_browser)
+                    except Exception as init_err:
+                        logger.error(f"Failed to recover browser: {init_err}")
+                    context_item = None  # The old context died with the browser
+                        
+            except Exception as e:
+                error_message = f"Unexpected error for {url}: {e}"
+                logger.error(f"{error_message} (Attempt {attempt+1}/{max_retries})")
+                slot.report(OUTCOME_ERROR)
+                failure = classify_error(e)
+            finally:
+                # Reset the pooled page for the next URL instead of closing it
+                if page and context_item:
+                    await self._reset_page(context_item)
+                page = None
+                await self.concurrency.release(slot)
+            
+            # Handle retries: permanent errors, exhausted attempts or budget end the loop
+            decision = self.retry_policy.decide(url, failure, attempt, max_retries - 1)
+            if not decision.retry:
+                logger.info(f"Not retrying {url}: {decision.reason}")
+                break
+            if breaker and not breaker.allow_request(url):
+                # The domain was declared dead meanwhile; stop retrying
+                error_message = breaker.open_error(url)
+                break
+            logger.info(f"Retrying {url} in {decision.delay:.2f} seconds (attempt {attempt+1}/{max_retries})")
+            await asyncio.sleep(decision.delay)
+            # Respect any pause the server requested for this domain
+            await self._enforce_domain_rate_limit(url)
+                
+        # Return context to pool
+        if context_item:
+            await self._return_context_to_pool(context_item)
+            
+        if error_message:
+            fetch_duration = time.time() - fetch_start_time
+            logger.error(
+                f"Failed to process {url} after {attempts} attempts, took {fetch_duration:.2f} seconds."
+            )
+            
         result = {
             "original_url": url,
             "final_url": final_url,
             "content": html_content,
             "error": error_message,
+            "content_hash": (
+                self.html_store.put(html_content)
+                if self.html_store and html_content
+                else ""
+            ),
         }
+        if self.extract_links:
+            result["content_format"] = CONTENT_FORMAT_LINKS
+        if observation and not error_message:
+            result["readiness"] = observation
             
         return result
 
+    async def _wait_until_ready(
+        self, page: Page, url: str, profile: ReadinessProfile, scroll_page: bool
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the loaded page according to the readiness profile. Returns
+        the quiescence observation, or None for the other strategies.
+        """
+        if profile.wait_strategy == WAIT_DOMCONTENTLOADED or not profile.js_enabled:
+            # Nothing will render after DOMContentLoaded without scripts
+            return None
+
+        if profile.wait_strategy == WAIT_NETWORKIDLE:
+            if scroll_page and profile.max_scrolls:
+                with _phase_timer(self.metrics, url, PHASE_SCROLL):
+                    await self._scroll_page(page, max_scrolls=profile.max_scrolls)
+            try:
+                # Shorter network idle timeout
+                with _phase_timer(self.metrics, url, PHASE_NETWORKIDLE):
+                    await page.wait_for_load_state("networkidle", timeout=5000)
+            except PlaywrightTimeoutError:
+                logger.warning(f"Network idle wait timed out for {page.url}. Continuing.")
+            except PlaywrightError as e:
+                logger.warning(f"Network idle wait failed for {page.url}: {e}. Continuing.")
+            return None
+
+        with _phase_timer(self.metrics, url, PHASE_SETTLE):
+            observation = await settle_page(page, profile, scroll=scroll_page)
+        logger.debug(f"Readiness for {url}: {observation}")
+        return observation
+
     async def _scroll_page(
         self, page: Page, scroll_delay: float = 0.3, max_scrolls: int = 5
     ):
@@ -684,70 +1464,40 @@ class PlaywrightCrawler:
 
     async def process_urls(
         self,
-        urls: List[str],
+        urls: UrlSource,
         scroll_pages: bool = False,
-        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
     ) -> AsyncGenerator[Dict[str, str], None]:
-        """Process URLs in optimized batches with resource management.
+        """Process URLs with a sliding window of pages, yielding results as they complete.
         
         Args:
-            urls: List of URLs to process
+            urls: URLs to process; an async iterable (e.g. UrlFeed) may keep adding URLs mid-run
             scroll_pages: Whether to scroll pages during fetching
-            batch_size: Optional batch size to process URLs in chunks
+            max_in_flight: Number of pages scheduled at once (defaults to the context pool size;
+                the adaptive controller decides how many actually run)
         """
-        if not urls:
+        if isinstance(urls, (list, tuple, set)) and not urls:
             return
 
         if not self.browser or not self.browser.is_connected():
             await self._ensure_browser_started()
+        else:
+            # Start each run with a browser that is within its memory budget
+            await self.recycle_browser_if_over_budget()
             
-        # Determine batch size if not provided
-        if batch_size is None:
-            batch_size = min(len(urls), self.semaphore._value * 2)
+        max_in_flight = max_in_flight or self.context_pool_size
             
-        # Process URLs in batches
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i:i+batch_size]
-            tasks = [
-                asyncio.create_task(
-                    self._fetch_single(url, scroll_pages), 
-                    name=f"fetch_{url[:50]}"
+        async for result in sliding_window(
+            urls,
+            lambda url: self._fetch_single(url, scroll_pages),
+            max_in_flight,
+            _task_error_result,
+        ):
+            if result.get("error"):
+                logger.warning(
+                    f"Error processing URL {result.get('original_url', 'unknown')}: {result['error']}"
                 )
-                for url in batch
-            ]
-            
-            # Process completed tasks
-            for future in asyncio.as_completed(tasks):
-                try:
-                    result = await future
-                    yield result
-                    if result.get("error"):
-                        logger.warning(
-                            f"Error processing URL {result.get('original_url', 'unknown')}: {result['error']}"
-                        )
-                except Exception as e:
-                    task_name = (
-                        future.get_name() if hasattr(future, "get_name") else "unknown_task"
-                    )
-                    logger.error(
-                        f"Task {task_name} raised an unexpected exception: {e}",
-                        exc_info=True,
-                    )
-                    original_url = (
-                        task_name.replace("fetch_", "")
-                        if task_name.startswith("fetch_")
-                        else "unknown_url"
-                    )
-                    yield {
-                        "original_url": original_url,
-                        "final_url": original_url,
-                        "content": "",
-                        "error": f"Task execution failed: {e}",
-                    }
-            
-            # Small pause between batches to avoid overwhelming resources
-            if i + batch_size < len(urls):
-                await asyncio.sleep(0.5)
+            yield result
 
 
 # ---- Resource Monitoring Utilities ----
@@ -761,6 +1511,7 @@ class ResourceMonitor:
         self._stats = {
             "memory_usage": [],
             "cpu_usage": [],
+            "child_memory_usage": [],  # Playwright driver and browser processes
         }
         
     async def start_monitoring(self):
@@ -783,28 +1534,36 @@ class ResourceMonitor:
             logger.warning("psutil not available, resource monitoring disabled")
             return
             
+        # Get current process; the first cpu_percent() call only sets the reference point
+        process = psutil.Process()
+        process.cpu_percent(interval=None)
+
         while not self._stop_event.is_set():
             try:
-                # Get current process
-                process = psutil.Process()
-                
                 # Memory usage
                 memory_info = process.memory_info()
                 memory_mb = memory_info.rss / (1024 * 1024)
                 self._stats["memory_usage"].append(memory_mb)
                 
-                # CPU usage
-                cpu_percent = process.cpu_percent(interval=0.1)
+                # CPU usage since the previous sample, without blocking the event loop
+                cpu_percent = process.cpu_percent(interval=None)
                 self._stats["cpu_usage"].append(cpu_percent)
+
+                # Child processes (browser) are where crawl memory actually grows
+                child_memory_mb = get_child_process_memory_mb() or 0.0
+                self._stats["child_memory_usage"].append(child_memory_mb)
                 
                 if len(self._stats["memory_usage"]) > 50:
                     # Keep only the last 50 measurements
                     self._stats["memory_usage"] = self._stats["memory_usage"][-50:]
                     self._stats["cpu_usage"] = self._stats["cpu_usage"][-50:]
+                    self._stats["child_memory_usage"] = self._stats["child_memory_usage"][-50:]
                     
                 # Log if memory usage is high
                 if memory_mb > 500:  # More than 500MB
                     logger.warning(f"High memory usage: {memory_mb:.2f}MB")
+                if child_memory_mb > DEFAULT_BROWSER_MEMORY_BUDGET_MB:
+                    logger.warning(f"High browser memory usage: {child_memory_mb:.2f}MB")
                     
             except Exception as e:
                 logger.error(f"Error monitoring resources: {e}")
@@ -823,10 +1582,13 @@ class ResourceMonitor:
         """Get a summary of the stats"""
         memory_usage = self._stats["memory_usage"]
         cpu_usage = self._stats["cpu_usage"]
+        child_memory_usage = self._stats["child_memory_usage"]
         
         return {
             "avg_memory_mb": sum(memory_usage) / max(1, len(memory_usage)),
             "max_memory_mb": max(memory_usage) if memory_usage else 0,
+            "avg_child_memory_mb": sum(child_memory_usage) / max(1, len(child_memory_usage)),
+            "max_child_memory_mb": max(child_memory_usage) if child_memory_usage else 0,
             "avg_cpu_percent": sum(cpu_usage) / max(1, len(cpu_usage)),
             "max_cpu_percent": max(cpu_usage) if cpu_usage else 0,
         }
@@ -860,11 +1622,11 @@ async def main_playwright():
             page_timeout=10000,
             browser_args={"args": ["--disable-dev-shm-usage", "--no-sandbox"]},
         ) as crawler:
-            # Process URLs in batches with optimized parameters
+            # Process URLs with optimized parameters
             async for result in crawler.process_urls(
                 urls=urls_to_fetch,
                 scroll_pages=True,
-                batch_size=2,  # Process in smaller batches for better stability
+                max_in_flight=2,  # Keep few pages open at once for better stability
             ):
                 results_count += 1
                 print("-" * 40)
@@ -940,10 +1702,10 @@ async def main_aiohttp():
 
     try:
         start_time = time.time()
-        # Process URLs with batch size for better resource management
+        # Keep a bounded number of requests in flight for better resource management
         async for result in crawler.process_urls(
             urls=urls_to_fetch,
-            batch_size=3,
+            max_in_flight=3,
         ):
             results_count += 1
             print("-" * 40)
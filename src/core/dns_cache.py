@@ -0,0 +1,235 @@
+# src/core/dns_cache.py
+# -*- coding: utf-8 -*-
+
+"""
+Persistent DNS cache for the aiohttp crawlers.
+
+aiohttp's ``ttl_dns_cache`` lives inside one ``TCPConnector`` and is lost
+with its session, so every fetch run starts by resolving each source and
+article domain again. ``PersistentDnsCache`` keeps resolved addresses with
+a TTL in a small JSON file in the data directory; ``CachingResolver`` plugs
+it into a connector, answering from the cache and resolving (and storing)
+only what is missing or expired.
+
+``warm_up_dns`` resolves a set of hosts concurrently, e.g. all source
+domains at the start of a fetch run, so the crawl itself finds them cached.
+Entries of a host whose addresses stop accepting connections can be
+dropped with ``forget()``. The cache is thread-safe and may be shared by
+several workers.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+
+logger = logging.getLogger(__name__)
+
+DNS_CACHE_FILE_NAME = "dns_cache.json"
+DEFAULT_DNS_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ENTRIES = 5000
+WARM_UP_CONCURRENCY = 32
+# Per-host resolution timeout during warm-up
+WARM_UP_RESOLVE_TIMEOUT_SECONDS = 5.0
+
+
+class PersistentDnsCache:
+    """Host -> resolved addresses with a TTL, optionally persisted to JSON."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = DEFAULT_DNS_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Serializes whole saves (snapshot + replace), so an older snapshot never
+        # replaces a newer one when several workers save the shared cache
+        self._save_lock = threading.Lock()
+        # "host|family" -> (expires_at, [{"host", "family", "proto", "flags"}, ...])
+        self._entries: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._dirty = False
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "forgotten": 0}
+
+    @staticmethod
+    def _key(host: str, family: int) -> str:
+        return f"{host.lower()}|{int(family)}"
+
+    def get(self, host: str, family: int = socket.AF_UNSPEC) -> Optional[List[Dict[str, Any]]]:
+        """Cached addresses of a host, or None if unknown or expired."""
+        key = self._key(host, family)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._stats["hits"] += 1
+                return [dict(address) for address in entry[1]]
+            if entry:
+                del self._entries[key]
+                self._dirty = True
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, host: str, family: int, addresses: List[Dict[str, Any]]) -> None:
+        """Store the addresses of a host for ``ttl_seconds``."""
+        if not addresses:
+            return
+        key = self._key(host, family)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Drop the entry closest to expiry
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.time() + self.ttl_seconds, addresses)
+            self._dirty = True
+            self._stats["stores"] += 1
+
+    def forget(self, host: str) -> None:
+        """Drop every cached entry of a host (e.g. after its addresses refused connections)."""
+        prefix = f"{host.lower()}|"
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._dirty = True
+                self._stats["forgotten"] += 1
+
+    # --- Persistence ---
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Restore unexpired entries from ``path`` (default: ``path`` of the cache).
+        Returns how many were loaded.
+        """
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read DNS cache {path}: {e}")
+            return 0
+
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, entry in data.get("entries", {}).items():
+                try:
+                    expires_at, addresses = float(entry["expires_at"]), list(entry["addresses"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if expires_at > now and addresses:
+                    self._entries[key] = (expires_at, addresses)
+                    loaded += 1
+        if loaded:
+            logger.info(f"Loaded {loaded} cached DNS entries from {path}")
+        return loaded
+
+    def save(self) -> None:
+        """Write the unexpired entries to ``path`` if anything changed."""
+        if not self.path:
+            return
+        with self._save_lock:
+            now = time.time()
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = {
+                    "saved_at": now,
+                    "entries": {
+                        key: {"expires_at": expires_at, "addresses": addresses}
+                        for key, (expires_at, addresses) in self._entries.items()
+                        if expires_at > now
+                    },
+                }
+                self._dirty = False
+            tmp_path = None
+            try:
+                cache_dir = os.path.dirname(self.path) or "."
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Could not save DNS cache to {self.path}: {e}")
+                with self._lock:
+                    self._dirty = True  # Try again on the next save
+            finally:
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+
+class CachingResolver(AbstractResolver):
+    """aiohttp resolver answering from a ``PersistentDnsCache``, resolving misses with ``resolver``."""
+
+    def __init__(self, cache: PersistentDnsCache, resolver: Optional[AbstractResolver] = None):
+        self.cache = cache
+        # Create inside the running loop: the default resolver binds to it
+        self._resolver = resolver or DefaultResolver()
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> List[Dict[str, Any]]:
+        addresses = self.cache.get(host, family)
+        if addresses is None:
+            results = await self._resolver.resolve(host, port, family)
+            addresses = [
+                {
+                    "host": result["host"],
+                    "family": int(result["family"]),
+                    "proto": result["proto"],
+                    "flags": result["flags"],
+                }
+                for result in results
+            ]
+            self.cache.put(host, family, addresses)
+        return [{"hostname": host, "port": port, **address} for address in addresses]
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+async def warm_up_dns(
+    resolver: AbstractResolver,
+    hosts: Iterable[str],
+    concurrency: int = WARM_UP_CONCURRENCY,
+    family: socket.AddressFamily = socket.AF_UNSPEC,
+) -> int:
+    """Resolve ``hosts`` concurrently through ``resolver``. Returns how many resolved."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _resolve(host: str) -> bool:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(
+                    resolver.resolve(host, 0, family), WARM_UP_RESOLVE_TIMEOUT_SECONDS
+                )
+                return True
+            except (OSError, asyncio.TimeoutError) as e:
+                logger.debug(f"DNS warm-up failed for {host}: {e}")
+                return False
+
+    results = await asyncio.gather(*(_resolve(host) for host in set(hosts) if host))
+    return sum(results)
@@ -0,0 +1,330 @@
+# src/core/feed_discovery.py
+# -*- coding: utf-8 -*-
+
+"""
+RSS / Atom feed and news sitemap discovery and parsing.
+
+Many sources publish a feed (RSS 2.0, RSS 1.0/RDF, Atom) or a Google News
+sitemap that lists exactly their article URLs with publish dates. When a
+source has one, its article links are read from the feed instead of asking
+the LLM to pick them out of the page's link list.
+
+``discover_feed`` looks for a usable feed of a source page, in this order:
+
+1. ``<link rel="alternate" type="application/rss+xml|atom+xml">`` in the page
+2. ``feed`` below the page path and the well-known ``/feed``, ``/rss.xml``,
+   ``/atom.xml`` of the site
+3. news sitemaps listed as ``Sitemap:`` in the site's robots.txt (sitemap
+   indexes are followed into their children whose URL mentions "news")
+
+A candidate is only accepted when it parses to at least one entry. Plain
+sitemaps (without ``<news:news>`` elements) list every page of a site and are
+not accepted.
+
+Crawl results holding a feed carry ``content_format = CONTENT_FORMAT_FEED``
+and their ``content`` is the feed document.
+"""
+
+import asyncio
+import logging
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Union
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.core.rate_limiter import DomainRateLimiter
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FORMAT_FEED = "feed"
+
+FEED_MIME_TYPES = (
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/rdf+xml",
+    "application/x-rss+xml",
+)
+# Feeds and sitemaps are often served with a generic XML, text or even HTML type
+FEED_CONTENT_TYPES = FEED_MIME_TYPES + (
+    "application/xml",
+    "text/xml",
+    "text/plain",
+    "text/html",
+)
+WELL_KNOWN_FEED_PATHS = ("/feed", "/rss.xml", "/atom.xml")
+
+# Sources without a feed are checked again after this long
+FEED_RECHECK_SECONDS = 7 * 24 * 3600
+# Feed entries older than this are not crawled
+MAX_FEED_ENTRY_AGE_SECONDS = 7 * 24 * 3600
+MAX_FEED_ENTRIES = 100
+MAX_FEED_BYTES = 5 * 1024 * 1024
+DISCOVERY_REQUEST_TIMEOUT = 10.0  # Seconds per candidate request
+MAX_ROBOTS_SITEMAPS = 5
+MAX_NEWS_SITEMAPS = 3
+
+
+@dataclass
+class FeedEntry:
+    """One article listed by a feed or news sitemap."""
+
+    url: str
+    title: str = ""
+    published: Optional[float] = None  # Unix timestamp
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _child(element: ET.Element, name: str) -> Optional[ET.Element]:
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _child_text(element: ET.Element, *names: str) -> str:
+    for name in names:
+        child = _child(element, name)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return ""
+
+
+def _parse_date(value: str) -> Optional[float]:
+    """Unix timestamp of an RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) date."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _parse_xml(content: Union[str, bytes]) -> Optional[ET.Element]:
+    if isinstance(content, str):
+        content = content.lstrip("\ufeff \t\r\n")
+    else:
+        content = content.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if not content:
+        return None
+    try:
+        return ET.fromstring(content)
+    except ET.ParseError:
+        return None
+
+
+def _rss_entry(item: ET.Element) -> Optional[FeedEntry]:
+    url = _child_text(item, "link")
+    if not url:
+        guid = _child(item, "guid")
+        if guid is not None and guid.get("isPermaLink", "true") == "true" and guid.text:
+            url = guid.text.strip()
+    if not url:
+        return None
+    return FeedEntry(
+        url, _child_text(item, "title"), _parse_date(_child_text(item, "pubDate", "date"))
+    )
+
+
+def _atom_entry(entry: ET.Element) -> Optional[FeedEntry]:
+    url = ""
+    for child in entry:
+        if _local(child.tag) == "link" and child.get("rel", "alternate") == "alternate":
+            url = (child.get("href") or "").strip()
+            if url:
+                break
+    if not url:
+        return None
+    return FeedEntry(
+        url, _child_text(entry, "title"), _parse_date(_child_text(entry, "published", "updated"))
+    )
+
+
+def _news_sitemap_entry(element: ET.Element) -> Optional[FeedEntry]:
+    news = _child(element, "news")
+    url = _child_text(element, "loc")
+    if news is None or not url:
+        return None
+    return FeedEntry(
+        url,
+        _child_text(news, "title"),
+        _parse_date(_child_text(news, "publication_date") or _child_text(element, "lastmod")),
+    )
+
+
+def parse_feed(content: Union[str, bytes], base_url: str = "") -> List[FeedEntry]:
+    """
+    Entries of an RSS, Atom or news sitemap document in document order.
+    Relative URLs are resolved against ``base_url``. Anything else (HTML,
+    plain sitemaps, invalid XML) gives an empty list.
+    """
+    root = _parse_xml(content)
+    if root is None:
+        return []
+
+    kind = _local(root.tag)
+    if kind in ("rss", "RDF"):
+        entries = [_rss_entry(item) for item in root.iter() if _local(item.tag) == "item"]
+    elif kind == "feed":
+        entries = [_atom_entry(entry) for entry in root if _local(entry.tag) == "entry"]
+    elif kind == "urlset":
+        entries = [_news_sitemap_entry(element) for element in root if _local(element.tag) == "url"]
+    else:
+        return []
+
+    result = []
+    for entry in entries:
+        if entry is None:
+            continue
+        entry.url = urljoin(base_url, entry.url)
+        if entry.url.startswith(("http://", "https://")):
+            result.append(entry)
+    return result
+
+
+def parse_sitemap_index(content: Union[str, bytes]) -> List[str]:
+    """Child sitemap URLs of a sitemap index (empty for anything else)."""
+    root = _parse_xml(content)
+    if root is None or _local(root.tag) != "sitemapindex":
+        return []
+    return [
+        loc for loc in (_child_text(sitemap, "loc") for sitemap in root) if loc
+    ]
+
+
+def recent_entry_urls(
+    entries: List[FeedEntry],
+    max_age_seconds: float = MAX_FEED_ENTRY_AGE_SECONDS,
+    limit: int = MAX_FEED_ENTRIES,
+) -> List[str]:
+    """
+    URLs of the entries worth crawling: newest first, without entries older than
+    ``max_age_seconds`` (undated entries are kept), at most ``limit``.
+    """
+    cutoff = time.time() - max_age_seconds
+    recent = [entry for entry in entries if entry.published is None or entry.published >= cutoff]
+    # Undated entries keep their feed order after the dated ones
+    recent.sort(key=lambda entry: -(entry.published or 0.0))
+    urls: List[str] = []
+    for entry in recent:
+        if entry.url not in urls:
+            urls.append(entry.url)
+        if len(urls) >= limit:
+            break
+    return urls
+
+
+def feed_links_from_html(html: str, page_url: str) -> List[str]:
+    """Feed URLs announced by ``<link rel="alternate">`` elements of a page."""
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer("link"))
+    links = []
+    for link in soup.find_all("link", href=True):
+        rel = link.get("rel") or []
+        if isinstance(rel, str):
+            rel = rel.split()
+        if "alternate" in (r.lower() for r in rel) and (link.get("type") or "").lower() in FEED_MIME_TYPES:
+            links.append(urljoin(page_url, link["href"].strip()))
+    return links
+
+
+def feed_candidates(page_url: str, html: Optional[str] = None) -> List[str]:
+    """Feed URLs to try for a source page, most specific first."""
+    parts = urlsplit(page_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    candidates = feed_links_from_html(html, page_url) if html else []
+    if parts.path.strip("/"):
+        # Section feeds, e.g. /category/tech/feed
+        candidates.append(f"{origin}{parts.path.rstrip('/')}/feed")
+    candidates.extend(origin + path for path in WELL_KNOWN_FEED_PATHS)
+    return list(dict.fromkeys(candidates))
+
+
+async def _get(
+    session: aiohttp.ClientSession,
+    url: str,
+    rate_limiter: Optional[DomainRateLimiter],
+    content_types: Optional[tuple] = FEED_CONTENT_TYPES,
+) -> Optional[bytes]:
+    """Body of a successful response, or None."""
+    if rate_limiter:
+        await rate_limiter.acquire(url)
+    try:
+        async with session.get(
+            url,
+            timeout=aiohttp.ClientTimeout(total=DISCOVERY_REQUEST_TIMEOUT),
+            ssl=False,
+        ) as response:
+            if response.status != 200:
+                return None
+            if content_types and response.content_type not in content_types:
+                return None
+            body = await response.content.read(MAX_FEED_BYTES + 1)
+            return body if len(body) <= MAX_FEED_BYTES else None
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeError) as e:
+        logger.debug(f"Feed discovery request to {url} failed: {e}")
+        return None
+
+
+async def _news_sitemap_from_robots(
+    session: aiohttp.ClientSession, origin: str, rate_limiter: Optional[DomainRateLimiter]
+) -> Optional[str]:
+    robots = await _get(session, f"{origin}/robots.txt", rate_limiter, content_types=None)
+    if not robots:
+        return None
+    sitemaps = [
+        line.split(":", 1)[1].strip()
+        for line in robots.decode("utf-8", errors="replace").splitlines()
+        if line.lower().startswith("sitemap:")
+    ]
+    for sitemap_url in sitemaps[:MAX_ROBOTS_SITEMAPS]:
+        content = await _get(session, sitemap_url, rate_limiter)
+        if not content:
+            continue
+        if parse_feed(content, sitemap_url):
+            return sitemap_url
+        children = [url for url in parse_sitemap_index(content) if "news" in url.lower()]
+        for child_url in children[:MAX_NEWS_SITEMAPS]:
+            child = await _get(session, child_url, rate_limiter)
+            if child and parse_feed(child, child_url):
+                return child_url
+    return None
+
+
+async def discover_feed(
+    session: aiohttp.ClientSession,
+    page_url: str,
+    html: Optional[str] = None,
+    rate_limiter: Optional[DomainRateLimiter] = None,
+) -> Optional[str]:
+    """
+    URL of a feed or news sitemap listing the articles of ``page_url``, or None.
+    ``html`` is the page itself, used for ``<link rel="alternate">`` discovery.
+    """
+    for candidate in feed_candidates(page_url, html):
+        content = await _get(session, candidate, rate_limiter)
+        if content and parse_feed(content, candidate):
+            logger.info(f"Discovered feed {candidate} for {page_url}")
+            return candidate
+
+    parts = urlsplit(page_url)
+    sitemap_url = await _news_sitemap_from_robots(
+        session, f"{parts.scheme}://{parts.netloc}", rate_limiter
+    )
+    if sitemap_url:
+        logger.info(f"Discovered news sitemap {sitemap_url} for {page_url}")
+    return sitemap_url
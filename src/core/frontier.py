@@ -0,0 +1,116 @@
+# src/core/frontier.py
+# -*- coding: utf-8 -*-
+
+"""
+Crawl frontier: the set of article URLs already stored or claimed in this run.
+
+URLs are compared by their canonical form (see ``canonicalize_url``), so
+``http``/``https``, trailing-slash, ``utm_*``, fragment and ``index.html``
+variants of one article are crawled and analyzed only once.
+
+The run's URLs are held as 64-bit fingerprints of their canonical form (a
+set of ints, no URL strings). A collision between two distinct articles is
+about ``n**2 / 2**65`` likely for ``n`` URLs, negligible at any realistic run
+size, so a new article is never mistaken for a seen one.
+
+Given the ``UrlIndex`` of stored articles (``stored``), the frontier consults
+it for stored URLs and only holds the URLs claimed in the current run, so it
+does not have to be seeded from the database.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.url_index import UrlIndex
+from src.utils.url_utils import canonicalize_url, url_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class UrlFrontier:
+    """
+    Thread-safe seen-set of canonical article URLs.
+
+    Seed it with the URLs already in the database at the start of a fetch run
+    (or give it the ``stored`` URL index); ``filter_new`` then returns only links
+    that were neither stored before nor claimed earlier in the same run, and
+    claims them.
+    """
+
+    def __init__(self, stored: Optional[UrlIndex] = None):
+        # Optional index of the stored article URLs, consulted besides the run's own URLs
+        self.stored = stored
+        self._fingerprints: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "duplicates": 0}
+
+    def _lookup(self, url: str) -> Tuple[Optional[int], bool]:
+        """Fingerprint of the URL's canonical form, and whether it is a stored article."""
+        key = canonicalize_url(url)
+        if not key:
+            return None, False
+        return url_fingerprint(key), self.stored is not None and self.stored.contains_key(key)
+
+    def _seen_locked(self, fingerprint: int) -> bool:
+        self._stats["checked"] += 1
+        return fingerprint in self._fingerprints
+
+    def seed(self, urls: Iterable[str]) -> int:
+        """Mark URLs (e.g. those already in the database) as seen. Returns how many were new."""
+        added = 0
+        with self._lock:
+            for url in urls:
+                key = canonicalize_url(url)
+                fingerprint = url_fingerprint(key) if key else None
+                if fingerprint is None or fingerprint in self._fingerprints:
+                    continue
+                self._fingerprints.add(fingerprint)
+                added += 1
+        return added
+
+    def add(self, url: str) -> bool:
+        """Mark a URL as seen. Returns False if it (or a variant of it) was already seen."""
+        fingerprint, stored = self._lookup(url)
+        if fingerprint is None:
+            return False
+        with self._lock:
+            if stored or self._seen_locked(fingerprint):
+                self._stats["duplicates"] += 1
+                return False
+            self._fingerprints.add(fingerprint)
+            return True
+
+    def seen(self, url: str) -> bool:
+        """Whether the URL or one of its variants was already seen."""
+        fingerprint, stored = self._lookup(url)
+        if fingerprint is None:
+            return False
+        if stored:
+            return True
+        with self._lock:
+            return self._seen_locked(fingerprint)
+
+    __contains__ = seen
+
+    def filter_new(self, urls: Iterable[str]) -> List[str]:
+        """
+        Return the URLs not seen yet, in order and without variants of one another,
+        and mark them as seen. URLs that cannot be canonicalized are dropped.
+        """
+        return [url for url in urls if self.add(url)]
+
+    def reset(self) -> None:
+        """Forget all URLs."""
+        with self._lock:
+            self._fingerprints.clear()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get size and lookup counters of the frontier."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["urls"] = len(self._fingerprints)
+        return stats
@@ -0,0 +1,292 @@
+# src/core/html_store.py
+# -*- coding: utf-8 -*-
+
+"""
+Content-addressed store for raw HTML fetched by the crawlers.
+
+Every page is saved once under the SHA-256 of its UTF-8 bytes, compressed with
+zstd (if the ``zstandard`` package is installed) or zlib otherwise. Identical
+pages fetched repeatedly share one file. Entries are evicted by TTL and, when
+the store grows past its byte budget, oldest-first until it fits again.
+
+Workers pass the content key around instead of the full HTML string, and the
+processing pipeline can be re-run from the stored copy without refetching.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+HTML_STORE_DIR_NAME = "html_store"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB of compressed HTML
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # One week
+DEFAULT_SWEEP_INTERVAL = 300.0  # Seconds between TTL sweeps triggered by put()
+MAX_MEMORY_FALLBACK_ENTRIES = 64
+
+ZSTD_SUFFIX = ".zst"
+ZLIB_SUFFIX = ".z"
+
+
+def content_key(html: str) -> str:
+    """Return the content address (SHA-256 hex digest) for an HTML string."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class RawHtmlStore:
+    """Deduplicating, compressed, size- and TTL-bounded on-disk HTML store."""
+
+    def __init__(
+        self,
+        root_dir: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        compression_level: int = 3,
+    ):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        # key -> (path, compressed size, last access time)
+        self._index: Dict[str, Tuple[str, int, float]] = {}
+        self._total_bytes = 0
+        self._last_sweep = 0.0
+        # Pages that could not be written to disk are kept here so callers never lose them
+        self._memory_fallback: Dict[str, str] = {}
+        self._stats = {"puts": 0, "dedup_hits": 0, "gets": 0, "misses": 0, "evicted": 0}
+
+        if zstandard is not None:
+            self._suffix = ZSTD_SUFFIX
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        else:
+            self._suffix = ZLIB_SUFFIX
+            self._compressor = None
+
+        os.makedirs(root_dir, exist_ok=True)
+        self._load_index()
+        self.evict()
+
+    def _load_index(self) -> None:
+        """Rebuild the in-memory index from the files on disk."""
+        for shard in os.scandir(self.root_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                key, suffix = os.path.splitext(entry.name)
+                if suffix not in (ZSTD_SUFFIX, ZLIB_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                self._index[key] = (entry.path, stat.st_size, stat.st_mtime)
+                self._total_bytes += stat.st_size
+        logger.info(
+            f"Raw HTML store at {self.root_dir}: {len(self._index)} entries, "
+            f"{self._total_bytes / (1024 * 1024):.1f}MB"
+        )
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], key + self._suffix)
+
+    def _adopt(self, key: str) -> Optional[Tuple[str, int, float]]:
+        """Index an entry written by another process (e.g. a crawl shard) sharing the directory."""
+        for suffix in (ZSTD_SUFFIX, ZLIB_SUFFIX):
+            path = os.path.join(self.root_dir, key[:2], key + suffix)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = (path, stat.st_size, stat.st_mtime)
+            with self._lock:
+                if key not in self._index:
+                    self._index[key] = entry
+                    self._total_bytes += stat.st_size
+                return self._index[key]
+        return None
+
+    def _compress(self, data: bytes) -> bytes:
+        if self._compressor is not None:
+            return self._compressor.compress(data)
+        return zlib.compress(data, self.compression_level)
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        if path.endswith(ZSTD_SUFFIX):
+            if zstandard is None:
+                raise ValueError("zstandard is not installed, cannot read .zst entry")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def put(self, html: str) -> str:
+        """Store an HTML string and return its content key."""
+        key = content_key(html)
+        now = time.time()
+        self._stats["puts"] += 1
+
+        with self._lock:
+            existing = self._index.get(key)
+            if existing:
+                # Same page already stored: just refresh its access time
+                path, size, _ = existing
+                try:
+                    os.utime(path, (now, now))
+                except FileNotFoundError:
+                    # Evicted by another process sharing the directory: write it again
+                    del self._index[key]
+                    self._total_bytes -= size
+                    existing = None
+                except OSError:
+                    pass
+                if existing:
+                    self._index[key] = (path, size, now)
+                    self._stats["dedup_hits"] += 1
+                    return key
+
+        path = self._path_for(key)
+        tmp_path = None
+        try:
+            payload = self._compress(html.encode("utf-8"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write raw HTML {key[:12]} to store: {e}")
+            if tmp_path is not None:
+                # Neither _load_index nor evict() look at .tmp files, they would pile up
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            with self._lock:
+                if len(self._memory_fallback) >= MAX_MEMORY_FALLBACK_ENTRIES:
+                    self._memory_fallback.pop(next(iter(self._memory_fallback)))
+                self._memory_fallback[key] = html
+            return key
+
+        with self._lock:
+            if key not in self._index:
+                # Another thread may have stored the same page meanwhile; count it once
+                self._total_bytes += len(payload)
+            self._index[key] = (path, len(payload), now)
+            needs_eviction = (
+                self._total_bytes > self.max_bytes
+                or now - self._last_sweep > DEFAULT_SWEEP_INTERVAL
+            )
+        if needs_eviction:
+            self.evict()
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """Load an HTML string by content key, or None if it is not (or no longer) stored."""
+        self._stats["gets"] += 1
+        with self._lock:
+            if key in self._memory_fallback:
+                return self._memory_fallback[key]
+            entry = self._index.get(key)
+        if not entry:
+            entry = self._adopt(key)
+        if not entry:
+            self._stats["misses"] += 1
+            return None
+
+        path, size, _ = entry
+        try:
+            with open(path, "rb") as f:
+                html = self._decompress(path, f.read()).decode("utf-8")
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Raw HTML entry {key[:12]} unreadable, dropping it: {e}")
+            self._remove(key)
+            self._stats["misses"] += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (path, size, now)
+        return html
+
+    def is_persisted(self, key: str) -> bool:
+        """Whether a content key is stored on disk, i.e. readable by other processes sharing the directory."""
+        with self._lock:
+            entry = self._index.get(key)
+        # Another process sharing the directory may have evicted the file
+        return entry is not None and os.path.isfile(entry[0])
+
+    def contains(self, key: str) -> bool:
+        """Check whether a content key is stored."""
+        with self._lock:
+            if key in self._index or key in self._memory_fallback:
+                return True
+        return self._adopt(key) is not None
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if not entry:
+                return
+            self._total_bytes -= entry[1]
+        try:
+            os.remove(entry[0])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete raw HTML entry {key[:12]}: {e}")
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used ones until under the byte budget."""
+        now = time.time()
+        with self._lock:
+            self._last_sweep = now
+            expired = [
+                key
+                for key, (_, _, accessed) in self._index.items()
+                if self.ttl_seconds and now - accessed > self.ttl_seconds
+            ]
+            overflow = []
+            remaining = self._total_bytes - sum(self._index[k][1] for k in expired)
+            if remaining > self.max_bytes:
+                expired_set = set(expired)
+                by_age = sorted(
+                    (item for item in self._index.items() if item[0] not in expired_set),
+                    key=lambda item: item[1][2],
+                )
+                for key, (_, size, _) in by_age:
+                    if remaining <= self.max_bytes:
+                        break
+                    overflow.append(key)
+                    remaining -= size
+
+        to_remove = expired + overflow
+        for key in to_remove:
+            self._remove(key)
+        if to_remove:
+            self._stats["evicted"] += len(to_remove)
+            logger.info(
+                f"Evicted {len(to_remove)} raw HTML entries "
+                f"({len(expired)} expired, {len(overflow)} over budget)."
+            )
+        return len(to_remove)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get store counters and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._index)
+            stats["total_mb"] = self._total_bytes / (1024 * 1024)
+        return stats
@@ -0,0 +1,255 @@
+# src/core/http_cache.py
+# -*- coding: utf-8 -*-
+
+"""
+HTTP validator cache used by the crawlers.
+
+Stores the ETag / Last-Modified validators of a response together with a
+zlib-compressed copy of its body, keyed by URL. On the next fetch the crawler
+sends If-None-Match / If-Modified-Since and, on a 304 Not Modified answer,
+serves the cached body instead of downloading the page again. Lookups read
+only the validators; the body is read and decompressed (``load_content``)
+only once a 304 says it is still current.
+
+The cache lives in a small standalone SQLite file (not the Qt application
+database) so it can be used safely from the crawler worker threads.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DB_NAME = "http_cache.db"
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600  # Drop entries not revalidated for 30 days
+DEFAULT_COMPRESSION_LEVEL = 6
+
+
+@dataclass
+class CachedResponse:
+    """The validators of a cached response, needed to revalidate it."""
+
+    url: str
+    final_url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build the request headers for a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Persistent conditional-GET cache.
+
+    Several crawlers can share one database file; each uses its own
+    ``namespace`` so that e.g. rendered Playwright DOMs and raw aiohttp
+    bodies for the same URL never mix.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        namespace: str = "default",
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.max_age_seconds = max_age_seconds
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "not_modified": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # The connection is shared by the crawler threads, access is serialized by _lock
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            db_path, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    namespace TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    final_url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, url)
+                )
+                """
+            )
+            self._conn.commit()
+        self.prune()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the validators cached for a URL (without the body), or None if nothing is stored."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT final_url, etag, last_modified, stored_at "
+                    "FROM http_cache WHERE namespace = ? AND url = ?",
+                    (self.namespace, url),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"HTTP cache lookup failed for {url}: {e}")
+            return None
+
+        if not row:
+            self._stats["misses"] += 1
+            return None
+
+        final_url, etag, last_modified, stored_at = row
+        self._stats["hits"] += 1
+        return CachedResponse(
+            url=url,
+            final_url=final_url,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=stored_at,
+        )
+
+    def load_content(self, url: str) -> Optional[str]:
+        """
+        Read and decompress the cached body of a URL, after a 304 confirmed it.
+        Returns None if the entry is gone or corrupt (a corrupt one is deleted).
+        """
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT body FROM http_cache WHERE namespace = ? AND url = ?",
+                    (self.namespace, url),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"HTTP cache read failed for {url}: {e}")
+            return None
+        if not row:
+            return None
+        try:
+            return zlib.decompress(row[0]).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding corrupt HTTP cache entry for {url}: {e}")
+            self.delete(url)
+            return None
+
+    def store(
+        self,
+        url: str,
+        final_url: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """
+        Store a response body. Responses without any validator are not cached,
+        since they could never be revalidated.
+        """
+        if self._conn is None or not content or not (etag or last_modified):
+            return False
+        body = zlib.compress(content.encode("utf-8"), self.compression_level)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO http_cache
+                        (namespace, url, final_url, etag, last_modified, body, stored_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (self.namespace, url, final_url, etag, last_modified, body, time.time()),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"HTTP cache store failed for {url}: {e}")
+            return False
+        self._stats["stores"] += 1
+        return True
+
+    def mark_not_modified(self, url: str, refresh: bool = True) -> None:
+        """
+        Record a successful 304 revalidation so the entry is not pruned. With
+        ``refresh=False`` the entry keeps its age, so it still expires
+        ``max_age_seconds`` after it was stored.
+        """
+        self._stats["not_modified"] += 1
+        if self._conn is None or not refresh:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE http_cache SET stored_at = ? WHERE namespace = ? AND url = ?",
+                    (time.time(), self.namespace, url),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"HTTP cache update failed for {url}: {e}")
+
+    def delete(self, url: str) -> None:
+        """Remove the cached entry for a URL."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM http_cache WHERE namespace = ? AND url = ?",
+                    (self.namespace, url),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"HTTP cache delete failed for {url}: {e}")
+
+    def prune(self) -> int:
+        """Remove entries that have not been stored or revalidated within max_age_seconds."""
+        if self._conn is None or not self.max_age_seconds:
+            return 0
+        cutoff = time.time() - self.max_age_seconds
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM http_cache WHERE namespace = ? AND stored_at < ?",
+                    (self.namespace, cutoff),
+                )
+                self._conn.commit()
+                removed = cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"HTTP cache prune failed: {e}")
+            return 0
+        if removed:
+            logger.info(f"Pruned {removed} stale HTTP cache entries ({self.namespace}).")
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss/store counters for this cache instance."""
+        return dict(self._stats)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error as e:
+                    logger.error(f"Error closing HTTP cache: {e}")
+                self._conn = None
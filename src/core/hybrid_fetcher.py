@@ -0,0 +1,177 @@
+# src/core/hybrid_fetcher.py
+# -*- coding: utf-8 -*-
+
+"""
+Adaptive fetch backend selection for source pages.
+
+Most news sources serve their article lists as static HTML, so a plain
+aiohttp GET is enough. ``HybridFetcher`` tries ``AiohttpCrawler`` first and
+only escalates to ``PlaywrightCrawler`` (full browser page, scrolling,
+network-idle wait) when the static response looks JS-rendered or the static
+fetch hit a transient failure. Permanent failures (404 / 410, DNS errors,
+rejected content types or sizes) are not escalated, a browser would get the
+same answer.
+
+Only pages flagged by ``detect_js_rendering`` mark a source as needing the
+browser (``result["js_rendering"]`` holds the reason); a browser fetch after a
+network blip is used for that run only. Sources remembered as JS-rendered are
+fetched statically again now and then, so a site that dropped its client-side
+rendering goes back to aiohttp.
+"""
+
+import logging
+import random
+import re
+from typing import Dict, Optional, Tuple
+
+from src.core.circuit_breaker import is_circuit_open_error
+from src.core.crawler import AiohttpCrawler, PlaywrightCrawler
+from src.core.html_store import RawHtmlStore
+from src.core.readiness import ReadinessProfile
+from src.core.retry_policy import RETRY_NON_RETRYABLE, RETRY_RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+BACKEND_STATIC = "aiohttp"
+BACKEND_BROWSER = "playwright"
+FETCH_BACKENDS = (BACKEND_STATIC, BACKEND_BROWSER)
+
+# Share of fetches of a browser-pinned source that try the static fetch first again
+DEFAULT_BROWSER_REPROBE_RATE = 0.1
+# Static failures a browser would hit as well: permanent errors and throttling
+_NON_ESCALATING_ERROR_CATEGORIES = (RETRY_NON_RETRYABLE, RETRY_RATE_LIMITED)
+
+# Heuristic thresholds for a static page that is usable without JavaScript
+MIN_ANCHOR_COUNT = 10
+MIN_BODY_TEXT_CHARS = 200
+
+_ANCHOR_RE = re.compile(r"<a\s[^>]*href\s*=", re.IGNORECASE)
+_BODY_RE = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+_STRIP_BLOCKS_RE = re.compile(
+    r"<(script|style|noscript|template|svg)[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Mount points and attributes left behind by client-side rendering frameworks
+_SPA_MARKER_RE = re.compile(
+    r"""id\s*=\s*["'](?:root|app|__next|__nuxt|___gatsby|svelte)["']"""
+    r"|\bng-app\b|\bng-version\b|\bdata-reactroot\b|\bdata-server-rendered\b",
+    re.IGNORECASE,
+)
+_NOSCRIPT_HINT_RE = re.compile(
+    r"<noscript[^>]*>[^<]*(?:enable|requires?)\s+javascript", re.IGNORECASE
+)
+
+
+def detect_js_rendering(html: str) -> Optional[str]:
+    """
+    Decide whether a statically fetched page needs a browser to be useful.
+
+    Returns a short reason string if the page looks JS-rendered, otherwise None.
+    """
+    if not html or not html.strip():
+        return "empty response"
+
+    body_match = _BODY_RE.search(html)
+    body = body_match.group(1) if body_match else html
+    anchor_count = len(_ANCHOR_RE.findall(body))
+    text = _WHITESPACE_RE.sub(" ", _TAG_RE.sub(" ", _STRIP_BLOCKS_RE.sub(" ", body))).strip()
+
+    if len(text) < MIN_BODY_TEXT_CHARS:
+        return f"near-empty body ({len(text)} chars of text)"
+    if anchor_count < MIN_ANCHOR_COUNT:
+        if _SPA_MARKER_RE.search(body):
+            return f"SPA root marker with only {anchor_count} links"
+        if _NOSCRIPT_HINT_RE.search(body):
+            return "page asks to enable JavaScript"
+        return f"only {anchor_count} links"
+    return None
+
+
+class HybridFetcher:
+    """Fetch a source page with aiohttp, escalating to Playwright only when needed."""
+
+    def __init__(
+        self,
+        static_crawler: AiohttpCrawler,
+        browser_crawler: PlaywrightCrawler,
+        html_store: Optional[RawHtmlStore] = None,
+        browser_reprobe_rate: float = DEFAULT_BROWSER_REPROBE_RATE,
+    ):
+        # The static crawler must not write to the store itself: pages that get
+        # escalated to the browser would leave an unused copy behind
+        self.static_crawler = static_crawler
+        self.browser_crawler = browser_crawler
+        self.html_store = html_store
+        self.browser_reprobe_rate = browser_reprobe_rate
+        self._stats = {"static": 0, "browser": 0, "escalated": 0, "reprobed": 0}
+
+    async def _fetch_with_browser(
+        self, url: str, readiness: Optional[ReadinessProfile] = None
+    ) -> Dict[str, str]:
+        self._stats["browser"] += 1
+        return await self.browser_crawler._fetch_single(
+            url, scroll_page=True, readiness=readiness
+        )
+
+    async def fetch(
+        self,
+        url: str,
+        backend_hint: Optional[str] = None,
+        readiness: Optional[ReadinessProfile] = None,
+    ) -> Tuple[Dict[str, str], str]:
+        """
+        Fetch a source page.
+
+        Args:
+            url: Source page URL.
+            backend_hint: Backend remembered for this source from a previous run, if any.
+            readiness: The source's page readiness profile, used if the browser is needed.
+
+        Returns:
+            (crawl result dict, backend that produced it). Only when the page was
+            flagged as JS-rendered does the result carry ``js_rendering``, the
+            reason the source should be remembered as a browser source.
+        """
+        if backend_hint == BACKEND_BROWSER:
+            if random.random() >= self.browser_reprobe_rate:
+                return await self._fetch_with_browser(url, readiness), BACKEND_BROWSER
+            logger.info(f"Re-probing browser source {url} with a static fetch")
+            self._stats["reprobed"] += 1
+
+        result = await self.static_crawler.fetch_url(url)
+        if is_circuit_open_error(result.get("error")):
+            # The domain is known to be down; a browser would not reach it either
+            return result, BACKEND_STATIC
+        js_reason = None
+        if result.get("error"):
+            if result.get("error_category") in _NON_ESCALATING_ERROR_CATEGORIES:
+                return result, BACKEND_STATIC
+            reason = f"static fetch failed: {result['error']}"
+        else:
+            reason = js_reason = detect_js_rendering(result.get("content", ""))
+
+        if reason is None:
+            self._stats["static"] += 1
+            html_content = result.get("content", "")
+            result["content_hash"] = (
+                self.html_store.put(html_content) if self.html_store and html_content else ""
+            )
+            return result, BACKEND_STATIC
+
+        logger.info(f"Escalating {url} to browser fetch: {reason}")
+        self._stats["escalated"] += 1
+        browser_result = await self._fetch_with_browser(url, readiness)
+        if browser_result.get("error") and not result.get("error"):
+            # The browser failed as well; keep the static page rather than nothing
+            result["content_hash"] = (
+                self.html_store.put(result["content"]) if self.html_store else ""
+            )
+            return result, BACKEND_STATIC
+        if js_reason and not browser_result.get("error"):
+            browser_result["js_rendering"] = js_reason
+        return browser_result, BACKEND_BROWSER
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get counts of static fetches, browser fetches, escalations and re-probes."""
+        return dict(self._stats)
@@ -0,0 +1,213 @@
+# src/core/link_extraction.py
+# -*- coding: utf-8 -*-
+
+"""
+Link extraction for source pages: in the browser for ``PlaywrightCrawler``,
+and directly from fetched HTML.
+
+Instead of transferring the whole rendered DOM with ``page.content()`` and
+reducing it to links in Python (BeautifulSoup cleaning, Markdown conversion,
+regex filtering), a script in the page collects the visible anchors
+(text, absolute href, bounding box, enclosing DOM section) and returns only
+those, which shrinks the payload from megabytes to kilobytes.
+
+Anchors inside the elements that ``clean_html`` removes (header, nav,
+footer, ads, comments, ...) are skipped in the page as well, so the
+resulting link list matches what ``extract_html_links`` gives for the HTML.
+
+Crawl results in this format carry ``content_format = CONTENT_FORMAT_LINKS``
+and their ``content`` is the JSON-encoded link list.
+
+``extract_html_links`` produces the same kind of link list from an HTML page
+in one walk over its lxml tree, skipping the excluded elements, so source
+pages fetched as HTML are never converted to Markdown just for their links.
+Selectors the matcher cannot decide per element (``complex_selectors``) are
+applied by ``clean_html`` before the walk. ``parse_html`` builds the same
+tree BeautifulSoup's ``lxml`` builder builds, so an ``ExclusionMatcher``
+decides the same elements in both.
+"""
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from src.utils.exclusion_matcher import ExclusionMatcher
+from src.utils.html_utils import (
+    DEFAULT_EXCLUDE_SELECTORS,
+    DEFAULT_EXCLUDE_TAGS,
+    DEFAULT_EXCLUSION_MATCHER,
+    clean_html,
+)
+
+if TYPE_CHECKING:
+    # Only for the annotation: CPU workers import this module and must not load Playwright
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FORMAT_HTML = "html"
+CONTENT_FORMAT_LINKS = "links"
+
+MAX_EXTRACTED_LINKS = 3000
+
+# Same elements clean_html removes
+EXCLUDE_SELECTOR = ",".join(list(DEFAULT_EXCLUDE_TAGS) + list(DEFAULT_EXCLUDE_SELECTORS))
+
+# Closest of these is the ``section`` of a link (as in _EXTRACT_LINKS_JS)
+SECTION_TAGS = frozenset(("article", "main", "section", "aside", "nav", "header", "footer"))
+# Text inside these is not link text
+_NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+_EXTRACT_LINKS_JS = """
+([excludeSelector, maxLinks]) => {
+    const sectionOf = (a) => {
+        const el = a.closest("article,main,section,aside,nav,header,footer");
+        if (!el) return "";
+        let name = el.tagName.toLowerCase();
+        if (el.id) name += "#" + el.id;
+        else if (typeof el.className === "string" && el.className.trim())
+            name += "." + el.className.trim().split(/\\s+/)[0];
+        return name;
+    };
+    const links = [];
+    const seen = new Set();
+    for (const a of document.querySelectorAll("a[href]")) {
+        if (links.length >= maxLinks) break;
+        const href = a.href;
+        if (!href || !/^https?:/i.test(href)) continue;
+        if (excludeSelector && a.closest(excludeSelector)) continue;
+        const rect = a.getBoundingClientRect();
+        if (rect.width <= 0 || rect.height <= 0) continue;
+        const style = getComputedStyle(a);
+        if (style.visibility === "hidden" || style.display === "none") continue;
+        const text = (a.innerText || a.textContent || "").replace(/\\s+/g, " ").trim();
+        if (!text) continue;
+        const key = href + "\\u0000" + text;
+        if (seen.has(key)) continue;
+        seen.add(key);
+        links.push({
+            text: text,
+            href: href,
+            box: [
+                Math.round(rect.left + window.scrollX),
+                Math.round(rect.top + window.scrollY),
+                Math.round(rect.width),
+                Math.round(rect.height),
+            ],
+            section: sectionOf(a),
+        });
+    }
+    return links;
+}
+"""
+
+
+async def extract_page_links(page: "Page") -> List[Dict[str, Any]]:
+    """
+    Visible anchors of the page in document order, as dicts with ``text``,
+    ``href`` (absolute), ``box`` ([x, y, width, height] in page coordinates)
+    and ``section`` (closest article/main/section/... as ``tag#id`` or ``tag.class``).
+    """
+    return await page.evaluate(_EXTRACT_LINKS_JS, [EXCLUDE_SELECTOR, MAX_EXTRACTED_LINKS])
+
+
+def parse_html(html_content: str):
+    """Root element of a page parsed the way BeautifulSoup's lxml builder parses it (None if empty)."""
+    # BeautifulSoup's lxml builder feeds the whole document to the push parser
+    parser = etree.HTMLParser(recover=True)
+    parser.feed(html_content)
+    return parser.close()
+
+
+def _section_name(element) -> str:
+    name = element.tag
+    if element.get("id"):
+        return f"{name}#{element.get('id')}"
+    classes = (element.get("class") or "").split()
+    return f"{name}.{classes[0]}" if classes else name
+
+
+def _link_text(element, matcher: ExclusionMatcher, parts: List[str]) -> None:
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if (
+            isinstance(child.tag, str)
+            and child.tag not in _NON_TEXT_TAGS
+            and not matcher.matches(child.tag, child.attrib)
+        ):
+            _link_text(child, matcher, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def extract_html_links(
+    html_content: str,
+    base_url: str,
+    matcher: Optional[ExclusionMatcher] = None,
+    max_links: int = MAX_EXTRACTED_LINKS,
+) -> List[Dict[str, Any]]:
+    """
+    Anchors of an HTML page outside the excluded elements (``matcher``, default:
+    the rules of ``clean_html``) in document order, as dicts with
+    ``text``, ``href`` (absolute, http(s) only) and ``section`` like
+    ``extract_page_links``. Anchors without text are skipped.
+    """
+    matcher = matcher or DEFAULT_EXCLUSION_MATCHER
+    if html_content and matcher.complex_selectors:
+        # Descendant, pseudo-class etc. selectors need the whole tree: let
+        # BeautifulSoup remove what they match, the walk skips the rest
+        html_content = clean_html(html_content, base_url, matcher=matcher)
+    try:
+        root = parse_html(html_content) if html_content else None
+    except (etree.ParserError, ValueError) as e:
+        logger.debug(f"lxml could not parse {base_url}: {e}")
+        return []
+    if root is None:
+        return []
+
+    links: List[Dict[str, Any]] = []
+    seen = set()
+    # (element, section of its subtree)
+    pending = [(root, "")]
+    while pending and len(links) < max_links:
+        element, section = pending.pop()
+        if not isinstance(element.tag, str) or matcher.matches(element.tag, element.attrib):
+            continue
+        if element.tag in SECTION_TAGS:
+            section = _section_name(element)
+        href = element.get("href") if element.tag == "a" else None
+        if href is None:
+            # Reversed, so children are popped in document order
+            pending.extend((child, section) for child in reversed(element))
+            continue
+
+        url = urljoin(base_url, href.strip())
+        if not url.lower().startswith(("http://", "https://")):
+            continue
+        parts: List[str] = []
+        _link_text(element, matcher, parts)
+        text = " ".join("".join(parts).split())
+        if not text or (url, text) in seen:
+            continue
+        seen.add((url, text))
+        links.append({"text": text, "href": url, "section": section})
+    return links
+
+
+def encode_links(links: List[Dict[str, Any]]) -> str:
+    """Serialize a link list as the ``content`` of a crawl result."""
+    return json.dumps(links, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_links(content: str) -> List[Dict[str, Any]]:
+    """Parse the ``content`` of a links-format crawl result; invalid content gives an empty list."""
+    try:
+        links = json.loads(content)
+    except (TypeError, ValueError) as e:
+        logger.error(f"Invalid link list content: {e}")
+        return []
+    return [link for link in links if isinstance(link, dict) and link.get("href")]
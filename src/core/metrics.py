@@ -0,0 +1,300 @@
+# src/core/metrics.py
+# -*- coding: utf-8 -*-
+
+"""
+Per-request phase timings for the crawlers.
+
+``FetchMetrics`` collects latency samples per domain and phase into
+HDR-style histograms (log2 magnitude buckets split into linear sub-buckets,
+so every value is kept within ~6% without storing the samples) and can dump
+them as JSON at the end of a fetch run.
+
+aiohttp phases come from a ``TraceConfig`` (``create_trace_config``):
+
+- ``dns``: host resolution (cache misses only)
+- ``connect``: TCP connect plus TLS handshake; aiohttp has no separate TLS event
+- ``ttfb``: request headers sent until response headers received
+
+The crawlers time the other phases themselves with ``timer()``: ``download``
+and ``decode`` for aiohttp; ``goto``, ``domcontentloaded``, ``settle``,
+``scroll``, ``networkidle`` and ``content`` for Playwright; and ``total``
+for both.
+
+``CpuExecutor`` records its calls as ``clean``, ``links`` and ``metadata``
+(run time in the worker process) and ``cpu_wait`` (time spent waiting for a
+free slot or worker and transferring arguments and results).
+
+Besides latencies, named counters (e.g. the retry decisions of
+``RetryPolicy``) are kept per domain with ``increment()``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+PHASE_DNS = "dns"
+PHASE_CONNECT = "connect"
+PHASE_TTFB = "ttfb"
+PHASE_DOWNLOAD = "download"
+PHASE_DECODE = "decode"
+PHASE_GOTO = "goto"
+PHASE_DOMCONTENTLOADED = "domcontentloaded"
+PHASE_SETTLE = "settle"
+PHASE_SCROLL = "scroll"
+PHASE_NETWORKIDLE = "networkidle"
+PHASE_CONTENT = "content"
+PHASE_TOTAL = "total"
+PHASE_CLEAN = "clean"
+PHASE_LINKS = "links"
+PHASE_METADATA = "metadata"
+PHASE_CPU_WAIT = "cpu_wait"
+
+METRICS_DIR_NAME = "metrics"
+ALL_DOMAINS = "*"
+
+
+class LatencyHistogram:
+    """
+    Fixed-precision latency histogram with sparse buckets.
+
+    Values are recorded in microseconds. Values below ``SUB_BUCKETS`` get a
+    bucket each; above that every power of two is split into ``SUB_BUCKETS``
+    linear buckets, bounding the relative error by 1 / SUB_BUCKETS.
+    """
+
+    SUB_BUCKET_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+
+    @classmethod
+    def _bucket_index(cls, value: int) -> int:
+        if value < cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return shift * cls.SUB_BUCKETS + (value >> shift)
+
+    @classmethod
+    def _bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        if index < 2 * cls.SUB_BUCKETS:
+            return index, index
+        shift, sub = divmod(index, cls.SUB_BUCKETS)
+        sub += cls.SUB_BUCKETS
+        shift -= 1
+        return sub << shift, ((sub + 1) << shift) - 1
+
+    def record(self, milliseconds: float) -> None:
+        value = max(0, int(milliseconds * 1000))
+        index = self._bucket_index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def percentile(self, percent: float) -> float:
+        """Value in milliseconds at or below which ``percent`` of the samples fall."""
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                low, high = self._bucket_bounds(index)
+                value = min(max((low + high) // 2, self.min_us), self.max_us)
+                return value / 1000.0
+        return self.max_us / 1000.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_ms": round(self.min_us / 1000.0, 3),
+            "mean_ms": round(self.total_us / self.count / 1000.0, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p90_ms": round(self.percentile(90), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_us / 1000.0, 3),
+        }
+
+
+def _domain_of(url: Any) -> str:
+    if isinstance(url, str):
+        return (urlsplit(url).hostname or "").lower() or "unknown"
+    return (getattr(url, "host", None) or "unknown").lower()
+
+
+class FetchMetrics:
+    """
+    Thread-safe per-domain, per-phase latency histograms and counters.
+
+    One instance may be shared by every crawler of a fetch run, across worker threads.
+    """
+
+    def __init__(self, dump_dir: Optional[str] = None):
+        self.dump_dir = dump_dir
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def record(self, domain: str, phase: str, milliseconds: float) -> None:
+        """Record one phase duration for a domain."""
+        with self._lock:
+            for key in (domain, ALL_DOMAINS):
+                phases = self._histograms.setdefault(key, {})
+                histogram = phases.get(phase)
+                if histogram is None:
+                    histogram = phases[phase] = LatencyHistogram()
+                histogram.record(milliseconds)
+
+    def record_url(self, url: str, phase: str, milliseconds: float) -> None:
+        """Record one phase duration for the domain of a URL."""
+        self.record(_domain_of(url), phase, milliseconds)
+
+    def increment(self, domain: str, counter: str, amount: int = 1) -> None:
+        """Add to a named counter of a domain."""
+        with self._lock:
+            for key in (domain, ALL_DOMAINS):
+                counters = self._counters.setdefault(key, {})
+                counters[counter] = counters.get(counter, 0) + amount
+
+    def increment_url(self, url: str, counter: str, amount: int = 1) -> None:
+        """Add to a named counter of the domain of a URL."""
+        self.increment(_domain_of(url), counter, amount)
+
+    def get_counters(self) -> Dict[str, int]:
+        """Counter totals across all domains."""
+        with self._lock:
+            return dict(self._counters.get(ALL_DOMAINS, {}))
+
+    @contextmanager
+    def timer(self, url: str, phase: str) -> Iterator[None]:
+        """Time the enclosed block (sync or across awaits) as one phase sample for the URL's domain."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_url(url, phase, (time.perf_counter() - start) * 1000.0)
+
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        """Build a TraceConfig recording the dns, connect and ttfb phases."""
+
+        def _trace_ctx(trace_request_ctx):
+            return SimpleNamespace(domain="unknown", marks={})
+
+        trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=_trace_ctx)
+
+        def _mark(name):
+            async def handler(session, ctx, params):
+                ctx.marks[name] = time.perf_counter()
+            return handler
+
+        def _elapsed(ctx, start_mark):
+            start = ctx.marks.pop(start_mark, None)
+            return None if start is None else (time.perf_counter() - start) * 1000.0
+
+        async def on_request_start(session, ctx, params):
+            ctx.domain = _domain_of(params.url)
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            elapsed = _elapsed(ctx, "dns")
+            if elapsed is not None:
+                ctx.dns_ms = elapsed
+                self.record(ctx.domain, PHASE_DNS, elapsed)
+
+        async def on_connection_create_end(session, ctx, params):
+            # Connection creation includes the DNS lookup; report only TCP + TLS
+            elapsed = _elapsed(ctx, "connect")
+            if elapsed is not None:
+                connect_ms = max(0.0, elapsed - getattr(ctx, "dns_ms", 0.0))
+                self.record(ctx.domain, PHASE_CONNECT, connect_ms)
+            ctx.dns_ms = 0.0
+
+        async def on_request_end(session, ctx, params):
+            elapsed = _elapsed(ctx, "headers_sent")
+            if elapsed is not None:
+                self.record(ctx.domain, PHASE_TTFB, elapsed)
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_dns_resolvehost_start.append(_mark("dns"))
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_connection_create_start.append(_mark("connect"))
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_request_headers_sent.append(_mark("headers_sent"))
+        trace_config.on_request_end.append(on_request_end)
+        # A redirect ends one hop; the next hop sends its own headers
+        trace_config.on_request_redirect.append(on_request_end)
+        return trace_config
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summaries of every histogram and counter; the ``*`` domain aggregates all domains."""
+        with self._lock:
+            domains = {
+                domain: {phase: hist.to_dict() for phase, hist in sorted(phases.items())}
+                for domain, phases in sorted(self._histograms.items())
+            }
+            counters = {
+                domain: dict(sorted(values.items()))
+                for domain, values in sorted(self._counters.items())
+            }
+        return {
+            "started_at": datetime.fromtimestamp(self._started_at).isoformat(timespec="seconds"),
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "domains": domains,
+            "counters": counters,
+        }
+
+    def get_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-phase summaries across all domains."""
+        return self.to_dict()["domains"].get(ALL_DOMAINS, {})
+
+    def dump_json(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the histograms as JSON. Without a path, a timestamped file is
+        created in ``dump_dir``. Returns the written path, or None if there
+        was nothing to write or no destination.
+        """
+        with self._lock:
+            if not self._histograms and not self._counters:
+                return None
+        if path is None:
+            if not self.dump_dir:
+                return None
+            os.makedirs(self.dump_dir, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.dump_dir, f"fetch_metrics_{stamp}.json")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            logger.error(f"Failed to write fetch metrics to {path}: {e}")
+            return None
+        logger.info(f"Fetch metrics written to {path}")
+        return path
+
+    def reset(self) -> None:
+        """Drop all samples and start a new collection period."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._started_at = time.time()
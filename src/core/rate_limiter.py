@@ -0,0 +1,212 @@
+# src/core/rate_limiter.py
+# -*- coding: utf-8 -*-
+
+"""
+Per-domain token-bucket rate limiter shared by the crawlers.
+
+Each domain gets a bucket with a refill ``rate`` (requests per second) and a
+``burst`` capacity. ``acquire()`` reserves a token under a short thread lock
+and then sleeps *outside* of it until the reservation is due, so concurrent
+requests to the same domain are spaced out without being serialized behind a
+lock, and requests to other domains are never blocked.
+
+When a server answers 429 / 503, ``penalize()`` pauses the domain for the
+``Retry-After`` period (or a default penalty) before any further token is
+handed out.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN_RATE = 2.0  # Requests per second
+DEFAULT_DOMAIN_BURST = 4
+DEFAULT_PENALTY_SECONDS = 5.0  # Pause after a 429/503 without Retry-After
+MAX_RETRY_AFTER_SECONDS = 300.0  # Never honor absurdly long Retry-After values
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+@dataclass
+class DomainRateLimit:
+    """Rate and burst settings for one domain."""
+
+    rate: float = DEFAULT_DOMAIN_RATE
+    burst: int = DEFAULT_DOMAIN_BURST
+
+
+class RateLimitedError(Exception):
+    """Raised by a crawler when a server answers with a throttling status code."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        self.status = status
+        self.retry_after = retry_after
+        super().__init__(
+            f"HTTP {status} (rate limited"
+            + (f", retry after {retry_after:.0f}s)" if retry_after else ")")
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at is None:
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+def domain_of(url: str) -> str:
+    """Return the rate-limiting key for a URL."""
+    return urlparse(url).netloc.lower()
+
+
+class _TokenBucket:
+    """
+    Token bucket state for one domain. Tokens may go negative: each negative
+    token is a reservation that is due once the bucket has refilled.
+    ``updated`` may lie in the future while the domain is paused.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, limit: DomainRateLimit, now: float):
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self.tokens = float(self.burst)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller has to wait for it."""
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = max(self.updated, now)
+        self.tokens -= 1.0
+        wait = self.updated - now
+        if self.tokens < 0:
+            wait += -self.tokens / self.rate
+        return wait
+
+    def pause(self, now: float, delay: float) -> None:
+        """Hand out no tokens for ``delay`` seconds, then resume at the base rate."""
+        self.tokens = min(self.tokens, 1.0)
+        self.updated = max(self.updated, now + delay)
+
+
+class DomainRateLimiter:
+    """
+    Token-bucket rate limiter keyed by domain.
+
+    One instance can be shared by several crawlers, including crawlers running
+    on different threads / event loops: the internal lock is only held while
+    the bucket arithmetic runs, never while waiting.
+    """
+
+    def __init__(
+        self,
+        default_limit: Optional[DomainRateLimit] = None,
+        domain_limits: Optional[Dict[str, DomainRateLimit]] = None,
+    ):
+        self.default_limit = default_limit or DomainRateLimit()
+        self._limits: Dict[str, DomainRateLimit] = {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "delayed": 0, "penalties": 0}
+        self._total_wait = 0.0
+        for domain, limit in (domain_limits or {}).items():
+            self.set_limit(domain, limit.rate, limit.burst)
+
+    def load_limits(self, rows: Iterable[Tuple[str, float, int]]) -> None:
+        """Load (domain, rate, burst) rows, e.g. from DomainRateLimitRepository.get_all()."""
+        count = 0
+        for domain, rate, burst in rows:
+            self.set_limit(domain, rate, burst)
+            count += 1
+        if count:
+            logger.info(f"Loaded {count} per-domain rate limits.")
+
+    def set_limit(self, domain: str, rate: float, burst: int) -> None:
+        """Set the rate (requests/second) and burst size for a domain."""
+        if rate <= 0 or burst < 1:
+            logger.warning(
+                f"Ignoring invalid rate limit for {domain}: rate={rate}, burst={burst}"
+            )
+            return
+        domain = domain.lower()
+        with self._lock:
+            self._limits[domain] = DomainRateLimit(rate=rate, burst=burst)
+            # Recreate the bucket so the new settings take effect immediately
+            self._buckets.pop(domain, None)
+
+    def export_limits(self) -> List[Tuple[str, float, int]]:
+        """The per-domain limits as (domain, rate, burst) rows, the format ``load_limits`` takes."""
+        with self._lock:
+            return [(domain, limit.rate, limit.burst) for domain, limit in self._limits.items()]
+
+    def get_limit(self, domain: str) -> DomainRateLimit:
+        """Get the effective limit for a domain."""
+        return self._limits.get(domain.lower(), self.default_limit)
+
+    def _bucket(self, domain: str, now: float) -> _TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = _TokenBucket(self._limits.get(domain, self.default_limit), now)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for the URL's domain and return the required delay."""
+        domain = domain_of(url)
+        now = time.monotonic()
+        with self._lock:
+            wait = self._bucket(domain, now).reserve(now)
+            self._stats["acquired"] += 1
+            if wait > 0:
+                self._stats["delayed"] += 1
+                self._total_wait += wait
+        return wait
+
+    async def acquire(self, url: str) -> float:
+        """Wait until a request to the URL's domain is allowed. Returns the time waited."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, url: str, retry_after: Optional[float] = None) -> float:
+        """
+        Pause a domain after a 429/503 answer. The pause lasts ``retry_after``
+        seconds if the server sent one, otherwise DEFAULT_PENALTY_SECONDS.
+        """
+        domain = domain_of(url)
+        delay = retry_after if retry_after is not None else DEFAULT_PENALTY_SECONDS
+        delay = min(delay, MAX_RETRY_AFTER_SECONDS)
+        now = time.monotonic()
+        with self._lock:
+            self._bucket(domain, now).pause(now, delay)
+            self._stats["penalties"] += 1
+        logger.warning(f"Server throttled {domain}, pausing requests for {delay:.1f}s")
+        return delay
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get acquire/delay/penalty counters and the total time spent waiting."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["total_wait_seconds"] = round(self._total_wait, 2)
+            stats["domains"] = len(self._buckets)
+        return stats
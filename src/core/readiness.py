@@ -0,0 +1,188 @@
+# src/core/readiness.py
+# -*- coding: utf-8 -*-
+
+"""
+Page readiness strategies for ``PlaywrightCrawler``.
+
+Instead of fixed scroll sleeps and a ``networkidle`` wait (which many news
+sites never reach because of analytics beacons), the default ``quiescence``
+strategy installs a MutationObserver in the page and waits until the DOM
+has not gained or lost nodes for ``settle_ms``. Scrolling jumps to the
+bottom, waits for quiescence again and stops as soon as the anchor count
+stops growing.
+
+Each source has a ``ReadinessProfile`` (stored in ``news_sources``): the
+wait strategy, the scroll limit, whether JavaScript is enabled and the
+learned settle time. ``learn()`` shortens the settle time while fetches
+still yield the full link set and lengthens it when links go missing, so
+each source converges on the smallest wait that still works.
+"""
+
+import logging
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Page, Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+# Wait strategies
+WAIT_QUIESCENCE = "quiescence"  # MutationObserver-based DOM quiet period (default)
+WAIT_NETWORKIDLE = "networkidle"  # Fixed-delay scrolling plus networkidle, the old behaviour
+WAIT_DOMCONTENTLOADED = "domcontentloaded"  # No extra wait, no scrolling (server-rendered pages)
+WAIT_STRATEGIES = (WAIT_QUIESCENCE, WAIT_NETWORKIDLE, WAIT_DOMCONTENTLOADED)
+
+DEFAULT_MAX_SCROLLS = 5
+DEFAULT_SETTLE_MS = 500
+MIN_SETTLE_MS = 100
+MAX_SETTLE_MS = 3000
+# A quiescence wait gives up after this long (pages with constantly mutating tickers)
+QUIESCENCE_TIMEOUT_MS = 4000
+
+# Learning: a fetch counts as complete with at least this share of the expected links
+FULL_LINK_RATIO = 0.9
+SETTLE_DECREASE_FACTOR = 0.8
+SETTLE_INCREASE_FACTOR = 2.0
+# Each incomplete fetch lowers the expectation a little, so a page that really
+# shrank stops being treated as incomplete
+EXPECTED_LINKS_DECAY = 0.95
+
+# Resolves once no nodes were added or removed for quietMs (or after timeoutMs)
+_QUIESCENCE_JS = """
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    const start = performance.now();
+    let last = start;
+    let mutations = 0;
+    const root = document.documentElement || document;
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        last = performance.now();
+    });
+    observer.observe(root, { childList: true, subtree: true });
+    const poll = Math.max(25, Math.min(100, quietMs / 4));
+    const check = () => {
+        const now = performance.now();
+        const quiet = now - last >= quietMs;
+        if (quiet || now - start >= timeoutMs) {
+            observer.disconnect();
+            resolve({
+                quiet: quiet,
+                elapsed: now - start,
+                mutations: mutations,
+                anchors: document.querySelectorAll("a[href]").length,
+                height: document.body ? document.body.scrollHeight : 0,
+            });
+        } else {
+            setTimeout(check, poll);
+        }
+    };
+    setTimeout(check, poll);
+})
+"""
+
+
+@dataclass
+class ReadinessProfile:
+    """How to decide that a source page is ready, plus what was learned about it."""
+
+    wait_strategy: str = WAIT_QUIESCENCE
+    max_scrolls: int = DEFAULT_MAX_SCROLLS
+    js_enabled: bool = True
+    settle_ms: int = DEFAULT_SETTLE_MS
+    expected_links: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ReadinessProfile":
+        """Build a profile from stored values; missing or NULL values use the defaults."""
+        profile = cls()
+        if not data:
+            return profile
+        for field in fields(cls):
+            value = data.get(field.name)
+            if value is not None:
+                setattr(profile, field.name, value)
+        if profile.wait_strategy not in WAIT_STRATEGIES:
+            logger.warning(f"Unknown wait strategy '{profile.wait_strategy}', using {WAIT_QUIESCENCE}")
+            profile.wait_strategy = WAIT_QUIESCENCE
+        profile.js_enabled = bool(profile.js_enabled)
+        profile.max_scrolls = max(0, int(profile.max_scrolls))
+        profile.settle_ms = min(max(int(profile.settle_ms), MIN_SETTLE_MS), MAX_SETTLE_MS)
+        return profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def learn(self, observation: Dict[str, Any]) -> bool:
+        """
+        Adjust the settle time from one fetch's readiness observation.
+
+        Returns True if the profile changed and should be saved.
+        """
+        if observation.get("strategy") != WAIT_QUIESCENCE:
+            return False
+        links = int(observation.get("links") or 0)
+        if links <= 0:
+            return False
+
+        before = (self.settle_ms, self.expected_links)
+        if self.expected_links is None or links >= self.expected_links * FULL_LINK_RATIO:
+            # Full link set: try a shorter wait next time
+            self.expected_links = max(self.expected_links or 0, links)
+            self.settle_ms = max(MIN_SETTLE_MS, int(self.settle_ms * SETTLE_DECREASE_FACTOR))
+        else:
+            # Links went missing: the page was read too early
+            self.settle_ms = min(MAX_SETTLE_MS, int(self.settle_ms * SETTLE_INCREASE_FACTOR))
+            self.expected_links = max(links, int(self.expected_links * EXPECTED_LINKS_DECAY))
+        return (self.settle_ms, self.expected_links) != before
+
+
+async def wait_for_dom_quiescence(
+    page: Page, settle_ms: int, timeout_ms: int = QUIESCENCE_TIMEOUT_MS
+) -> Dict[str, Any]:
+    """
+    Wait until the page's DOM has been free of node additions and removals
+    for ``settle_ms``. Returns quiet, elapsed, mutations, anchors and height.
+    """
+    return await page.evaluate(_QUIESCENCE_JS, [settle_ms, timeout_ms])
+
+
+async def settle_page(
+    page: Page, profile: ReadinessProfile, scroll: bool = True
+) -> Dict[str, Any]:
+    """
+    Wait for the page to be ready according to a quiescence profile and
+    scroll it until no new anchors appear.
+
+    Returns an observation for ``ReadinessProfile.learn``: strategy,
+    settle_ms, links, scrolls, quiet, wait_ms.
+    """
+    observation = {
+        "strategy": WAIT_QUIESCENCE,
+        "settle_ms": profile.settle_ms,
+        "links": 0,
+        "scrolls": 0,
+        "quiet": True,
+        "wait_ms": 0.0,
+    }
+    try:
+        state = await wait_for_dom_quiescence(page, profile.settle_ms)
+        observation["wait_ms"] += state["elapsed"]
+        observation["quiet"] = state["quiet"]
+        anchors = state["anchors"]
+
+        max_scrolls = profile.max_scrolls if scroll else 0
+        while observation["scrolls"] < max_scrolls:
+            await page.evaluate("window.scrollTo(0, document.body ? document.body.scrollHeight : 0)")
+            state = await wait_for_dom_quiescence(page, profile.settle_ms)
+            observation["scrolls"] += 1
+            observation["wait_ms"] += state["elapsed"]
+            observation["quiet"] = observation["quiet"] and state["quiet"]
+            if state["anchors"] <= anchors:
+                break  # Scrolling no longer loads links
+            anchors = state["anchors"]
+        observation["links"] = anchors
+    except PlaywrightError as e:
+        # Navigation away or a closed page; read whatever is there
+        logger.warning(f"Readiness wait failed for {page.url}: {str(e).splitlines()[0]}")
+    observation["wait_ms"] = round(observation["wait_ms"], 1)
+    return observation
@@ -0,0 +1,288 @@
+# src/core/retry_policy.py
+# -*- coding: utf-8 -*-
+
+"""
+Retry policy shared by the crawlers and the LLM client.
+
+Failures are classified before anything is retried:
+
+- ``retryable``: timeouts, connection errors, 5xx and other transient failures
+- ``rate_limited``: 429 / 503; the wait honors ``Retry-After`` when the server sends one
+- ``non_retryable``: 4xx such as 403 / 404 / 410, decode errors, invalid URLs,
+  certificate and DNS failures; repeating the request would give the same answer
+
+Retryable failures back off exponentially with jitter, capped at
+``max_delay``. A ``Retry-After`` longer than ``max_retry_after`` is not
+waited for at all, the request fails instead.
+
+On top of the per-request attempt limit, an optional ``RetryBudget`` caps the
+retries of a whole run to a share of its requests (10% by default, with a
+small floor so short runs can still retry). When a site or an API has an
+outage, retries then stop early instead of multiplying both the load on the
+failing origin and the run's wall time.
+
+Retry decisions are counted per domain in ``FetchMetrics`` when one is given.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.core.metrics import FetchMetrics
+from src.core.rate_limiter import RateLimitedError, THROTTLE_STATUS_CODES, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Error categories
+RETRY_RETRYABLE = "retryable"
+RETRY_RATE_LIMITED = "rate_limited"
+RETRY_NON_RETRYABLE = "non_retryable"
+
+DEFAULT_RETRY_BASE_DELAY = 1.0  # Seconds before the first retry
+DEFAULT_RETRY_MAX_DELAY = 30.0
+DEFAULT_JITTER_FACTOR = 0.1
+# Rate-limited requests fail instead of waiting longer than this for Retry-After
+DEFAULT_MAX_RETRY_AFTER_SECONDS = 60.0
+
+# Retry budget: at most this share of a run's requests may be retried...
+DEFAULT_RETRY_BUDGET_RATIO = 0.1
+# ...but always allow this many retries, so small runs are not starved
+DEFAULT_MIN_RETRY_BUDGET = 10
+
+# 4xx statuses that are worth repeating (timeouts, early data)
+RETRYABLE_CLIENT_STATUS_CODES = (408, 425)
+# Browser network errors that repeat on every attempt
+NON_RETRYABLE_ERROR_MARKERS = (
+    "net::ERR_NAME_NOT_RESOLVED",
+    "net::ERR_CERT_",
+    "net::ERR_SSL_",
+    "net::ERR_INVALID_URL",
+    "net::ERR_UNKNOWN_URL_SCHEME",
+    "net::ERR_TOO_MANY_REDIRECTS",
+    "net::ERR_BLOCKED_BY_CLIENT",
+)
+
+# FetchMetrics counters
+COUNTER_RETRIES = "retries"
+COUNTER_RATE_LIMITED_RETRIES = "rate_limited_retries"
+COUNTER_NON_RETRYABLE = "non_retryable"
+COUNTER_RETRY_BUDGET_EXHAUSTED = "retry_budget_exhausted"
+COUNTER_RETRIES_EXHAUSTED = "retries_exhausted"
+
+
+@dataclass
+class RetryFailure:
+    """A classified failure of one attempt."""
+
+    category: str
+    reason: str = ""
+    retry_after: Optional[float] = None
+
+
+@dataclass
+class RetryDecision:
+    """Whether to retry a failed attempt, and how long to wait first."""
+
+    retry: bool
+    delay: float = 0.0
+    reason: str = ""
+
+
+def classify_status(status: int) -> str:
+    """Error category of an HTTP error status."""
+    if status in THROTTLE_STATUS_CODES:
+        return RETRY_RATE_LIMITED
+    if status >= 500 or status in RETRYABLE_CLIENT_STATUS_CODES:
+        return RETRY_RETRYABLE
+    return RETRY_NON_RETRYABLE
+
+
+def _status_of(error: BaseException) -> Optional[int]:
+    # aiohttp.ClientResponseError has .status, openai.APIStatusError has .status_code
+    for attribute in ("status", "status_code"):
+        status = getattr(error, attribute, None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _retry_after_of(error: BaseException) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        return parse_retry_after(headers.get("Retry-After"))
+    except AttributeError:
+        return None
+
+
+def classify_error(error: BaseException) -> RetryFailure:
+    """Classify an exception raised by a fetch or API call."""
+    reason = str(error).splitlines()[0] if str(error) else type(error).__name__
+    if isinstance(error, RateLimitedError):
+        return RetryFailure(RETRY_RATE_LIMITED, reason, error.retry_after)
+
+    status = _status_of(error)
+    if status is not None:
+        category = classify_status(status)
+        retry_after = _retry_after_of(error) if category == RETRY_RATE_LIMITED else None
+        return RetryFailure(category, reason, retry_after)
+
+    if any(marker in reason for marker in NON_RETRYABLE_ERROR_MARKERS):
+        return RetryFailure(RETRY_NON_RETRYABLE, reason)
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return RetryFailure(RETRY_RETRYABLE, reason)
+    # Decode errors, invalid URLs (aiohttp.InvalidURL is a ValueError), programming errors
+    if isinstance(error, (ValueError, LookupError, TypeError)):
+        return RetryFailure(RETRY_NON_RETRYABLE, reason)
+    # Connection resets, client errors, browser errors: assume transient
+    return RetryFailure(RETRY_RETRYABLE, reason)
+
+
+class RetryBudget:
+    """
+    Caps the retries of a run to ``ratio`` of its requests (at least ``min_retries``).
+
+    Thread-safe; one instance may be shared by every crawler of a fetch run.
+    After ``share()`` it may also be handed to processes started from the given
+    multiprocessing context (e.g. crawl shards), which then spend from the same
+    counters.
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        min_retries: int = DEFAULT_MIN_RETRY_BUDGET,
+    ):
+        self.ratio = max(0.0, ratio)
+        self.min_retries = max(0, min_retries)
+        self._lock = threading.Lock()
+        # requests, retries, denied
+        self._counts = [0, 0, 0]
+        self._shared = False
+
+    def share(self, context) -> None:
+        """
+        Move the counters into shared memory of a ``multiprocessing`` context;
+        call it before other threads use the budget.
+        """
+        if self._shared:
+            return
+        with self._lock:
+            self._counts = context.Array("q", self._counts, lock=False)
+        self._lock = context.Lock()
+        self._shared = True
+
+    def _allowed(self) -> int:
+        return max(self.min_retries, int(self._counts[0] * self.ratio))
+
+    def record_request(self) -> None:
+        """Count a first attempt; every request grows the budget by ``ratio``."""
+        with self._lock:
+            self._counts[0] += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget. Returns False when it is used up."""
+        with self._lock:
+            if self._counts[1] >= self._allowed():
+                self._counts[2] += 1
+                return False
+            self._counts[1] += 1
+            return True
+
+    def reset(self) -> None:
+        """Start a new run with an empty budget."""
+        with self._lock:
+            self._counts[:] = [0, 0, 0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self._counts[0],
+                "retries": self._counts[1],
+                "denied": self._counts[2],
+                "allowed": self._allowed(),
+            }
+
+
+class RetryPolicy:
+    """Decides whether and when a failed attempt is retried."""
+
+    def __init__(
+        self,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        jitter_factor: float = DEFAULT_JITTER_FACTOR,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER_SECONDS,
+        budget: Optional[RetryBudget] = None,
+        metrics: Optional[FetchMetrics] = None,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self.jitter_factor = jitter_factor
+        self.max_retry_after = max_retry_after
+        # Optional run-wide cap on retries (shared between crawlers)
+        self.budget = budget
+        # Optional per-domain retry counters
+        self.metrics = metrics
+
+    def backoff(self, retries_done: int) -> float:
+        """Exponential backoff with jitter before retry number ``retries_done + 1``."""
+        delay = min(self.base_delay * (2 ** retries_done), self.max_delay)
+        jitter = delay * self.jitter_factor
+        return max(0.0, delay + random.uniform(-jitter, jitter))
+
+    def record_request(self, url: str) -> None:
+        """Count the first attempt of a request towards the retry budget."""
+        if self.budget:
+            self.budget.record_request()
+
+    def _count(self, url: str, counter: str) -> None:
+        if self.metrics:
+            self.metrics.increment_url(url, counter)
+
+    def decide(
+        self, url: str, failure: RetryFailure, retries_done: int, max_retries: int
+    ) -> RetryDecision:
+        """
+        Decide about the failed attempt of a request that has already been
+        retried ``retries_done`` times and may be retried ``max_retries`` times.
+        """
+        if failure.category == RETRY_NON_RETRYABLE:
+            self._count(url, COUNTER_NON_RETRYABLE)
+            return RetryDecision(False, reason=f"not retryable ({failure.reason})")
+        if retries_done >= max_retries:
+            self._count(url, COUNTER_RETRIES_EXHAUSTED)
+            return RetryDecision(False, reason=f"gave up after {retries_done} retries")
+
+        delay = self.backoff(retries_done)
+        if failure.category == RETRY_RATE_LIMITED and failure.retry_after is not None:
+            if failure.retry_after > self.max_retry_after:
+                self._count(url, COUNTER_NON_RETRYABLE)
+                return RetryDecision(
+                    False, reason=f"Retry-After {failure.retry_after:.0f}s is too long"
+                )
+            delay = max(delay, failure.retry_after)
+
+        if self.budget and not self.budget.try_spend():
+            self._count(url, COUNTER_RETRY_BUDGET_EXHAUSTED)
+            return RetryDecision(False, reason="retry budget of this run is exhausted")
+
+        self._count(url, COUNTER_RETRIES)
+        if failure.category == RETRY_RATE_LIMITED:
+            self._count(url, COUNTER_RATE_LIMITED_RETRIES)
+        return RetryDecision(True, delay=delay)
+
+    def reset(self) -> None:
+        """Start a new run (empties the retry budget)."""
+        if self.budget:
+            self.budget.reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retry budget usage of the current run."""
+        return {"budget": self.budget.get_stats() if self.budget else None}
@@ -0,0 +1,163 @@
+# src/core/scheduler.py
+# -*- coding: utf-8 -*-
+
+"""
+Sliding-window work scheduler for the crawlers.
+
+Instead of cutting the URL list into fixed batches and waiting for the
+slowest URL of each batch, ``sliding_window`` keeps exactly ``max_in_flight``
+fetches running and starts the next URL as soon as any one of them finishes.
+Results are yielded in completion order.
+
+The input may be a plain iterable or an async iterable, so producers can keep
+adding URLs while the crawl is running (see ``UrlFeed``).
+"""
+
+import asyncio
+import logging
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+UrlSource = Union[Iterable[str], AsyncIterable[str]]
+
+
+class UrlFeed:
+    """
+    Async iterable of URLs that can be extended while it is being consumed.
+
+    Call ``add()`` from the same event loop to enqueue more URLs and
+    ``close()`` once no more will come; iteration ends when the feed is
+    closed and drained.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, urls: Optional[Iterable[str]] = None):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+        for url in urls or ():
+            self.add(url)
+
+    def add(self, url: str) -> bool:
+        """Enqueue a URL. Returns False if the feed is already closed."""
+        if self._closed:
+            return False
+        self._queue.put_nowait(url)
+        return True
+
+    def close(self) -> None:
+        """Signal that no more URLs will be added."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put_nowait(self._CLOSED)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self
+
+    async def __anext__(self) -> str:
+        item = await self._queue.get()
+        if item is self._CLOSED:
+            # Keep the sentinel so further readers stop as well
+            self._queue.put_nowait(item)
+            raise StopAsyncIteration
+        return item
+
+
+async def _as_async_iterator(urls: UrlSource) -> AsyncGenerator[str, None]:
+    """Adapt a plain iterable to an async iterator."""
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
+
+async def sliding_window(
+    urls: UrlSource,
+    fetch: Callable[[str], Awaitable[T]],
+    max_in_flight: int,
+    on_error: Callable[[str, BaseException], T],
+) -> AsyncGenerator[T, None]:
+    """
+    Run ``fetch(url)`` for every URL with at most ``max_in_flight`` calls
+    running at once, yielding each result as soon as it completes.
+
+    Args:
+        urls: Iterable or async iterable of URLs; it is consumed lazily.
+        fetch: Coroutine function fetching one URL.
+        max_in_flight: Number of concurrent fetches to keep running.
+        on_error: Builds the result for a URL whose fetch raised an exception
+            or was cancelled (while the scheduler itself was not).
+    """
+    max_in_flight = max(1, max_in_flight)
+    source = _as_async_iterator(urls)
+    in_flight: Dict[asyncio.Future, str] = {}
+    next_url: Optional[asyncio.Future] = None
+    exhausted = False
+
+    try:
+        while True:
+            # Request the next URL while there is a free slot. This is a task of its
+            # own so a slow async producer never delays yielding finished results.
+            if not exhausted and next_url is None and len(in_flight) < max_in_flight:
+                next_url = asyncio.ensure_future(source.__anext__())
+
+            waiting = set(in_flight)
+            if next_url is not None:
+                waiting.add(next_url)
+            if not waiting:
+                break
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if next_url is not None and next_url in done:
+                done.discard(next_url)
+                try:
+                    url = next_url.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    task = asyncio.create_task(fetch(url), name=f"fetch_{url[:50]}")
+                    in_flight[task] = url
+                next_url = None
+
+            for task in done:
+                url = in_flight.pop(task)
+                try:
+                    result = task.result()
+                except asyncio.CancelledError as e:
+                    current = asyncio.current_task()
+                    if current is not None and current.cancelling():
+                        raise  # The scheduler itself is being cancelled
+                    # Only this fetch was cancelled (e.g. by its crawler): one failed URL
+                    logger.warning(f"Fetch task for {url} was cancelled")
+                    result = on_error(url, e if e.args else asyncio.CancelledError("fetch was cancelled"))
+                except Exception as e:
+                    logger.error(f"Fetch task for {url} raised an exception: {e}", exc_info=True)
+                    result = on_error(url, e)
+                yield result
+    finally:
+        # Consumer stopped early or was cancelled: do not leave fetches running
+        pending = list(in_flight)
+        if next_url is not None:
+            pending.append(next_url)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await source.aclose()
@@ -0,0 +1,259 @@
+# src/core/session_manager.py
+# -*- coding: utf-8 -*-
+
+"""
+Long-lived aiohttp session shared by the sub-article crawlers.
+
+Creating a ``TCPConnector`` / ``ClientSession`` per crawl throws away DNS
+results and keep-alive connections, so every batch of sub-articles pays for
+DNS, TCP and TLS setup again. ``CrawlerSessionManager`` owns a single
+connector with global and per-host connection limits for the lifetime of the
+worker that created it, and counts new vs. reused connections through an
+aiohttp ``TraceConfig``.
+
+With a ``PersistentDnsCache`` the connector resolves through it, so DNS
+results outlive the session and the run. ``warm_up()`` resolves all known
+domains concurrently and opens keep-alive connections to the busiest origins
+before the crawl starts. Pre-connects go through the crawlers' rate limiter
+and skip domains whose circuit is open, like any other request.
+
+The session is bound to the event loop it is first used on; create one
+manager per worker thread and close it from that same loop.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from src.core.circuit_breaker import DomainCircuitBreaker
+from src.core.dns_cache import CachingResolver, PersistentDnsCache, warm_up_dns
+from src.core.metrics import FetchMetrics
+from src.core.rate_limiter import DomainRateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 8
+DEFAULT_DNS_CACHE_TTL = 300  # Seconds
+DEFAULT_KEEPALIVE_TIMEOUT = 30  # Seconds an idle connection is kept for reuse
+DEFAULT_USER_AGENT = "SmartInfo/1.0"
+# Warm-up: origins that get a keep-alive connection, and the overall time limit
+DEFAULT_PRECONNECT_DOMAINS = 10
+WARM_UP_TIMEOUT_SECONDS = 5.0
+
+
+class CrawlerSessionManager:
+    """Owns one shared aiohttp ClientSession and its connection pool."""
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_CONNECTION_LIMIT,
+        limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache: int = DEFAULT_DNS_CACHE_TTL,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+        metrics: Optional[FetchMetrics] = None,
+        dns_cache: Optional[PersistentDnsCache] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        circuit_breaker: Optional[DomainCircuitBreaker] = None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.headers = headers or {"User-Agent": DEFAULT_USER_AGENT}
+        # Optional per-domain phase timings collected from the shared session
+        self.metrics = metrics
+        # Optional DNS cache that persists across sessions and runs
+        self.dns_cache = dns_cache
+        # Optional limiter and breaker shared with the crawlers; warm-up requests obey them
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self._resolver: Optional[CachingResolver] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._stats = {
+            "requests": 0,
+            "new_connections": 0,
+            "reused_connections": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "warm_up_resolved": 0,
+            "warm_up_connections": 0,
+        }
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        """Build a TraceConfig that feeds the connection reuse counters."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_end(session, ctx, params):
+            self._stats["requests"] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self._stats["new_connections"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self._stats["reused_connections"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self._stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self._stats["dns_cache_misses"] += 1
+
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use in the running loop."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                if self.dns_cache is not None:
+                    self._resolver = CachingResolver(self.dns_cache)
+                connector = aiohttp.TCPConnector(
+                    resolver=self._resolver,
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.ttl_dns_cache,
+                    keepalive_timeout=self.keepalive_timeout,
+                    enable_cleanup_closed=True,
+                )
+                trace_configs = [self._create_trace_config()]
+                if self.metrics:
+                    trace_configs.append(self.metrics.create_trace_config())
+                self._session = aiohttp.ClientSession(
+                    headers=self.headers,
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=None),
+                    trace_configs=trace_configs,
+                )
+                logger.info(
+                    f"Created shared crawler session (limit={self.limit}, "
+                    f"per host={self.limit_per_host})."
+                )
+        return self._session
+
+    async def warm_up(
+        self,
+        dns_urls: Iterable[str],
+        preconnect_urls: Optional[Iterable[str]] = None,
+        preconnect_limit: int = DEFAULT_PRECONNECT_DOMAINS,
+        timeout: float = WARM_UP_TIMEOUT_SECONDS,
+    ) -> Dict[str, Any]:
+        """
+        Prepare the session for a fetch run: resolve the hosts of ``dns_urls``
+        concurrently, then open a keep-alive connection to each of the
+        ``preconnect_limit`` origins that occur most often in ``preconnect_urls``
+        (default: ``dns_urls``). Origins with an open circuit are skipped and
+        each pre-connect waits for a rate limiter token. Failures are ignored;
+        the whole warm-up gives up after ``timeout`` seconds.
+        """
+        dns_urls = list(dns_urls)
+        preconnect_urls = dns_urls if preconnect_urls is None else list(preconnect_urls)
+        hosts = {urlparse(url).hostname for url in dns_urls}
+        origin_counts = Counter(
+            f"{parsed.scheme}://{parsed.netloc}"
+            for parsed in map(urlparse, preconnect_urls)
+            if parsed.scheme in ("http", "https") and parsed.netloc
+        )
+        breaker = self.circuit_breaker
+        # An open or half-open circuit already has its own probe; don't add traffic
+        skipped = [
+            origin for origin in origin_counts
+            if breaker is not None and breaker.retry_at(origin) is not None
+        ]
+        for origin in skipped:
+            del origin_counts[origin]
+        origins = [origin for origin, _ in origin_counts.most_common(preconnect_limit)]
+
+        session = await self.get_session()
+        stats = {
+            "hosts": len(hosts),
+            "resolved": 0,
+            "origins": len(origins),
+            "connected": 0,
+            "skipped_open_circuit": len(skipped),
+        }
+
+        async def _preconnect(origin: str) -> bool:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(origin)
+            try:
+                # The response is discarded; its connection stays in the pool.
+                # ssl=False like AiohttpCrawler, or the pooled connection would not match
+                async with session.head(f"{origin}/", allow_redirects=False, ssl=False):
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug(f"Pre-connect to {origin} failed: {e}")
+                return False
+
+        async def _run() -> None:
+            if self._resolver is not None:
+                stats["resolved"] = await warm_up_dns(self._resolver, hosts)
+            results = await asyncio.gather(*(_preconnect(origin) for origin in origins))
+            stats["connected"] = sum(results)
+
+        try:
+            await asyncio.wait_for(_run(), timeout)
+        except asyncio.TimeoutError:
+            logger.info(f"Connection warm-up stopped after {timeout:.1f}s.")
+        if self.dns_cache is not None:
+            self.dns_cache.save()
+
+        self._stats["warm_up_resolved"] += stats["resolved"]
+        self._stats["warm_up_connections"] += stats["connected"]
+        logger.info(
+            f"Warm-up: resolved {stats['resolved']}/{stats['hosts']} hosts, "
+            f"connected to {stats['connected']}/{stats['origins']} origins."
+        )
+        return stats
+
+    def forget_host(self, url: str) -> None:
+        """Drop cached DNS results of a URL's host, e.g. after its addresses refused connections."""
+        parsed = urlparse(url)
+        if not parsed.hostname:
+            return
+        if self.dns_cache is not None:
+            self.dns_cache.forget(parsed.hostname)
+        if self._session is not None and not self._session.closed:
+            port = parsed.port or (443 if parsed.scheme == "https" else 80)
+            self._session.connector.clear_dns_cache(parsed.hostname, port)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the shared session exists and has not been closed."""
+        return self._session is not None and not self._session.closed
+
+    async def close(self) -> None:
+        """Close the shared session and all pooled connections."""
+        if self._session is None:
+            return
+        if not self._session.closed:
+            await self._session.close()
+            logger.info(f"Shared crawler session closed. Stats: {self.get_stats()}")
+        self._session = None
+        self._resolver = None
+        if self.dns_cache is not None:
+            self.dns_cache.save()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get request and connection counters, including the connection reuse ratio."""
+        stats = dict(self._stats)
+        connections = stats["new_connections"] + stats["reused_connections"]
+        stats["reuse_ratio"] = (
+            round(stats["reused_connections"] / connections, 3) if connections else 0.0
+        )
+        return stats
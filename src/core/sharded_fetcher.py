@@ -0,0 +1,424 @@
+# src/core/sharded_fetcher.py
+# -*- coding: utf-8 -*-
+
+"""
+Multi-process sharded source page fetching.
+
+``HybridFetcher`` runs on one event loop in one thread, so charset
+detection, HTML decoding, the Playwright driver protocol and the GUI all
+compete for the same GIL and a large fetch run keeps a single core busy.
+``ShardedFetcher`` spreads the work over ``shard_count`` worker processes:
+
+- URLs are assigned to a shard by a stable hash of their domain, so every
+  request to a domain goes through the same process and that process's
+  rate limiter, adaptive concurrency limits and circuit breaker see all of
+  the domain's traffic.
+- Each shard runs its own event loop with its own ``AiohttpCrawler`` /
+  ``PlaywrightCrawler`` (Chromium is only started once a shard needs it).
+  Shards are spawned lazily, on the first URL that hashes to them.
+- Requests and results travel over ``multiprocessing`` queues. Fetched pages
+  are written to the shared ``RawHtmlStore`` directory by the shard and only
+  their content key comes back (``content`` is emptied and ``content_stored``
+  set); the main process loads the page from the store when it needs it.
+
+``fetch()`` has the same signature and result as ``HybridFetcher.fetch``, so
+callers can use either. Shards start from the main process's per-domain
+rate limits, persisted open circuits and persisted DNS cache. Circuit state
+changes inside a shard are sent back and applied to the main process's
+breaker, which saves them and notifies its listeners, and all shards spend
+retries from the main process's retry budget through shared counters. Hosts
+resolved inside a shard only live for that shard's lifetime.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.circuit_breaker import DomainCircuitBreaker
+from src.core.crawler import AiohttpCrawler, PlaywrightCrawler
+from src.core.html_store import RawHtmlStore
+from src.core.http_cache import HttpCache
+from src.core.hybrid_fetcher import BACKEND_STATIC, HybridFetcher
+from src.core.metrics import FetchMetrics
+from src.core.rate_limiter import DomainRateLimiter, domain_of
+from src.core.readiness import ReadinessProfile
+from src.core.retry_policy import RetryBudget, RetryPolicy
+from src.core.session_manager import CrawlerSessionManager
+from src.core.dns_cache import PersistentDnsCache
+
+logger = logging.getLogger(__name__)
+
+# At most this many shards when the process count is "auto" (0)
+MAX_AUTO_SHARDS = 8
+DEFAULT_PAGES_PER_SHARD = 4  # Browser contexts per shard
+READER_POLL_SECONDS = 1.0  # How often the result reader checks for dead shards
+SHUTDOWN_TIMEOUT_SECONDS = 30.0
+
+# Messages from the shards
+_MSG_RESULT = "result"
+_MSG_CIRCUIT = "circuit"
+_MSG_DONE = "done"
+
+
+def resolve_shard_count(configured: Any) -> int:
+    """Shard count for a configured process count: 0 means one per CPU core (capped)."""
+    try:
+        count = int(configured)
+    except (TypeError, ValueError):
+        return 1
+    if count <= 0:
+        return max(1, min(os.cpu_count() or 1, MAX_AUTO_SHARDS))
+    return count
+
+
+def shard_for_url(url: str, shard_count: int) -> int:
+    """Stable shard index of a URL's domain (the same in every process and run)."""
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(domain_of(url).encode("utf-8")) % shard_count
+
+
+@dataclass
+class ShardConfig:
+    """
+    Everything a shard process needs to build its fetcher; must stay picklable
+    (a shared ``retry_budget`` only while spawning the shard).
+    """
+
+    http_cache_path: str
+    html_store_dir: str
+    extract_links: bool = True
+    rate_limits: List[Tuple[str, float, int]] = field(default_factory=list)
+    circuit_state_path: Optional[str] = None
+    retry_budget: Optional[RetryBudget] = None
+    pages_per_shard: int = DEFAULT_PAGES_PER_SHARD
+    metrics_dir: Optional[str] = None
+    dns_cache_path: Optional[str] = None
+
+
+def _error_result(url: str, error: str) -> Dict[str, str]:
+    return {"original_url": url, "final_url": url, "content": "", "error": error, "content_hash": ""}
+
+
+# --- Shard process side ---
+def run_shard(shard_id: int, config: ShardConfig, tasks, results) -> None:
+    """Entry point of a shard process."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s - shard {shard_id} - %(levelname)s - %(message)s",
+        force=True,
+    )
+    try:
+        asyncio.run(_shard_main(shard_id, config, tasks, results))
+    except KeyboardInterrupt:
+        pass
+
+
+def _next_task(tasks) -> Optional[Tuple]:
+    """Block for the next request; None means stop (also when the main process is gone)."""
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            return tasks.get(timeout=READER_POLL_SECONDS)
+        except queue.Empty:
+            if parent is not None and not parent.is_alive():
+                return None
+
+
+async def _shard_main(shard_id: int, config: ShardConfig, tasks, results) -> None:
+    loop = asyncio.get_running_loop()
+    metrics = FetchMetrics(config.metrics_dir) if config.metrics_dir else None
+    html_store = RawHtmlStore(config.html_store_dir)
+    rate_limiter = DomainRateLimiter()
+    rate_limiter.load_limits(config.rate_limits)
+    # Loaded but never saved: the main process owns the state file and mirrors
+    # this shard's state changes into its own breaker
+    circuit_breaker = DomainCircuitBreaker()
+    circuit_breaker.load(config.circuit_state_path)
+    circuit_breaker.add_listener(
+        lambda domain, state: results.put(
+            (_MSG_CIRCUIT, domain, circuit_breaker.export_circuit(domain))
+        )
+    )
+    retry_policy = RetryPolicy(budget=config.retry_budget or RetryBudget(), metrics=metrics)
+    browser_cache = HttpCache(
+        config.http_cache_path,
+        namespace="playwright-links" if config.extract_links else "playwright",
+    )
+    static_cache = HttpCache(config.http_cache_path, namespace="aiohttp")
+    # Read-only copy as well (no path, so never saved)
+    dns_cache = PersistentDnsCache()
+    if config.dns_cache_path:
+        dns_cache.load(config.dns_cache_path)
+    session_manager = CrawlerSessionManager(
+        metrics=metrics,
+        dns_cache=dns_cache,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+    )
+    browser_crawler = PlaywrightCrawler(
+        max_concurrent_pages=config.pages_per_shard,
+        http_cache=browser_cache,
+        html_store=html_store,
+        rate_limiter=rate_limiter,
+        metrics=metrics,
+        circuit_breaker=circuit_breaker,
+        retry_policy=retry_policy,
+        extract_links=config.extract_links,
+    )
+    fetcher = HybridFetcher(
+        AiohttpCrawler(
+            request_timeout=15,
+            http_cache=static_cache,
+            rate_limiter=rate_limiter,
+            session_manager=session_manager,
+            metrics=metrics,
+            circuit_breaker=circuit_breaker,
+            retry_policy=retry_policy,
+        ),
+        browser_crawler,
+        html_store=html_store,
+    )
+
+    async def _fetch(request_id: int, url: str, backend_hint: Optional[str], readiness: Optional[Dict]):
+        try:
+            profile = ReadinessProfile.from_dict(readiness) if readiness else None
+            result, backend = await fetcher.fetch(url, backend_hint, profile)
+        except Exception as e:
+            logger.error(f"Shard {shard_id} failed to fetch {url}: {e}", exc_info=True)
+            result, backend = _error_result(url, f"Shard fetch failed: {e}"), backend_hint or BACKEND_STATIC
+        content_hash = result.get("content_hash")
+        if result.get("content") and content_hash and html_store.is_persisted(content_hash):
+            # Don't pickle the page through the result queue, the main process reads the store
+            result = {**result, "content": "", "content_stored": True}
+        results.put((_MSG_RESULT, request_id, result, backend))
+
+    running = set()
+    try:
+        while True:
+            task = await loop.run_in_executor(None, _next_task, tasks)
+            if task is None:
+                break
+            fetch_task = asyncio.create_task(_fetch(*task))
+            running.add(fetch_task)
+            fetch_task.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        stats = {
+            "fetcher": fetcher.get_stats(),
+            "browser_pool": {
+                k: v
+                for k, v in browser_crawler.get_pool_stats().items()
+                if k not in ("contexts", "concurrency")
+            },
+            "retry": retry_policy.get_stats()["budget"],
+        }
+        try:
+            await browser_crawler.shutdown()
+        except Exception as e:
+            logger.error(f"Shard {shard_id}: error shutting down the browser: {e}")
+        await session_manager.close()
+        browser_cache.close()
+        static_cache.close()
+        if metrics:
+            metrics.dump_json(
+                os.path.join(config.metrics_dir, f"fetch_metrics_shard{shard_id}_{os.getpid()}.json")
+            )
+        results.put((_MSG_DONE, shard_id, stats))
+
+
+# --- Main process side ---
+class ShardedFetcher:
+    """
+    Fetch source pages in ``shard_count`` worker processes partitioned by domain.
+
+    ``fetch()`` may be awaited from any event loop; results are delivered by a
+    reader thread. Circuit state changes of the shards are applied to
+    ``circuit_breaker`` from that thread.
+    """
+
+    def __init__(
+        self,
+        config: ShardConfig,
+        shard_count: int,
+        circuit_breaker: Optional[DomainCircuitBreaker] = None,
+    ):
+        self.config = config
+        self.shard_count = max(1, shard_count)
+        self.circuit_breaker = circuit_breaker
+        # Spawn, not fork: the parent runs Qt and other threads
+        self._ctx = multiprocessing.get_context("spawn")
+        if config.retry_budget:
+            # One run-wide budget for the main process and every shard
+            config.retry_budget.share(self._ctx)
+        self._results = self._ctx.Queue()
+        self._task_queues: List[Any] = [None] * self.shard_count
+        self._processes: List[Optional[multiprocessing.process.BaseProcess]] = [None] * self.shard_count
+        self._finished: set = set()  # Shards that reported done or died
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count()
+        # request id -> (shard, url, backend hint, future)
+        self._pending: Dict[int, Tuple[int, str, Optional[str], asyncio.Future]] = {}
+        self._reader: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._shard_stats: Dict[int, Dict[str, Any]] = {}
+        self._stats = {"dispatched": [0] * self.shard_count, "shard_failures": 0}
+
+    def _ensure_shard(self, shard: int) -> Any:
+        """Start a shard process (and the result reader) on first use. Call with the lock held."""
+        if self._processes[shard] is None:
+            tasks = self._ctx.Queue()
+            process = self._ctx.Process(
+                target=run_shard,
+                args=(shard, self.config, tasks, self._results),
+                name=f"crawl-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self._task_queues[shard] = tasks
+            self._processes[shard] = process
+            logger.info(f"Started crawl shard {shard} (pid {process.pid})")
+        if self._reader is None:
+            self._reader = threading.Thread(
+                target=self._read_results, name="crawl-shard-results", daemon=True
+            )
+            self._reader.start()
+        return self._task_queues[shard]
+
+    async def fetch(
+        self,
+        url: str,
+        backend_hint: Optional[str] = None,
+        readiness: Optional[ReadinessProfile] = None,
+    ) -> Tuple[Dict[str, str], str]:
+        """Fetch a source page in its domain's shard; same contract as ``HybridFetcher.fetch``."""
+        shard = shard_for_url(url, self.shard_count)
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if self._stopping.is_set() or shard in self._finished:
+                return _error_result(url, f"Crawl shard {shard} is not running"), backend_hint or BACKEND_STATIC
+            tasks = self._ensure_shard(shard)
+            request_id = next(self._request_ids)
+            self._pending[request_id] = (shard, url, backend_hint, future)
+            self._stats["dispatched"][shard] += 1
+        tasks.put((request_id, url, backend_hint, readiness.to_dict() if readiness else None))
+        try:
+            return await future
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, value: Tuple[Dict[str, str], str]) -> None:
+        if not future.done():
+            future.set_result(value)
+
+    def _deliver(self, request_id: int, value: Optional[Tuple[Dict[str, str], str]] = None, error: str = "") -> None:
+        with self._lock:
+            pending = self._pending.pop(request_id, None)
+        if not pending:
+            return  # The caller was cancelled meanwhile
+        shard, url, backend_hint, future = pending
+        if value is None:
+            value = (_error_result(url, error), backend_hint or BACKEND_STATIC)
+        try:
+            future.get_loop().call_soon_threadsafe(self._resolve, future, value)
+        except RuntimeError:
+            pass  # The caller's event loop is closed
+
+    def _fail_dead_shards(self) -> None:
+        with self._lock:
+            dead = [
+                shard
+                for shard, process in enumerate(self._processes)
+                if process is not None and shard not in self._finished and not process.is_alive()
+            ]
+            for shard in dead:
+                self._finished.add(shard)
+                self._stats["shard_failures"] += 1
+            orphaned = [
+                (request_id, shard)
+                for request_id, (shard, _, _, _) in self._pending.items()
+                if shard in dead
+            ]
+        for shard in dead:
+            logger.error(
+                f"Crawl shard {shard} exited unexpectedly (exit code {self._processes[shard].exitcode})"
+            )
+        for request_id, shard in orphaned:
+            self._deliver(request_id, error=f"Crawl shard {shard} exited unexpectedly")
+
+    def _read_results(self) -> None:
+        """Reader thread: hand shard results to the waiting futures."""
+        while True:
+            with self._lock:
+                started = [shard for shard, p in enumerate(self._processes) if p is not None]
+                all_done = bool(started) and all(shard in self._finished for shard in started)
+            if self._stopping.is_set() and all_done:
+                break
+            try:
+                message = self._results.get(timeout=READER_POLL_SECONDS)
+            except queue.Empty:
+                self._fail_dead_shards()
+                continue
+            except (EOFError, OSError):
+                break
+            if message[0] == _MSG_RESULT:
+                _, request_id, result, backend = message
+                self._deliver(request_id, (result, backend))
+            elif message[0] == _MSG_CIRCUIT:
+                _, domain, circuit = message
+                if self.circuit_breaker:
+                    self.circuit_breaker.apply_circuit(domain, circuit)
+            elif message[0] == _MSG_DONE:
+                _, shard, stats = message
+                with self._lock:
+                    self._finished.add(shard)
+                    self._shard_stats[shard] = stats
+
+    def _stop_processes(self, timeout: float) -> None:
+        with self._lock:
+            self._stopping.set()
+            running = [
+                (shard, process)
+                for shard, process in enumerate(self._processes)
+                if process is not None and shard not in self._finished
+            ]
+        for shard, _ in running:
+            self._task_queues[shard].put(None)
+        for shard, process in running:
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning(f"Crawl shard {shard} did not stop in {timeout:.0f}s, terminating it")
+                process.terminate()
+                process.join(5.0)
+        if self._reader is not None:
+            self._reader.join(timeout)
+        # Whatever is still waiting will never get an answer
+        with self._lock:
+            leftover = list(self._pending)
+        for request_id in leftover:
+            self._deliver(request_id, error="Crawl shards were shut down")
+
+    async def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Let the shards finish their queued URLs, then stop them."""
+        await asyncio.get_running_loop().run_in_executor(None, self._stop_processes, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """URLs dispatched per shard, shard failures and each finished shard's own stats."""
+        with self._lock:
+            return {
+                "shards": self.shard_count,
+                "started": sum(1 for p in self._processes if p is not None),
+                "dispatched": list(self._stats["dispatched"]),
+                "shard_failures": self._stats["shard_failures"],
+                "per_shard": dict(self._shard_stats),
+            }
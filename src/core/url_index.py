@@ -0,0 +1,186 @@
+# src/core/url_index.py
+# -*- coding: utf-8 -*-
+
+"""
+Process-wide in-memory index of the stored article URLs.
+
+Deduplicating against the database used to read every ``news.url`` into a
+Python list (``get_all_urls``) per fetch run and per ``add_batch`` call. With
+hundreds of thousands of stored articles that scan, and the transient list of
+strings it builds, is a visible per-call cost.
+
+``UrlIndex`` is loaded from the table once and then updated incrementally by
+``NewsRepository`` on every insert and delete. It keeps a 64-bit fingerprint
+of each URL's canonical form (see ``canonicalize_url``) with a reference
+count, so variants of one article share an entry and deleting one of two
+stored variants keeps the other known. It also counts stored articles per
+origin (``scheme://host``) for connection warm-up.
+
+Membership checks need no database access and are thread-safe, so crawl
+workers may use the index directly (``UrlFrontier`` consults it). Loading and
+resyncing go through ``NewsRepository`` on the main thread. The index records
+a table signature (row count and highest assigned id) that every write of the
+repository advances; ``NewsRepository.sync_url_index()`` compares it with the
+table once per fetch run and reloads the index after writes made elsewhere.
+"""
+
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.utils.url_utils import canonicalize_url, url_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _origin(url: str) -> Optional[str]:
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme in ("http", "https") and parts.netloc:
+        return f"{parts.scheme}://{parts.netloc}"
+    return None
+
+
+class UrlIndex:
+    """Thread-safe multiset of canonical URL fingerprints, with per-origin counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # fingerprint -> number of stored URLs with that canonical form
+        self._counts: Dict[int, int] = {}
+        self._origins: Counter = Counter()
+        self._loaded = False
+        # Table signature the index is in sync with: (row count, highest assigned id)
+        self._signature: Optional[Tuple[int, int]] = None
+        self._stats = {"loads": 0, "checked": 0, "hits": 0}
+
+    @staticmethod
+    def key_of(url: str) -> Optional[str]:
+        """Canonical form a URL is indexed under (None if it cannot be canonicalized)."""
+        return canonicalize_url(url) or url or None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def signature(self) -> Optional[Tuple[int, int]]:
+        return self._signature
+
+    def set_signature(self, signature: Optional[Tuple[int, int]]) -> None:
+        with self._lock:
+            self._signature = signature
+
+    def advance_signature(self, rows: int, last_id: Optional[int] = None) -> None:
+        """Account for ``rows`` inserted (or deleted, if negative) rows, the last with id ``last_id``."""
+        with self._lock:
+            if self._signature is None:
+                return
+            count, top_id = self._signature
+            self._signature = (count + rows, max(top_id, last_id or 0))
+
+    def _add_locked(self, url: str) -> None:
+        key = self.key_of(url)
+        if not key:
+            return
+        fingerprint = url_fingerprint(key)
+        self._counts[fingerprint] = self._counts.get(fingerprint, 0) + 1
+        origin = _origin(url)
+        if origin:
+            self._origins[origin] += 1
+
+    def load(self, urls: Iterable[str], signature: Optional[Tuple[int, int]] = None) -> int:
+        """Replace the content with ``urls``. Returns the number of distinct canonical URLs."""
+        with self._lock:
+            self._counts.clear()
+            self._origins.clear()
+            for url in urls:
+                self._add_locked(url)
+            self._loaded = True
+            self._signature = signature
+            self._stats["loads"] += 1
+            size = len(self._counts)
+        logger.info(f"URL index loaded with {size} canonical article URLs.")
+        return size
+
+    def add(self, url: str) -> None:
+        """Record a stored URL."""
+        with self._lock:
+            self._add_locked(url)
+
+    def discard(self, url: str) -> None:
+        """Forget one stored occurrence of a URL."""
+        key = self.key_of(url)
+        if not key:
+            return
+        fingerprint = url_fingerprint(key)
+        origin = _origin(url)
+        with self._lock:
+            count = self._counts.get(fingerprint, 0)
+            if count > 1:
+                self._counts[fingerprint] = count - 1
+            elif count:
+                del self._counts[fingerprint]
+            if origin and self._origins.get(origin):
+                self._origins[origin] -= 1
+                if not self._origins[origin]:
+                    del self._origins[origin]
+
+    def clear(self, signature: Optional[Tuple[int, int]] = None) -> None:
+        """Empty the index (the table was emptied); it stays loaded."""
+        with self._lock:
+            self._counts.clear()
+            self._origins.clear()
+            self._signature = signature
+
+    def invalidate(self) -> None:
+        """Mark the index stale; it is reloaded on its next use through the repository."""
+        with self._lock:
+            self._loaded = False
+            self._signature = None
+
+    def contains_key(self, key: str) -> bool:
+        """Whether a canonical URL (as returned by ``key_of``) is stored."""
+        fingerprint = url_fingerprint(key)
+        with self._lock:
+            self._stats["checked"] += 1
+            if fingerprint in self._counts:
+                self._stats["hits"] += 1
+                return True
+            return False
+
+    def __contains__(self, url: str) -> bool:
+        key = self.key_of(url)
+        return bool(key) and self.contains_key(key)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def get_origin_counts(self) -> Counter:
+        """Stored articles per origin (``scheme://host``)."""
+        with self._lock:
+            return Counter(self._origins)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["urls"] = len(self._counts)
+            stats["origins"] = len(self._origins)
+        return stats
+
+
+_url_index: Optional[UrlIndex] = None
+_url_index_lock = threading.Lock()
+
+
+def get_url_index() -> UrlIndex:
+    """The process-wide URL index (created empty and unloaded on first use)."""
+    global _url_index
+    with _url_index_lock:
+        if _url_index is None:
+            _url_index = UrlIndex()
+        return _url_index
@@ -26,6 +26,7 @@ from src.db.schema_constants import (
     API_CONFIG_TABLE,
     SYSTEM_CONFIG_TABLE,
     QA_HISTORY_TABLE,
+    DOMAIN_RATE_LIMITS_TABLE,
 )
 
 logger = logging.getLogger(__name__)
@@ -162,6 +163,27 @@ class DatabaseConnectionManager:
         query.finish()
         return True
 
+    def _ensure_column(self, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table if it is missing (schema migration)."""
+        query = QSqlQuery(self._qt_database)
+        if not query.exec(f"PRAGMA table_info({table})"):
+            logger.error(
+                f"Failed to inspect table {table}: {query.lastError().text()}"
+            )
+            query.finish()
+            return False
+        columns = set()
+        while query.next():
+            columns.add(query.value(1))
+        query.finish()
+
+        if column in columns:
+            return True
+        logger.info(f"Adding missing column {table}.{column}")
+        return self._execute_schema_query(
+            f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+        )
+
     def _create_tables(self):
         """Create database tables using QSqlQuery (if they do not exist)"""
         if not self._qt_database or not self._qt_database.isOpen():
@@ -193,10 +215,29 @@ class DatabaseConnectionManager:
                 name TEXT NOT NULL, 
                 url TEXT NOT NULL UNIQUE,
                 category_id INTEGER NOT NULL, 
+                fetch_backend TEXT,
+                wait_strategy TEXT,
+                max_scrolls INTEGER,
+                js_enabled INTEGER,
+                settle_ms INTEGER,
+                expected_links INTEGER,
+                feed_url TEXT,
+                feed_checked_at INTEGER,
                 FOREIGN KEY (category_id) REFERENCES {NEWS_CATEGORY_TABLE}(id) ON DELETE CASCADE
             )
         """
         )
+        # Databases created before fetch backend detection lack this column
+        self._ensure_column(NEWS_SOURCES_TABLE, "fetch_backend", "TEXT")
+        # Page readiness profile columns (see src/core/readiness.py); NULL means default
+        self._ensure_column(NEWS_SOURCES_TABLE, "wait_strategy", "TEXT")
+        self._ensure_column(NEWS_SOURCES_TABLE, "max_scrolls", "INTEGER")
+        self._ensure_column(NEWS_SOURCES_TABLE, "js_enabled", "INTEGER")
+        self._ensure_column(NEWS_SOURCES_TABLE, "settle_ms", "INTEGER")
+        self._ensure_column(NEWS_SOURCES_TABLE, "expected_links", "INTEGER")
+        # Discovered RSS/Atom feed or news sitemap, and when discovery last ran
+        self._ensure_column(NEWS_SOURCES_TABLE, "feed_url", "TEXT")
+        self._ensure_column(NEWS_SOURCES_TABLE, "feed_checked_at", "INTEGER")
 
         self._execute_schema_query(
             f"""
@@ -286,6 +327,17 @@ class DatabaseConnectionManager:
         """
         )
 
+        # Per-domain crawl rate limits (token bucket rate in requests/second and burst size)
+        self._execute_schema_query(
+            f"""
+            CREATE TABLE IF NOT EXISTS {DOMAIN_RATE_LIMITS_TABLE} (
+                domain TEXT PRIMARY KEY NOT NULL,
+                rate REAL NOT NULL,
+                burst INTEGER NOT NULL
+            )
+        """
+        )
+
         logger.info("Database tables verified/created successfully.")
 
     def _cleanup(self):
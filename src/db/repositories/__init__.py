@@ -13,6 +13,7 @@ from .news_repository import NewsRepository
 from .api_key_repository import ApiKeyRepository
 from .system_config_repository import SystemConfigRepository
 from .qa_repository import QARepository
+from .domain_rate_limit_repository import DomainRateLimitRepository
 
 # Define what is accessible when using 'from src.db.repositories import *'
 # Although explicit imports are generally preferred.
@@ -24,4 +25,5 @@ __all__ = [
     "ApiKeyRepository",
     "SystemConfigRepository",
     "QARepository",
+    "DomainRateLimitRepository",
 ] 
\ No newline at end of file
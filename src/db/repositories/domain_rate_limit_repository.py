@@ -0,0 +1,64 @@
+# src/db/repositories/domain_rate_limit_repository.py
+# -*- coding: utf-8 -*-
+
+import logging
+from typing import List, Optional, Tuple
+
+from src.db.schema_constants import DOMAIN_RATE_LIMITS_TABLE
+from .base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DomainRateLimitRepository(BaseRepository):
+    """
+    Repository for per-domain crawl rate limits using QSqlQuery.
+
+    The app only reads the limits at startup (``get_all``); there is no UI for
+    them, they are managed outside the app with ``save`` / ``delete`` or by
+    editing the ``domain_rate_limits`` table.
+    """
+
+    def get(self, domain: str) -> Optional[Tuple[str, float, int]]:
+        """Gets the (domain, rate, burst) settings for a domain."""
+        query_str = f"SELECT domain, rate, burst FROM {DOMAIN_RATE_LIMITS_TABLE} WHERE domain = ?"
+        return self._fetchone(query_str, (domain.lower(),))
+
+    def get_all(self) -> List[Tuple[str, float, int]]:
+        """Gets all per-domain rate limits as (domain, rate, burst) tuples."""
+        query_str = f"SELECT domain, rate, burst FROM {DOMAIN_RATE_LIMITS_TABLE} ORDER BY domain"
+        return self._fetchall(query_str)
+
+    def save(self, domain: str, rate: float, burst: int) -> bool:
+        """Saves or updates the rate (requests/second) and burst size for a domain."""
+        if rate <= 0 or burst < 1:
+            logger.warning(
+                f"Invalid rate limit for '{domain}': rate={rate}, burst={burst}"
+            )
+            return False
+        query_str = f"""
+            INSERT INTO {DOMAIN_RATE_LIMITS_TABLE} (domain, rate, burst)
+            VALUES (?, ?, ?)
+            ON CONFLICT(domain)
+            DO UPDATE SET rate = excluded.rate, burst = excluded.burst
+        """
+        query = self._execute(query_str, (domain.lower(), rate, burst), commit=True)
+        saved = query is not None
+        if saved:
+            logger.info(f"Saved rate limit for '{domain}': {rate}/s, burst {burst}.")
+        else:
+            logger.error(f"Failed to save rate limit for '{domain}'.")
+        return saved
+
+    def delete(self, domain: str) -> bool:
+        """Deletes the rate limit of a domain (it falls back to the default)."""
+        query_str = f"DELETE FROM {DOMAIN_RATE_LIMITS_TABLE} WHERE domain = ?"
+        query = self._execute(query_str, (domain.lower(),), commit=True)
+        if query:
+            deleted = self._get_rows_affected(query) > 0
+            if deleted:
+                logger.info(f"Deleted rate limit for '{domain}'.")
+            else:
+                logger.warning(f"Could not delete rate limit for '{domain}' (not found?).")
+            return deleted
+        return False
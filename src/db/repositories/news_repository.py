@@ -10,6 +10,7 @@ import logging
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime
 
+from src.core.url_index import UrlIndex, get_url_index
 from src.db.schema_constants import NEWS_TABLE
 from .base_repository import BaseRepository
 
@@ -19,6 +20,41 @@ logger = logging.getLogger(__name__)
 class NewsRepository(BaseRepository):
     """Repository for news table operations."""
 
+    def __init__(self, url_index: Optional[UrlIndex] = None):
+        super().__init__()
+        # Stored article urls, kept in sync with the table by this repository
+        self._url_index = url_index if url_index is not None else get_url_index()
+
+    def _last_assigned_id(self) -> int:
+        """Highest id ever assigned in the news table (its AUTOINCREMENT sequence)."""
+        row = self._fetchone("SELECT seq FROM sqlite_sequence WHERE name = ?", (NEWS_TABLE,))
+        return int(row[0]) if row and row[0] is not None else 0
+
+    def _table_signature(self) -> Tuple[int, int]:
+        """
+        (row count, highest assigned id) of the news table; changes with every
+        insert or delete. Counting is a full scan, so this is only queried when
+        the url index is loaded or synced; writes advance the signature instead.
+        """
+        row = self._fetchone(f"SELECT COUNT(*) FROM {NEWS_TABLE}")
+        return (int(row[0]) if row else 0), self._last_assigned_id()
+
+    def get_url_index(self) -> UrlIndex:
+        """The in-memory index of stored article urls, loaded on first use."""
+        if not self._url_index.loaded:
+            self._url_index.load(self.get_all_urls(), self._table_signature())
+        return self._url_index
+
+    def sync_url_index(self) -> UrlIndex:
+        """
+        Reload the url index if the table was changed other than through a
+        NewsRepository (call once per fetch run, not per write).
+        """
+        if self._url_index.loaded and self._url_index.signature == self._table_signature():
+            return self._url_index
+        self._url_index.invalidate()
+        return self.get_url_index()
+
     def add(self, item: Dict[str, Any]) -> Optional[int]:
         """Adds a single news item. Returns new ID or None if failed/exists."""
         # Basic validation
@@ -28,8 +64,9 @@ class NewsRepository(BaseRepository):
             )
             return None
 
-        # Check for duplicates by url
-        if self.exists_by_url(item["url"]):
+        # Check for duplicates by canonical url
+        url_index = self.get_url_index()
+        if item["url"] in url_index:
             logger.debug(f"News with url {item['url']} already exists, skipping.")
             return None
 
@@ -60,6 +97,10 @@ class NewsRepository(BaseRepository):
 
         if query:
             last_id = self._get_last_insert_id(query)
+            url_index.add(item["url"])
+            url_index.advance_signature(
+                1, int(last_id) if last_id is not None else self._last_assigned_id()
+            )
             if last_id is not None:
                 logger.info(f"Added news item '{item.get('title')}' with ID {last_id}.")
                 # Ensure the ID type is appropriate (likely int)
@@ -82,15 +123,20 @@ class NewsRepository(BaseRepository):
             return 0, 0
 
         params_list = []
+        urls = []
         skipped_count = 0
-        processed_urls = set(self.get_all_urls())  # Get existing urls efficiently
+        # Compare canonical urls so http/https, trailing-slash, tracking-parameter
+        # and index.html variants of a stored article count as duplicates
+        url_index = self.get_url_index()
+        processed_urls = set()
 
         for item in items:
             url = item.get("url")
             if not item.get("title") or not url:
                 skipped_count += 1
                 continue
-            if url in processed_urls:
+            url_key = url_index.key_of(url)
+            if url_key in processed_urls or url_index.contains_key(url_key):
                 skipped_count += 1
                 continue
 
@@ -107,7 +153,8 @@ class NewsRepository(BaseRepository):
                 item.get("content", ""),
             )
             params_list.append(params)
-            processed_urls.add(url)  # Add to set to avoid duplicates within the batch
+            urls.append(url)
+            processed_urls.add(url_key)  # Add to set to avoid duplicates within the batch
 
         if not params_list:
             return 0, skipped_count
@@ -120,6 +167,11 @@ class NewsRepository(BaseRepository):
         """
         # Use the new _executemany
         success_count = self._executemany(query_str, params_list, commit=True)
+        # The batch is one transaction: either every row was inserted or none
+        if success_count == len(params_list):
+            for url in urls:
+                url_index.add(url)
+            url_index.advance_signature(success_count, self._last_assigned_id())
 
         # The returned success_count from _executemany is now the number of successful inserts
         final_skipped = len(items) - success_count  # More accurate skipped count
@@ -149,6 +201,8 @@ class NewsRepository(BaseRepository):
 
     def delete(self, news_id: int) -> bool:
         """Deletes a news item."""
+        url_index = self.get_url_index()
+        url_row = self._fetchone(f"SELECT url FROM {NEWS_TABLE} WHERE id = ?", (news_id,))
         query_str = f"DELETE FROM {NEWS_TABLE} WHERE id = ?"
         query = self._execute(query_str, (news_id,), commit=True)
         if query:
@@ -156,6 +210,9 @@ class NewsRepository(BaseRepository):
             deleted = rows_affected > 0
             if deleted:
                 logger.info(f"Deleted news item ID {news_id}.")
+                if url_row:
+                    url_index.discard(url_row[0])
+                url_index.advance_signature(-rows_affected)
             return deleted
         return False
 
@@ -203,6 +260,7 @@ class NewsRepository(BaseRepository):
             self._db.rollback()
             return False
 
+        self._url_index.clear(signature=(0, 0))
         logger.info(f"Cleared all data from {NEWS_TABLE} table.")
         return True
 
@@ -2,13 +2,45 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from typing import List, Optional, Tuple
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.db.schema_constants import NEWS_SOURCES_TABLE, NEWS_CATEGORY_TABLE
 from .base_repository import BaseRepository  # Uses the new QtSql BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Columns of the per-source page readiness profile
+READINESS_PROFILE_COLUMNS = (
+    "wait_strategy",
+    "max_scrolls",
+    "js_enabled",
+    "settle_ms",
+    "expected_links",
+)
+
+# Columns listed by get_all / get_by_category, in row order
+SOURCE_LIST_COLUMNS = (
+    "id",
+    "name",
+    "url",
+    "category_id",
+    "category_name",
+    "fetch_backend",
+    "feed_url",
+    "feed_checked_at",
+) + READINESS_PROFILE_COLUMNS
+
+
+def readiness_profile_from_values(values) -> Optional[Dict[str, Any]]:
+    """Builds a readiness profile from its column values in READINESS_PROFILE_COLUMNS order (None if all are NULL)."""
+    # QtSql may return NULL columns as empty strings
+    profile = {
+        column: None if value in (None, "") else value
+        for column, value in zip(READINESS_PROFILE_COLUMNS, values)
+    }
+    return profile if any(value is not None for value in profile.values()) else None
+
 
 class NewsSourceRepository(BaseRepository):
     """Repository for news_sources table operations using QSqlQuery."""
@@ -58,20 +90,71 @@ class NewsSourceRepository(BaseRepository):
         )
         return self._fetchone(query_str, (url,))
 
-    def get_all(self) -> List[Tuple[int, str, str, int, str]]:
-        """Gets all sources with category names."""
+    def _list_columns(self) -> str:
+        """SELECT list of get_all / get_by_category, in SOURCE_LIST_COLUMNS order."""
+        source_columns = ("fetch_backend", "feed_url", "feed_checked_at") + READINESS_PROFILE_COLUMNS
+        return ", ".join(
+            ["ns.id", "ns.name", "ns.url", "ns.category_id", "nc.name as category_name"]
+            + [f"ns.{column}" for column in source_columns]
+        )
+
+    def get_all(self) -> List[Tuple]:
+        """Gets all sources with category names, fetch backends, feeds and readiness profiles (see SOURCE_LIST_COLUMNS)."""
         query_str = f"""
-            SELECT ns.id, ns.name, ns.url, ns.category_id, nc.name as category_name
+            SELECT {self._list_columns()}
             FROM {NEWS_SOURCES_TABLE} ns
             JOIN {NEWS_CATEGORY_TABLE} nc ON ns.category_id = nc.id
             ORDER BY nc.name, ns.name
         """
         return self._fetchall(query_str)
 
-    def get_by_category(self, category_id: int) -> List[Tuple[int, str, str, int, str]]:
-        """Gets all sources for a specific category ID."""
+    def set_fetch_backend(self, url: str, backend: Optional[str]) -> bool:
+        """Remembers which fetch backend works for a source (None clears it)."""
+        query_str = f"UPDATE {NEWS_SOURCES_TABLE} SET fetch_backend = ? WHERE url = ?"
+        query = self._execute(query_str, (backend, url), commit=True)
+        if query:
+            updated = self._get_rows_affected(query) > 0
+            if updated:
+                logger.info(f"Set fetch backend of source {url} to '{backend}'.")
+            else:
+                logger.warning(f"Could not set fetch backend, source {url} not found.")
+            return updated
+        return False
+
+    def set_readiness_profile(self, url: str, profile: Dict[str, Any]) -> bool:
+        """Stores a source's page readiness profile; columns missing from ``profile`` are set to NULL."""
+        assignments = ", ".join(f"{column} = ?" for column in READINESS_PROFILE_COLUMNS)
+        values = [profile.get(column) for column in READINESS_PROFILE_COLUMNS]
+        if values[2] is not None:
+            values[2] = 1 if values[2] else 0  # js_enabled
+        query_str = f"UPDATE {NEWS_SOURCES_TABLE} SET {assignments} WHERE url = ?"
+        query = self._execute(query_str, (*values, url), commit=True)
+        if query:
+            updated = self._get_rows_affected(query) > 0
+            if updated:
+                logger.debug(f"Stored readiness profile of source {url}: {profile}")
+            else:
+                logger.warning(f"Could not store readiness profile, source {url} not found.")
+            return updated
+        return False
+
+    def set_feed(self, url: str, feed_url: Optional[str]) -> bool:
+        """Stores the feed found for a source (None if it has none) and marks it as checked now."""
+        query_str = f"UPDATE {NEWS_SOURCES_TABLE} SET feed_url = ?, feed_checked_at = ? WHERE url = ?"
+        query = self._execute(query_str, (feed_url, int(time.time()), url), commit=True)
+        if query:
+            updated = self._get_rows_affected(query) > 0
+            if updated:
+                logger.info(f"Set feed of source {url} to '{feed_url}'.")
+            else:
+                logger.warning(f"Could not set feed, source {url} not found.")
+            return updated
+        return False
+
+    def get_by_category(self, category_id: int) -> List[Tuple]:
+        """Gets all sources for a specific category ID, in the same row shape as get_all."""
         query_str = f"""
-            SELECT ns.id, ns.name, ns.url, ns.category_id, nc.name as category_name
+            SELECT {self._list_columns()}
             FROM {NEWS_SOURCES_TABLE} ns
             JOIN {NEWS_CATEGORY_TABLE} nc ON ns.category_id = nc.id
             WHERE ns.category_id = ?
@@ -11,4 +11,5 @@ NEWS_SOURCES_TABLE = "news_sources"
 NEWS_TABLE = "news"
 API_CONFIG_TABLE = "api_config"
 SYSTEM_CONFIG_TABLE = "system_config"
-QA_HISTORY_TABLE = "qa_history"
\ No newline at end of file
+QA_HISTORY_TABLE = "qa_history"
+DOMAIN_RATE_LIMITS_TABLE = "domain_rate_limits"
@@ -29,7 +29,16 @@ from src.db.repositories import (
     ApiKeyRepository,
     SystemConfigRepository,
     QARepository,
+    DomainRateLimitRepository,
 )
+from src.core.http_cache import HttpCache, HTTP_CACHE_DB_NAME
+from src.core.html_store import RawHtmlStore, HTML_STORE_DIR_NAME
+from src.core.rate_limiter import DomainRateLimiter
+from src.core.metrics import FetchMetrics, METRICS_DIR_NAME
+from src.core.circuit_breaker import DomainCircuitBreaker, CIRCUIT_STATE_FILE_NAME
+from src.core.retry_policy import RetryBudget, RetryPolicy
+from src.core.dns_cache import PersistentDnsCache, DNS_CACHE_FILE_NAME
+from src.core.cpu_executor import CpuExecutor
 from src.services.llm_client import LLMClient
 from src.services.setting_service import SettingService
 from src.services.news_service import NewsService
@@ -91,6 +100,7 @@ def initialize_services(config: AppConfig) -> Dict[str, Any]:
         api_key_repo = ApiKeyRepository()
         system_config_repo = SystemConfigRepository()
         qa_repo = QARepository()
+        rate_limit_repo = DomainRateLimitRepository()
 
         # Services
         setting_service = SettingService(config, api_key_repo, system_config_repo)
@@ -106,7 +116,36 @@ def initialize_services(config: AppConfig) -> Dict[str, Any]:
                 "Volcano Engine API key not configured. LLM-dependent features may fail."
             )
 
-        news_service = NewsService(news_repo, source_repo, category_repo)
+        http_cache = HttpCache(
+            os.path.join(config.data_dir, HTTP_CACHE_DB_NAME), namespace="aiohttp"
+        )
+        html_store = RawHtmlStore(os.path.join(config.data_dir, HTML_STORE_DIR_NAME))
+        rate_limiter = DomainRateLimiter()
+        rate_limiter.load_limits(rate_limit_repo.get_all())
+        fetch_metrics = FetchMetrics(os.path.join(config.data_dir, METRICS_DIR_NAME))
+        circuit_breaker = DomainCircuitBreaker(
+            state_path=os.path.join(config.data_dir, CIRCUIT_STATE_FILE_NAME)
+        )
+        circuit_breaker.load()
+        retry_policy = RetryPolicy(budget=RetryBudget(), metrics=fetch_metrics)
+        llm_retry_policy = RetryPolicy(budget=RetryBudget(), metrics=fetch_metrics)
+        dns_cache = PersistentDnsCache(os.path.join(config.data_dir, DNS_CACHE_FILE_NAME))
+        dns_cache.load()
+        cpu_executor = CpuExecutor(metrics=fetch_metrics)
+        news_service = NewsService(
+            news_repo,
+            source_repo,
+            category_repo,
+            http_cache,
+            html_store,
+            rate_limiter,
+            metrics=fetch_metrics,
+            circuit_breaker=circuit_breaker,
+            retry_policy=retry_policy,
+            llm_retry_policy=llm_retry_policy,
+            dns_cache=dns_cache,
+            cpu_executor=cpu_executor,
+        )
         qa_service = QAService(qa_repo)
 
         logger.info("Services initialized successfully.")
@@ -26,6 +26,14 @@ from typing import (
 
 from openai import APIError, AsyncOpenAI, OpenAI, ChatCompletion
 
+from src.core.retry_policy import (
+    RETRY_RETRYABLE,
+    RetryBudget,
+    RetryFailure,
+    RetryPolicy,
+    classify_error,
+)
+
 logger = logging.getLogger(__name__)
 
 class LLMClient:
@@ -36,7 +44,11 @@ class LLMClient:
     """
 
     def __init__(
-        self, base_url: str, api_key: Optional[str], async_mode: bool = False
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        async_mode: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> None:
         """
         Initializes the LLM Client.
@@ -45,6 +57,8 @@ class LLMClient:
             base_url: The base URL of the LLM API (e.g., "https://api.deepseek.com").
             api_key: The API key for authentication. Can be None if authentication is handled differently (e.g., Azure).
             async_mode: Whether to operate in asynchronous mode.
+            retry_policy: Which API errors are retried and how long to wait; by default
+                one with its own retry budget for this client.
         """
         if not api_key:
             # Allow for scenarios like Azure AD auth where key might be optional/handled by library
@@ -54,6 +68,7 @@ class LLMClient:
         self.base_url = base_url
         self.api_key = api_key
         self.async_mode = async_mode
+        self.retry_policy = retry_policy or RetryPolicy(budget=RetryBudget())
         self._client = None
 
     def __enter__(self):
@@ -118,7 +133,9 @@ class LLMClient:
             messages: The list of messages to send to the LLM.
             max_tokens: The maximum number of tokens to generate.
             temperature: Sampling temperature.
-            max_retries: The number of times to retry the API call on failure.
+            max_retries: The maximum number of attempts. Non-retryable errors (e.g. 400 / 401)
+                are not repeated, rate limits wait for Retry-After and every retry draws
+                on the retry policy's budget.
             **kwargs: Additional parameters for the API call.
 
         Returns:
@@ -135,7 +152,9 @@ class LLMClient:
         }
         logger.debug(f"LLM non-streaming request: {request_params}")
 
+        self.retry_policy.record_request(self.base_url)
         for attempt in range(max_retries):
+            failure: Optional[RetryFailure] = None
             try:
                 if self.async_mode:
                     if not isinstance(self._client, AsyncOpenAI):
@@ -170,36 +189,34 @@ class LLMClient:
                         0
                     ].finish_reason not in [None, "stop"]:
                         break  # Exit retry loop for specific non-retryable finish reasons
+                    failure = RetryFailure(RETRY_RETRYABLE, "empty response")
 
             except APIError as e:
                 logger.error(
                     f"LLM API Error (Attempt {attempt + 1}/{max_retries}) for model {model}: {e}",
                     exc_info=True,
                 )
-                # Implement backoff strategy
-                wait_time = 2**attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
-                (
-                    await asyncio.sleep(wait_time)
-                    if self.async_mode
-                    else time.sleep(wait_time)
-                )
+                failure = classify_error(e)
             except Exception as e:
                 logger.error(
                     f"Unexpected Error during LLM call (Attempt {attempt + 1}/{max_retries}) for model {model}: {e}",
                     exc_info=True,
                 )
-                wait_time = 2**attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
-                (
-                    await asyncio.sleep(wait_time)
-                    if self.async_mode
-                    else time.sleep(wait_time)
-                )
+                failure = classify_error(e)
+
+            # Backoff strategy: permanent errors, exhausted attempts or budget end the loop
+            decision = self.retry_policy.decide(self.base_url, failure, attempt, max_retries - 1)
+            if not decision.retry:
+                logger.info(f"Not retrying LLM call for model {model}: {decision.reason}")
+                break
+            logger.info(f"Retrying in {decision.delay:.2f} seconds...")
+            (
+                await asyncio.sleep(decision.delay)
+                if self.async_mode
+                else time.sleep(decision.delay)
+            )
 
-        logger.error(
-            f"Failed to get LLM completion for model {model} after {max_retries} attempts."
-        )
+        logger.error(f"Failed to get LLM completion for model {model}.")
         return None
 
     async def stream_completion_content(
@@ -10,11 +10,25 @@ import json
 import logging
 import asyncio
 import re
+from collections import Counter
 from typing import AsyncGenerator, List, Dict, Optional, Tuple, Callable, Any
 from urllib.parse import urljoin
 
 # Crawler for asynchronous HTTP requests
+from src.core.circuit_breaker import DomainCircuitBreaker, is_circuit_open_error
+from src.core.concurrency import AdaptiveConcurrencyController
+from src.core.cpu_executor import CpuExecutor
+from src.core.dns_cache import PersistentDnsCache
+from src.core.feed_discovery import CONTENT_FORMAT_FEED, parse_feed, recent_entry_urls
 from src.core.crawler import AiohttpCrawler
+from src.core.frontier import UrlFrontier
+from src.core.http_cache import HttpCache
+from src.core.link_extraction import CONTENT_FORMAT_LINKS, decode_links, extract_html_links
+from src.core.retry_policy import RetryBudget, RetryPolicy
+from src.core.html_store import RawHtmlStore
+from src.core.metrics import PHASE_LINKS, PHASE_METADATA, FetchMetrics
+from src.core.rate_limiter import DomainRateLimiter
+from src.core.session_manager import CrawlerSessionManager, DEFAULT_PRECONNECT_DOMAINS
 
 # Repository interfaces for database operations
 from src.db.repositories import (
@@ -22,6 +36,7 @@ from src.db.repositories import (
     NewsSourceRepository,
     NewsCategoryRepository,
 )
+from src.db.repositories.news_source_repository import readiness_profile_from_values
 
 # Client to interact with the LLM API
 from src.services.llm_client import LLMClient
@@ -29,12 +44,13 @@ from src.services.llm_client import LLMClient
 # Utilities for processing content and LLM output
 from src.utils.markdown_utils import (
     clean_markdown_links,
+    format_links_as_markdown,
     strip_markdown_divider,
     strip_markdown_links,
 )
 from src.utils.parse import parse_json_from_text
 from src.utils.token_utils import get_token_size
-from src.utils.html_utils import clean_and_format_html, extract_metadata_from_article_html
+from src.utils.html_utils import extract_metadata_from_article_html
 from src.utils.text_utils import get_chunks
 from src.utils.prompt import (
     SYSTEM_PROMPT_EXTRACT_ARTICLE_LINKS,
@@ -49,6 +65,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_EXTRACTION_MODEL = "deepseek-v3-250324"
 MAX_OUTPUT_TOKENS = 16384  # Max tokens for LLM output
 MAX_INPUT_TOKENS = 131072 - 2 * MAX_OUTPUT_TOKENS  # Max tokens for LLM input prompt
+SUB_CRAWL_CONCURRENCY = 5  # Starting concurrency of sub-article crawls
 
 class NewsService:
     """
@@ -67,15 +84,179 @@ class NewsService:
         news_repo: NewsRepository,
         source_repo: NewsSourceRepository,
         category_repo: NewsCategoryRepository,
+        http_cache: Optional[HttpCache] = None,
+        html_store: Optional[RawHtmlStore] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        frontier: Optional[UrlFrontier] = None,
+        metrics: Optional[FetchMetrics] = None,
+        circuit_breaker: Optional[DomainCircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        llm_retry_policy: Optional[RetryPolicy] = None,
+        dns_cache: Optional[PersistentDnsCache] = None,
+        cpu_executor: Optional[CpuExecutor] = None,
     ):
         # Initialize database repository interfaces
         self._news_repo = news_repo
         self._source_repo = source_repo
         self._category_repo = category_repo
+        # Optional conditional-GET cache shared by all sub-article crawls
+        self._http_cache = http_cache
+        # Content-addressed store of fetched raw HTML (source pages and sub-articles)
+        self._html_store = html_store
+        # Per-domain rate limiter shared by every crawler of the fetch pipeline
+        self._rate_limiter = rate_limiter or DomainRateLimiter()
+        # Canonical seen-set of article URLs (stored in the DB or claimed in this run)
+        # (by default it consults the in-memory index of stored urls instead of being seeded)
+        self._frontier = (
+            frontier if frontier is not None else UrlFrontier(stored=news_repo.get_url_index())
+        )
+        self._frontier_seeded = False
+        # Optional per-domain fetch phase timings, dumped at the end of each fetch run
+        self._metrics = metrics
+        # Per-domain circuit breaker shared by every crawler of the fetch pipeline
+        self._circuit_breaker = circuit_breaker or DomainCircuitBreaker()
+        # Retry policy shared by every crawler of the fetch pipeline; its budget is per run
+        self._retry_policy = retry_policy or RetryPolicy()
+        # Retry policy of the LLM calls made while processing pages; its budget is per run
+        self._llm_retry_policy = llm_retry_policy or RetryPolicy(budget=RetryBudget())
+        # Optional DNS cache persisted across runs, shared by every crawler session
+        self._dns_cache = dns_cache
+        # Optional process pool for link and metadata extraction (inline when None)
+        self._cpu_executor = cpu_executor
+        # Article origins by number of stored articles, counted when a fetch run starts
+        self._article_origin_counts: Counter = Counter()
+
+    @property
+    def html_store(self) -> Optional[RawHtmlStore]:
+        """The raw HTML store shared with the crawl workers."""
+        return self._html_store
+
+    @property
+    def rate_limiter(self) -> DomainRateLimiter:
+        """The per-domain rate limiter shared with the crawl workers."""
+        return self._rate_limiter
+
+    @property
+    def frontier(self) -> UrlFrontier:
+        """The crawl frontier used to skip already known article URLs."""
+        return self._frontier
+
+    @property
+    def metrics(self) -> Optional[FetchMetrics]:
+        """The fetch timing metrics shared with the crawl workers, if enabled."""
+        return self._metrics
+
+    @property
+    def circuit_breaker(self) -> DomainCircuitBreaker:
+        """The per-domain circuit breaker shared with the crawl workers."""
+        return self._circuit_breaker
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """The retry policy (with the run's retry budget) shared with the crawl workers."""
+        return self._retry_policy
+
+    @property
+    def llm_retry_policy(self) -> RetryPolicy:
+        """The retry policy (with the run's LLM retry budget) shared by the processing workers."""
+        return self._llm_retry_policy
+
+    @property
+    def dns_cache(self) -> Optional[PersistentDnsCache]:
+        """The persistent DNS cache shared with the crawl workers, if enabled."""
+        return self._dns_cache
+
+    @property
+    def cpu_executor(self) -> Optional[CpuExecutor]:
+        """The process pool for link and metadata extraction, if enabled."""
+        return self._cpu_executor
+
+    def get_article_warm_up_urls(self, limit: int = DEFAULT_PRECONNECT_DOMAINS) -> List[str]:
+        """Origins (``scheme://host/``) of the stored articles, most frequent first, for connection warm-up."""
+        return [f"{origin}/" for origin, _ in self._article_origin_counts.most_common(limit)]
+
+    def begin_fetch_run(self) -> int:
+        """
+        Reset the crawl frontier, make sure it knows the article URLs already in the
+        database (through the URL index, or by seeding it), and start a new metrics
+        period and retry budget. Call from the main thread when a fetch run starts.
+        Returns the number of stored URLs known to the frontier.
+        """
+        if self._metrics:
+            self._metrics.reset()
+        self._retry_policy.reset()
+        self._llm_retry_policy.reset()
+        self._frontier.reset()
+        # Loaded once, then only reloaded if the table changed behind the repository
+        url_index = self._news_repo.sync_url_index()
+        if self._frontier.stored is not None:
+            seeded = len(url_index)
+        else:
+            seeded = self._frontier.seed(self._news_repo.get_all_urls())
+        self._frontier_seeded = True
+        if self._cpu_executor:
+            self._cpu_executor.start()
+        self._article_origin_counts = url_index.get_origin_counts()
+        logger.info(f"Crawl frontier knows {seeded} stored article URLs.")
+        return seeded
+
+    def dump_fetch_metrics(self) -> Optional[str]:
+        """Write the fetch timing histograms of the finished run as JSON. Returns the file path."""
+        logger.info(f"Retry budget of this run: {self._retry_policy.get_stats()['budget']}")
+        logger.info(
+            f"LLM retry budget of this run: {self._llm_retry_policy.get_stats()['budget']}"
+        )
+        if not self._metrics:
+            return None
+        summary = self._metrics.get_summary()
+        if summary:
+            logger.info(f"Fetch phase timings (all domains): {summary}")
+        counters = self._metrics.get_counters()
+        if counters:
+            logger.info(f"Fetch retry counters (all domains): {counters}")
+        return self._metrics.dump_json()
+
+    def _ensure_frontier_seeded(self) -> None:
+        if not self._frontier_seeded:
+            self.begin_fetch_run()
+
+    def get_raw_html(self, content_key: str) -> Optional[str]:
+        """Load previously fetched raw HTML by its content key."""
+        if not self._html_store or not content_key:
+            return None
+        return self._html_store.get(content_key)
 
     # -------------------------------------------------------------------------
     # Main Orchestration Method (Called by Worker/Controller)
     # -------------------------------------------------------------------------
+    async def process_stored_html(
+        self,
+        url: str,
+        content_key: str,
+        source_info: Dict[str, Any],
+        on_status_update: Optional[Callable[[str, str, str], None]],
+        llm_client: LLMClient,
+        session_manager: Optional[CrawlerSessionManager] = None,
+        concurrency: Optional[AdaptiveConcurrencyController] = None,
+    ) -> Tuple[int, str, Optional[Exception]]:
+        """
+        Run the processing pipeline on HTML previously saved in the raw HTML store.
+        Used by the processor worker, and allows re-processing a page without refetching it.
+        If ``source_info["content_format"]`` is ``links``, the stored content is a link
+        list extracted in the browser rather than HTML.
+        """
+        html_content = self.get_raw_html(content_key)
+        if html_content is None:
+            error = Exception(f"Raw HTML {content_key[:12]} not found in store")
+            logger.error(f"Cannot process {url}: {error}")
+            if on_status_update:
+                on_status_update(url, "Store Error", str(error))
+            return 0, "", error
+        return await self._process_html_and_analyze(
+            url, html_content, source_info, on_status_update, llm_client,
+            session_manager, concurrency,
+        )
+
     async def _process_html_and_analyze(
         self,
         url: str,
@@ -83,6 +264,8 @@ class NewsService:
         source_info: Dict[str, Any],
         on_status_update: Optional[Callable[[str, str, str], None]],
         llm_client: LLMClient,
+        session_manager: Optional[CrawlerSessionManager] = None,
+        concurrency: Optional[AdaptiveConcurrencyController] = None,
     ) -> Tuple[int, str, Optional[Exception]]:
         """
         Asynchronous entry point to process HTML content and analyze news articles.
@@ -93,6 +276,8 @@ class NewsService:
             b. Analyze sub-articles via LLM.
             c. Parse analysis results.
         4. Save all parsed items to the database.
+        For a feed (``source_info["content_format"]`` is ``feed``) steps 1-3a are
+        replaced by crawling the feed's recent entries.
 
         Args:
             url: Source page URL.
@@ -100,6 +285,8 @@ class NewsService:
             source_info: Metadata about the source (id, name, category, etc.).
             on_status_update: Optional callback for progress reporting.
             llm_client: Instance of LLMClient for API interaction.
+            session_manager: Optional shared aiohttp session used for sub-article crawls.
+            concurrency: Optional adaptive concurrency controller kept across sub-article crawls.
 
         Returns:
             saved_item_count (int): Number of saved news items.
@@ -114,14 +301,40 @@ class NewsService:
                 except Exception as e:
                     logger.error(f"Status update callback error for {url}: {e}")
 
-        saved_item_count = 0
         analysis_result: List[Dict[str, Any]] = []
         processing_error: Optional[Exception] = None
         all_parsed_results_for_url: List[Dict[str, Any]] = []
 
         try:
-            # Step 1: Clean HTML and produce Markdown
-            markdown = self._clean_and_prepare_markdown(url, html_content, _status_update)
+            # Feeds list the article URLs directly: no Markdown and no LLM link extraction
+            if source_info.get("content_format") == CONTENT_FORMAT_FEED:
+                feed_links = self._prepare_feed_links(url, html_content, _status_update)
+                if not feed_links:
+                    return 0, "", None
+                sub_structure_data_map, processing_error = await self._crawl_article_links(
+                    url, feed_links, "Feed", _status_update, session_manager, concurrency,
+                )
+                if sub_structure_data_map:
+                    analysis_result, analyze_error = await self._analyze_content(
+                        url, sub_structure_data_map, "Feed", _status_update, llm_client
+                    )
+                    processing_error = processing_error or analyze_error
+                if analysis_result:
+                    parsed_items, parse_error = self._parse_analysis_results(
+                        url, analysis_result, sub_structure_data_map,
+                        source_info, "Feed", _status_update
+                    )
+                    processing_error = processing_error or parse_error
+                    all_parsed_results_for_url.extend(parsed_items or [])
+                return self._finish_processing(
+                    url, all_parsed_results_for_url, processing_error, _status_update
+                )
+
+            # Step 1: Clean HTML and produce Markdown (link lists from the browser skip the HTML step)
+            if source_info.get("content_format") == CONTENT_FORMAT_LINKS:
+                markdown = self._prepare_link_list_markdown(url, html_content, _status_update)
+            else:
+                markdown = await self._clean_and_prepare_markdown(url, html_content, _status_update)
             if not markdown:
                 # Skip processing if no valid Markdown generated
                 return 0, "", None
@@ -154,7 +367,8 @@ class NewsService:
 
                 # 3a: Link extraction and crawling
                 sub_structure_data_map, chunk_error = await self._extract_and_crawl_links(
-                    url, chunk_content, status_prefix, _status_update, llm_client
+                    url, chunk_content, status_prefix, _status_update, llm_client,
+                    session_manager, concurrency,
                 )
                 if chunk_error:
                     processing_error = chunk_error
@@ -188,30 +402,10 @@ class NewsService:
                     all_parsed_results_for_url.extend(parsed_items)
 
             # Step 4: Persist accumulated results to the database
-            saved_item_count, db_error = self._save_results_to_db(
-                url, all_parsed_results_for_url, _status_update
-            )
-            if db_error:
-                processing_error = processing_error or db_error
-
-            # Finalize status with summary of added vs skipped items
-            final_status = "Complete" if not processing_error else "Complete*"
-            _status_update(
-                final_status,
-                f"Added: {saved_item_count}, Skipped: {len(all_parsed_results_for_url) - saved_item_count}"
+            return self._finish_processing(
+                url, all_parsed_results_for_url, processing_error, _status_update
             )
 
-            # Format summary of parsed items as Markdown for logging/display
-            analysis_result_markdown = "\n".join([
-                f"### {item.get('title', '')}\n"
-                f"🔗 {item.get('url', '')}\n"
-                f"📅 {item.get('date', '')}\n"
-                f"📝 {item.get('summary', '')}\n"
-                for item in all_parsed_results_for_url
-            ])
-
-            return saved_item_count, analysis_result_markdown, processing_error
-
         except Exception as critical_err:
             # Catch any unexpected error and report as fatal
             logger.error(f"Fatal processing error for {url}: {critical_err}", exc_info=True)
@@ -221,36 +415,71 @@ class NewsService:
     # -------------------------------------------------------------------------
     # Private Helper Methods for Processing Steps
     # -------------------------------------------------------------------------
-    def _clean_and_prepare_markdown(
+    def _finish_processing(
+        self,
+        url: str,
+        all_parsed_results_for_url: List[Dict[str, Any]],
+        processing_error: Optional[Exception],
+        _status_update: Callable[[str, str], None],
+    ) -> Tuple[int, str, Optional[Exception]]:
+        """Save the parsed items of a source page and report the final status."""
+        saved_item_count, db_error = self._save_results_to_db(
+            url, all_parsed_results_for_url, _status_update
+        )
+        if db_error:
+            processing_error = processing_error or db_error
+
+        # Finalize status with summary of added vs skipped items
+        final_status = "Complete" if not processing_error else "Complete*"
+        _status_update(
+            final_status,
+            f"Added: {saved_item_count}, Skipped: {len(all_parsed_results_for_url) - saved_item_count}"
+        )
+
+        # Format summary of parsed items as Markdown for logging/display
+        analysis_result_markdown = "\n".join([
+            f"### {item.get('title', '')}\n"
+            f"🔗 {item.get('url', '')}\n"
+            f"📅 {item.get('date', '')}\n"
+            f"📝 {item.get('summary', '')}\n"
+            for item in all_parsed_results_for_url
+        ])
+
+        return saved_item_count, analysis_result_markdown, processing_error
+
+    async def _run_cpu(self, url: str, phase: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a CPU-bound call in the process pool, or inline when there is none."""
+        if self._cpu_executor:
+            return await self._cpu_executor.run(url, phase, fn, *args)
+        return fn(*args)
+
+    async def _clean_and_prepare_markdown(
         self, url: str, html_content: str, _status_update: Callable[[str, str], None]
     ) -> Optional[str]:
         """
-        Clean raw HTML and convert it into Markdown format.
-        - Removes unwanted tags/styles.
-        - Normalizes links.
+        Turn raw HTML into the filtered Markdown link list used for link extraction.
+        - Collects the anchors outside unwanted elements straight from the DOM
+          (the rest of the page is never converted to Markdown).
+        - Normalizes and filters links.
         """
-        _status_update("HTML Proc", "Cleaning and formatting HTML")
+        _status_update("HTML Proc", "Extracting links from HTML")
         if not html_content or not html_content.strip():
             _status_update("Skipped", "Empty HTML content")
             return None
 
         try:
-            # Convert HTML to markdown
-            markdown = clean_and_format_html(
-                html_content=html_content,
-                base_url=url,
-                output_format="markdown",
-            )
-            if not markdown or not markdown.strip():
-                _status_update("Skipped", "No Markdown after cleaning")
+            links = await self._run_cpu(url, PHASE_LINKS, extract_html_links, html_content, url)
+            if not links:
+                _status_update("Skipped", "No links after cleaning")
                 return None
 
-            # exist url in the db
-            exist_url = self._news_repo.get_all_urls()
+            # Known article urls (in the db or already claimed in this run)
+            self._ensure_frontier_seeded()
 
-            # Remove or adjust any residual markdown links
-            cleaned_markdown = clean_markdown_links(markdown, exclude_urls=exist_url, base_url=url)
-            _status_update("HTML Done", "Cleaned HTML to Markdown")
+            cleaned_markdown = clean_markdown_links(
+                format_links_as_markdown(links), exclude_urls=self._frontier, base_url=url
+            )
+            _status_update("HTML Done", f"{len(links)} links extracted from HTML")
             return cleaned_markdown
 
         except Exception as e:
@@ -258,6 +487,41 @@ class NewsService:
             _status_update("HTML Error", str(e))
             return None  # Continue processing with next steps as skippable error
 
+    def _prepare_link_list_markdown(
+        self, url: str, links_content: str, _status_update: Callable[[str, str], None]
+    ) -> Optional[str]:
+        """
+        Turn a link list extracted in the browser into the same filtered Markdown
+        links ``_clean_and_prepare_markdown`` produces, without parsing any HTML.
+        """
+        _status_update("Links Proc", "Filtering extracted links")
+        links = decode_links(links_content)
+        if not links:
+            _status_update("Skipped", "No links extracted")
+            return None
+
+        # Known article urls (in the db or already claimed in this run)
+        self._ensure_frontier_seeded()
+
+        cleaned_markdown = clean_markdown_links(
+            format_links_as_markdown(links), exclude_urls=self._frontier, base_url=url
+        )
+        _status_update("Links Done", f"{len(links)} links extracted in browser")
+        return cleaned_markdown
+
+    def _prepare_feed_links(
+        self, url: str, feed_content: str, _status_update: Callable[[str, str], None]
+    ) -> Optional[List[str]]:
+        """Article URLs of a source's feed or news sitemap: recent entries, newest first."""
+        _status_update("Feed Proc", "Reading feed entries")
+        entries = parse_feed(feed_content, url)
+        links = recent_entry_urls(entries)
+        if not links:
+            _status_update("Skipped", f"No recent feed entries ({len(entries)} in feed)")
+            return None
+        _status_update("Feed Done", f"{len(links)} recent of {len(entries)} feed entries")
+        return links
+
     async def _extract_and_crawl_links(
         self,
         base_url: str,
@@ -265,9 +529,13 @@ class NewsService:
         status_prefix: str,
         _status_update: Callable[[str, str], None],
         llm_client: LLMClient,
+        session_manager: Optional[CrawlerSessionManager] = None,
+        concurrency: Optional[AdaptiveConcurrencyController] = None,
     ) -> Tuple[Dict[str, str], Optional[Exception]]:
         """
         Extracts article links from Markdown using LLM and fetches sub-article content.
+        Sub-articles are fetched over the shared session when one is given, and with the
+        given concurrency controller so the limits it learned carry over between pages.
         Returns a mapping from sub-URL to its extracted metadata.
         """
         sub_structure_data_map: Dict[str, str] = {}
@@ -293,49 +561,119 @@ class NewsService:
             return sub_structure_data_map, None
 
         # Normalize and filter out self-links
-        extracted_links = [
+        candidate_links = [
             urljoin(base_url, link.strip())
             for link in links_str.splitlines()
             if link.strip() and link.strip() != base_url
         ]
-        if not extracted_links:
+        if not candidate_links:
             logger.warning(f"LLM link output produced no valid URLs for {base_url} ({status_prefix})")
             _status_update(f"{status_prefix} No Links", "Parsing failed")
             return sub_structure_data_map, None
 
+        return await self._crawl_article_links(
+            base_url, candidate_links, status_prefix, _status_update,
+            session_manager, concurrency,
+        )
+
+    async def _crawl_article_links(
+        self,
+        base_url: str,
+        candidate_links: List[str],
+        status_prefix: str,
+        _status_update: Callable[[str, str], None],
+        session_manager: Optional[CrawlerSessionManager] = None,
+        concurrency: Optional[AdaptiveConcurrencyController] = None,
+    ) -> Tuple[Dict[str, str], Optional[Exception]]:
+        """
+        Fetches the article links of a source page that are not known yet and
+        extracts their metadata. Returns a mapping from sub-URL to its extracted metadata.
+        """
+        sub_structure_data_map: Dict[str, str] = {}
+        error: Optional[Exception] = None
+
+        # Drop links already stored or claimed in this run, including their
+        # http/https, trailing-slash, tracking-parameter and index.html variants
+        self._ensure_frontier_seeded()
+        extracted_links = self._frontier.filter_new(candidate_links)
+        duplicate_count = len(candidate_links) - len(extracted_links)
+        if duplicate_count:
+            logger.info(
+                f"Skipped {duplicate_count} already known links for {base_url} ({status_prefix})"
+            )
+        if not extracted_links:
+            _status_update(f"{status_prefix} No New Links", f"{duplicate_count} already known")
+            return sub_structure_data_map, None
+
         # 2) Crawl each extracted link concurrently
         _status_update(f"{status_prefix} Crawling", f"{len(extracted_links)} URLs")
         logger.info(f"Crawling {len(extracted_links)} links for {base_url} ({status_prefix})")
-        sub_crawler = AiohttpCrawler(max_concurrent_requests=5, request_timeout=15)
+        sub_crawler = AiohttpCrawler(
+            max_concurrent_requests=SUB_CRAWL_CONCURRENCY,
+            request_timeout=15,
+            http_cache=self._http_cache,
+            html_store=self._html_store,
+            rate_limiter=self._rate_limiter,
+            session_manager=session_manager,
+            metrics=self._metrics,
+            concurrency=concurrency,
+            circuit_breaker=self._circuit_breaker,
+            retry_policy=self._retry_policy,
+        )
+        open_circuit_errors = set()
+        # Metadata extraction runs while the remaining sub-articles download
+        extraction_tasks: Dict[str, asyncio.Task] = {}
         try:
-            async for crawl_result in sub_crawler.process_urls(extracted_links):
-                # Skip any failed requests
-                if crawl_result.get("error"):
-                    logger.warning(f"Sub-crawl failed for {crawl_result.get('original_url')}: {crawl_result['error']}")
-                    continue
-                if not crawl_result.get("content"):
-                    logger.warning(f"Sub-crawl returned empty content for {crawl_result.get('original_url')}")
-                    continue
-
-                sub_url = crawl_result.get("final_url", crawl_result.get("original_url"))
-                if not sub_url:
-                    continue
-
-                # Extract structured data (title, date, content) from HTML
-                structure_data = extract_metadata_from_article_html(
-                    html_content=crawl_result["content"],
-                    base_url=sub_url,
-                )
-                if not structure_data:
-                    continue
-
-                sub_structure_data_map[sub_url] = structure_data
+            try:
+                async for crawl_result in sub_crawler.process_urls(extracted_links):
+                    if is_circuit_open_error(crawl_result.get("error")):
+                        open_circuit_errors.add(crawl_result["error"])
+                        continue
+                    # Skip any failed requests
+                    if crawl_result.get("error"):
+                        logger.warning(f"Sub-crawl failed for {crawl_result.get('original_url')}: {crawl_result['error']}")
+                        continue
+                    if not crawl_result.get("content"):
+                        logger.warning(f"Sub-crawl returned empty content for {crawl_result.get('original_url')}")
+                        continue
+
+                    sub_url = crawl_result.get("final_url", crawl_result.get("original_url"))
+                    if not sub_url or sub_url in extraction_tasks:
+                        continue
+
+                    # Extract structured data (title, date, content) from HTML
+                    extraction_tasks[sub_url] = asyncio.create_task(
+                        self._run_cpu(
+                            sub_url, PHASE_METADATA,
+                            extract_metadata_from_article_html, crawl_result["content"], sub_url,
+                        )
+                    )
 
-        except Exception as sub_err:
-            # Record crawl errors and propagate
-            logger.error(f"Sub-crawl error for {base_url} ({status_prefix}): {sub_err}", exc_info=True)
-            _status_update(f"{status_prefix} CrawlErr", str(sub_err))
-            error = sub_err
+            except Exception as sub_err:
+                # Record crawl errors and propagate
+                logger.error(f"Sub-crawl error for {base_url} ({status_prefix}): {sub_err}", exc_info=True)
+                _status_update(f"{status_prefix} CrawlErr", str(sub_err))
+                error = sub_err
+
+            if extraction_tasks:
+                _status_update(f"{status_prefix} Extracting", f"{len(extraction_tasks)} articles")
+                results = await asyncio.gather(*extraction_tasks.values(), return_exceptions=True)
+                for sub_url, structure_data in zip(extraction_tasks, results):
+                    if isinstance(structure_data, Exception):
+                        logger.warning(f"Metadata extraction failed for {sub_url}: {structure_data}")
+                    elif structure_data:
+                        sub_structure_data_map[sub_url] = structure_data
+        finally:
+            # Cancelled (or failed) before the extractions were awaited: don't leave them running
+            unfinished = [task for task in extraction_tasks.values() if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+        if open_circuit_errors:
+            # Report domains skipped because their circuit is open
+            _status_update(f"{status_prefix} Circuit Open", "; ".join(sorted(open_circuit_errors)))
 
         if not sub_structure_data_map:
             _status_update(f"{status_prefix} No Sub-Content", "")
@@ -600,33 +938,31 @@ Markdown:
         return self._category_repo.delete(category_id)
 
     # --- Source Methods ---
+    @staticmethod
+    def _source_from_row(r: Tuple) -> Dict[str, Any]:
+        """Source dict of a get_all / get_by_category row (see SOURCE_LIST_COLUMNS)."""
+        # QtSql may return NULL columns as empty strings
+        return {
+            "id": r[0],
+            "name": r[1],
+            "url": r[2],
+            "category_id": r[3],
+            "category_name": r[4],
+            "fetch_backend": r[5] or None,
+            "feed_url": r[6] or None,
+            "feed_checked_at": int(r[7]) if r[7] not in (None, "") else None,
+            "readiness_profile": readiness_profile_from_values(r[8:]),
+        }
+
     def get_all_sources(self) -> List[Dict[str, Any]]:
         """Retrieve all news sources along with their category metadata."""
         rows = self._source_repo.get_all()
-        return [
-            {
-                "id": r[0],
-                "name": r[1],
-                "url": r[2],
-                "category_id": r[3],
-                "category_name": r[4],
-            }
-            for r in rows
-        ]
+        return [self._source_from_row(r) for r in rows]
 
     def get_sources_by_category_id(self, category_id: int) -> List[Dict[str, Any]]:
         """Retrieve news sources filtered by specific category ID."""
         rows = self._source_repo.get_by_category(category_id)
-        return [
-            {
-                "id": r[0],
-                "name": r[1],
-                "url": r[2],
-                "category_id": r[3],
-                "category_name": r[4],
-            }
-            for r in rows
-        ]
+        return [self._source_from_row(r) for r in rows]
 
     def add_source(self, name: str, url: str, category_name: str) -> Optional[int]:
         """Add a new source; create category if it does not exist."""
@@ -652,6 +988,18 @@ Markdown:
             category_id = category[0]
         return self._source_repo.update(source_id, name, url, category_id)
 
+    def set_source_fetch_backend(self, url: str, backend: str) -> bool:
+        """Remember which fetch backend (aiohttp / playwright) works for a source."""
+        return self._source_repo.set_fetch_backend(url, backend)
+
+    def set_source_readiness_profile(self, url: str, profile: Dict[str, Any]) -> bool:
+        """Store a source's page readiness profile (wait strategy, scrolls, JS, learned settle time)."""
+        return self._source_repo.set_readiness_profile(url, profile)
+
+    def set_source_feed(self, url: str, feed_url: Optional[str]) -> bool:
+        """Store the RSS/Atom feed or news sitemap discovered for a source (None: it has none)."""
+        return self._source_repo.set_feed(url, feed_url)
+
     def delete_source(self, source_id: int) -> bool:
         """Delete a news source by its ID."""
         return self._source_repo.delete(source_id)
@@ -22,6 +22,8 @@ from PySide6.QtCore import QObject, Signal, Slot, QThreadPool, QModelIndex, Qt
 from PySide6.QtSql import QSqlTableModel
 from PySide6.QtCore import QSortFilterProxyModel
 
+from src.config import CONFIG_KEY_CRAWL_PROCESSES, get_config
+from src.core.sharded_fetcher import resolve_shard_count
 from src.services.news_service import NewsService
 from src.services.setting_service import SettingService
 from src.db.connection import get_db  # Needed for QSqlTableModel
@@ -30,6 +32,7 @@ from src.ui.workers.news_fetch_workers import (
     WorkerSignals,
     CrawlerWorker,  # Changed from InitialCrawlerWorker
     ProcessorWorker,  # Changed from ProcessingWorker
+    ShardedCrawlerWorker,
 )
 
 import asyncio
@@ -130,6 +133,7 @@ class NewsController(QObject):
     )  # Final status message (e.g., "Finished", "Cancelled")
     error_occurred = Signal(str, str)  # title, message
     analysis_chunk_received = Signal(int, str)  # news_id, chunk_text
+    open_circuits_changed = Signal(dict)  # domain -> circuit info, see get_open_circuits()
 
     def __init__(self, news_service: NewsService, setting_service: SettingService, parent=None):
         super().__init__(parent)
@@ -154,12 +158,20 @@ class NewsController(QObject):
         # --- Connect worker signals ---
         self._connect_worker_signals()
 
+        # Circuit state changes happen in worker threads; the signal is queued to the UI
+        self._news_service.circuit_breaker.add_listener(
+            lambda domain, state: self.open_circuits_changed.emit(self.get_open_circuits())
+        )
+
     def _connect_worker_signals(self):
         """Connect worker signals to handler methods."""
         # Crawl phase signals
         self._worker_signals.initial_crawl_status.connect(self._handle_initial_crawl_status)
         self._worker_signals.html_ready.connect(self._handle_html_ready)
         self._worker_signals.initial_crawl_finished.connect(self._handle_initial_crawl_phase_finished)
+        self._worker_signals.fetch_backend_detected.connect(self._handle_fetch_backend_detected)
+        self._worker_signals.readiness_profile_learned.connect(self._handle_readiness_profile_learned)
+        self._worker_signals.feed_discovered.connect(self._handle_feed_discovered)
         
         # Processing phase signals
         self._worker_signals.processing_status.connect(self._handle_processing_status)
@@ -439,11 +451,33 @@ class NewsController(QObject):
                 self._reset_fetch_state("Worker start failed")
                 return
 
-        # Start the CrawlerWorker
+        # Seed the crawl frontier with stored article urls (DB access stays on this thread)
         try:
-            self._active_initial_crawler = CrawlerWorker(
-                sources_to_fetch, self._worker_signals
+            self._news_service.begin_fetch_run()
+        except Exception as e:
+            logger.error(f"Failed to seed crawl frontier: {e}", exc_info=True)
+        # Warm up DNS and connections for the usual article domains meanwhile
+        self._processing_worker.warm_up(self._news_service.get_article_warm_up_urls())
+
+        # Start the CrawlerWorker (sharded across processes if configured)
+        try:
+            worker_args = (
+                sources_to_fetch,
+                self._worker_signals,
+                self._news_service.html_store,
+                self._news_service.rate_limiter,
+                self._news_service.metrics,
+                self._news_service.circuit_breaker,
+                self._news_service.retry_policy,
+                self._news_service.dns_cache,
             )
+            shard_count = resolve_shard_count(get_config().get(CONFIG_KEY_CRAWL_PROCESSES, 1))
+            if shard_count > 1:
+                self._active_initial_crawler = ShardedCrawlerWorker(
+                    *worker_args, shard_count=shard_count
+                )
+            else:
+                self._active_initial_crawler = CrawlerWorker(*worker_args)
             self._active_initial_crawler.start()  # Using QThread's start method
             logger.info("CrawlerWorker started.")
         except Exception as e:
@@ -570,6 +604,10 @@ class NewsController(QObject):
             sources = self._news_service.get_sources_by_category_id(category_id)
         return sorted(list(set(s["name"] for s in sources if s.get("name"))))
 
+    def get_open_circuits(self) -> Dict[str, Dict[str, Any]]:
+        """Domains currently skipped because their circuit breaker is open."""
+        return self._news_service.circuit_breaker.get_open_circuits()
+
     def get_analysis_result(self, url: str) -> Optional[str]:
         """Retrieves cached analysis result for a URL."""
         return self._analysis_results_cache.get(url)
@@ -596,6 +634,10 @@ class NewsController(QObject):
         # Clear references
         self._active_initial_crawler = None
         self._processing_worker = None
+
+        # Stop the CPU worker processes once nothing can submit to them anymore
+        if self._news_service.cpu_executor:
+            self._news_service.cpu_executor.shutdown()
         
         logger.info("NewsController cleanup finished.")
 
@@ -609,8 +651,26 @@ class NewsController(QObject):
             
         self.fetch_status_update.emit(url, status, False)  # is_final=False
 
+    @Slot(str, str)
+    def _handle_fetch_backend_detected(self, url: str, backend: str):
+        """Persist the fetch backend that worked for a source (runs in the main thread)."""
+        if not self._news_service.set_source_fetch_backend(url, backend):
+            logger.debug(f"Fetch backend for {url} not saved (not a stored source?).")
+
+    @Slot(str, dict)
+    def _handle_readiness_profile_learned(self, url: str, profile: dict):
+        """Persist a source's updated page readiness profile (runs in the main thread)."""
+        if not self._news_service.set_source_readiness_profile(url, profile):
+            logger.debug(f"Readiness profile for {url} not saved (not a stored source?).")
+
+    @Slot(str, str)
+    def _handle_feed_discovered(self, url: str, feed_url: str):
+        """Persist the feed discovered for a source, or that it has none (runs in the main thread)."""
+        if not self._news_service.set_source_feed(url, feed_url or None):
+            logger.debug(f"Feed of {url} not saved (not a stored source?).")
+
     @Slot(str, str, dict)
-    def _handle_html_ready(self, url: str, html_content: str, source_info: dict):
+    def _handle_html_ready(self, url: str, content_key: str, source_info: dict):
         if url in self._task_tracker.cancelled_urls:
             logger.info(f"Ignoring html_ready for cancelled URL: {url}")
             # Ensure final status is emitted for this cancelled URL
@@ -624,7 +684,7 @@ class NewsController(QObject):
             return  # Ignore if fetch cancelled or stopped
         
         if self._processing_worker and self._processing_worker.isRunning():
-            future = self._processing_worker.submit_task(url, html_content, source_info)
+            future = self._processing_worker.submit_task(url, content_key, source_info)
             if future is None:
                 logger.error(f"Failed to submit processing task for {url}.")
                 self.fetch_status_update.emit(
@@ -713,6 +773,7 @@ class NewsController(QObject):
                 f"All fetch/processing tasks complete or removed. Status: {final_message}"
             )
             self.fetch_process_finished.emit(final_message)  # Notify view
+            self._news_service.dump_fetch_metrics()
             self._reset_fetch_state(final_message)
             self.refresh_news()  # Refresh the news list
 
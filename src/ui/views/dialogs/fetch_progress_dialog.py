@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import time
 from typing import Dict, List, Any, Optional
 
 from PySide6.QtWidgets import (
@@ -96,6 +97,13 @@ class FetchProgressDialog(QDialog):
         table_layout.addWidget(self.table)
         layout.addWidget(table_container, 1)
 
+        # --- Domains skipped because their circuit breaker is open ---
+        self.circuit_label = QLabel()
+        self.circuit_label.setObjectName("OpenCircuitsLabel")
+        self.circuit_label.setWordWrap(True)
+        self.circuit_label.setVisible(False)
+        layout.addWidget(self.circuit_label)
+
         # --- Add Stop Selected Button ---
         button_layout = QHBoxLayout() # Layout for buttons at the bottom
         self.stop_button = QPushButton("Stop Selected")
@@ -237,6 +245,29 @@ class FetchProgressDialog(QDialog):
         if len(sources) > 0:
             self.is_running = True
     
+    @Slot(dict)
+    def set_open_circuits(self, circuits: Dict[str, Dict[str, Any]]):
+        """Shows the domains that are skipped because their circuit breaker is open."""
+        if not circuits:
+            self.circuit_label.clear()
+            self.circuit_label.setVisible(False)
+            return
+
+        parts = []
+        tooltip_lines = []
+        for domain, info in sorted(circuits.items()):
+            if info.get("state") == "half_open":
+                parts.append(f"{domain} (probing)")
+            else:
+                retry_at = time.strftime("%H:%M", time.localtime(info.get("retry_at", 0)))
+                parts.append(f"{domain} (until {retry_at})")
+            tooltip_lines.append(
+                f"{domain}: {info.get('failures', 0)} failures, last error: {info.get('last_error', '')}"
+            )
+        self.circuit_label.setText("Circuit open, skipping: " + ", ".join(parts))
+        self.circuit_label.setToolTip("\n".join(tooltip_lines))
+        self.circuit_label.setVisible(True)
+
     def set_final_status(self, message: str):
         """Updates the window title with the final status message."""
         self.setWindowTitle(f"News Fetch - {message}")
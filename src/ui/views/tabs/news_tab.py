@@ -170,6 +170,7 @@ class NewsTab(QWidget):
         self.controller.fetch_analysis_result.connect(self._cache_analysis_result)
         self.controller.fetch_process_finished.connect(self._handle_fetch_finished)
         self.controller.error_occurred.connect(self._show_error_message)
+        self.controller.open_circuits_changed.connect(self._update_open_circuits)
 
     # --- Internal Trigger Methods (Called by UI Signals) ---
     def _trigger_fetch_news(self):
@@ -212,6 +213,7 @@ class NewsTab(QWidget):
                 self.fetch_progress_dialog.add_sources_to_table(new_sources)
                 
             self.fetch_progress_dialog.setWindowTitle("News Fetch Progress")
+            self.fetch_progress_dialog.set_open_circuits(self.controller.get_open_circuits())
             self.fetch_progress_dialog.show()
             self.fetch_progress_dialog.raise_()
             
@@ -234,6 +236,7 @@ class NewsTab(QWidget):
             self.fetch_progress_dialog.populate_table(selected_sources)
 
         self.fetch_progress_dialog.setWindowTitle("News Fetch Progress")
+        self.fetch_progress_dialog.set_open_circuits(self.controller.get_open_circuits())
         self.fetch_progress_dialog.show()
         self.fetch_progress_dialog.raise_()
 
@@ -408,6 +411,12 @@ class NewsTab(QWidget):
                 f"Progress dialog not visible, ignoring status update for {url}: {status}"
             )
 
+    @Slot(dict)
+    def _update_open_circuits(self, circuits: Dict[str, Dict[str, Any]]):
+        """Shows open circuit breakers in the FetchProgressDialog."""
+        if self.fetch_progress_dialog:
+            self.fetch_progress_dialog.set_open_circuits(circuits)
+
     @Slot(str, str)
     def _cache_analysis_result(self, url: str, analysis_result: str):
         """Stores the received analysis result locally."""
@@ -3,13 +3,40 @@
 
 import asyncio
 import logging
+import os
 import threading
+import time
 from typing import List, Dict, Optional, Any, Set, Callable, Union, Tuple
 
 from PySide6.QtCore import QObject, Signal, QThread
 
-from src.services.news_service import NewsService
-from src.core.crawler import PlaywrightCrawler
+from src.config import CONFIG_KEY_BROWSER_LINK_EXTRACTION, get_config
+from src.services.news_service import NewsService, SUB_CRAWL_CONCURRENCY
+from src.core.circuit_breaker import DomainCircuitBreaker
+from src.core.concurrency import AdaptiveConcurrencyController
+from src.core.crawler import (
+    ADAPTIVE_MAX_CONCURRENCY_FACTOR,
+    AiohttpCrawler,
+    PlaywrightCrawler,
+)
+from src.core.hybrid_fetcher import BACKEND_BROWSER, BACKEND_STATIC, HybridFetcher
+from src.core.http_cache import HttpCache, HTTP_CACHE_DB_NAME
+from src.core.html_store import HTML_STORE_DIR_NAME, RawHtmlStore
+from src.core.metrics import FetchMetrics
+from src.core.rate_limiter import DomainRateLimiter
+from src.core.readiness import ReadinessProfile
+from src.core.retry_policy import RetryPolicy
+from src.core.sharded_fetcher import ShardConfig, ShardedFetcher
+from src.core.session_manager import CrawlerSessionManager
+from src.core.dns_cache import PersistentDnsCache
+from src.core.feed_discovery import (
+    CONTENT_FORMAT_FEED,
+    FEED_CONTENT_TYPES,
+    FEED_RECHECK_SECONDS,
+    discover_feed,
+    parse_feed,
+)
+from src.core.link_extraction import CONTENT_FORMAT_LINKS
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +46,12 @@ class WorkerSignals(QObject):
     """Defines signals available from all workers."""
 
     # Initial Crawl Signals (emitted by CrawlerWorker)
-    html_ready = Signal(str, str, dict)  # url, html_content, source_info
+    html_ready = Signal(str, str, dict)  # url, content_key (raw HTML store), source_info
     initial_crawl_status = Signal(str, str)  # url, status_message
     initial_crawl_finished = Signal()  # Signal when the *initial crawl phase* is done
+    fetch_backend_detected = Signal(str, str)  # url, backend that worked for the source
+    readiness_profile_learned = Signal(str, dict)  # url, updated page readiness profile
+    feed_discovered = Signal(str, str)  # url, feed / news sitemap URL of the source ("" if none)
 
     # Processing Signals (emitted by ProcessorWorker's tasks)
     processing_status = Signal(str, str)  # url, status_details
@@ -143,6 +173,14 @@ class AsyncWorkerBase(QThread):
         raise NotImplementedError(
             "Subclasses must implement _main_worker_coroutine"
         )
+
+    async def _shutdown_resources(self):
+        """
+        Release worker-specific async resources.
+        Runs on the worker's event loop after leftover tasks have been cancelled.
+        Override in subclasses that own sessions, browsers, etc.
+        """
+        pass
     
     def _cleanup_event_loop(self, thread_id: int):
         """Clean up the event loop and pending tasks."""
@@ -170,6 +208,15 @@ class AsyncWorkerBase(QThread):
                         asyncio.gather(*tasks_to_cancel, return_exceptions=True)
                     )
                 
+                # Release async resources owned by the worker
+                try:
+                    self.loop.run_until_complete(self._shutdown_resources())
+                except Exception as e:
+                    logger.error(
+                        f"{worker_name} ({thread_id}): Error releasing resources: {e}",
+                        exc_info=True
+                    )
+
                 # Shutdown async generators
                 if hasattr(self.loop, "shutdown_asyncgens"):
                     logger.debug(f"{worker_name} ({thread_id}): Shutting down async generators...")
@@ -368,21 +415,107 @@ class CrawlerWorker(AsyncWorkerBase):
     Replaces the previous InitialCrawlerWorker (QRunnable).
     """
     
-    def __init__(self, urls_with_info: List[Dict[str, Any]], worker_signals: WorkerSignals, parent=None):
+    def __init__(
+        self,
+        urls_with_info: List[Dict[str, Any]],
+        worker_signals: WorkerSignals,
+        html_store: Optional[RawHtmlStore] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        metrics: Optional[FetchMetrics] = None,
+        circuit_breaker: Optional[DomainCircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        dns_cache: Optional[PersistentDnsCache] = None,
+        parent=None,
+    ):
         """
         Initialize the crawler worker.
         
         Args:
             urls_with_info: List of source dictionaries with URL and metadata
             worker_signals: Signals object for communication
+            html_store: Raw HTML store; fetched pages are handed over by content key
+            rate_limiter: Per-domain rate limiter shared with the sub-article crawler
+            metrics: Per-domain fetch phase timings shared with the sub-article crawler
+            circuit_breaker: Per-domain circuit breaker shared with the sub-article crawler
+            retry_policy: Retry policy whose run-wide retry budget is shared with the sub-article crawler
+            dns_cache: DNS cache persisted across runs; source domains are resolved into it before crawling
             parent: Optional parent QObject
         """
         super().__init__(worker_signals, parent)
         self.source_manager = SourceManager(urls_with_info)
+        self._html_store = html_store
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics
+        self._circuit_breaker = circuit_breaker
+        self._retry_policy = retry_policy
+        self._dns_cache = dns_cache
         
         # Crawler instance management
         self._crawler_lock = threading.Lock()
-        self._crawler = PlaywrightCrawler()
+        self._session_manager = CrawlerSessionManager(
+            metrics=self._metrics,
+            dns_cache=self._dns_cache,
+            rate_limiter=self._rate_limiter,
+            circuit_breaker=self._circuit_breaker,
+        )
+        self._setup_feed_crawler()
+        self._setup_fetcher()
+
+    def _setup_feed_crawler(self) -> None:
+        """Create the crawler that reads the feeds of sources that have one."""
+        self._feed_http_cache = HttpCache(
+            os.path.join(get_config().data_dir, HTTP_CACHE_DB_NAME),
+            namespace="feeds",
+        )
+        self._feed_crawler = AiohttpCrawler(
+            request_timeout=15,
+            http_cache=self._feed_http_cache,
+            html_store=self._html_store,
+            rate_limiter=self._rate_limiter,
+            session_manager=self._session_manager,
+            allowed_content_types=FEED_CONTENT_TYPES,
+            metrics=self._metrics,
+            circuit_breaker=self._circuit_breaker,
+            retry_policy=self._retry_policy,
+        )
+
+    def _setup_fetcher(self) -> None:
+        """Create the crawlers and the ``HybridFetcher`` that fetch source pages in this thread."""
+        # Browser fetches return only the visible links unless disabled in the config
+        extract_links = bool(get_config().get(CONFIG_KEY_BROWSER_LINK_EXTRACTION, True))
+        # Conditional-GET cache so unchanged source pages skip the browser entirely;
+        # link lists and HTML are cached separately
+        self._http_cache = HttpCache(
+            os.path.join(get_config().data_dir, HTTP_CACHE_DB_NAME),
+            namespace="playwright-links" if extract_links else "playwright",
+        )
+        self._crawler = PlaywrightCrawler(
+            http_cache=self._http_cache,
+            html_store=self._html_store,
+            rate_limiter=self._rate_limiter,
+            metrics=self._metrics,
+            circuit_breaker=self._circuit_breaker,
+            retry_policy=self._retry_policy,
+            extract_links=extract_links,
+        )
+        # Static pages are fetched with aiohttp; the browser is only used when needed
+        self._static_http_cache = HttpCache(
+            os.path.join(get_config().data_dir, HTTP_CACHE_DB_NAME),
+            namespace="aiohttp",
+        )
+        self._fetcher = HybridFetcher(
+            AiohttpCrawler(
+                request_timeout=15,
+                http_cache=self._static_http_cache,
+                rate_limiter=self._rate_limiter,
+                session_manager=self._session_manager,
+                metrics=self._metrics,
+                circuit_breaker=self._circuit_breaker,
+                retry_policy=self._retry_policy,
+            ),
+            self._crawler,
+            html_store=self._html_store,
+        )
     
     async def _main_worker_coroutine(self):
         """Main coroutine that performs crawling operations."""
@@ -393,6 +526,9 @@ class CrawlerWorker(AsyncWorkerBase):
             # Get all initial source URLs
             initial_urls = self.source_manager.get_all_urls()
             sources_to_process = [{"url": url} for url in initial_urls]
+
+            # Resolve and connect to the source domains while the browser starts
+            await self._warm_up(initial_urls)
             
             # Process the initial batch of sources
             await self._process_source_batch(sources_to_process)
@@ -409,6 +545,22 @@ class CrawlerWorker(AsyncWorkerBase):
                 
             logger.info(f"CrawlerWorker main coroutine finished (thread {worker_id})")
     
+    async def _warm_up(self, urls: List[str]) -> None:
+        """
+        Resolve all source domains into the DNS cache and open keep-alive connections
+        to them; launch the browser at the same time if any source needs it.
+        """
+        steps = [self._session_manager.warm_up(urls)]
+        if any(
+            (self.source_manager.get_source_info(url) or {}).get("fetch_backend") == BACKEND_BROWSER
+            for url in urls
+        ):
+            steps.append(self._crawler._ensure_browser_started())
+        results = await asyncio.gather(*steps, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"CrawlerWorker warm-up step failed: {result}")
+
     async def _process_source_batch(self, sources: List[Dict[str, Any]]) -> None:
         """
         Process a batch of sources by creating tasks for each URL.
@@ -462,8 +614,26 @@ class CrawlerWorker(AsyncWorkerBase):
                 self.signals.initial_crawl_status.emit(url, "Cancelled")
                 return
                 
-            # Perform the crawl
-            result = await self._crawler._fetch_single(url, scroll_page=True)
+            # Sources with a feed are read from it; the page itself is not fetched
+            known_info = self.source_manager.get_source_info(url) or {}
+            result = None
+            if known_info.get("feed_url"):
+                result = await self._fetch_feed(url, known_info["feed_url"])
+            if result is None:
+                # Perform the crawl with the backend and readiness profile remembered for this source
+                backend_hint = known_info.get("fetch_backend")
+                readiness = ReadinessProfile.from_dict(known_info.get("readiness_profile"))
+                result, backend = await self._fetcher.fetch(url, backend_hint, readiness)
+                # A browser fetch is only remembered when the static page needed JS;
+                # after a failed static fetch it is used for this run alone
+                remember = backend == BACKEND_STATIC or result.get("js_rendering")
+                if not result.get("error") and backend != backend_hint and remember:
+                    self.signals.fetch_backend_detected.emit(result.get("original_url", url), backend)
+                observation = result.get("readiness")
+                if backend == BACKEND_BROWSER and observation and readiness.learn(observation):
+                    self.signals.readiness_profile_learned.emit(
+                        result.get("original_url", url), readiness.to_dict()
+                    )
             url_from_result = result.get("original_url", url)
             
             # Check for cancellation after crawl
@@ -481,22 +651,42 @@ class CrawlerWorker(AsyncWorkerBase):
                 )
                 return
                 
-            # Extract content and error information
+            # Extract content and error information (pages fetched in a shard
+            # come back as a content key only, with ``content_stored`` set)
             html = result.get("content")
+            content_key = result.get("content_hash")
+            content_stored = bool(result.get("content_stored") and content_key)
             error = result.get("error")
+            content_format = result.get("content_format")
+            if content_format:
+                # Tells the processor that the stored content is a link list, not HTML
+                source_info = {**source_info, "content_format": content_format}
             
             # Emit appropriate signals
             if error:
                 self.signals.initial_crawl_status.emit(
                     url_from_result, f"Crawled - Failed: {error}"
                 )
-            elif html:
+            elif html and not content_key:
+                self.signals.initial_crawl_status.emit(
+                    url_from_result, "Crawled - Failed: Raw HTML store unavailable"
+                )
+            elif html or content_stored:
                 self.signals.initial_crawl_status.emit(
                     url_from_result, "Crawled - Success"
                 )
+                # Only the content key crosses threads, the HTML stays in the store
                 self.signals.html_ready.emit(
-                    url_from_result, html, source_info
+                    url_from_result, content_key, source_info
                 )
+                if self._needs_feed_discovery(known_info):
+                    # Browser link lists carry no <link rel="alternate"> elements
+                    page_html = None
+                    if content_format != CONTENT_FORMAT_LINKS:
+                        page_html = html
+                        if not page_html and self._html_store:
+                            page_html = self._html_store.get(content_key)
+                    await self._discover_feed(url_from_result, page_html)
             else:
                 self.signals.initial_crawl_status.emit(
                     url_from_result, "Crawled - Failed: No content"
@@ -516,6 +706,39 @@ class CrawlerWorker(AsyncWorkerBase):
             # Remove task from tracking
             self.remove_task(url)
     
+    async def _fetch_feed(self, url: str, feed_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the feed of a source as its crawl result. Returns None if the feed
+        could not be read this time; a feed without entries is forgotten.
+        """
+        result = await self._feed_crawler.fetch_url(feed_url)
+        if result.get("error"):
+            logger.warning(f"Feed {feed_url} of {url} failed ({result['error']}), crawling the page instead.")
+            return None
+        if not parse_feed(result.get("content") or "", feed_url):
+            logger.warning(f"Feed {feed_url} of {url} lists no articles any more, crawling the page instead.")
+            self.signals.feed_discovered.emit(url, "")
+            return None
+        return {**result, "original_url": url, "content_format": CONTENT_FORMAT_FEED}
+
+    @staticmethod
+    def _needs_feed_discovery(source_info: Dict[str, Any]) -> bool:
+        """Whether to look for a feed of a source: it has none and was not checked recently."""
+        if source_info.get("feed_url"):
+            return False
+        checked_at = source_info.get("feed_checked_at")
+        return checked_at is None or time.time() - checked_at > FEED_RECHECK_SECONDS
+
+    async def _discover_feed(self, url: str, html: Optional[str]) -> None:
+        """Look for a feed or news sitemap of a source and report the result for storage."""
+        try:
+            session = await self._session_manager.get_session()
+            feed_url = await discover_feed(session, url, html, self._rate_limiter)
+        except Exception as e:
+            logger.warning(f"Feed discovery for {url} failed: {e}")
+            return
+        self.signals.feed_discovered.emit(url, feed_url or "")
+
     def add_urls_to_crawl(self, new_sources: List[Dict[str, Any]]) -> None:
         """
         Add new URLs to crawl while the worker is running.
@@ -574,24 +797,81 @@ class CrawlerWorker(AsyncWorkerBase):
         except Exception as e:
             logger.error(f"Error adding new tasks: {e}", exc_info=True)
 
+    async def _shutdown_resources(self):
+        """Shut down the browser and close the shared aiohttp session."""
+        logger.info(f"CrawlerWorker: Browser pool stats: {self._crawler.get_pool_stats()}")
+        try:
+            logger.info("CrawlerWorker: Shutting down crawler...")
+            await self._crawler.shutdown()
+            logger.info("CrawlerWorker: Crawler shut down.")
+        except Exception as e:
+            logger.error(f"CrawlerWorker: Error shutting down crawler: {e}", exc_info=True)
+        await self._session_manager.close()
+
     def _cleanup_event_loop(self, thread_id: int):
         """Clean up the event loop, pending tasks, and crawler resources."""
         worker_name = self.__class__.__name__
-        
-        # Shutdown the crawler
-        try:
-            logger.info(f"{worker_name} ({thread_id}): Shutting down crawler...")
-            self._crawler.shutdown()
-            logger.info(f"{worker_name} ({thread_id}): Crawler shut down.")
-        except Exception as e:
-            logger.error(
-                f"{worker_name} ({thread_id}): Error shutting down crawler: {e}",
-                exc_info=True
-            )
-            
-        # Call the parent class method to clean up the event loop
+
+        # Parent cleanup cancels leftover tasks and awaits _shutdown_resources
         super()._cleanup_event_loop(thread_id)
 
+        logger.info(f"{worker_name} ({thread_id}): Fetch backends used: {self._fetcher.get_stats()}")
+        logger.info(
+            f"{worker_name} ({thread_id}): HTTP cache stats: "
+            f"playwright={self._http_cache.get_stats()}, aiohttp={self._static_http_cache.get_stats()}"
+        )
+        self._http_cache.close()
+        self._static_http_cache.close()
+        self._feed_http_cache.close()
+
+
+class ShardedCrawlerWorker(CrawlerWorker):
+    """
+    CrawlerWorker that fetches source pages in several processes, sharded by domain.
+    Task tracking, cancellation and the signals are the same as in CrawlerWorker.
+    """
+
+    def __init__(self, *args, shard_count: int = 2, **kwargs):
+        """
+        Initialize the sharded crawler worker.
+
+        Args:
+            shard_count: Number of crawl processes
+            *args, **kwargs: See CrawlerWorker
+        """
+        self._shard_count = shard_count
+        super().__init__(*args, **kwargs)
+
+    def _setup_fetcher(self) -> None:
+        """Create the ``ShardedFetcher``; the shards build their own crawlers."""
+        data_dir = get_config().data_dir
+        config = ShardConfig(
+            http_cache_path=os.path.join(data_dir, HTTP_CACHE_DB_NAME),
+            html_store_dir=self._html_store.root_dir if self._html_store else os.path.join(data_dir, HTML_STORE_DIR_NAME),
+            extract_links=bool(get_config().get(CONFIG_KEY_BROWSER_LINK_EXTRACTION, True)),
+            rate_limits=self._rate_limiter.export_limits() if self._rate_limiter else [],
+            circuit_state_path=self._circuit_breaker.state_path if self._circuit_breaker else None,
+            retry_budget=self._retry_policy.budget if self._retry_policy else None,
+            metrics_dir=self._metrics.dump_dir if self._metrics else None,
+            dns_cache_path=self._dns_cache.path if self._dns_cache else None,
+        )
+        self._fetcher = ShardedFetcher(config, self._shard_count, self._circuit_breaker)
+        logger.info(f"ShardedCrawlerWorker: fetching source pages in {self._shard_count} processes")
+
+    async def _warm_up(self, urls: List[str]) -> None:
+        """The shards resolve through the persisted DNS cache themselves; nothing to prepare here."""
+
+    async def _shutdown_resources(self):
+        """Stop the crawl shard processes and close the feed session."""
+        await self._fetcher.shutdown()
+        await self._session_manager.close()
+
+    def _cleanup_event_loop(self, thread_id: int):
+        """Clean up the event loop and log the shards' statistics."""
+        AsyncWorkerBase._cleanup_event_loop(self, thread_id)
+        logger.info(f"ShardedCrawlerWorker ({thread_id}): Shard stats: {self._fetcher.get_stats()}")
+        self._feed_http_cache.close()
+
 
 class ProcessorWorker(AsyncWorkerBase):
     """
@@ -616,10 +896,30 @@ class ProcessorWorker(AsyncWorkerBase):
         self.llm_base_url = llm_base_url
         self.llm_api_key = llm_api_key
         self.llm_semaphore = None
+        # One connection pool for all sub-article crawls of this worker
+        self._session_manager = CrawlerSessionManager(
+            metrics=news_service.metrics,
+            dns_cache=news_service.dns_cache,
+            rate_limiter=news_service.rate_limiter,
+            circuit_breaker=news_service.circuit_breaker,
+        )
+        # Adaptive concurrency limits learned across all sub-article crawls of this worker
+        self._concurrency = AdaptiveConcurrencyController(
+            initial_limit=SUB_CRAWL_CONCURRENCY,
+            max_limit=SUB_CRAWL_CONCURRENCY * ADAPTIVE_MAX_CONCURRENCY_FACTOR,
+        )
     
     def _initialize_resources(self):
         """Initialize LLM semaphore to control concurrent LLM requests."""
         self.llm_semaphore = asyncio.Semaphore(3)
+
+    async def _shutdown_resources(self):
+        """Close the shared crawler session and its pooled connections."""
+        logger.info(
+            f"ProcessorWorker crawler session stats: {self._session_manager.get_stats()}"
+        )
+        logger.info(f"ProcessorWorker sub-crawl concurrency: {self._concurrency.get_stats()}")
+        await self._session_manager.close()
     
     async def _main_worker_coroutine(self):
         """
@@ -633,13 +933,19 @@ class ProcessorWorker(AsyncWorkerBase):
         except asyncio.CancelledError:
             logger.info("ProcessorWorker main coroutine cancelled.")
     
-    def submit_task(self, url: str, html_content: str, source_info: Dict[str, Any]):
+    def warm_up(self, urls: List[str]) -> None:
+        """Resolve and pre-connect to the given article origins on this worker's loop."""
+        if not urls or not self.loop or not self.loop.is_running() or self.is_cancelled():
+            return
+        asyncio.run_coroutine_threadsafe(self._session_manager.warm_up(urls), self.loop)
+
+    def submit_task(self, url: str, content_key: str, source_info: Dict[str, Any]):
         """
         Submit a processing task to be executed asynchronously.
         
         Args:
             url: URL of the content
-            html_content: HTML content to process
+            content_key: Raw HTML store key of the fetched content
             source_info: Source metadata dictionary
             
         Returns:
@@ -657,7 +963,7 @@ class ProcessorWorker(AsyncWorkerBase):
         logger.debug(f"Submitting processing task for {url} to ProcessorWorker.")
         
         # Create the coroutine
-        coro = self._process_task(url, html_content, source_info)
+        coro = self._process_task(url, content_key, source_info)
         
         # Schedule it on the event loop
         future = asyncio.run_coroutine_threadsafe(coro, self.loop)
@@ -666,13 +972,13 @@ class ProcessorWorker(AsyncWorkerBase):
         self.add_task(url, future)
         return future
     
-    async def _process_task(self, url: str, html_content: str, source_info: Dict[str, Any]):
+    async def _process_task(self, url: str, content_key: str, source_info: Dict[str, Any]):
         """
         Process a single URL's content.
         
         Args:
             url: URL of the content
-            html_content: HTML content to process
+            content_key: Raw HTML store key of the fetched content
             source_info: Source metadata dictionary
         """
         task = asyncio.current_task()
@@ -709,13 +1015,21 @@ class ProcessorWorker(AsyncWorkerBase):
                     base_url=self.llm_base_url,
                     api_key=self.llm_api_key,
                     async_mode=True,
+                    # Run-wide LLM retry budget, counted in the fetch metrics
+                    retry_policy=self.news_service.llm_retry_policy,
                 ) as llm_client:
                     logger.debug(f"Created LLM client for task {task_id}")
 
-                    # Process the HTML content and analyze
+                    # Load the stored HTML, process and analyze it
                     saved_count, analysis_result_md, error_obj = (
-                        await self.news_service._process_html_and_analyze(
-                            url, html_content, source_info, status_callback, llm_client
+                        await self.news_service.process_stored_html(
+                            url,
+                            content_key,
+                            source_info,
+                            status_callback,
+                            llm_client,
+                            self._session_manager,
+                            self._concurrency,
                         )
                     )
 
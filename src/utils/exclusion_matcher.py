@@ -0,0 +1,128 @@
+# src/utils/exclusion_matcher.py
+# -*- coding: utf-8 -*-
+
+"""
+Precompiled exclusion rules for HTML cleaning.
+
+The exclusion rules (tag names and CSS selectors) are compiled once into hash
+sets of tag names, classes, ids and attribute names. Whether an element is
+excluded is then decided from its own name and attributes with a few set
+lookups, so cleaning a page takes one walk over its DOM whatever the number
+of rules.
+
+Selectors other than ``tag``, ``.class``, ``#id`` and ``[attr]`` cannot be
+decided that way; they are kept in ``complex_selectors`` for the caller to
+evaluate separately.
+
+Matchers are immutable and cached by their rules: ``compile_exclusion_matcher``
+returns the same instance for the same rules, so it may be called per page.
+Per-source rules are derived from a base matcher with ``with_overrides``.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple
+
+_SIMPLE_SELECTOR_RE = re.compile(
+    r"^(?:(?P<tag>[a-zA-Z][\w-]*)|\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)|\[(?P<attr>[\w-]+)\])$"
+)
+
+
+class ExclusionMatcher:
+    """Tag names, classes, ids and attributes whose elements are dropped."""
+
+    def __init__(
+        self,
+        rules: Tuple[str, ...],
+        tags: FrozenSet[str],
+        classes: FrozenSet[str],
+        ids: FrozenSet[str],
+        attrs: FrozenSet[str],
+        complex_selectors: Tuple[str, ...] = (),
+    ):
+        # Normalized rules the matcher was compiled from
+        self.rules = rules
+        self.tags = tags
+        self.classes = classes
+        self.ids = ids
+        self.attrs = attrs
+        self.complex_selectors = complex_selectors
+
+    def matches(self, name: str, attrs: Mapping[str, Any]) -> bool:
+        """
+        Whether an element with this tag name and these attributes is excluded.
+        ``class`` may be a string (lxml) or a list of tokens (BeautifulSoup).
+        """
+        if name in self.tags:
+            return True
+        if not attrs:
+            return False
+        if self.classes:
+            class_value = attrs.get("class")
+            if class_value:
+                tokens = class_value.split() if isinstance(class_value, str) else class_value
+                if not self.classes.isdisjoint(tokens):
+                    return True
+        if self.ids and attrs.get("id") in self.ids:
+            return True
+        return bool(self.attrs) and not self.attrs.isdisjoint(attrs)
+
+    def with_overrides(
+        self, exclude: Iterable[str] = (), keep: Iterable[str] = ()
+    ) -> "ExclusionMatcher":
+        """
+        Matcher for a source that also excludes the ``exclude`` rules and no
+        longer excludes the ``keep`` rules (tag names or selectors, e.g.
+        ``keep=["figure", ".gallery"]``).
+        """
+        kept = {_normalize(rule) for rule in keep}
+        rules = [rule for rule in self.rules if rule not in kept]
+        rules.extend(exclude)
+        return compile_exclusion_matcher(rules)
+
+
+def _normalize(rule: str) -> str:
+    rule = rule.strip()
+    # Tag names and attribute names are case-insensitive in HTML
+    match = _SIMPLE_SELECTOR_RE.match(rule)
+    if match and (match.group("tag") or match.group("attr")):
+        return rule.lower()
+    return rule
+
+
+@lru_cache(maxsize=64)
+def _compile(rules: Tuple[str, ...]) -> ExclusionMatcher:
+    tags, classes, ids, attrs, complex_selectors = set(), set(), set(), set(), []
+    for rule in rules:
+        match = _SIMPLE_SELECTOR_RE.match(rule)
+        if not match:
+            complex_selectors.append(rule)
+        elif match.group("tag"):
+            tags.add(match.group("tag"))
+        elif match.group("cls"):
+            classes.add(match.group("cls"))
+        elif match.group("id"):
+            ids.add(match.group("id"))
+        else:
+            attrs.add(match.group("attr"))
+    return ExclusionMatcher(
+        rules,
+        frozenset(tags),
+        frozenset(classes),
+        frozenset(ids),
+        frozenset(attrs),
+        tuple(complex_selectors),
+    )
+
+
+def compile_exclusion_matcher(
+    exclude_selectors: Optional[Sequence[str]] = None,
+    exclude_tags: Optional[Sequence[str]] = None,
+) -> ExclusionMatcher:
+    """
+    Compile tag names and selectors into a matcher (cached: the same rules give
+    the same matcher, so changed rules are compiled once on first use).
+    """
+    rules = [_normalize(tag) for tag in exclude_tags or ()]
+    rules.extend(_normalize(selector) for selector in exclude_selectors or ())
+    return _compile(tuple(rule for rule in dict.fromkeys(rules) if rule))
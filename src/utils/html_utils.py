@@ -3,8 +3,9 @@
 import logging
 import re
 from typing import Any, Dict, List, Optional
-from bs4 import BeautifulSoup
-from markdownify import markdownify
+from bs4 import BeautifulSoup, Tag
+
+from src.utils.exclusion_matcher import ExclusionMatcher, compile_exclusion_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +157,11 @@ DEFAULT_EXCLUDE_SELECTORS = [
     ".top-picks",
 ]
 
+# Compiled once; per-source rules: DEFAULT_EXCLUSION_MATCHER.with_overrides(...)
+DEFAULT_EXCLUSION_MATCHER = compile_exclusion_matcher(
+    DEFAULT_EXCLUDE_SELECTORS, DEFAULT_EXCLUDE_TAGS
+)
+
 
 # --- Cleaning Function ---
 def clean_html(
@@ -163,6 +169,7 @@ def clean_html(
     base_url: str,
     exclude_tags: Optional[List[str]] = DEFAULT_EXCLUDE_TAGS,
     exclude_selectors: Optional[List[str]] = DEFAULT_EXCLUDE_SELECTORS,
+    matcher: Optional[ExclusionMatcher] = None,
 ) -> str:
     """
     清理HTML内容，移除不需要的元素，并返回清理后的HTML字符串。
@@ -172,6 +179,7 @@ def clean_html(
         base_url: 网页的基础URL（用于日志记录）
         exclude_tags: 要排除的HTML标签列表
         exclude_selectors: 要排除的CSS选择器列表
+        matcher: 预编译的排除规则（优先于 exclude_tags / exclude_selectors）
 
     Returns:
         已清理的HTML字符串
@@ -191,24 +199,33 @@ def clean_html(
     logger.debug(f"Cleaning HTML for {base_url}.")
 
     # --- 初始清理 ---
-    elements_to_remove = []
-    if exclude_tags:
-        for tag_name in exclude_tags:
-            try:
-                elements_to_remove.extend(soup.find_all(tag_name))
-            except Exception as e:
-                logger.warning(f"Error finding exclude_tags '{tag_name}': {e}")
-
-    if exclude_selectors:
-        for selector in exclude_selectors:
-            try:
-                elements_to_remove.extend(soup.select(selector))
-            except Exception as e:
-                logger.warning(f"Error processing exclude_selector '{selector}': {e}")
+    matcher = matcher or compile_exclusion_matcher(exclude_selectors, exclude_tags)
 
+    # One walk over the tree; excluded subtrees are not descended into
     removed_count = 0
-    unique_elements = set(elements_to_remove)
-    for element in unique_elements:
+    pending = [soup]
+    while pending:
+        for child in list(pending.pop().contents):
+            if not isinstance(child, Tag):
+                continue
+            if matcher.matches(child.name, child.attrs):
+                child.decompose()
+                removed_count += 1
+            else:
+                pending.append(child)
+
+    # Selectors the matcher cannot decide per element
+    elements_to_remove = []
+    for selector in matcher.complex_selectors:
+        try:
+            elements_to_remove.extend(soup.select(selector))
+        except Exception as e:
+            logger.warning(f"Error processing exclude_selector '{selector}': {e}")
+
+    # Deduplicate by identity: Tags compare equal by content, so a set would
+    # keep only one of several identical elements (e.g. repeated buttons)
+    unique_elements = {id(element): element for element in elements_to_remove}
+    for element in unique_elements.values():
         if element.parent is not None:
             element.decompose()
             removed_count += 1
@@ -221,74 +238,6 @@ def clean_html(
     return str(soup)
 
 
-# --- Formatting Function ---
-def format_html(
-    cleaned_html: str,
-    base_url: str,
-    output_format: str = "markdown",
-    markdownify_options: Optional[Dict[str, Any]] = None,
-) -> str:
-    """
-    将已清理的HTML字符串格式化为指定格式的文本。
-
-    Args:
-        cleaned_html: clean_html返回的HTML字符串
-        base_url: 网页的基础URL（用于日志记录）
-        output_format: 输出格式，'markdown' 或 'plain_text'
-        markdownify_options: 传递给markdownify的额外选项
-
-    Returns:
-        格式化后的文本内容
-    """
-    if not cleaned_html:
-        return ""
-    # 解析清理后的HTML字符串
-    try:
-        soup = BeautifulSoup(cleaned_html, "lxml")
-    except Exception:
-        try:
-            soup = BeautifulSoup(cleaned_html, "html.parser")
-        except Exception as parse_err:
-            logger.error(f"Failed to parse cleaned HTML for {base_url}: {parse_err}")
-            return ""
-    formatted_content = ""
-    try:
-        target_element = soup.body or soup
-        if not target_element:
-            logger.warning(f"No target element (body or root) found for {base_url}.")
-            return ""
-        if output_format == "markdown":
-            opts = markdownify_options or {}
-            formatted_content = markdownify(str(target_element), **opts).strip()
-            logger.debug(f"Formatted as Markdown for {base_url}")
-        else:
-            formatted_content = target_element.get_text(separator="\n", strip=True)
-            logger.debug(f"Formatted as plain_text for {base_url}")
-    except Exception as e:
-        logger.error(
-            f"Error during final formatting ({output_format}) for {base_url}: {e}"
-        )
-        # 回退：直接提取所有文本
-        try:
-            formatted_content = soup.get_text(separator="\n", strip=True)
-        except Exception:
-            formatted_content = ""
-    return formatted_content
-
-
-# --- Combined Function ---
-def clean_and_format_html(
-    html_content: str,
-    base_url: str,
-    output_format: str = "markdown",
-    exclude_tags: Optional[List[str]] = DEFAULT_EXCLUDE_TAGS,
-    exclude_selectors: Optional[List[str]] = DEFAULT_EXCLUDE_SELECTORS,
-    markdownify_options: Optional[Dict[str, Any]] = None,
-) -> str:
-    """Removes elements and formats the remaining HTML."""
-    cleaned_html = clean_html(html_content, base_url, exclude_tags, exclude_selectors)
-    return format_html(cleaned_html, base_url, output_format, markdownify_options)
-
 # --- Extract metadata from article html ---
 def extract_metadata_from_article_html(html_content: str, base_url: str) -> Optional[Dict[str, Any]]:
     """Extract metadata from article html."""
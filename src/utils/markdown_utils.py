@@ -11,7 +11,7 @@ Main features:
 
 import re
 from urllib.parse import urljoin
-from typing import List, Optional
+from typing import Any, Container, Dict, List, Optional
 
 # Optimized constant name: Link filter regex
 LINK_FILTER_REGEX = re.compile(
@@ -122,7 +122,7 @@ LINK_FILTER_REGEX = re.compile(
 )
 
 
-def clean_markdown_links(raw_text: str, exclude_urls: List[str] = None, base_url: str = None) -> Optional[str]:
+def clean_markdown_links(raw_text: str, exclude_urls: Container[str] = None, base_url: str = None) -> Optional[str]:
     """
     Clean links in Markdown text, keeping only link expressions.
     """
@@ -141,7 +141,8 @@ def clean_markdown_links(raw_text: str, exclude_urls: List[str] = None, base_url
     link_pattern = r"\[([^\]]+)\]\(([^)]+)\)"
     extracted_links = re.findall(link_pattern, text_filtered)
 
-    # Filter out links with URLs in exclude_urls
+    # Filter out links with URLs in exclude_urls (a list, set or UrlFrontier)
+    exclude_urls = exclude_urls if exclude_urls is not None else ()
     filtered_links = []
     for text, url in extracted_links:
         full_url = urljoin(base_url, url)
@@ -156,6 +157,24 @@ def clean_markdown_links(raw_text: str, exclude_urls: List[str] = None, base_url
         return None
 
 
+def format_links_as_markdown(links: List[Dict[str, Any]]) -> str:
+    """
+    Render a link list (dicts with ``text`` and ``href``, e.g. extracted in
+    the browser) as Markdown link lines, ready for ``clean_markdown_links``.
+    """
+    lines = []
+    for link in links:
+        text = " ".join(str(link.get("text") or "").split())
+        href = str(link.get("href") or "").strip()
+        if not text or not href:
+            continue
+        # Keep the text and URL from breaking the [text](url) syntax
+        text = text.replace("[", "(").replace("]", ")")
+        href = href.replace(" ", "%20").replace("(", "%28").replace(")", "%29")
+        lines.append(f"[{text}]({href})")
+    return "\n".join(lines)
+
+
 def strip_image_links(raw_text: str) -> str:
     """
     Remove image links from Markdown text.
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+URL canonicalization used for de-duplicating crawled articles.
+
+The same article is often linked as ``http`` and ``https``, with or without a
+trailing slash, with ``utm_*`` tracking parameters, a fragment or an explicit
+``index.html``. ``canonicalize_url`` maps all of these variants to one key.
+The key is only meant for comparison; always fetch the original URL.
+``url_fingerprint`` hashes a key to the 64-bit int that in-memory URL sets
+(``UrlIndex``, ``UrlFrontier``) store instead of the string.
+"""
+
+import hashlib
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change the page content
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "mc_cid",
+        "mc_eid",
+        "igshid",
+        "spm",
+        "share_token",
+        "ref_src",
+    }
+)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+INDEX_PAGES = ("index.html", "index.htm", "index.php", "index.shtml", "default.aspx")
+
+_MULTI_SLASH_RE = re.compile(r"/{2,}")
+# Characters kept as-is when re-quoting the path (RFC 3986 reserved + '%')
+_PATH_SAFE_CHARS = "/:@!$&'()*+,;=-._~%"
+
+
+def _is_tracking_param(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """
+    Build the de-duplication key of a URL.
+
+    - ``http`` and ``https`` are treated as the same page (the key uses https)
+    - scheme and host are lower-cased, default ports and fragments are dropped
+    - tracking parameters are removed and the remaining query is sorted
+    - duplicate slashes, a trailing slash and index pages are removed from the path
+
+    Returns None for anything that is not an absolute http(s) URL.
+    """
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+
+    netloc = host
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{host}:{port}"
+
+    path = _MULTI_SLASH_RE.sub("/", quote(unquote(parts.path), safe=_PATH_SAFE_CHARS))
+    last_segment = path.rsplit("/", 1)[-1]
+    if last_segment.lower() in INDEX_PAGES:
+        path = path[: -len(last_segment)]
+    path = path.rstrip("/")
+
+    query_pairs = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit(("https", netloc, path, query, ""))
+
+
+def url_fingerprint(key: str) -> int:
+    """64-bit hash of a canonical URL (a ``canonicalize_url`` key)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
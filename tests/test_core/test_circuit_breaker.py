@@ -0,0 +1,223 @@
+# tests/test_core/test_circuit_breaker.py
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.circuit_breaker import (
+    CIRCUIT_STATE_FILE_NAME,
+    DomainCircuitBreaker,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    is_circuit_open_error,
+)
+
+URL = "https://dead.example.com/news"
+OTHER_URL = "https://alive.example.org/news"
+DOMAIN = "dead.example.com"
+
+
+class TestDomainCircuitBreaker(unittest.TestCase):
+    """Closed -> open -> half-open -> closed transitions, cooldowns and persistence."""
+
+    def setUp(self):
+        self.now = 1_000_000.0
+        patcher = mock.patch("src.core.circuit_breaker.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.temp_dir = tempfile.mkdtemp(prefix="test_circuit_")
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.transitions = []
+
+    def _breaker(self, **kwargs) -> DomainCircuitBreaker:
+        breaker = DomainCircuitBreaker(
+            failure_threshold=3, cooldown_seconds=60, max_cooldown_seconds=200, **kwargs
+        )
+        breaker.add_listener(lambda domain, state: self.transitions.append((domain, state)))
+        return breaker
+
+    def _open(self, breaker: DomainCircuitBreaker) -> None:
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure(URL, "net::ERR_CONNECTION_REFUSED")
+
+    def test_01_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the failure threshold, per domain."""
+        breaker = self._breaker()
+        breaker.record_failure(URL, "timeout")
+        breaker.record_failure(URL, "timeout")
+        self.assertTrue(breaker.allow_request(URL))
+        breaker.record_failure(URL, "timeout")
+        self.assertFalse(breaker.allow_request(URL))
+        self.assertTrue(breaker.allow_request(OTHER_URL))
+        self.assertEqual(self.transitions, [(DOMAIN, STATE_OPEN)])
+        self.assertEqual(breaker.retry_at(URL), self.now + 60)
+        self.assertTrue(is_circuit_open_error(breaker.open_error(URL)))
+
+    def test_02_success_resets_the_failure_count(self):
+        """Test that failures must be consecutive."""
+        breaker = self._breaker()
+        breaker.record_failure(URL)
+        breaker.record_failure(URL)
+        breaker.record_success(URL)
+        breaker.record_failure(URL)
+        breaker.record_failure(URL)
+        self.assertTrue(breaker.allow_request(URL))
+        self.assertEqual(self.transitions, [])
+
+    def test_03_half_open_probe_closes_on_success(self):
+        """Test that one probe goes out after the cooldown and success closes the circuit."""
+        breaker = self._breaker()
+        self._open(breaker)
+        self.now += 59
+        self.assertFalse(breaker.allow_request(URL))
+        self.now += 2
+        self.assertTrue(breaker.allow_request(URL))  # The probe
+        self.assertFalse(breaker.allow_request(URL))  # Only one probe at a time
+        self.assertEqual(breaker.get_open_circuits()[DOMAIN]["state"], STATE_HALF_OPEN)
+        breaker.record_success(URL)
+        self.assertTrue(breaker.allow_request(URL))
+        self.assertEqual(breaker.get_open_circuits(), {})
+        self.assertEqual(
+            [state for _, state in self.transitions], [STATE_OPEN, STATE_HALF_OPEN, STATE_CLOSED]
+        )
+
+    def test_04_failed_probe_doubles_the_cooldown(self):
+        """Test that a failed probe re-opens with a doubled cooldown, capped at the maximum."""
+        breaker = self._breaker()
+        self._open(breaker)
+        expected_cooldowns = [120, 200, 200]
+        for cooldown in expected_cooldowns:
+            self.now = breaker.retry_at(URL)
+            self.assertTrue(breaker.allow_request(URL))
+            breaker.record_failure(URL, "still down")
+            self.assertEqual(breaker.retry_at(URL), self.now + cooldown)
+            self.assertFalse(breaker.allow_request(URL))
+
+    def test_05_lost_probe_is_replaced(self):
+        """Test that a probe that never reports back is given up after the probe timeout."""
+        breaker = self._breaker(probe_timeout_seconds=30)
+        self._open(breaker)
+        self.now += 60
+        self.assertTrue(breaker.allow_request(URL))
+        self.now += 29
+        self.assertFalse(breaker.allow_request(URL))
+        self.now += 2
+        self.assertTrue(breaker.allow_request(URL))
+
+    def test_06_open_circuits_persist(self):
+        """Test that open circuits survive a restart and closed ones are not saved."""
+        state_path = os.path.join(self.temp_dir, CIRCUIT_STATE_FILE_NAME)
+        breaker = self._breaker(state_path=state_path)
+        self._open(breaker)
+        breaker.record_failure(OTHER_URL)
+        # A probe in flight at shutdown is due again right away after the restart
+        self.now += 60
+        self.assertTrue(breaker.allow_request(URL))
+
+        restored = DomainCircuitBreaker(state_path=state_path)
+        self.assertEqual(restored.load(), 1)
+        circuit = restored.get_open_circuits()[DOMAIN]
+        self.assertEqual(circuit["state"], STATE_OPEN)
+        self.assertEqual(circuit["failures"], 3)
+        self.assertTrue(restored.allow_request(URL))
+        self.assertTrue(restored.allow_request(OTHER_URL))
+
+        # A breaker without a state path reads the file but never writes it
+        reader = DomainCircuitBreaker()
+        self.assertEqual(reader.load(state_path), 1)
+        reader.reset()
+        self.assertEqual(DomainCircuitBreaker(state_path=state_path).load(), 1)
+
+    def test_07_reset(self):
+        """Test that reset closes one or all circuits."""
+        breaker = self._breaker()
+        self._open(breaker)
+        for _ in range(3):
+            breaker.record_failure(OTHER_URL)
+        breaker.reset(DOMAIN)
+        self.assertTrue(breaker.allow_request(URL))
+        self.assertFalse(breaker.allow_request(OTHER_URL))
+        breaker.reset()
+        self.assertTrue(breaker.allow_request(OTHER_URL))
+        self.assertIn(("alive.example.org", STATE_CLOSED), self.transitions)
+
+    def test_08_corrupt_state_file(self):
+        """Test that an unreadable state file loads nothing."""
+        state_path = os.path.join(self.temp_dir, CIRCUIT_STATE_FILE_NAME)
+        with open(state_path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(DomainCircuitBreaker(state_path=state_path).load(), 0)
+
+    def test_09_apply_exported_circuit(self):
+        """Test that a circuit exported by another breaker is taken over, saved and announced."""
+        state_path = os.path.join(self.temp_dir, CIRCUIT_STATE_FILE_NAME)
+        shard = DomainCircuitBreaker(failure_threshold=3, cooldown_seconds=60)
+        main = self._breaker(state_path=state_path)
+        self.assertIsNone(shard.export_circuit(DOMAIN))
+        for _ in range(3):
+            shard.record_failure(URL, "refused")
+
+        main.apply_circuit(DOMAIN, shard.export_circuit(DOMAIN))
+        self.assertFalse(main.allow_request(URL))
+        self.assertEqual(main.retry_at(URL), shard.retry_at(URL))
+        self.assertEqual(self.transitions, [(DOMAIN, STATE_OPEN)])
+        self.assertEqual(DomainCircuitBreaker(state_path=state_path).load(), 1)
+
+        main.apply_circuit(DOMAIN, None)
+        self.assertTrue(main.allow_request(URL))
+        self.assertEqual(self.transitions[-1], (DOMAIN, STATE_CLOSED))
+        self.assertEqual(DomainCircuitBreaker(state_path=state_path).load(), 0)
+
+    def test_10_concurrent_saves(self):
+        """Test that saves from several threads leave a complete state file and no temp files."""
+        state_path = os.path.join(self.temp_dir, CIRCUIT_STATE_FILE_NAME)
+        breaker = self._breaker(state_path=state_path)
+        domains = [f"site{i}.example.com" for i in range(8)]
+
+        def open_circuit(domain):
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure(f"https://{domain}/", "refused")
+
+        threads = [threading.Thread(target=open_circuit, args=(domain,)) for domain in domains]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(os.listdir(self.temp_dir), [CIRCUIT_STATE_FILE_NAME])
+        self.assertEqual(DomainCircuitBreaker(state_path=state_path).load(), len(domains))
+
+    def test_11_failed_save_removes_the_temp_file(self):
+        """Test that a save failing mid-write keeps the old state file and leaves no temp file."""
+        state_path = os.path.join(self.temp_dir, CIRCUIT_STATE_FILE_NAME)
+        breaker = self._breaker(state_path=state_path)
+        self._open(breaker)
+        breaker.reset()
+        failures = (
+            ("json.dump", OSError("disk full")),
+            ("json.dump", ValueError("not serializable")),
+            ("os.replace", OSError("busy")),
+        )
+        for target, error in failures:
+            with self.subTest(target=target, error=error):
+                with mock.patch(f"src.core.circuit_breaker.{target}", side_effect=error):
+                    self._open(breaker)
+                self.assertEqual(os.listdir(self.temp_dir), [CIRCUIT_STATE_FILE_NAME])
+                self.assertEqual(DomainCircuitBreaker(state_path=state_path).load(), 0)
+                breaker.reset()
+
+
+if __name__ == "__main__":
+    unittest.main()
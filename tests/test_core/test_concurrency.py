@@ -0,0 +1,161 @@
+# tests/test_core/test_concurrency.py
+import unittest
+import asyncio
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.concurrency import (
+    DEFAULT_EVAL_INTERVAL,
+    AdaptiveConcurrencyController,
+    AdaptiveLimit,
+    OUTCOME_ERROR,
+    OUTCOME_OVERLOAD,
+    OUTCOME_SUCCESS,
+)
+
+
+def _saturated_successes(limit: AdaptiveLimit, count: int, latency: float = 0.1) -> None:
+    """Report successes while every slot of the limit is busy."""
+    for _ in range(count):
+        limit.in_flight = limit.current
+        limit.record(latency, OUTCOME_SUCCESS, limit.epoch)
+    limit.in_flight = 0
+
+
+class TestAdaptiveLimit(unittest.TestCase):
+    """Additive increase, multiplicative decrease of a single limit."""
+
+    def test_01_additive_increase_when_saturated(self):
+        """Test that the limit grows by one slot per round trip while saturated."""
+        limit = AdaptiveLimit("test", initial_limit=4, max_limit=10)
+        # +1/limit per success: about one slot per limit's worth of successes
+        _saturated_successes(limit, 4)
+        self.assertEqual(limit.current, 4)
+        _saturated_successes(limit, 1)
+        self.assertEqual(limit.current, 5)
+        _saturated_successes(limit, 5)
+        self.assertEqual(limit.current, 6)
+        self.assertEqual(limit.stats["increases"], 2)
+
+    def test_02_no_increase_when_idle(self):
+        """Test that successes below the limit do not grow it."""
+        limit = AdaptiveLimit("test", initial_limit=4, max_limit=10)
+        for _ in range(50):
+            limit.record(0.1, OUTCOME_SUCCESS, limit.epoch)
+        self.assertEqual(limit.current, 4)
+
+    def test_03_increase_is_capped(self):
+        """Test that the limit never exceeds max_limit."""
+        limit = AdaptiveLimit("test", initial_limit=2, max_limit=3)
+        _saturated_successes(limit, 100)
+        self.assertEqual(limit.current, 3)
+
+    def test_04_overload_halves_once_per_epoch(self):
+        """Test that a burst of timeouts from one epoch cuts the limit only once."""
+        limit = AdaptiveLimit("test", initial_limit=8, max_limit=16)
+        started_epoch = limit.epoch
+        for _ in range(5):
+            limit.record(1.0, OUTCOME_OVERLOAD, started_epoch)
+        self.assertEqual(limit.current, 4)
+        self.assertEqual(limit.stats["decreases"], 1)
+        # A request started after the cut may cut again
+        limit.record(1.0, OUTCOME_OVERLOAD, limit.epoch)
+        self.assertEqual(limit.current, 2)
+
+    def test_05_decrease_respects_min_limit(self):
+        """Test that cuts stop at min_limit."""
+        limit = AdaptiveLimit("test", initial_limit=2, min_limit=1, max_limit=4)
+        for _ in range(5):
+            limit.record(1.0, OUTCOME_OVERLOAD, limit.epoch)
+        self.assertEqual(limit.current, 1)
+
+    def test_06_error_rate_cuts(self):
+        """Test that an error rate above max_error_rate cuts the limit."""
+        limit = AdaptiveLimit("test", initial_limit=8, max_limit=16, max_error_rate=0.2)
+        for i in range(DEFAULT_EVAL_INTERVAL):
+            limit.record(0.1, OUTCOME_ERROR if i < 3 else OUTCOME_SUCCESS, limit.epoch)
+        self.assertEqual(limit.current, 4)
+
+    def test_07_latency_regression_cuts(self):
+        """Test that p95 latency well above its baseline cuts the limit."""
+        limit = AdaptiveLimit("test", initial_limit=8, max_limit=16, latency_tolerance=2.0)
+        for _ in range(DEFAULT_EVAL_INTERVAL):
+            limit.record(0.1, OUTCOME_SUCCESS, limit.epoch)
+        self.assertEqual(limit.get_stats()["baseline_p95_ms"], 100.0)
+        for _ in range(DEFAULT_EVAL_INTERVAL):
+            limit.record(0.5, OUTCOME_SUCCESS, limit.epoch)
+        self.assertEqual(limit.current, 4)
+
+    def test_08_acquire_waits_for_a_free_slot(self):
+        """Test that acquire blocks at the limit and release wakes a waiter."""
+
+        async def scenario():
+            limit = AdaptiveLimit("test", initial_limit=1, max_limit=1)
+            await limit.acquire()
+            waiter = asyncio.create_task(limit.acquire())
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            await limit.release()
+            await asyncio.wait_for(waiter, 1.0)
+            self.assertEqual(limit.in_flight, 1)
+
+        asyncio.run(scenario())
+
+
+class TestAdaptiveConcurrencyController(unittest.TestCase):
+    """Global and per-domain limits."""
+
+    def test_01_overload_cuts_only_its_domain(self):
+        """Test that timeouts of one domain cut its own limit, not the global one."""
+
+        async def scenario():
+            controller = AdaptiveConcurrencyController(
+                initial_limit=10, max_limit=20, initial_domain_limit=4, max_domain_limit=8
+            )
+            async with controller.slot("https://slow.example.com/a") as slot:
+                slot.report(OUTCOME_OVERLOAD)
+            async with controller.slot("https://fast.example.org/a") as slot:
+                slot.report(OUTCOME_SUCCESS)
+            return controller.get_stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["domains"]["slow.example.com"]["limit"], 2)
+        self.assertEqual(stats["domains"]["fast.example.org"]["limit"], 4)
+        self.assertEqual(stats["global"]["limit"], 10)
+        self.assertEqual(stats["global"]["in_flight"], 0)
+
+    def test_02_domain_limit_bounds_parallel_requests(self):
+        """Test that no more than the domain limit run at once for one domain."""
+
+        async def scenario():
+            controller = AdaptiveConcurrencyController(
+                initial_limit=10, max_limit=10, initial_domain_limit=2, max_domain_limit=2
+            )
+            running = peak = 0
+
+            async def fetch(i: int):
+                nonlocal running, peak
+                async with controller.slot(f"https://example.com/{i}") as slot:
+                    running += 1
+                    peak = max(peak, running)
+                    await asyncio.sleep(0.01)
+                    running -= 1
+                    slot.report(OUTCOME_SUCCESS)
+
+            await asyncio.gather(*(fetch(i) for i in range(8)))
+            return peak
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
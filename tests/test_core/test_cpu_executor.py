@@ -0,0 +1,117 @@
+# tests/test_core/test_cpu_executor.py
+import unittest
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.cpu_executor import WARM_UP_MODULES, CpuExecutor
+from src.core.metrics import PHASE_CPU_WAIT, PHASE_METADATA, FetchMetrics
+
+URL = "https://news.example.com/a"
+
+
+# Run in the worker processes, so module-level
+def _square(value: int) -> int:
+    return value * value
+
+
+def _fail(message: str) -> None:
+    raise ValueError(message)
+
+
+def _crash_once(marker_path: str) -> str:
+    """Kill the worker the first time (when the marker does not exist yet)."""
+    if not os.path.exists(marker_path):
+        open(marker_path, "w").close()
+        os._exit(1)
+    return "recovered"
+
+
+def _crash() -> None:
+    os._exit(1)
+
+
+def _loaded_modules(names):
+    return {name: name in sys.modules for name in names}
+
+
+class TestCpuExecutor(unittest.TestCase):
+    """Calls, failures and pool restarts of the worker pool."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="test_cpu_executor_")
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+
+    def _executor(self, **kwargs) -> CpuExecutor:
+        kwargs.setdefault("warm_up_modules", ())
+        executor = CpuExecutor(max_workers=1, **kwargs)
+        self.addCleanup(executor.shutdown, True)
+        return executor
+
+    def test_01_run_and_metrics(self):
+        """Test that results come back and run and wait times are recorded."""
+        metrics = FetchMetrics()
+        executor = self._executor(metrics=metrics)
+        self.assertEqual(asyncio.run(executor.run(URL, PHASE_METADATA, _square, 7)), 49)
+        summary = metrics.get_summary()
+        self.assertEqual(summary[PHASE_METADATA]["count"], 1)
+        self.assertEqual(summary[PHASE_CPU_WAIT]["count"], 1)
+
+    def test_02_exceptions_are_re_raised(self):
+        """Test that an exception of the function reaches the caller and the pool stays usable."""
+        executor = self._executor()
+
+        async def scenario():
+            with self.assertRaisesRegex(ValueError, "bad page"):
+                await executor.run(URL, PHASE_METADATA, _fail, "bad page")
+            return await executor.run(URL, PHASE_METADATA, _square, 3)
+
+        self.assertEqual(asyncio.run(scenario()), 9)
+        self.assertEqual(executor.get_stats()["failures"], 1)
+        self.assertEqual(executor.get_stats()["pool_restarts"], 0)
+
+    def test_03_broken_pool_is_replaced_and_the_call_retried(self):
+        """Test that a worker dying mid-call restarts the pool and the call succeeds on retry."""
+        executor = self._executor()
+        marker = os.path.join(self.temp_dir, "crashed")
+        result = asyncio.run(executor.run(URL, PHASE_METADATA, _crash_once, marker))
+        self.assertEqual(result, "recovered")
+        stats = executor.get_stats()
+        self.assertEqual((stats["pool_restarts"], stats["failures"], stats["calls"]), (1, 0, 1))
+
+    def test_04_call_that_breaks_every_pool_fails(self):
+        """Test that a call killing its worker twice is given up, and later calls get a new pool."""
+        executor = self._executor()
+
+        async def scenario():
+            with self.assertRaises(BrokenProcessPool):
+                await executor.run(URL, PHASE_METADATA, _crash)
+            return await executor.run(URL, PHASE_METADATA, _square, 4)
+
+        self.assertEqual(asyncio.run(scenario()), 16)
+        stats = executor.get_stats()
+        self.assertEqual((stats["pool_restarts"], stats["failures"]), (2, 1))
+
+    def test_05_warm_up_does_not_load_playwright(self):
+        """Test that the default warm-up imports the extraction modules but not Playwright."""
+        executor = self._executor(warm_up_modules=WARM_UP_MODULES)
+        loaded = asyncio.run(
+            executor.run(URL, PHASE_METADATA, _loaded_modules, ("src.core.link_extraction", "playwright"))
+        )
+        self.assertEqual(loaded, {"src.core.link_extraction": True, "playwright": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
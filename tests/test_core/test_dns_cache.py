@@ -0,0 +1,196 @@
+# tests/test_core/test_dns_cache.py
+import unittest
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+from aiohttp.abc import AbstractResolver
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.dns_cache import (
+    DNS_CACHE_FILE_NAME,
+    CachingResolver,
+    PersistentDnsCache,
+    warm_up_dns,
+)
+
+HOST = "news.example.com"
+
+
+def _addresses(ip: str):
+    return [{"host": ip, "family": int(socket.AF_INET), "proto": 6, "flags": 0}]
+
+
+class _FakeResolver(AbstractResolver):
+    """Resolves every host to 192.0.2.1, except hosts starting with 'bad'."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        self.calls.append(host)
+        if host.startswith("bad"):
+            raise OSError(f"cannot resolve {host}")
+        return [{"hostname": host, "port": port, **_addresses("192.0.2.1")[0]}]
+
+    async def close(self):
+        pass
+
+
+class TestPersistentDnsCache(unittest.TestCase):
+    """Expiry, eviction and persistence of cached addresses."""
+
+    def setUp(self):
+        self.now = 1_000_000.0
+        patcher = mock.patch("src.core.dns_cache.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.temp_dir = tempfile.mkdtemp(prefix="test_dns_cache_")
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.path = os.path.join(self.temp_dir, DNS_CACHE_FILE_NAME)
+
+    def test_01_entries_expire(self):
+        """Test that addresses are served until their TTL runs out, per host and family."""
+        cache = PersistentDnsCache(ttl_seconds=60)
+        cache.put(HOST, socket.AF_INET, _addresses("192.0.2.1"))
+        self.assertEqual(cache.get("News.Example.com", socket.AF_INET), _addresses("192.0.2.1"))
+        self.assertIsNone(cache.get(HOST, socket.AF_INET6))
+        self.now += 61
+        self.assertIsNone(cache.get(HOST, socket.AF_INET))
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+    def test_02_capacity_drops_the_entry_closest_to_expiry(self):
+        """Test that a full cache makes room by dropping the oldest entry."""
+        cache = PersistentDnsCache(ttl_seconds=60, max_entries=2)
+        cache.put("a.example.com", socket.AF_INET, _addresses("192.0.2.1"))
+        self.now += 1
+        cache.put("b.example.com", socket.AF_INET, _addresses("192.0.2.2"))
+        cache.put("c.example.com", socket.AF_INET, _addresses("192.0.2.3"))
+        self.assertIsNone(cache.get("a.example.com", socket.AF_INET))
+        self.assertIsNotNone(cache.get("b.example.com", socket.AF_INET))
+        self.assertIsNotNone(cache.get("c.example.com", socket.AF_INET))
+
+    def test_03_forget(self):
+        """Test that forget drops every family of a host."""
+        cache = PersistentDnsCache()
+        cache.put(HOST, socket.AF_INET, _addresses("192.0.2.1"))
+        cache.put(HOST, socket.AF_UNSPEC, _addresses("192.0.2.1"))
+        cache.forget("NEWS.example.com")
+        self.assertIsNone(cache.get(HOST, socket.AF_INET))
+        self.assertIsNone(cache.get(HOST, socket.AF_UNSPEC))
+        self.assertEqual(cache.get_stats()["forgotten"], 1)
+
+    def test_04_save_and_load(self):
+        """Test that unexpired entries survive a restart and expired ones do not."""
+        cache = PersistentDnsCache(self.path, ttl_seconds=60)
+        cache.put("short.example.com", socket.AF_INET, _addresses("192.0.2.1"))
+        self.now += 30
+        cache.put(HOST, socket.AF_INET, _addresses("192.0.2.2"))
+        cache.save()
+
+        self.now += 40
+        restored = PersistentDnsCache(self.path, ttl_seconds=60)
+        self.assertEqual(restored.load(), 1)
+        self.assertEqual(restored.get(HOST, socket.AF_INET), _addresses("192.0.2.2"))
+        self.assertIsNone(restored.get("short.example.com", socket.AF_INET))
+        self.assertEqual(os.listdir(self.temp_dir), [DNS_CACHE_FILE_NAME])
+
+    def test_05_save_only_when_changed(self):
+        """Test that an unchanged cache is not written again."""
+        cache = PersistentDnsCache(self.path)
+        cache.save()
+        self.assertFalse(os.path.exists(self.path))
+        cache.put(HOST, socket.AF_INET, _addresses("192.0.2.1"))
+        cache.save()
+        os.remove(self.path)
+        cache.save()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_06_unreadable_file(self):
+        """Test that a corrupt file or malformed entries load nothing."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(PersistentDnsCache(self.path).load(), 0)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"entries": {"x|2": {"expires_at": "soon"}, "y|2": "bad"}}, f)
+        self.assertEqual(PersistentDnsCache(self.path).load(), 0)
+        self.assertEqual(PersistentDnsCache(os.path.join(self.temp_dir, "missing.json")).load(), 0)
+
+    def test_07_concurrent_saves(self):
+        """Test that saves from several threads leave only the complete cache file."""
+        cache = PersistentDnsCache(self.path)
+
+        def save_repeatedly(index):
+            for n in range(20):
+                cache.put(f"host{index}-{n}.example.com", socket.AF_INET, _addresses("192.0.2.1"))
+                cache.save()
+
+        threads = [threading.Thread(target=save_repeatedly, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cache.save()
+        self.assertEqual(os.listdir(self.temp_dir), [DNS_CACHE_FILE_NAME])
+        self.assertEqual(PersistentDnsCache(self.path).load(), 80)
+
+    def test_08_failed_save_is_retried(self):
+        """Test that a failed save removes its temp file and is written on the next save."""
+        cache = PersistentDnsCache(self.path)
+        cache.put(HOST, socket.AF_INET, _addresses("192.0.2.1"))
+        with mock.patch("src.core.dns_cache.os.replace", side_effect=OSError("disk full")):
+            cache.save()
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        cache.save()
+        self.assertEqual(os.listdir(self.temp_dir), [DNS_CACHE_FILE_NAME])
+        self.assertEqual(PersistentDnsCache(self.path).load(), 1)
+
+
+class TestCachingResolver(unittest.TestCase):
+    """Resolution through the cache, and warm-up."""
+
+    def test_01_resolves_misses_once(self):
+        """Test that a host is resolved once and then answered from the cache."""
+        cache = PersistentDnsCache()
+        fake = _FakeResolver()
+        resolver = CachingResolver(cache, fake)
+
+        async def scenario():
+            first = await resolver.resolve(HOST, 443, socket.AF_INET)
+            second = await resolver.resolve(HOST, 80, socket.AF_INET)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(fake.calls, [HOST])
+        self.assertEqual(first[0]["host"], "192.0.2.1")
+        self.assertEqual((first[0]["port"], second[0]["port"]), (443, 80))
+        self.assertEqual(second[0]["hostname"], HOST)
+
+    def test_02_warm_up(self):
+        """Test that warm-up resolves each distinct host once and counts failures out."""
+        cache = PersistentDnsCache()
+        fake = _FakeResolver()
+        resolver = CachingResolver(cache, fake)
+        hosts = ["a.example.com", "b.example.com", "a.example.com", "bad.example.com", ""]
+        resolved = asyncio.run(warm_up_dns(resolver, hosts, concurrency=2))
+        self.assertEqual(resolved, 2)
+        self.assertEqual(sorted(fake.calls), ["a.example.com", "b.example.com", "bad.example.com"])
+        self.assertIsNotNone(cache.get("b.example.com", socket.AF_UNSPEC))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+# tests/test_core/test_feed_discovery.py
+import unittest
+import asyncio
+import os
+import sys
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.feed_discovery import (
+    FeedEntry,
+    discover_feed,
+    feed_candidates,
+    parse_feed,
+    parse_sitemap_index,
+    recent_entry_urls,
+)
+
+BASE_URL = "https://news.example.com/"
+
+# Starts with a byte order mark, as some feeds are served
+RSS = """\ufeff<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>News</title>
+  <item><title>First</title><link>https://news.example.com/a</link>
+    <pubDate>Tue, 01 Apr 2025 08:00:00 GMT</pubDate></item>
+  <item><title>Relative</title><link>/b</link></item>
+  <item><title>Guid only</title><guid>https://news.example.com/c</guid></item>
+  <item><title>Not a permalink</title><guid isPermaLink="false">tag:123</guid></item>
+  <item><title>Mail</title><link>mailto:desk@example.com</link></item>
+</channel></rss>
+"""
+
+RDF = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel><title>News</title></channel>
+  <item><title>Dated</title><link>https://news.example.com/rdf</link><dc:date>2025-04-01T08:00:00Z</dc:date></item>
+</rdf:RDF>
+"""
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>News</title>
+  <entry><title>Atom story</title>
+    <link rel="self" href="https://news.example.com/api/1"/>
+    <link href="https://news.example.com/atom-story"/>
+    <updated>2025-04-02T10:00:00+02:00</updated></entry>
+  <entry><title>No link</title></entry>
+</feed>
+"""
+
+NEWS_SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url><loc>https://news.example.com/sitemap-story</loc>
+    <news:news><news:title>Sitemap story</news:title>
+      <news:publication_date>2025-04-03</news:publication_date></news:news></url>
+  <url><loc>https://news.example.com/about</loc></url>
+</urlset>
+"""
+
+PLAIN_SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://news.example.com/about</loc><lastmod>2025-04-03</lastmod></url>
+</urlset>
+"""
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{origin}/sitemap-pages.xml</loc></sitemap>
+  <sitemap><loc>{origin}/sitemap-news.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+
+class TestParseFeed(unittest.TestCase):
+    """Entries of the supported feed formats."""
+
+    def test_01_rss(self):
+        """Test links, relative URLs, permalink guids and dates of an RSS 2.0 feed."""
+        entries = parse_feed(RSS.encode("utf-8"), BASE_URL)
+        self.assertEqual(
+            [entry.url for entry in entries],
+            ["https://news.example.com/a", "https://news.example.com/b", "https://news.example.com/c"],
+        )
+        self.assertEqual(entries[0].title, "First")
+        self.assertEqual(entries[0].published, 1743494400.0)
+        self.assertIsNone(entries[1].published)
+
+    def test_02_rdf_and_atom(self):
+        """Test RSS 1.0 items with Dublin Core dates and Atom alternate links."""
+        rdf = parse_feed(RDF)
+        self.assertEqual([(e.url, e.published) for e in rdf], [("https://news.example.com/rdf", 1743494400.0)])
+        atom = parse_feed(ATOM)
+        self.assertEqual([entry.url for entry in atom], ["https://news.example.com/atom-story"])
+        self.assertEqual(atom[0].published, 1743580800.0)
+
+    def test_03_news_sitemap(self):
+        """Test that only news entries of a sitemap are taken, and plain sitemaps give nothing."""
+        entries = parse_feed(NEWS_SITEMAP)
+        self.assertEqual([(e.url, e.title) for e in entries], [("https://news.example.com/sitemap-story", "Sitemap story")])
+        self.assertEqual(entries[0].published, 1743638400.0)
+        self.assertEqual(parse_feed(PLAIN_SITEMAP), [])
+
+    def test_04_not_a_feed(self):
+        """Test HTML, invalid XML and empty documents."""
+        for content in ("<html><body><a href='/a'>A</a></body></html>", "<rss><channel>", "", b"  "):
+            with self.subTest(content=content):
+                self.assertEqual(parse_feed(content, BASE_URL), [])
+
+    def test_05_sitemap_index(self):
+        """Test the child sitemaps of an index."""
+        self.assertEqual(
+            parse_sitemap_index(SITEMAP_INDEX.format(origin="https://x.com")),
+            ["https://x.com/sitemap-pages.xml", "https://x.com/sitemap-news.xml"],
+        )
+        self.assertEqual(parse_sitemap_index(NEWS_SITEMAP), [])
+
+    def test_06_recent_entry_urls(self):
+        """Test newest-first order, the age cutoff, undated entries, duplicates and the limit."""
+        now = 1_000_000.0
+        entries = [
+            FeedEntry("https://e.com/old", published=now - 10 * 86400),
+            FeedEntry("https://e.com/undated"),
+            FeedEntry("https://e.com/newer", published=now - 3600),
+            FeedEntry("https://e.com/newest", published=now - 60),
+            FeedEntry("https://e.com/newer", published=now - 3600),
+        ]
+        with mock.patch("src.core.feed_discovery.time.time", return_value=now):
+            self.assertEqual(
+                recent_entry_urls(entries, max_age_seconds=7 * 86400),
+                ["https://e.com/newest", "https://e.com/newer", "https://e.com/undated"],
+            )
+            self.assertEqual(recent_entry_urls(entries, limit=1), ["https://e.com/newest"])
+
+
+class TestFeedDiscovery(unittest.TestCase):
+    """Candidate order and discovery against a local site."""
+
+    def test_01_candidates(self):
+        """Test that announced feeds come first, then the section and well-known feeds."""
+        html = (
+            '<html><head><link rel="alternate" type="application/rss+xml" href="/rss/tech.xml">'
+            '<link rel="stylesheet" href="/site.css"></head></html>'
+        )
+        self.assertEqual(
+            feed_candidates("https://news.example.com/tech/", html),
+            [
+                "https://news.example.com/rss/tech.xml",
+                "https://news.example.com/tech/feed",
+                "https://news.example.com/feed",
+                "https://news.example.com/rss.xml",
+                "https://news.example.com/atom.xml",
+            ],
+        )
+
+    def _discover(self, routes, page_path="/tech/", html=None):
+        requested = []
+
+        def handler_for(body, content_type):
+            async def handler(request):
+                requested.append(request.path)
+                return web.Response(text=body.format(origin=origin[0]), content_type=content_type)
+            return handler
+
+        origin = [""]
+
+        async def scenario():
+            app = web.Application()
+            for path, (body, content_type) in routes.items():
+                app.router.add_get(path, handler_for(body, content_type))
+            runner = web.AppRunner(app)
+            await runner.setup()
+            try:
+                await web.TCPSite(runner, "127.0.0.1", 0).start()
+                origin[0] = f"http://127.0.0.1:{runner.addresses[0][1]}"
+                async with aiohttp.ClientSession() as session:
+                    found = await discover_feed(session, origin[0] + page_path, html)
+                return found.replace(origin[0], "") if found else None
+            finally:
+                await runner.cleanup()
+
+        return asyncio.run(scenario()), requested
+
+    def test_02_well_known_feed(self):
+        """Test that a feed at a well-known path is found and non-feeds are skipped."""
+        found, requested = self._discover(
+            {
+                "/tech/feed": ("<html>Not a feed</html>", "text/html"),
+                "/rss.xml": (RSS, "application/rss+xml"),
+            }
+        )
+        self.assertEqual(found, "/rss.xml")
+        self.assertEqual(requested, ["/tech/feed", "/rss.xml"])
+
+    def test_03_news_sitemap_from_robots(self):
+        """Test that robots.txt sitemap indexes are followed into their news child."""
+        found, requested = self._discover(
+            {
+                "/robots.txt": ("User-agent: *\nSitemap: {origin}/sitemap.xml\n", "text/plain"),
+                "/sitemap.xml": (SITEMAP_INDEX, "application/xml"),
+                "/sitemap-pages.xml": (PLAIN_SITEMAP, "application/xml"),
+                "/sitemap-news.xml": (NEWS_SITEMAP, "application/xml"),
+            }
+        )
+        self.assertEqual(found, "/sitemap-news.xml")
+        self.assertNotIn("/sitemap-pages.xml", requested)
+
+    def test_04_nothing_found(self):
+        """Test that a site without feeds gives None."""
+        found, _ = self._discover({"/robots.txt": ("User-agent: *\n", "text/plain")})
+        self.assertIsNone(found)
+
+
+if __name__ == "__main__":
+    unittest.main()
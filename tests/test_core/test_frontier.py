@@ -0,0 +1,153 @@
+# tests/test_core/test_frontier.py
+import unittest
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.frontier import UrlFrontier
+from src.core.url_index import UrlIndex
+from src.utils.url_utils import canonicalize_url
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+    """Variants of one article map to one key; different pages do not."""
+
+    def test_01_variants_share_a_key(self):
+        """Test scheme, host case, port, slash, index page, fragment and tracking variants."""
+        key = canonicalize_url("https://news.example.com/2025/04/story")
+        variants = [
+            "http://news.example.com/2025/04/story",
+            "HTTPS://News.Example.COM/2025/04/story/",
+            "https://news.example.com:443/2025/04/story",
+            "http://news.example.com:80/2025/04/story",
+            "https://news.example.com//2025//04/story",
+            "https://news.example.com/2025/04/story/index.html",
+            "https://news.example.com/2025/04/story#comments",
+            "https://news.example.com/2025/04/story?utm_source=rss&utm_medium=feed",
+            "https://news.example.com/2025/04/story?fbclid=abc&gclid=def",
+            "https://news.example.com./2025/04/story",
+            "  https://news.example.com/2025/04/story  ",
+        ]
+        for variant in variants:
+            with self.subTest(variant=variant):
+                self.assertEqual(canonicalize_url(variant), key)
+
+    def test_02_query_is_kept_and_sorted(self):
+        """Test that content parameters stay, in a stable order."""
+        self.assertEqual(
+            canonicalize_url("https://example.com/list?page=2&cat=tech&utm_campaign=x"),
+            canonicalize_url("https://example.com/list?cat=tech&page=2"),
+        )
+        self.assertNotEqual(
+            canonicalize_url("https://example.com/list?page=2"),
+            canonicalize_url("https://example.com/list?page=3"),
+        )
+
+    def test_03_distinct_pages_stay_distinct(self):
+        """Test that port, path case and percent-encoding differences are preserved."""
+        base = canonicalize_url("https://example.com/News")
+        self.assertNotEqual(base, canonicalize_url("https://example.com/news"))
+        self.assertNotEqual(base, canonicalize_url("https://example.com:8443/News"))
+        self.assertEqual(
+            canonicalize_url("https://example.com/a%20b"),
+            canonicalize_url("https://example.com/a b"),
+        )
+
+    def test_04_non_http_urls(self):
+        """Test that anything but absolute http(s) URLs has no key."""
+        for url in ("", None, "/relative/path", "mailto:a@example.com", "ftp://example.com/x",
+                    "javascript:void(0)", "https://", "http://example.com:notaport/"):
+            with self.subTest(url=url):
+                self.assertIsNone(canonicalize_url(url))
+
+
+class TestUrlFrontier(unittest.TestCase):
+    """Canonical seen-set semantics of the crawl frontier."""
+
+    def test_01_add_and_seen(self):
+        """Test that a URL and its variants are claimed once."""
+        frontier = UrlFrontier()
+        self.assertFalse(frontier.seen("https://example.com/a"))
+        self.assertTrue(frontier.add("https://example.com/a"))
+        self.assertTrue(frontier.seen("http://example.com/a/?utm_source=x"))
+        self.assertFalse(frontier.add("http://example.com/a/#top"))
+        self.assertEqual(len(frontier), 1)
+        self.assertEqual(frontier.get_stats()["duplicates"], 1)
+
+    def test_02_uncanonicalizable_urls_are_rejected(self):
+        """Test that relative and non-http URLs are neither added nor seen."""
+        frontier = UrlFrontier()
+        self.assertFalse(frontier.add("/relative"))
+        self.assertFalse(frontier.add("mailto:a@example.com"))
+        self.assertFalse(frontier.seen("/relative"))
+        self.assertEqual(len(frontier), 0)
+
+    def test_03_seed_counts_distinct_urls(self):
+        """Test that seeding skips variants and bad URLs and marks the rest as seen."""
+        frontier = UrlFrontier()
+        seeded = frontier.seed(
+            ["https://example.com/a", "http://example.com/a/", "https://example.com/b", "", "/x"]
+        )
+        self.assertEqual(seeded, 2)
+        self.assertFalse(frontier.add("https://example.com/b?utm_medium=rss"))
+
+    def test_04_filter_new_keeps_order_and_dedups(self):
+        """Test that filter_new returns unseen URLs in order, once per canonical form."""
+        frontier = UrlFrontier()
+        frontier.seed(["https://example.com/old"])
+        links = [
+            "https://example.com/new1",
+            "http://example.com/old",
+            "https://example.com/new2",
+            "https://example.com/new1/",
+            "javascript:void(0)",
+            "https://example.com/new3",
+        ]
+        self.assertEqual(
+            frontier.filter_new(links),
+            ["https://example.com/new1", "https://example.com/new2", "https://example.com/new3"],
+        )
+        self.assertEqual(frontier.filter_new(links), [])
+
+    def test_05_many_urls_are_all_kept(self):
+        """Test that a large run keeps every distinct URL."""
+        frontier = UrlFrontier()
+        urls = [f"https://example.com/article/{i}" for i in range(20000)]
+        self.assertEqual(frontier.filter_new(urls), urls)
+        stats = frontier.get_stats()
+        self.assertEqual(stats["urls"], 20000)
+        self.assertEqual(stats["duplicates"], 0)
+        self.assertEqual(frontier.filter_new(urls[::100]), [])
+
+    def test_06_reset(self):
+        """Test that reset forgets everything."""
+        frontier = UrlFrontier()
+        frontier.add("https://example.com/a")
+        frontier.reset()
+        self.assertEqual(len(frontier), 0)
+        self.assertTrue(frontier.add("https://example.com/a"))
+
+    def test_07_stored_url_index(self):
+        """Test that URLs in the stored index count as seen without seeding."""
+        stored = UrlIndex()
+        stored.load(["https://example.com/stored"])
+        frontier = UrlFrontier(stored=stored)
+        self.assertTrue(frontier.seen("http://example.com/stored/"))
+        self.assertFalse(frontier.add("https://example.com/stored?utm_source=x"))
+        self.assertTrue(frontier.add("https://example.com/fresh"))
+        # Only the run's own URLs are held by the frontier
+        self.assertEqual(len(frontier), 1)
+        frontier.reset()
+        self.assertTrue(frontier.seen("https://example.com/stored"))
+
+
+if __name__ == "__main__":
+    unittest.main()
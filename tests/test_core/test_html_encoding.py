@@ -0,0 +1,87 @@
+# tests/test_core/test_html_encoding.py
+import unittest
+import codecs
+import os
+import sys
+from unittest import mock
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.crawler import CHARSET_DETECT_BYTES, CHARSET_SNIFF_BYTES, sniff_html_encoding
+
+CHINESE_TEXT = "新闻标题与正文内容"
+
+
+def _page(head: str, body: str = CHINESE_TEXT) -> str:
+    return f"<html><head>{head}<title>t</title></head><body><p>{body}</p></body></html>"
+
+
+class TestSniffHtmlEncoding(unittest.TestCase):
+    """Charset detection order: header, BOM, <meta>, detector, UTF-8."""
+
+    def test_01_header_charset_wins(self):
+        """Test that a valid Content-Type charset is used as is."""
+        raw = _page('<meta charset="utf-8">').encode("gb18030")
+        self.assertEqual(sniff_html_encoding(raw, "GB18030"), "gb18030")
+        self.assertEqual(sniff_html_encoding(raw, '"ISO-8859-1"'), "iso8859-1")
+
+    def test_02_legacy_chinese_charsets_use_superset(self):
+        """Test that gb2312 / gbk declarations decode as gb18030."""
+        raw = _page('<meta charset="gb2312">').encode("gb18030")
+        self.assertEqual(sniff_html_encoding(raw, "gbk"), "gb18030")
+        self.assertEqual(sniff_html_encoding(raw), "gb18030")
+
+    def test_03_unknown_header_charset_is_ignored(self):
+        """Test that an unknown header charset falls through to the document."""
+        raw = _page('<meta charset="shift_jis">', "ニュース記事").encode("shift_jis")
+        self.assertEqual(sniff_html_encoding(raw, "x-made-up"), "shift_jis")
+
+    def test_04_bom(self):
+        """Test that a byte order mark decides the encoding without a header."""
+        html = _page("")
+        self.assertEqual(sniff_html_encoding(codecs.BOM_UTF8 + html.encode("utf-8")), "utf-8-sig")
+        self.assertEqual(sniff_html_encoding(html.encode("utf-16")), "utf-16")
+        # A BOM beats a contradicting <meta>
+        raw = codecs.BOM_UTF8 + _page('<meta charset="gbk">').encode("utf-8")
+        self.assertEqual(sniff_html_encoding(raw), "utf-8-sig")
+
+    def test_05_meta_charset_forms(self):
+        """Test <meta charset> and <meta http-equiv> declarations."""
+        self.assertEqual(
+            sniff_html_encoding(_page("<meta charset='Big5'>", "新聞標題").encode("big5")), "big5"
+        )
+        http_equiv = '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=euc-kr">'
+        self.assertEqual(
+            sniff_html_encoding(_page(http_equiv, "뉴스 기사").encode("euc-kr")), "euc_kr"
+        )
+
+    def test_06_detector_sees_bounded_prefix(self):
+        """Test that <meta> is only sniffed in the prefix and the detector gets a bounded slice."""
+        padding = "<!--" + "x" * CHARSET_SNIFF_BYTES + "-->"
+        raw = _page(padding + '<meta charset="koi8-r">', "y" * CHARSET_DETECT_BYTES).encode("ascii")
+        with mock.patch("src.core.crawler.charset_normalizer.from_bytes") as from_bytes:
+            from_bytes.return_value.best.return_value = None
+            self.assertEqual(sniff_html_encoding(raw), "utf-8")
+        (detected,), _ = from_bytes.call_args
+        self.assertEqual(detected, raw[:CHARSET_DETECT_BYTES])
+
+    def test_07_detector_fallback(self):
+        """Test that undeclared content is detected well enough to decode."""
+        raw = _page("", CHINESE_TEXT * 40).encode("utf-8")
+        encoding = sniff_html_encoding(raw)
+        self.assertIn(CHINESE_TEXT, raw.decode(encoding))
+
+    def test_08_empty_content_defaults_to_utf8(self):
+        """Test that an empty body falls back to UTF-8."""
+        self.assertEqual(sniff_html_encoding(b""), "utf-8")
+
+
+if __name__ == "__main__":
+    unittest.main()
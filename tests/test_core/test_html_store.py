@@ -0,0 +1,164 @@
+# tests/test_core/test_html_store.py
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from unittest import mock
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.html_store import RawHtmlStore, content_key
+
+
+def _page(n: int) -> str:
+    # Varied enough that the compressed entries have comparable sizes
+    return "<html><body>" + "".join(f"<p>Paragraph {n}-{i}</p>" for i in range(200)) + "</body></html>"
+
+
+class TestRawHtmlStore(unittest.TestCase):
+    """Deduplication, eviction and sharing of stored pages."""
+
+    def setUp(self):
+        self.now = 1_000_000.0
+        patcher = mock.patch("src.core.html_store.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.root_dir = tempfile.mkdtemp(prefix="test_html_store_")
+        self.addCleanup(shutil.rmtree, self.root_dir, True)
+
+    def test_01_put_and_get(self):
+        """Test that a page is stored once under its content key and read back."""
+        store = RawHtmlStore(self.root_dir)
+        key = store.put(_page(1))
+        self.assertEqual(key, content_key(_page(1)))
+        self.assertEqual(store.put(_page(1)), key)
+        self.assertEqual(store.get(key), _page(1))
+        self.assertTrue(store.is_persisted(key))
+        stats = store.get_stats()
+        self.assertEqual((stats["puts"], stats["dedup_hits"], stats["entries"]), (2, 1, 1))
+        self.assertIsNone(store.get(content_key("missing")))
+
+    def test_02_ttl_eviction(self):
+        """Test that entries not accessed within the TTL are evicted, accessed ones kept."""
+        store = RawHtmlStore(self.root_dir, ttl_seconds=100)
+        old = store.put(_page(1))
+        fresh = store.put(_page(2))
+        old_path = store._index[old][0]
+        self.now += 60
+        store.get(fresh)
+        self.now += 60
+        self.assertEqual(store.evict(), 1)
+        self.assertFalse(store.contains(old))
+        self.assertEqual(store.get(fresh), _page(2))
+        self.assertFalse(os.path.exists(old_path))
+
+    def test_03_lru_eviction_over_budget(self):
+        """Test that the least recently used entries go first once the byte budget is exceeded."""
+        store = RawHtmlStore(self.root_dir, ttl_seconds=0)
+        keys = []
+        for n in range(3):
+            keys.append(store.put(_page(n)))
+            self.now += 1
+        store.get(keys[0])  # Most recently used now
+        sizes = [os.path.getsize(store._index[key][0]) for key in keys]
+        store.max_bytes = sizes[0] + sizes[2] + 1
+        self.assertEqual(store.evict(), 1)
+        self.assertEqual([store.contains(key) for key in keys], [True, False, True])
+        self.assertEqual(store.get_stats()["evicted"], 1)
+
+    def test_04_index_survives_restart(self):
+        """Test that a new store over the same directory finds the existing entries."""
+        key = RawHtmlStore(self.root_dir).put(_page(1))
+        reopened = RawHtmlStore(self.root_dir)
+        self.assertEqual(reopened.get_stats()["entries"], 1)
+        self.assertEqual(reopened.get(key), _page(1))
+
+    def test_05_adopts_entries_of_other_processes(self):
+        """Test that entries written by another store sharing the directory are indexed on access."""
+        reader = RawHtmlStore(self.root_dir)
+        writer = RawHtmlStore(self.root_dir)
+        first = writer.put(_page(1))
+        second = writer.put(_page(2))
+        self.assertFalse(reader.is_persisted(first))
+        self.assertTrue(reader.contains(first))
+        self.assertTrue(reader.is_persisted(first))
+        self.assertEqual(reader.get(second), _page(2))
+        self.assertEqual(reader.get_stats()["entries"], 2)
+
+    def test_06_memory_fallback_when_disk_fails(self):
+        """Test that a page that cannot be written is still returned, but not as persisted."""
+        store = RawHtmlStore(self.root_dir)
+        with mock.patch("src.core.html_store.tempfile.mkstemp", side_effect=OSError("disk full")):
+            key = store.put(_page(1))
+        self.assertEqual(store.get(key), _page(1))
+        self.assertTrue(store.contains(key))
+        self.assertFalse(store.is_persisted(key))
+
+    def test_07_unreadable_entry_is_dropped(self):
+        """Test that a corrupt file is treated as a miss and removed."""
+        store = RawHtmlStore(self.root_dir)
+        key = store.put(_page(1))
+        path = store._index[key][0]
+        with open(path, "wb") as f:
+            f.write(b"not compressed")
+        self.assertIsNone(store.get(key))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(store.get_stats()["entries"], 0)
+
+    def test_08_put_rewrites_a_page_evicted_by_another_process(self):
+        """Test that put() of a page another store evicted writes it again instead of trusting the index."""
+        store_a = RawHtmlStore(self.root_dir, ttl_seconds=100)
+        store_b = RawHtmlStore(self.root_dir, ttl_seconds=100)
+        key = store_b.put(_page(1))
+        store_a.get(key)
+        self.now += 200
+        self.assertEqual(store_a.evict(), 1)
+        self.assertFalse(store_b.is_persisted(key))
+        self.assertEqual(store_b.put(_page(1)), key)
+        self.assertTrue(store_b.is_persisted(key))
+        self.assertEqual(store_a.get(key), _page(1))
+        self.assertEqual(store_b.get(key), _page(1))
+        self.assertEqual(store_b.get_stats()["dedup_hits"], 0)
+        self.assertEqual(store_b._total_bytes, os.path.getsize(store_b._index[key][0]))
+
+    def test_09_failed_write_leaves_no_temp_file(self):
+        """Test that a write failing after mkstemp removes its temp file."""
+        store = RawHtmlStore(self.root_dir)
+        with mock.patch("src.core.html_store.os.replace", side_effect=OSError("disk full")):
+            key = store.put(_page(1))
+        leftovers = [
+            name for _, _, files in os.walk(self.root_dir) for name in files if name.endswith(".tmp")
+        ]
+        self.assertEqual(leftovers, [])
+        self.assertFalse(store.is_persisted(key))
+        self.assertEqual(store.get(key), _page(1))
+
+    def test_10_concurrent_puts_count_the_size_once(self):
+        """Test that two writers of the same new page add its size to the total only once."""
+        store = RawHtmlStore(self.root_dir)
+        real_replace = os.replace
+        raced = []
+
+        def replace_then_race(src, dst):
+            real_replace(src, dst)
+            if not raced:
+                # A second writer that passed the duplicate check before this one indexed the page
+                raced.append(True)
+                store.put(_page(1))
+
+        with mock.patch("src.core.html_store.os.replace", side_effect=replace_then_race):
+            key = store.put(_page(1))
+        self.assertEqual(store.get_stats()["entries"], 1)
+        self.assertEqual(store._total_bytes, os.path.getsize(store._index[key][0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+# tests/test_core/test_http_cache.py
+import unittest
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.crawler import AiohttpCrawler
+from src.core.http_cache import HTTP_CACHE_DB_NAME, HttpCache
+
+URL = "https://example.com/news"
+PAGE = "<html><body><a href='/a'>Story</a></body></html>"
+ETAG = '"v1"'
+
+
+class TestHttpCache(unittest.TestCase):
+    """Storage, namespaces and expiry of cached responses."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="test_http_cache_")
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.db_path = os.path.join(self.temp_dir, HTTP_CACHE_DB_NAME)
+
+    def _cache(self, **kwargs) -> HttpCache:
+        cache = HttpCache(self.db_path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_01_store_and_get(self):
+        """Test that a lookup returns the validators and the body is loaded separately."""
+        cache = self._cache()
+        self.assertIsNone(cache.get(URL))
+        self.assertTrue(
+            cache.store(URL, URL + "/", PAGE, etag=ETAG, last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+        )
+        cached = cache.get(URL)
+        self.assertFalse(hasattr(cached, "content"))
+        self.assertEqual(cache.load_content(URL), PAGE)
+        self.assertEqual(cached.final_url, URL + "/")
+        self.assertEqual(
+            cached.conditional_headers(),
+            {"If-None-Match": ETAG, "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+        self.assertEqual(cache.get_stats(), {"hits": 1, "misses": 1, "stores": 1, "not_modified": 0})
+
+    def test_02_responses_without_validators_are_not_cached(self):
+        """Test that only revalidatable, non-empty responses are stored."""
+        cache = self._cache()
+        self.assertFalse(cache.store(URL, URL, PAGE))
+        self.assertFalse(cache.store(URL, URL, "", etag=ETAG))
+        self.assertIsNone(cache.get(URL))
+
+    def test_03_namespaces_do_not_mix(self):
+        """Test that caches sharing one file only see their own entries."""
+        html_cache = self._cache(namespace="aiohttp")
+        links_cache = self._cache(namespace="playwright_links")
+        html_cache.store(URL, URL, PAGE, etag=ETAG)
+        self.assertIsNone(links_cache.get(URL))
+        links_cache.store(URL, URL, "[]", etag='"links"')
+        self.assertEqual(html_cache.load_content(URL), PAGE)
+        self.assertEqual(links_cache.load_content(URL), "[]")
+        html_cache.delete(URL)
+        self.assertIsNone(html_cache.get(URL))
+        self.assertIsNotNone(links_cache.get(URL))
+
+    def test_04_prune_and_refresh(self):
+        """Test that revalidation keeps an entry alive and stale entries are pruned."""
+        now = [1_000_000.0]
+        with mock.patch("src.core.http_cache.time.time", side_effect=lambda: now[0]):
+            cache = self._cache(max_age_seconds=100)
+            cache.store(URL, URL, PAGE, etag=ETAG)
+            cache.store(URL + "/old", URL + "/old", PAGE, etag=ETAG)
+            now[0] += 80
+            cache.mark_not_modified(URL)
+            cache.mark_not_modified(URL + "/old", refresh=False)
+            now[0] += 50
+            self.assertEqual(cache.prune(), 1)
+        self.assertIsNotNone(cache.get(URL))
+        self.assertIsNone(cache.get(URL + "/old"))
+        self.assertEqual(cache.get_stats()["not_modified"], 2)
+
+    def test_05_corrupt_entry_is_dropped(self):
+        """Test that a body that does not decompress loads as None and is deleted."""
+        cache = self._cache()
+        cache.store(URL, URL, PAGE, etag=ETAG)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE http_cache SET body = ?", (b"not zlib",))
+        # The lookup does not touch the body
+        self.assertEqual(cache.get(URL).etag, ETAG)
+        self.assertIsNone(cache.load_content(URL))
+        self.assertIsNone(cache.get(URL))
+        self.assertIsNone(cache.load_content(URL + "/missing"))
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0], 0)
+
+
+class TestConditionalGet(unittest.TestCase):
+    """AiohttpCrawler revalidation against a local server."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="test_http_cache_")
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+
+    def test_01_not_modified_is_served_from_cache(self):
+        """Test that the second fetch sends the ETag and serves the cached body on 304."""
+        cache = HttpCache(os.path.join(self.temp_dir, HTTP_CACHE_DB_NAME))
+        self.addCleanup(cache.close)
+        crawler = AiohttpCrawler(http_cache=cache, max_retries=0)
+        requests = []
+
+        async def handler(request):
+            requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == ETAG:
+                return web.Response(status=304, headers={"ETag": ETAG})
+            return web.Response(text=PAGE, content_type="text/html", headers={"ETag": ETAG})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/news", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            try:
+                await web.TCPSite(runner, "127.0.0.1", 0).start()
+                url = f"http://127.0.0.1:{runner.addresses[0][1]}/news"
+                async with aiohttp.ClientSession() as session:
+                    return [await crawler._fetch_single(session, url) for _ in range(2)]
+            finally:
+                await runner.cleanup()
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(requests, [None, ETAG])
+        self.assertEqual(first["content"], PAGE)
+        self.assertEqual(second["content"], PAGE)
+        self.assertEqual(second["error"], "")
+        self.assertEqual(cache.get_stats()["not_modified"], 1)
+
+    def test_02_unusable_cached_body_is_fetched_again(self):
+        """Test that a 304 for a corrupt cached body leads to one unconditional GET."""
+        cache = HttpCache(os.path.join(self.temp_dir, HTTP_CACHE_DB_NAME))
+        self.addCleanup(cache.close)
+        crawler = AiohttpCrawler(http_cache=cache, max_retries=0)
+        requests = []
+
+        async def handler(request):
+            requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == ETAG:
+                return web.Response(status=304, headers={"ETag": ETAG})
+            return web.Response(text=PAGE, content_type="text/html", headers={"ETag": ETAG})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/news", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            try:
+                await web.TCPSite(runner, "127.0.0.1", 0).start()
+                url = f"http://127.0.0.1:{runner.addresses[0][1]}/news"
+                cache.store(url, url, PAGE, etag=ETAG)
+                with sqlite3.connect(cache.db_path) as conn:
+                    conn.execute("UPDATE http_cache SET body = ?", (b"not zlib",))
+                async with aiohttp.ClientSession() as session:
+                    return await crawler._fetch_single(session, url)
+            finally:
+                await runner.cleanup()
+
+        result = asyncio.run(scenario())
+        self.assertEqual(requests, [ETAG, None])
+        self.assertEqual((result["content"], result["error"]), (PAGE, ""))
+        self.assertEqual(cache.get_stats()["not_modified"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# tests/test_core/test_hybrid_fetcher.py
+import unittest
+import asyncio
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.hybrid_fetcher import (
+    BACKEND_BROWSER,
+    BACKEND_STATIC,
+    MIN_ANCHOR_COUNT,
+    HybridFetcher,
+    detect_js_rendering,
+)
+
+URL = "https://news.example.com/"
+
+LISTING_PAGE = (
+    "<html><head><script>var tracking = 1;</script></head><body><main>"
+    + "".join(
+        f'<p><a href="/2025/04/story-{i}.html">Story number {i} about the news of the day</a></p>'
+        for i in range(MIN_ANCHOR_COUNT + 5)
+    )
+    + "</main></body></html>"
+)
+LONG_TEXT = "<p>" + "Plenty of server-rendered text. " * 20 + "</p>"
+
+
+class TestDetectJsRendering(unittest.TestCase):
+    """Heuristics deciding whether a static page needs the browser."""
+
+    def test_01_static_listing_is_usable(self):
+        """Test that a page with text and enough links is kept."""
+        self.assertIsNone(detect_js_rendering(LISTING_PAGE))
+
+    def test_02_empty_and_near_empty_pages(self):
+        """Test that empty responses and bodies with hardly any text are escalated."""
+        self.assertEqual(detect_js_rendering(""), "empty response")
+        self.assertEqual(detect_js_rendering("  \n"), "empty response")
+        reason = detect_js_rendering("<html><body><div id='root'></div></body></html>")
+        self.assertTrue(reason.startswith("near-empty body"))
+
+    def test_03_script_text_does_not_count(self):
+        """Test that text inside script, style and noscript blocks is not page text."""
+        html = (
+            "<html><body><script>" + "window.__STATE__ = {};" * 50 + "</script>"
+            "<style>" + ".a{color:red}" * 50 + "</style><div id='app'></div></body></html>"
+        )
+        self.assertTrue(detect_js_rendering(html).startswith("near-empty body"))
+
+    def test_04_few_links(self):
+        """Test the reasons given for pages with text but too few links."""
+        spa = f"<html><body><div id='__next'>{LONG_TEXT}<a href='/a'>A</a></div></body></html>"
+        self.assertEqual(detect_js_rendering(spa), "SPA root marker with only 1 links")
+        noscript = (
+            f"<html><body><noscript>Please enable JavaScript to view this site.</noscript>"
+            f"{LONG_TEXT}</body></html>"
+        )
+        self.assertEqual(detect_js_rendering(noscript), "page asks to enable JavaScript")
+        plain = f"<html><body>{LONG_TEXT}<a href='/a'>A</a><a href='/b'>B</a></body></html>"
+        self.assertEqual(detect_js_rendering(plain), "only 2 links")
+
+
+class _FakeStaticCrawler:
+    def __init__(self, result):
+        self.result = result
+
+    async def fetch_url(self, url):
+        return dict(self.result)
+
+
+class _FakeBrowserCrawler:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def _fetch_single(self, url, scroll_page=False, readiness=None):
+        self.calls.append(url)
+        return dict(self.result)
+
+
+class TestHybridFetcher(unittest.TestCase):
+    """Backend choice of HybridFetcher."""
+
+    def _fetch(self, static_result, browser_result, backend_hint=None, reprobe_rate=0.0):
+        browser = _FakeBrowserCrawler(browser_result)
+        fetcher = HybridFetcher(
+            _FakeStaticCrawler(static_result), browser, browser_reprobe_rate=reprobe_rate
+        )
+        result, backend = asyncio.run(fetcher.fetch(URL, backend_hint))
+        return result, backend, browser.calls, fetcher.get_stats()
+
+    def test_01_static_page_stays_static(self):
+        """Test that a usable static page is not fetched again in the browser."""
+        result, backend, calls, stats = self._fetch(
+            {"content": LISTING_PAGE, "error": ""}, {"content": "<html/>", "error": ""}
+        )
+        self.assertEqual((backend, calls), (BACKEND_STATIC, []))
+        self.assertEqual(result["content"], LISTING_PAGE)
+        self.assertEqual(stats, {"static": 1, "browser": 0, "escalated": 0, "reprobed": 0})
+
+    def test_02_js_page_is_escalated(self):
+        """Test that a JS-rendered page goes to the browser and is flagged as such."""
+        rendered = {"content": LISTING_PAGE, "error": ""}
+        result, backend, calls, stats = self._fetch({"content": "<div id='root'></div>", "error": ""}, rendered)
+        self.assertEqual((backend, calls, stats["escalated"]), (BACKEND_BROWSER, [URL], 1))
+        self.assertTrue(result["js_rendering"].startswith("near-empty body"))
+
+    def test_03_browser_hint_skips_the_static_fetch(self):
+        """Test that a source remembered as JS-rendered goes straight to the browser."""
+        _, backend, calls, stats = self._fetch(
+            {"content": LISTING_PAGE, "error": ""}, {"content": LISTING_PAGE, "error": ""},
+            backend_hint=BACKEND_BROWSER,
+        )
+        self.assertEqual((backend, calls, stats["static"]), (BACKEND_BROWSER, [URL], 0))
+
+    def test_04_static_page_kept_when_the_browser_fails(self):
+        """Test that a thin static page beats a failed browser fetch."""
+        thin = "<html><body>" + LONG_TEXT + "</body></html>"
+        result, backend, _, _ = self._fetch(
+            {"content": thin, "error": ""}, {"content": "", "error": "browser crashed"}
+        )
+        self.assertEqual((backend, result["content"]), (BACKEND_STATIC, thin))
+
+    def test_05_transient_static_failure_is_not_remembered(self):
+        """Test that a browser fetch after a static transport error is not flagged as JS-rendered."""
+        result, backend, calls, _ = self._fetch(
+            {"content": "", "error": "Request timed out (>30 seconds)", "error_category": "retryable"},
+            {"content": LISTING_PAGE, "error": ""},
+        )
+        self.assertEqual((backend, calls), (BACKEND_BROWSER, [URL]))
+        self.assertNotIn("js_rendering", result)
+
+    def test_06_permanent_static_failure_is_not_escalated(self):
+        """Test that 404s and rejected responses are not fetched again in the browser."""
+        for error in ("HTTP error: 404 Not Found", "Unsupported content type: application/pdf"):
+            with self.subTest(error=error):
+                result, backend, calls, _ = self._fetch(
+                    {"content": "", "error": error, "error_category": "non_retryable"},
+                    {"content": LISTING_PAGE, "error": ""},
+                )
+                self.assertEqual((backend, calls, result["error"]), (BACKEND_STATIC, [], error))
+
+    def test_07_browser_source_is_reprobed(self):
+        """Test that a browser-pinned source whose static page is usable goes back to aiohttp."""
+        result, backend, calls, stats = self._fetch(
+            {"content": LISTING_PAGE, "error": ""}, {"content": LISTING_PAGE, "error": ""},
+            backend_hint=BACKEND_BROWSER, reprobe_rate=1.0,
+        )
+        self.assertEqual((backend, calls, stats["reprobed"]), (BACKEND_STATIC, [], 1))
+        _, backend, calls, _ = self._fetch(
+            {"content": "<div id='root'></div>", "error": ""}, {"content": LISTING_PAGE, "error": ""},
+            backend_hint=BACKEND_BROWSER, reprobe_rate=1.0,
+        )
+        self.assertEqual((backend, calls), (BACKEND_BROWSER, [URL]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+# tests/test_core/test_link_extraction.py
+import unittest
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from bs4 import BeautifulSoup
+
+from src.core.link_extraction import (
+    decode_links,
+    encode_links,
+    extract_html_links,
+    parse_html,
+)
+from src.utils.exclusion_matcher import compile_exclusion_matcher
+from src.utils.html_utils import DEFAULT_EXCLUSION_MATCHER
+
+BASE_URL = "https://news.example.com/section/"
+
+PAGE = """<html><head><title>Site</title></head>
+<body>
+  <header><a href="/">Home</a></header>
+  <nav class="primary"><a href="/world">World</a></nav>
+  <div class="sidebar"><a href="/trending">Trending</a></div>
+  <main id="content">
+    <a href="/2025/04/first.html">First   story</a>
+    <article class="story lead">
+      <a href="second.html"><span>Second</span> <b>story</b><span class="ad">AD</span></a>
+      <a href="https://other.example.org/third">Third story</a>
+      <a href="#comments">Comments</a>
+      <a href="mailto:desk@example.com">Mail the desk</a>
+      <a href="javascript:void(0)">Share</a>
+      <a href="/img"><img src="/x.png" alt="Only an image"></a>
+      <a href="/2025/04/first.html">First   story</a>
+      <a href="/2025/04/first.html">First story, again</a>
+      <div class="comments"><a href="/user/1">Commenter</a></div>
+    </article>
+  </main>
+  <section><a href="/unnamed">Unnamed section</a></section>
+  <a href="/top-level">Outside any section</a>
+  <footer><a href="/privacy">Privacy</a></footer>
+</body></html>
+"""
+
+
+class TestExtractHtmlLinks(unittest.TestCase):
+    """Anchors of fetched HTML outside the excluded subtrees."""
+
+    def test_01_links_in_document_order(self):
+        """Test texts, resolved hrefs and sections of the extracted links."""
+        links = extract_html_links(PAGE, BASE_URL)
+        self.assertEqual(
+            [(link["text"], link["href"], link["section"]) for link in links],
+            [
+                ("First story", "https://news.example.com/2025/04/first.html", "main#content"),
+                ("Second story", "https://news.example.com/section/second.html", "article.story"),
+                ("Third story", "https://other.example.org/third", "article.story"),
+                ("Comments", "https://news.example.com/section/#comments", "article.story"),
+                ("First story, again", "https://news.example.com/2025/04/first.html", "article.story"),
+                ("Unnamed section", "https://news.example.com/unnamed", "section"),
+                ("Outside any section", "https://news.example.com/top-level", ""),
+            ],
+        )
+
+    def test_02_excluded_subtrees_are_skipped(self):
+        """Test that header, nav, sidebar, comments and footer links are not extracted."""
+        hrefs = {link["href"] for link in extract_html_links(PAGE, BASE_URL)}
+        for path in ("/", "/world", "/trending", "/user/1", "/privacy"):
+            self.assertNotIn("https://news.example.com" + path, hrefs)
+
+    def test_03_excluded_children_are_not_link_text(self):
+        """Test that text of excluded elements inside an anchor is left out."""
+        texts = [link["text"] for link in extract_html_links(PAGE, BASE_URL)]
+        self.assertIn("Second story", texts)
+        self.assertFalse(any("AD" in text for text in texts))
+
+    def test_04_custom_matcher(self):
+        """Test that per-source overrides change which subtrees are skipped."""
+        matcher = DEFAULT_EXCLUSION_MATCHER.with_overrides(exclude=["article"], keep=["nav", "footer"])
+        links = extract_html_links(PAGE, BASE_URL, matcher=matcher)
+        self.assertEqual(
+            [link["text"] for link in links],
+            ["World", "First story", "Unnamed section", "Outside any section", "Privacy"],
+        )
+        self.assertEqual(links[0]["section"], "nav.primary")
+
+    def test_05_complex_selectors(self):
+        """Test that selectors the matcher cannot decide per element still exclude their subtrees."""
+        matcher = DEFAULT_EXCLUSION_MATCHER.with_overrides(
+            exclude=["main > a", "article a[href^='https://other']", "section:first-of-type"]
+        )
+        self.assertTrue(matcher.complex_selectors)
+        links = extract_html_links(PAGE, BASE_URL, matcher=matcher)
+        self.assertEqual(
+            [link["text"] for link in links],
+            ["Second story", "Comments", "First story", "First story, again", "Outside any section"],
+        )
+        self.assertEqual(links[2]["section"], "article.story")
+
+    def test_06_max_links(self):
+        """Test that extraction stops at max_links."""
+        links = extract_html_links(PAGE, BASE_URL, max_links=2)
+        self.assertEqual([link["text"] for link in links], ["First story", "Second story"])
+
+    def test_07_empty_and_unparsable_input(self):
+        """Test that empty or content-free pages give no links."""
+        self.assertEqual(extract_html_links("", BASE_URL), [])
+        self.assertEqual(extract_html_links("   ", BASE_URL), [])
+        self.assertEqual(extract_html_links("<html><body><p>No links</p></body></html>", BASE_URL), [])
+
+
+class TestLinkEncoding(unittest.TestCase):
+    """Link lists stored as crawl result content."""
+
+    def test_01_round_trip(self):
+        """Test that encoded links decode to the same list, non-ASCII text included."""
+        links = [
+            {"text": "新闻标题", "href": "https://example.com/a", "section": "main"},
+            {"text": "Second", "href": "https://example.com/b", "box": [0, 10, 100, 20], "section": ""},
+        ]
+        content = encode_links(links)
+        self.assertIn("新闻标题", content)
+        self.assertEqual(decode_links(content), links)
+
+    def test_02_invalid_content(self):
+        """Test that invalid content and entries without href are dropped."""
+        self.assertEqual(decode_links("not json"), [])
+        self.assertEqual(decode_links(None), [])
+        self.assertEqual(
+            decode_links('[{"text": "no href"}, "string", {"text": "ok", "href": "https://e.com/"}]'),
+            [{"text": "ok", "href": "https://e.com/"}],
+        )
+
+
+
+# --- parse_html fixtures: each page is parsed by both lxml and BeautifulSoup ---
+PAGE_CHROME = """<!DOCTYPE html>
+<html><head><title>Site</title><style>body { color: red; }</style>
+<script>var tracking = "ignored";</script></head>
+<body>
+  <header><a href="/">Home</a> <a href="/about">About</a></header>
+  <nav class="menu"><ul><li><a href="/world">World</a></li><li><a href="/tech">Tech</a></li></ul></nav>
+  <div id="sidebar"><h3>Trending</h3><a href="/trending/1">Trending story</a></div>
+  <main>
+    <article>
+      <h1>Main headline</h1>
+      <p>First <strong>bold</strong> and <em>emphasis</em> with a
+         <a href="/2025/04/story.html" title="Story">relative link</a>.</p>
+      <p>Second paragraph<br>after a line break<br/>and another.</p>
+    </article>
+  </main>
+  <aside class="ad-banner">Buy now</aside>
+  <footer><p>Copyright 2025</p><a href="/privacy">Privacy</a></footer>
+</body></html>
+"""
+
+PAGE_LISTS = """<html><body>
+<h2>Latest</h2>
+<ul>
+  <li><a href="https://news.example.com/a1">Article one</a></li>
+  <li>Plain item with <code>inline code</code></li>
+  <li>Nested
+    <ol start="3"><li>three</li><li>four <b>bold</b></li></ol>
+  </li>
+</ul>
+<ol><li><p>Paragraph item</p><p>Second paragraph in item</p></li></ol>
+<dl><dt>Term</dt><dd>Definition text</dd></dl>
+</body></html>
+"""
+
+PAGE_TABLES = """<html><body>
+<table>
+  <caption>Results</caption>
+  <thead><tr><th>Team</th><th>Score</th></tr></thead>
+  <tbody>
+    <tr><td>Red</td><td>3</td></tr>
+    <tr><td colspan="2">Abandoned | rain</td></tr>
+  </tbody>
+</table>
+<table><tr><td>No header</td><td>row</td></tr><tr><td>x</td><td>y</td></tr></table>
+</body></html>
+"""
+
+PAGE_CODE_QUOTES = """<html><body>
+<pre><code class="language-python">def f(x):
+    return x * 2
+
+print(f(21))</code></pre>
+<pre>  indented   pre
+text</pre>
+<blockquote><p>Quoted <em>text</em></p><blockquote>nested quote</blockquote></blockquote>
+<p>A <q>short quote</q>, <del>deleted</del>, <sub>sub</sub> and <sup>sup</sup>.</p>
+<hr>
+<h3>Heading with <a href="#top">anchor</a></h3>
+</body></html>
+"""
+
+PAGE_MEDIA = """<html><body>
+<figure><img src="/img/photo.jpg" alt="A photo" title="Photo title"><figcaption>Caption text</figcaption></figure>
+<p>Inline <img src="https://cdn.example.com/x.png" alt=""> image and
+<a href="https://example.org/"><img src="/logo.png" alt="Logo"></a></p>
+<video src="/clip.mp4" poster="/poster.jpg">Video fallback</video>
+<iframe src="https://ads.example.com/frame"></iframe>
+<div class="comments"><p>User comment</p></div>
+<p>Text with &amp; entities &lt;tag&gt; &nbsp; and   irregular
+   whitespace\tand *asterisks* _underscores_ [brackets]</p>
+</body></html>
+"""
+
+PAGE_MALFORMED = """<body><div><p>Unclosed paragraph<p>Another <b>bold <i>nested</b> text</i>
+<ul><li>item one<li>item two</ul><table><tr><td>cell<td>cell 2</table>
+<!-- a comment --><div class="share-buttons">Share</div><span>tail text</span>"""
+
+PAGES = {
+    "chrome": PAGE_CHROME,
+    "lists": PAGE_LISTS,
+    "tables": PAGE_TABLES,
+    "code_quotes": PAGE_CODE_QUOTES,
+    "media": PAGE_MEDIA,
+    "malformed": PAGE_MALFORMED,
+}
+
+
+def _lxml_elements(html: str):
+    return [
+        (element.tag, dict(element.attrib), (element.text or "").strip())
+        for element in parse_html(html).iter()
+        if isinstance(element.tag, str)
+    ]
+
+
+def _soup_elements(html: str):
+    soup = BeautifulSoup(html, "lxml")
+    return [
+        (
+            tag.name,
+            {k: " ".join(v) if isinstance(v, list) else v for k, v in tag.attrs.items()},
+            tag.contents[0].strip() if tag.contents and isinstance(tag.contents[0], str) else "",
+        )
+        for tag in soup.find_all(True)
+    ]
+
+
+class TestParseHtml(unittest.TestCase):
+    """parse_html must build the tree BeautifulSoup's lxml builder builds."""
+
+    def test_01_same_tree_as_beautifulsoup(self):
+        """Test element order, attributes and leading text against BeautifulSoup."""
+        for name, html in PAGES.items():
+            with self.subTest(page=name):
+                self.assertEqual(_lxml_elements(html), _soup_elements(html))
+
+    def test_02_same_exclusion_decisions(self):
+        """Test that a matcher flags the same elements on both trees."""
+        matcher = compile_exclusion_matcher([".menu", "#sidebar", ".share-buttons"], ["nav", "script"])
+        for name, html in PAGES.items():
+            with self.subTest(page=name):
+                flagged = [
+                    element.tag
+                    for element in parse_html(html).iter()
+                    if isinstance(element.tag, str) and matcher.matches(element.tag, element.attrib)
+                ]
+                expected = [
+                    tag.name
+                    for tag in BeautifulSoup(html, "lxml").find_all(True)
+                    if matcher.matches(tag.name, tag.attrs)
+                ]
+                self.assertEqual(flagged, expected)
+
+    def test_03_empty_input(self):
+        """Test that a document without any markup has no root."""
+        self.assertIsNone(parse_html(""))
+        self.assertEqual(parse_html("plain text").tag, "html")
+
+
+if __name__ == "__main__":
+    unittest.main()
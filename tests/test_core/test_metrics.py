@@ -0,0 +1,146 @@
+# tests/test_core/test_metrics.py
+import unittest
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import aiohttp
+from aiohttp import web
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.metrics import (
+    ALL_DOMAINS,
+    PHASE_CONNECT,
+    PHASE_DOWNLOAD,
+    PHASE_TOTAL,
+    PHASE_TTFB,
+    FetchMetrics,
+    LatencyHistogram,
+)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Bucketing and percentiles of the HDR-style histogram."""
+
+    def test_01_buckets_cover_every_value_once(self):
+        """Test that consecutive buckets are contiguous and each value falls in its own bucket."""
+        previous_high = -1
+        for index in range(LatencyHistogram._bucket_index(10**7) + 1):
+            low, high = LatencyHistogram._bucket_bounds(index)
+            self.assertEqual(low, previous_high + 1, f"gap before bucket {index}")
+            self.assertEqual(LatencyHistogram._bucket_index(low), index)
+            self.assertEqual(LatencyHistogram._bucket_index(high), index)
+            previous_high = high
+
+    def test_02_percentiles_within_precision(self):
+        """Test that percentiles are within 1/SUB_BUCKETS of the exact sample percentiles."""
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(4, 1.2) for _ in range(5000)]
+        histogram = LatencyHistogram()
+        for value in samples:
+            histogram.record(value)
+        ordered = sorted(samples)
+        for percent in (50, 90, 99):
+            with self.subTest(percent=percent):
+                exact = ordered[int(round(len(ordered) * percent / 100.0)) - 1]
+                self.assertAlmostEqual(
+                    histogram.percentile(percent), exact, delta=exact / LatencyHistogram.SUB_BUCKETS
+                )
+
+    def test_03_summary(self):
+        """Test count, min, mean and max of the summary, and an empty histogram."""
+        self.assertEqual(LatencyHistogram().to_dict(), {"count": 0})
+        self.assertEqual(LatencyHistogram().percentile(50), 0.0)
+        histogram = LatencyHistogram()
+        for value in (1.0, 2.0, 3.0, 250.0):
+            histogram.record(value)
+        summary = histogram.to_dict()
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["min_ms"], 1.0)
+        self.assertEqual(summary["max_ms"], 250.0)
+        self.assertEqual(summary["mean_ms"], 64.0)
+        self.assertAlmostEqual(summary["p99_ms"], 250.0, delta=250.0 / LatencyHistogram.SUB_BUCKETS)
+        self.assertAlmostEqual(summary["p50_ms"], 2.0, delta=2.0 / LatencyHistogram.SUB_BUCKETS)
+
+
+class TestFetchMetrics(unittest.TestCase):
+    """Per-domain histograms, counters, dumps and aiohttp tracing."""
+
+    def test_01_per_domain_and_aggregate(self):
+        """Test that samples land under their domain and the all-domains aggregate."""
+        metrics = FetchMetrics()
+        metrics.record_url("https://A.example.com/x", PHASE_DOWNLOAD, 10.0)
+        metrics.record_url("https://b.example.com/y", PHASE_DOWNLOAD, 30.0)
+        metrics.record("a.example.com", PHASE_TOTAL, 50.0)
+        domains = metrics.to_dict()["domains"]
+        self.assertEqual(set(domains), {"a.example.com", "b.example.com", ALL_DOMAINS})
+        self.assertEqual(domains["a.example.com"][PHASE_DOWNLOAD]["count"], 1)
+        self.assertEqual(metrics.get_summary()[PHASE_DOWNLOAD]["count"], 2)
+        self.assertEqual(metrics.get_summary()[PHASE_TOTAL]["max_ms"], 50.0)
+
+    def test_02_counters(self):
+        """Test that counters are kept per domain and totalled."""
+        metrics = FetchMetrics()
+        metrics.increment_url("https://a.example.com/", "retries")
+        metrics.increment_url("https://b.example.com/", "retries", 2)
+        self.assertEqual(metrics.get_counters(), {"retries": 3})
+        self.assertEqual(metrics.to_dict()["counters"]["b.example.com"], {"retries": 2})
+
+    def test_03_dump_json_and_reset(self):
+        """Test that a dump is written only when there is data and a destination."""
+        dump_dir = tempfile.mkdtemp(prefix="test_metrics_")
+        self.addCleanup(shutil.rmtree, dump_dir, True)
+        metrics = FetchMetrics(dump_dir=dump_dir)
+        self.assertIsNone(metrics.dump_json())
+        with metrics.timer("https://a.example.com/", PHASE_TOTAL):
+            pass
+        path = metrics.dump_json()
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["domains"]["a.example.com"][PHASE_TOTAL]["count"], 1)
+        self.assertIsNone(FetchMetrics().dump_json())
+        metrics.reset()
+        self.assertEqual(metrics.get_summary(), {})
+
+    def test_04_trace_config(self):
+        """Test that a real request records connect and ttfb for its domain."""
+        metrics = FetchMetrics()
+
+        async def handler(request):
+            return web.Response(text="ok")
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            try:
+                await web.TCPSite(runner, "127.0.0.1", 0).start()
+                url = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+                async with aiohttp.ClientSession(trace_configs=[metrics.create_trace_config()]) as session:
+                    for _ in range(2):
+                        async with session.get(url) as response:
+                            await response.text()
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(scenario())
+        phases = metrics.to_dict()["domains"]["127.0.0.1"]
+        self.assertEqual(phases[PHASE_TTFB]["count"], 2)
+        # The second request reuses the pooled connection
+        self.assertEqual(phases[PHASE_CONNECT]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
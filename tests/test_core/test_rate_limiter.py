@@ -0,0 +1,146 @@
+# tests/test_core/test_rate_limiter.py
+import unittest
+import asyncio
+import os
+import sys
+from email.utils import formatdate
+from unittest import mock
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.rate_limiter import (
+    DEFAULT_PENALTY_SECONDS,
+    MAX_RETRY_AFTER_SECONDS,
+    DomainRateLimit,
+    DomainRateLimiter,
+    parse_retry_after,
+)
+
+URL = "https://news.example.com/page"
+OTHER_URL = "https://other.example.org/page"
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Retry-After as delta-seconds and as an HTTP date."""
+
+    def setUp(self):
+        self.now = 1_700_000_000.0
+        patcher = mock.patch("src.core.rate_limiter.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_01_seconds(self):
+        """Test that delta-seconds are returned as they are."""
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertEqual(parse_retry_after(" 1.5 "), 1.5)
+        self.assertEqual(parse_retry_after("-5"), 0.0)
+
+    def test_02_http_date(self):
+        """Test that an HTTP date becomes the seconds left until it."""
+        self.assertAlmostEqual(parse_retry_after(formatdate(self.now + 30, usegmt=True)), 30.0)
+        self.assertEqual(parse_retry_after(formatdate(self.now - 30, usegmt=True)), 0.0)
+
+    def test_03_clamped_to_maximum(self):
+        """Test that absurdly long waits are capped at MAX_RETRY_AFTER_SECONDS."""
+        self.assertEqual(parse_retry_after("100000"), MAX_RETRY_AFTER_SECONDS)
+        far = formatdate(self.now + 10 * MAX_RETRY_AFTER_SECONDS, usegmt=True)
+        self.assertEqual(parse_retry_after(far), MAX_RETRY_AFTER_SECONDS)
+
+    def test_04_missing_or_invalid(self):
+        """Test that missing and unparsable values give None."""
+        for value in (None, "", "soon", "Mon, 99 Foo 2025"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_retry_after(value))
+
+
+class TestDomainRateLimiter(unittest.TestCase):
+    """Token buckets per domain, penalties and the lock-free wait."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch(
+            "src.core.rate_limiter.time.monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = DomainRateLimiter(DomainRateLimit(rate=2.0, burst=4))
+
+    def test_01_burst_then_spacing(self):
+        """Test that a burst goes through at once and later requests are spaced by 1/rate."""
+        waits = [self.limiter.reserve(URL) for _ in range(6)]
+        self.assertEqual(waits[:4], [0.0] * 4)
+        self.assertAlmostEqual(waits[4], 0.5)
+        self.assertAlmostEqual(waits[5], 1.0)
+        # The reservations are due after 1s; after 2s more the burst is back, not more
+        self.now += 3.0
+        self.assertEqual([self.limiter.reserve(URL) for _ in range(4)], [0.0] * 4)
+        self.assertAlmostEqual(self.limiter.reserve(URL), 0.5)
+
+    def test_02_domains_are_independent(self):
+        """Test that one domain's exhausted bucket does not delay another domain."""
+        for _ in range(10):
+            self.limiter.reserve(URL)
+        self.assertEqual(self.limiter.reserve(OTHER_URL), 0.0)
+        self.assertGreater(self.limiter.reserve("https://NEWS.example.com/x"), 0.0)
+
+    def test_03_per_domain_limits(self):
+        """Test that configured limits override the default and invalid ones are ignored."""
+        self.limiter.load_limits([("News.Example.com", 1.0, 1), ("bad.example.com", 0, 1)])
+        self.assertEqual(self.limiter.export_limits(), [("news.example.com", 1.0, 1)])
+        self.assertEqual(self.limiter.get_limit("bad.example.com"), self.limiter.default_limit)
+        self.assertEqual(self.limiter.reserve(URL), 0.0)
+        self.assertAlmostEqual(self.limiter.reserve(URL), 1.0)
+
+    def test_04_penalize_pauses_new_reservations(self):
+        """Test that a penalty holds back the domain's next tokens for the Retry-After period."""
+        self.assertEqual(self.limiter.penalize(URL, 10.0), 10.0)
+        self.assertAlmostEqual(self.limiter.reserve(URL), 10.0)
+        self.assertAlmostEqual(self.limiter.reserve(URL), 10.5)
+        self.assertEqual(self.limiter.reserve(OTHER_URL), 0.0)
+        # Once the pause and the queued reservations are over, the domain is open again
+        self.now += 20.0
+        self.assertEqual(self.limiter.reserve(URL), 0.0)
+
+    def test_05_penalty_default_and_clamp(self):
+        """Test the penalty without Retry-After and the cap on long ones."""
+        self.assertEqual(self.limiter.penalize(URL), DEFAULT_PENALTY_SECONDS)
+        self.assertEqual(self.limiter.penalize(OTHER_URL, 1e6), MAX_RETRY_AFTER_SECONDS)
+        self.assertAlmostEqual(self.limiter.reserve(OTHER_URL), MAX_RETRY_AFTER_SECONDS)
+        self.assertEqual(self.limiter.get_stats()["penalties"], 2)
+
+    def test_06_no_lock_held_while_sleeping(self):
+        """Test that acquire sleeps outside the lock, so other requests can reserve meanwhile."""
+        slept = []
+
+        async def fake_sleep(delay):
+            self.assertTrue(self.limiter._lock.acquire(blocking=False))
+            self.limiter._lock.release()
+            # Another request reserves while this one is waiting
+            self.assertEqual(self.limiter.reserve(OTHER_URL), 0.0)
+            slept.append(delay)
+
+        for _ in range(4):
+            self.limiter.reserve(URL)
+        with mock.patch("src.core.rate_limiter.asyncio.sleep", fake_sleep):
+            waited = asyncio.run(self.limiter.acquire(URL))
+        self.assertAlmostEqual(waited, 0.5)
+        self.assertEqual(slept, [waited])
+
+    def test_07_stats(self):
+        """Test the acquire, delay and wait counters."""
+        for _ in range(6):
+            self.limiter.reserve(URL)
+        stats = self.limiter.get_stats()
+        self.assertEqual((stats["acquired"], stats["delayed"], stats["domains"]), (6, 2, 1))
+        self.assertAlmostEqual(stats["total_wait_seconds"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# tests/test_core/test_readiness.py
+import unittest
+import asyncio
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.readiness import (
+    DEFAULT_MAX_SCROLLS,
+    DEFAULT_SETTLE_MS,
+    MAX_SETTLE_MS,
+    MIN_SETTLE_MS,
+    WAIT_NETWORKIDLE,
+    WAIT_QUIESCENCE,
+    ReadinessProfile,
+    settle_page,
+)
+
+
+def _observation(links: int, strategy: str = WAIT_QUIESCENCE):
+    return {"strategy": strategy, "links": links}
+
+
+class _FakePage:
+    """Answers the quiescence script with scripted DOM states."""
+
+    url = "https://news.example.com/"
+
+    def __init__(self, anchor_counts):
+        self.anchor_counts = list(anchor_counts)
+        self.scrolls = 0
+
+    async def evaluate(self, script, arg=None):
+        if arg is None:
+            self.scrolls += 1
+            return None
+        return {
+            "quiet": True,
+            "elapsed": arg[0] + 10.0,
+            "mutations": 3,
+            "anchors": self.anchor_counts.pop(0),
+            "height": 2000,
+        }
+
+
+class TestReadinessProfile(unittest.TestCase):
+    """Stored profiles and settle time learning."""
+
+    def test_01_from_dict(self):
+        """Test defaults for missing values and normalization of stored ones."""
+        self.assertEqual(ReadinessProfile.from_dict(None), ReadinessProfile())
+        profile = ReadinessProfile.from_dict(
+            {"wait_strategy": "bogus", "max_scrolls": -2, "js_enabled": 0, "settle_ms": 10, "expected_links": None}
+        )
+        self.assertEqual(profile.wait_strategy, WAIT_QUIESCENCE)
+        self.assertEqual(profile.max_scrolls, 0)
+        self.assertIs(profile.js_enabled, False)
+        self.assertEqual(profile.settle_ms, MIN_SETTLE_MS)
+        self.assertIsNone(profile.expected_links)
+        self.assertEqual(ReadinessProfile.from_dict({"settle_ms": 99999}).settle_ms, MAX_SETTLE_MS)
+        self.assertEqual(ReadinessProfile.from_dict({"max_scrolls": None}).max_scrolls, DEFAULT_MAX_SCROLLS)
+
+    def test_02_full_link_sets_shorten_the_wait(self):
+        """Test that complete fetches lower the settle time down to its floor."""
+        profile = ReadinessProfile()
+        self.assertTrue(profile.learn(_observation(100)))
+        self.assertEqual(profile.expected_links, 100)
+        self.assertLess(profile.settle_ms, DEFAULT_SETTLE_MS)
+        for _ in range(20):
+            profile.learn(_observation(95))
+        self.assertEqual(profile.settle_ms, MIN_SETTLE_MS)
+        self.assertEqual(profile.expected_links, 100)
+        self.assertFalse(profile.learn(_observation(100)))
+
+    def test_03_missing_links_lengthen_the_wait(self):
+        """Test that an incomplete fetch doubles the settle time and decays the expectation."""
+        profile = ReadinessProfile(settle_ms=400, expected_links=100)
+        self.assertTrue(profile.learn(_observation(50)))
+        self.assertEqual(profile.settle_ms, 800)
+        self.assertEqual(profile.expected_links, 95)
+        for _ in range(5):
+            profile.learn(_observation(50))
+        self.assertEqual(profile.settle_ms, MAX_SETTLE_MS)
+
+    def test_04_page_that_shrank_stops_being_incomplete(self):
+        """Test that a lasting drop in links is eventually accepted as the full set."""
+        profile = ReadinessProfile(expected_links=100)
+        for _ in range(20):
+            profile.learn(_observation(60))
+            if profile.expected_links * 0.9 <= 60:
+                break
+        settle_ms = profile.settle_ms
+        profile.learn(_observation(60))
+        self.assertLess(profile.settle_ms, settle_ms)
+
+    def test_05_other_observations_are_ignored(self):
+        """Test that non-quiescence strategies and failed reads teach nothing."""
+        profile = ReadinessProfile()
+        self.assertFalse(profile.learn(_observation(100, strategy=WAIT_NETWORKIDLE)))
+        self.assertFalse(profile.learn(_observation(0)))
+        self.assertEqual(profile, ReadinessProfile())
+
+    def test_06_settle_page_scrolls_until_links_stop_growing(self):
+        """Test the observation settle_page builds from the page's quiescence states."""
+        page = _FakePage([20, 35, 50, 50, 80])
+        profile = ReadinessProfile(settle_ms=200, max_scrolls=5)
+        observation = asyncio.run(settle_page(page, profile))
+        self.assertEqual(page.scrolls, 3)
+        self.assertEqual(observation["links"], 50)
+        self.assertEqual(observation["scrolls"], 3)
+        self.assertEqual(observation["wait_ms"], 4 * 210.0)
+        self.assertTrue(profile.learn(observation))
+
+        no_scroll = asyncio.run(settle_page(_FakePage([20]), profile, scroll=False))
+        self.assertEqual((no_scroll["links"], no_scroll["scrolls"]), (20, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+# tests/test_core/test_retry_policy.py
+import unittest
+import asyncio
+import multiprocessing
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.metrics import FetchMetrics
+from src.core.rate_limiter import RateLimitedError
+from src.core.retry_policy import (
+    COUNTER_NON_RETRYABLE,
+    COUNTER_RATE_LIMITED_RETRIES,
+    COUNTER_RETRIES,
+    COUNTER_RETRIES_EXHAUSTED,
+    COUNTER_RETRY_BUDGET_EXHAUSTED,
+    RETRY_NON_RETRYABLE,
+    RETRY_RATE_LIMITED,
+    RETRY_RETRYABLE,
+    RetryBudget,
+    RetryFailure,
+    RetryPolicy,
+    classify_error,
+    classify_status,
+)
+
+URL = "https://example.com/news"
+
+
+def _spend_retries(budget: RetryBudget, count: int) -> None:
+    for _ in range(count):
+        budget.try_spend()
+
+
+class _StatusError(Exception):
+    """An error carrying a status like aiohttp / openai exceptions do."""
+
+    def __init__(self, message, status=None, status_code=None, headers=None):
+        super().__init__(message)
+        if status is not None:
+            self.status = status
+        if status_code is not None:
+            self.status_code = status_code
+        self.headers = headers
+
+
+class TestClassification(unittest.TestCase):
+    """Error categories of statuses and exceptions."""
+
+    def test_01_classify_status(self):
+        """Test throttling, server, retryable client and final client statuses."""
+        cases = {
+            429: RETRY_RATE_LIMITED,
+            503: RETRY_RATE_LIMITED,
+            500: RETRY_RETRYABLE,
+            502: RETRY_RETRYABLE,
+            408: RETRY_RETRYABLE,
+            425: RETRY_RETRYABLE,
+            400: RETRY_NON_RETRYABLE,
+            403: RETRY_NON_RETRYABLE,
+            404: RETRY_NON_RETRYABLE,
+            410: RETRY_NON_RETRYABLE,
+        }
+        for status, category in cases.items():
+            with self.subTest(status=status):
+                self.assertEqual(classify_status(status), category)
+
+    def test_02_rate_limited_error(self):
+        """Test that RateLimitedError keeps its Retry-After."""
+        failure = classify_error(RateLimitedError(429, 12.0))
+        self.assertEqual(failure.category, RETRY_RATE_LIMITED)
+        self.assertEqual(failure.retry_after, 12.0)
+
+    def test_03_status_attributes(self):
+        """Test errors with .status or .status_code, and Retry-After from their headers."""
+        self.assertEqual(classify_error(_StatusError("gone", status=410)).category, RETRY_NON_RETRYABLE)
+        self.assertEqual(classify_error(_StatusError("boom", status_code=502)).category, RETRY_RETRYABLE)
+        failure = classify_error(
+            _StatusError("slow down", status_code=429, headers={"Retry-After": "7"})
+        )
+        self.assertEqual(failure.category, RETRY_RATE_LIMITED)
+        self.assertEqual(failure.retry_after, 7.0)
+
+    def test_04_exceptions_without_status(self):
+        """Test browser error markers, timeouts and programming errors."""
+        cases = [
+            (Exception("page.goto: net::ERR_NAME_NOT_RESOLVED at https://x"), RETRY_NON_RETRYABLE),
+            (Exception("net::ERR_CERT_DATE_INVALID"), RETRY_NON_RETRYABLE),
+            (Exception("net::ERR_CONNECTION_RESET"), RETRY_RETRYABLE),
+            (asyncio.TimeoutError(), RETRY_RETRYABLE),
+            (ConnectionResetError("reset by peer"), RETRY_RETRYABLE),
+            (UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte"), RETRY_NON_RETRYABLE),
+            (ValueError("invalid URL"), RETRY_NON_RETRYABLE),
+            (RuntimeError("something transient"), RETRY_RETRYABLE),
+        ]
+        for error, category in cases:
+            with self.subTest(error=repr(error)):
+                self.assertEqual(classify_error(error).category, category)
+
+    def test_05_reason_is_first_line(self):
+        """Test that the reason is the first line of the message, or the type name."""
+        self.assertEqual(classify_error(Exception("first\nsecond")).reason, "first")
+        self.assertEqual(classify_error(asyncio.TimeoutError()).reason, "TimeoutError")
+
+
+class TestRetryBudget(unittest.TestCase):
+    """Run-wide retry cap."""
+
+    def test_01_floor_for_small_runs(self):
+        """Test that min_retries are allowed before any request is counted."""
+        budget = RetryBudget(ratio=0.1, min_retries=3)
+        self.assertEqual([budget.try_spend() for _ in range(4)], [True, True, True, False])
+        self.assertEqual(budget.get_stats()["denied"], 1)
+
+    def test_02_grows_with_requests(self):
+        """Test that the budget is ratio of the counted requests once above the floor."""
+        budget = RetryBudget(ratio=0.1, min_retries=2)
+        for _ in range(50):
+            budget.record_request()
+        spent = sum(budget.try_spend() for _ in range(10))
+        self.assertEqual(spent, 5)
+        budget.record_request()
+        self.assertFalse(budget.try_spend())
+        for _ in range(9):
+            budget.record_request()
+        self.assertTrue(budget.try_spend())
+        self.assertEqual(budget.get_stats()["allowed"], 6)
+
+    def test_03_reset(self):
+        """Test that reset starts a new run."""
+        budget = RetryBudget(ratio=0.0, min_retries=1)
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        budget.reset()
+        self.assertEqual(budget.get_stats(), {"requests": 0, "retries": 0, "denied": 0, "allowed": 1})
+        self.assertTrue(budget.try_spend())
+
+    def test_04_shared_with_other_processes(self):
+        """Test that a shared budget is spent from by another process and keeps its counts."""
+        context = multiprocessing.get_context("spawn")
+        budget = RetryBudget(ratio=0.0, min_retries=3)
+        budget.record_request()
+        self.assertTrue(budget.try_spend())
+        budget.share(context)
+        self.assertEqual(budget.get_stats()["retries"], 1)
+        process = context.Process(target=_spend_retries, args=(budget, 3))
+        process.start()
+        process.join(60)
+        self.assertEqual(process.exitcode, 0)
+        self.assertFalse(budget.try_spend())
+        self.assertEqual(budget.get_stats(), {"requests": 1, "retries": 3, "denied": 2, "allowed": 3})
+        budget.reset()
+        self.assertTrue(budget.try_spend())
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Retry decisions and their counters."""
+
+    def setUp(self):
+        self.metrics = FetchMetrics()
+
+    def _policy(self, **kwargs) -> RetryPolicy:
+        kwargs.setdefault("jitter_factor", 0.0)
+        return RetryPolicy(metrics=self.metrics, **kwargs)
+
+    def test_01_non_retryable_is_never_retried(self):
+        """Test that a non-retryable failure stops at once."""
+        decision = self._policy().decide(URL, RetryFailure(RETRY_NON_RETRYABLE, "404"), 0, 3)
+        self.assertFalse(decision.retry)
+        self.assertEqual(self.metrics.get_counters(), {COUNTER_NON_RETRYABLE: 1})
+
+    def test_02_attempt_limit(self):
+        """Test that retries stop once max_retries have been made."""
+        policy = self._policy()
+        failure = RetryFailure(RETRY_RETRYABLE, "timeout")
+        self.assertTrue(policy.decide(URL, failure, 2, 3).retry)
+        self.assertFalse(policy.decide(URL, failure, 3, 3).retry)
+        self.assertEqual(self.metrics.get_counters()[COUNTER_RETRIES_EXHAUSTED], 1)
+
+    def test_03_exponential_backoff_is_capped(self):
+        """Test that the delay doubles per retry up to max_delay."""
+        policy = self._policy(base_delay=1.0, max_delay=5.0)
+        failure = RetryFailure(RETRY_RETRYABLE, "timeout")
+        delays = [policy.decide(URL, failure, n, 10).delay for n in range(5)]
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 5.0, 5.0])
+
+    def test_04_jitter_stays_in_bounds(self):
+        """Test that jitter moves the delay by at most jitter_factor."""
+        policy = RetryPolicy(base_delay=2.0, jitter_factor=0.25)
+        for _ in range(100):
+            self.assertTrue(1.5 <= policy.backoff(0) <= 2.5)
+
+    def test_05_retry_after(self):
+        """Test that Retry-After is waited for when short and refused when too long."""
+        policy = self._policy(base_delay=1.0, max_retry_after=30.0)
+        decision = policy.decide(URL, RetryFailure(RETRY_RATE_LIMITED, "429", 10.0), 0, 3)
+        self.assertTrue(decision.retry)
+        self.assertEqual(decision.delay, 10.0)
+        # Backoff longer than Retry-After wins
+        decision = policy.decide(URL, RetryFailure(RETRY_RATE_LIMITED, "429", 0.5), 2, 3)
+        self.assertEqual(decision.delay, 4.0)
+        self.assertFalse(policy.decide(URL, RetryFailure(RETRY_RATE_LIMITED, "429", 120.0), 0, 3).retry)
+        counters = self.metrics.get_counters()
+        self.assertEqual(counters[COUNTER_RATE_LIMITED_RETRIES], 2)
+        self.assertEqual(counters[COUNTER_NON_RETRYABLE], 1)
+
+    def test_06_budget_exhaustion(self):
+        """Test that retries stop when the shared budget is used up."""
+        budget = RetryBudget(ratio=0.0, min_retries=2)
+        first, second = self._policy(budget=budget), self._policy(budget=budget)
+        failure = RetryFailure(RETRY_RETRYABLE, "timeout")
+        self.assertTrue(first.decide(URL, failure, 0, 5).retry)
+        self.assertTrue(second.decide(URL, failure, 0, 5).retry)
+        decision = first.decide(URL, failure, 1, 5)
+        self.assertFalse(decision.retry)
+        self.assertIn("budget", decision.reason)
+        counters = self.metrics.get_counters()
+        self.assertEqual(counters[COUNTER_RETRIES], 2)
+        self.assertEqual(counters[COUNTER_RETRY_BUDGET_EXHAUSTED], 1)
+        first.reset()
+        self.assertTrue(second.decide(URL, failure, 1, 5).retry)
+
+    def test_07_record_request_feeds_the_budget(self):
+        """Test that first attempts counted by the policy grow its budget."""
+        policy = self._policy(budget=RetryBudget(ratio=0.5, min_retries=0))
+        for _ in range(4):
+            policy.record_request(URL)
+        self.assertEqual(policy.get_stats()["budget"]["allowed"], 2)
+        self.assertIsNone(self._policy().get_stats()["budget"])
+
+
+if __name__ == "__main__":
+    unittest.main()
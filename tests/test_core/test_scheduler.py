@@ -0,0 +1,152 @@
+# tests/test_core/test_scheduler.py
+import unittest
+import asyncio
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.scheduler import UrlFeed, sliding_window
+
+
+def _error_result(url, error):
+    return f"error:{url}:{error}"
+
+
+class TestSlidingWindow(unittest.TestCase):
+    """Concurrency, ordering, errors and cancellation of the sliding window."""
+
+    def test_01_keeps_the_window_full(self):
+        """Test that at most max_in_flight fetches run and a finished one is replaced at once."""
+        running = []
+        peak = [0]
+
+        async def fetch(url):
+            running.append(url)
+            peak[0] = max(peak[0], len(running))
+            # The first URL is slow; the rest must not wait for it
+            await asyncio.sleep(0.2 if url == "u0" else 0.01)
+            running.remove(url)
+            return url
+
+        async def scenario():
+            urls = [f"u{i}" for i in range(8)]
+            return [result async for result in sliding_window(urls, fetch, 3, _error_result)]
+
+        results = asyncio.run(scenario())
+        self.assertEqual(peak[0], 3)
+        self.assertEqual(sorted(results), sorted(f"u{i}" for i in range(8)))
+        # Completion order: the slow first URL comes last
+        self.assertEqual(results[-1], "u0")
+
+    def test_02_errors_become_results(self):
+        """Test that a failing fetch yields on_error's result and the others continue."""
+
+        async def fetch(url):
+            if url == "bad":
+                raise ValueError("boom")
+            return url
+
+        async def scenario():
+            return [r async for r in sliding_window(["a", "bad", "b"], fetch, 2, _error_result)]
+
+        self.assertEqual(sorted(asyncio.run(scenario())), ["a", "b", "error:bad:boom"])
+
+    def test_03_url_feed_extended_while_running(self):
+        """Test that URLs added to a UrlFeed during the crawl are fetched until it is closed."""
+        feed = UrlFeed(["seed"])
+
+        async def fetch(url):
+            await asyncio.sleep(0)
+            if url == "seed":
+                feed.add("child1")
+                feed.add("child2")
+                feed.close()
+            return url
+
+        async def scenario():
+            return [r async for r in sliding_window(feed, fetch, 2, _error_result)]
+
+        self.assertEqual(sorted(asyncio.run(scenario())), ["child1", "child2", "seed"])
+        self.assertFalse(feed.add("late"))
+
+    def test_04_early_stop_cancels_in_flight_fetches(self):
+        """Test that closing the generator cancels fetches still running."""
+        cancelled = []
+
+        async def fetch(url):
+            try:
+                await asyncio.sleep(0.05 if url == "fast" else 10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return url
+
+        async def scenario():
+            window = sliding_window(["fast", "slow1", "slow2"], fetch, 3, _error_result)
+            first = await window.__anext__()
+            await window.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(scenario()), "fast")
+        self.assertEqual(sorted(cancelled), ["slow1", "slow2"])
+
+    def test_05_cancelled_fetch_becomes_a_result(self):
+        """Test that a fetch cancelled on its own yields on_error's result and the stream goes on."""
+
+        async def fetch(url):
+            if url == "cancelled":
+                asyncio.current_task().cancel("sub-request dropped")
+            await asyncio.sleep(0)
+            return url
+
+        async def scenario():
+            return [r async for r in sliding_window(["a", "cancelled", "b"], fetch, 2, _error_result)]
+
+        self.assertEqual(
+            sorted(asyncio.run(scenario())), ["a", "b", "error:cancelled:sub-request dropped"]
+        )
+
+    def test_06_cancelling_the_consumer_stops_the_stream(self):
+        """Test that cancelling the task iterating the window raises and cancels the fetches."""
+        cancelled = []
+
+        async def fetch(url):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return url
+
+        async def consume():
+            return [r async for r in sliding_window(["a", "b"], fetch, 2, _error_result)]
+
+        async def scenario():
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0.05)
+            consumer.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await consumer
+
+        asyncio.run(scenario())
+        self.assertEqual(sorted(cancelled), ["a", "b"])
+
+    def test_07_empty_input(self):
+        """Test that no URLs give no results."""
+
+        async def scenario():
+            return [r async for r in sliding_window([], asyncio.sleep, 4, _error_result)]
+
+        self.assertEqual(asyncio.run(scenario()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+# tests/test_core/test_session_manager.py
+import unittest
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from benchmarks.origin_server import SCENARIO_STATIC, SyntheticOrigin
+from src.core.circuit_breaker import DomainCircuitBreaker
+from src.core.dns_cache import PersistentDnsCache
+from src.core.rate_limiter import DomainRateLimit, DomainRateLimiter
+from src.core.session_manager import CrawlerSessionManager
+
+ADDRESSES = [{"host": "192.0.2.1", "family": int(socket.AF_INET), "proto": 6, "flags": 0}]
+
+
+class TestCrawlerSessionManager(unittest.TestCase):
+    """Shared session lifetime, reuse counters, warm-up and DNS cache persistence."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir, ignore_errors=True)
+
+    def test_01_one_session_per_loop(self):
+        """Test that concurrent callers share one session and a closed one is replaced."""
+        manager = CrawlerSessionManager()
+
+        async def run():
+            sessions = await asyncio.gather(*(manager.get_session() for _ in range(5)))
+            self.assertTrue(all(session is sessions[0] for session in sessions))
+            self.assertTrue(manager.is_open)
+            await manager.close()
+            self.assertFalse(manager.is_open)
+            self.assertTrue(sessions[0].closed)
+            replacement = await manager.get_session()
+            await manager.close()
+            return sessions[0], replacement
+
+        first, replacement = asyncio.run(run())
+        self.assertIsNot(first, replacement)
+        # Closing twice (or before any use) is harmless
+        asyncio.run(manager.close())
+        asyncio.run(CrawlerSessionManager().close())
+
+    def test_02_connection_reuse_counters(self):
+        """Test that the TraceConfig counts one new connection and reuses it afterwards."""
+        manager = CrawlerSessionManager()
+
+        async def run():
+            async with SyntheticOrigin() as origin:
+                session = await manager.get_session()
+                for url in origin.urls(SCENARIO_STATIC, 4):
+                    async with session.get(url) as response:
+                        await response.read()
+                        self.assertEqual(response.status, 200)
+                await manager.close()
+
+        asyncio.run(run())
+        stats = manager.get_stats()
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual((stats["new_connections"], stats["reused_connections"]), (1, 3))
+        self.assertEqual(stats["reuse_ratio"], 0.75)
+
+    def test_03_warm_up_preconnects_busiest_origins(self):
+        """Test that warm-up opens keep-alive connections that later requests reuse."""
+        manager = CrawlerSessionManager()
+
+        async def run():
+            async with SyntheticOrigin() as origin:
+                urls = origin.urls(SCENARIO_STATIC, 3)
+                stats = await manager.warm_up(urls + ["mailto:someone@example.com"])
+                session = await manager.get_session()
+                async with session.get(urls[0], ssl=False) as response:
+                    await response.read()
+                await manager.close()
+                return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual((stats["origins"], stats["connected"]), (1, 1))
+        counters = manager.get_stats()
+        self.assertEqual(counters["warm_up_connections"], 1)
+        self.assertEqual((counters["new_connections"], counters["reused_connections"]), (1, 1))
+
+    def test_04_warm_up_respects_its_timeout(self):
+        """Test that warm-up gives up on origins that never answer after ``timeout`` seconds."""
+        manager = CrawlerSessionManager()
+
+        async def run():
+            async def never_answer(reader, writer):
+                await asyncio.sleep(30)
+
+            server = await asyncio.start_server(never_answer, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                started = time.monotonic()
+                stats = await manager.warm_up([f"http://127.0.0.1:{port}/news"], timeout=0.3)
+                elapsed = time.monotonic() - started
+                await manager.close()
+            finally:
+                server.close()
+            return stats, elapsed
+
+        stats, elapsed = asyncio.run(run())
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual((stats["origins"], stats["connected"]), (1, 0))
+
+    def test_05_close_saves_the_dns_cache(self):
+        """Test that closing the session writes the persistent DNS cache."""
+        path = os.path.join(self.test_dir, "dns_cache.json")
+        dns_cache = PersistentDnsCache(path)
+        manager = CrawlerSessionManager(dns_cache=dns_cache)
+
+        async def run():
+            await manager.get_session()
+            dns_cache.put("news.example.com", socket.AF_INET, ADDRESSES)
+            await manager.close()
+
+        asyncio.run(run())
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)["entries"]
+        self.assertEqual(list(entries), [f"news.example.com|{int(socket.AF_INET)}"])
+        self.assertEqual(PersistentDnsCache(path).load(), 1)
+
+    def test_06_warm_up_obeys_limiter_and_breaker(self):
+        """Test that warm-up skips open circuits and takes a rate limiter token per pre-connect."""
+        rate_limiter = DomainRateLimiter(DomainRateLimit(rate=1.0, burst=5))
+        circuit_breaker = DomainCircuitBreaker(failure_threshold=1)
+        manager = CrawlerSessionManager(rate_limiter=rate_limiter, circuit_breaker=circuit_breaker)
+
+        async def run():
+            async with SyntheticOrigin() as origin, SyntheticOrigin() as broken:
+                broken_url = broken.urls(SCENARIO_STATIC, 1)[0]
+                circuit_breaker.record_failure(broken_url, "HTTP 500")
+                stats = await manager.warm_up(origin.urls(SCENARIO_STATIC, 2) + [broken_url])
+                await manager.close()
+                return stats, sum(broken.hits.values()), urlparse(broken_url).netloc
+
+        stats, broken_hits, broken_domain = asyncio.run(run())
+        self.assertEqual((stats["origins"], stats["connected"]), (1, 1))
+        self.assertEqual(stats["skipped_open_circuit"], 1)
+        self.assertEqual(broken_hits, 0)
+        self.assertEqual(rate_limiter.get_stats()["acquired"], 1)
+        # The skipped domain's circuit is still open, not turned into a half-open probe
+        self.assertEqual(circuit_breaker.get_open_circuits()[broken_domain]["state"], "open")
+
+
+if __name__ == "__main__":
+    unittest.main()
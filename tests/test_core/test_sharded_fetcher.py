@@ -0,0 +1,155 @@
+# tests/test_core/test_sharded_fetcher.py
+import unittest
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from unittest import mock
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from benchmarks.origin_server import (
+    OriginConfig,
+    SCENARIO_SLOW,
+    SCENARIO_STATIC,
+    SyntheticOrigin,
+)
+from src.core.html_store import RawHtmlStore
+from src.core.hybrid_fetcher import BACKEND_STATIC
+from src.core.sharded_fetcher import (
+    MAX_AUTO_SHARDS,
+    ShardConfig,
+    ShardedFetcher,
+    resolve_shard_count,
+    shard_for_url,
+)
+
+# Spawning a shard imports the crawler stack in a fresh interpreter
+SHARD_START_TIMEOUT = 60.0
+
+
+class TestShardRouting(unittest.TestCase):
+    """Domain-hash routing and the configured shard count."""
+
+    def test_01_shard_for_url_is_stable_per_domain(self):
+        """Test that every URL of a domain maps to the same shard, in range."""
+        for count in (2, 3, 8):
+            with self.subTest(count=count):
+                shard = shard_for_url("https://news.example.com/a", count)
+                self.assertIn(shard, range(count))
+                self.assertEqual(shard_for_url("https://news.example.com/b?page=2", count), shard)
+                self.assertEqual(shard_for_url("https://NEWS.example.com/c", count), shard)
+        # crc32 of the domain, not hash(): the same value in every process and run
+        self.assertEqual(shard_for_url("https://news.example.com/", 8), zlib.crc32(b"news.example.com") % 8)
+
+    def test_02_domains_spread_over_shards(self):
+        """Test that different domains do not all land on one shard."""
+        shards = {shard_for_url(f"https://site{i}.example.com/", 4) for i in range(50)}
+        self.assertEqual(shards, {0, 1, 2, 3})
+
+    def test_03_single_shard(self):
+        """Test that one shard (or fewer) always routes to shard 0."""
+        self.assertEqual(shard_for_url("https://news.example.com/", 1), 0)
+        self.assertEqual(shard_for_url("https://news.example.com/", 0), 0)
+
+    def test_04_resolve_shard_count(self):
+        """Test explicit counts, "auto" (0) and invalid values."""
+        self.assertEqual(resolve_shard_count(3), 3)
+        self.assertEqual(resolve_shard_count("2"), 2)
+        self.assertEqual(resolve_shard_count(None), 1)
+        self.assertEqual(resolve_shard_count("many"), 1)
+        with mock.patch("src.core.sharded_fetcher.os.cpu_count", return_value=4):
+            self.assertEqual(resolve_shard_count(0), 4)
+            self.assertEqual(resolve_shard_count(-1), 4)
+        with mock.patch("src.core.sharded_fetcher.os.cpu_count", return_value=64):
+            self.assertEqual(resolve_shard_count(0), MAX_AUTO_SHARDS)
+        with mock.patch("src.core.sharded_fetcher.os.cpu_count", return_value=None):
+            self.assertEqual(resolve_shard_count(0), 1)
+
+
+class TestShardedFetcher(unittest.TestCase):
+    """A real spawned shard fetching from the local origin server."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir, ignore_errors=True)
+        self.config = ShardConfig(
+            http_cache_path=os.path.join(self.test_dir, "http_cache.sqlite"),
+            html_store_dir=os.path.join(self.test_dir, "html"),
+        )
+
+    def test_01_results_come_back_through_the_store(self):
+        """Test that a shard fetches pages and returns their store keys, not the HTML."""
+
+        async def run():
+            async with SyntheticOrigin() as origin:
+                fetcher = ShardedFetcher(self.config, shard_count=2)
+                try:
+                    urls = origin.urls(SCENARIO_STATIC, 3)
+                    results = await asyncio.wait_for(
+                        asyncio.gather(*(fetcher.fetch(url) for url in urls)),
+                        SHARD_START_TIMEOUT,
+                    )
+                finally:
+                    await fetcher.shutdown()
+                return urls, results, fetcher.get_stats()
+
+        urls, results, stats = asyncio.run(run())
+        store = RawHtmlStore(self.config.html_store_dir)
+        for url, (result, backend) in zip(urls, results):
+            with self.subTest(url=url):
+                self.assertEqual((result["error"], backend), ("", BACKEND_STATIC))
+                self.assertEqual(result["original_url"], url)
+                self.assertTrue(result["content_stored"])
+                self.assertEqual(result["content"], "")
+                self.assertIn("<a href=", store.get(result["content_hash"]))
+        # One domain (127.0.0.1): one shard started, the other never spawned
+        self.assertEqual(stats["started"], 1)
+        self.assertEqual(sorted(stats["dispatched"]), [0, 3])
+        self.assertEqual(stats["shard_failures"], 0)
+        shard = shard_for_url(urls[0], 2)
+        self.assertEqual(stats["per_shard"][shard]["fetcher"]["static"], 3)
+
+    def test_02_killed_shard_fails_its_pending_requests(self):
+        """Test that requests waiting on a shard that dies get an error result instead of hanging."""
+
+        async def run():
+            async with SyntheticOrigin(OriginConfig(slow_ttfb_seconds=5.0)) as origin:
+                fetcher = ShardedFetcher(self.config, shard_count=1)
+                try:
+                    urls = origin.urls(SCENARIO_SLOW, 2)
+                    fetches = [asyncio.ensure_future(fetcher.fetch(url)) for url in urls]
+                    # Wait until the shard is running and its requests reached the origin;
+                    # the origin holds them for 5s, so the shard is killed mid-request
+                    deadline = time.monotonic() + SHARD_START_TIMEOUT
+                    while origin.hits_for(urls) < len(urls):
+                        self.assertLess(time.monotonic(), deadline, "Shard never sent its requests")
+                        await asyncio.sleep(0.1)
+                    fetcher._processes[0].kill()
+                    results = await asyncio.wait_for(asyncio.gather(*fetches), 15.0)
+                    # Later requests for the dead shard fail right away
+                    late_result, _ = await fetcher.fetch(urls[0])
+                finally:
+                    await fetcher.shutdown(timeout=5.0)
+                return results, late_result, fetcher.get_stats()
+
+        results, late_result, stats = asyncio.run(run())
+        for result, backend in results:
+            self.assertEqual(result["error"], "Crawl shard 0 exited unexpectedly")
+            self.assertEqual(backend, BACKEND_STATIC)
+        self.assertEqual(late_result["error"], "Crawl shard 0 is not running")
+        self.assertEqual(stats["shard_failures"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
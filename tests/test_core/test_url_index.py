@@ -0,0 +1,114 @@
+# tests/test_core/test_url_index.py
+import unittest
+import os
+import sys
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.core.url_index import UrlIndex, get_url_index
+
+URL = "https://example.com/a"
+VARIANT = "http://Example.com/a/?utm_source=rss#top"
+
+
+class TestUrlIndex(unittest.TestCase):
+    """Reference counted membership, origin counts and the table signature."""
+
+    def test_01_variants_share_an_entry(self):
+        """Test that variants of one URL are one entry, kept until every variant is discarded."""
+        index = UrlIndex()
+        index.add(URL)
+        index.add(VARIANT)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.get_origin_counts(), {"https://example.com": 1, "http://Example.com": 1})
+
+        index.discard(URL)
+        self.assertIn(URL, index)
+        self.assertEqual(index.get_origin_counts(), {"http://Example.com": 1})
+        index.discard(VARIANT)
+        self.assertNotIn(URL, index)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.get_origin_counts(), {})
+
+        # Discarding what is not stored changes nothing
+        index.discard(URL)
+        self.assertEqual(index.get_stats()["urls"], 0)
+
+    def test_02_urls_without_canonical_form(self):
+        """Test that URLs canonicalize_url rejects are indexed as given, and empty ones not at all."""
+        index = UrlIndex()
+        self.assertEqual(UrlIndex.key_of("mailto:desk@example.com"), "mailto:desk@example.com")
+        self.assertIsNone(UrlIndex.key_of(""))
+        index.add("mailto:desk@example.com")
+        index.add("")
+        self.assertIn("mailto:desk@example.com", index)
+        self.assertNotIn("", index)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.get_origin_counts(), {})
+
+    def test_03_load_replaces_the_content(self):
+        """Test that load replaces the entries, marks the index loaded and sets the signature."""
+        index = UrlIndex()
+        self.assertFalse(index.loaded)
+        index.add("https://example.com/old")
+        size = index.load([URL, VARIANT, "https://other.example.com/b"], signature=(3, 7))
+        self.assertEqual(size, 2)
+        self.assertTrue(index.loaded)
+        self.assertEqual(index.signature, (3, 7))
+        self.assertNotIn("https://example.com/old", index)
+        self.assertEqual(index.get_stats()["loads"], 1)
+
+    def test_04_advance_signature(self):
+        """Test that writes move the signature, and an index without one stays without."""
+        index = UrlIndex()
+        index.advance_signature(1, 5)
+        self.assertIsNone(index.signature)
+
+        index.load([], signature=(2, 10))
+        index.advance_signature(2, 12)
+        self.assertEqual(index.signature, (4, 12))
+        # Deletes lower the count but never the highest assigned id
+        index.advance_signature(-3)
+        self.assertEqual(index.signature, (1, 12))
+        index.set_signature((0, 0))
+        self.assertEqual(index.signature, (0, 0))
+
+    def test_05_clear_and_invalidate(self):
+        """Test that clear keeps the index loaded and invalidate marks it for reloading."""
+        index = UrlIndex()
+        index.load([URL], signature=(1, 1))
+        index.clear(signature=(0, 1))
+        self.assertTrue(index.loaded)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.signature, (0, 1))
+
+        index.add(URL)
+        index.invalidate()
+        self.assertFalse(index.loaded)
+        self.assertIsNone(index.signature)
+        # Entries stay usable until the reload
+        self.assertIn(URL, index)
+
+    def test_06_stats_and_shared_index(self):
+        """Test the checked and hit counters, and that get_url_index returns one instance."""
+        index = UrlIndex()
+        index.add(URL)
+        self.assertTrue(index.contains_key(UrlIndex.key_of(VARIANT)))
+        self.assertNotIn("https://example.com/b", index)
+        # Unindexable URLs are answered without a lookup
+        self.assertNotIn("", index)
+        stats = index.get_stats()
+        self.assertEqual((stats["checked"], stats["hits"]), (2, 1))
+        self.assertEqual((stats["urls"], stats["origins"]), (1, 1))
+        self.assertIs(get_url_index(), get_url_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
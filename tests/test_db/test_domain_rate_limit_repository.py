@@ -0,0 +1,268 @@
+# tests/test_db/test_domain_rate_limit_repository.py
+import unittest
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Tuple
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+from PySide6.QtWidgets import QApplication
+
+# --- Import the config module itself ---
+import src.config  # Needed to access/replace _global_config
+
+# Import necessary components AFTER path adjustment
+from src.config import AppConfig, CONFIG_KEY_DATA_DIR, init_config
+from src.db.connection import (
+    init_db_connection,
+    DatabaseConnectionManager,
+    MAIN_DB_CONNECTION_NAME,
+    get_db,
+)
+from src.db.repositories import DomainRateLimitRepository
+from src.db.schema_constants import DOMAIN_RATE_LIMITS_TABLE
+
+# Ensure a QApplication instance exists if QSql requires it (important for testing)
+_app = QApplication.instance() or QApplication([])
+
+# --- Test Data for Domain Rate Limits ---
+SAMPLE_LIMIT_1 = ("news.example.com", 5.0, 10)
+SAMPLE_LIMIT_2 = ("cdn.example.org", 10.0, 20)
+
+
+# --- Mock AppConfig (Adapted from test_news_repository.py) ---
+class MockConfig(AppConfig):
+    def __init__(self, db_path):
+        self._persistent_config = self.DEFAULT_PERSISTENT_CONFIG.copy()
+        self._secrets = {}
+        self._data_dir = os.path.dirname(db_path)  # Use the directory of the temp file
+        self._db_path = db_path
+
+    def _load_secrets_from_env(self):
+        pass  # Prevent loading real secrets
+
+    def _ensure_data_dir(self):
+        pass  # Prevent creating real data dirs
+
+    def _load_from_db(self):
+        pass  # Prevent loading from real DB
+
+    def save_persistent(self) -> bool:
+        return True
+
+
+class TestDomainRateLimitRepository(unittest.TestCase):
+    """Test suite for the DomainRateLimitRepository class."""
+
+    db_manager: DatabaseConnectionManager
+    db: QSqlDatabase
+    repo: DomainRateLimitRepository
+    db_fd = None  # File descriptor for temp file
+    db_path = None  # Path to temp file
+    _original_global_config = None  # To store original config
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up for all tests in this class (runs once)."""
+        print("setUpClass: Setting up temporary database...")
+
+        # 1. Create temporary DB file
+        cls.db_fd, cls.db_path = tempfile.mkstemp(
+            suffix=".db", prefix="test_rate_limit_repo_"
+        )
+        print(f"setUpClass: Created temporary database file: {cls.db_path}")
+
+        # 2. Mock the global config
+        cls._original_global_config = src.config._global_config  # Store original
+        mock_config = MockConfig(cls.db_path)
+        src.config._global_config = mock_config  # Replace global singleton
+        print(
+            f"setUpClass: Overrode global config with MockConfig. DB path now: {src.config.get_config().db_path}"
+        )
+
+        # 3. Force re-initialization of the DB connection manager singleton
+        if DatabaseConnectionManager._instance:
+            print("setUpClass: Cleaning up existing DB Manager instance...")
+            DatabaseConnectionManager._instance._cleanup()
+            DatabaseConnectionManager._instance = None
+
+        # 4. Initialize the DB connection (will use the mocked config)
+        try:
+            print("setUpClass: Initializing DB Connection Manager for testing...")
+            cls.db_manager = init_db_connection()
+            cls.db = get_db()
+            print("setUpClass: DB Connection Manager Initialized.")
+        except Exception as e:
+            print(f"FATAL: Error during DB setup in setUpClass: {e}", file=sys.stderr)
+            # Cleanup before raising
+            if QSqlDatabase.contains(MAIN_DB_CONNECTION_NAME):
+                db = QSqlDatabase.database(MAIN_DB_CONNECTION_NAME)
+                if db.isOpen():
+                    db.close()
+                QSqlDatabase.removeDatabase(MAIN_DB_CONNECTION_NAME)
+            if cls.db_path and os.path.exists(cls.db_path):
+                os.remove(cls.db_path)
+            if cls.db_fd:
+                os.close(cls.db_fd)
+            src.config._global_config = cls._original_global_config  # Restore config
+            raise ConnectionError(
+                f"Failed to initialize DB connection for testing: {e}"
+            ) from e
+
+        if not cls.db or not cls.db.isOpen():
+            raise ConnectionError("Database connection failed to open in setUpClass")
+
+        print(f"setUpClass: Temporary database '{cls.db.databaseName()}' connected.")
+
+        # 5. Create the repository instance *after* DB is set up
+        cls.repo = DomainRateLimitRepository()
+        print("setUpClass: DomainRateLimitRepository instance created.")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down after all tests in this class (runs once)."""
+        print("\ntearDownClass: Cleaning up...")
+        if hasattr(cls, "db_manager") and cls.db_manager:
+            print("tearDownClass: Cleaning up DB Connection Manager...")
+            cls.db_manager._cleanup()
+            # Check if connection still exists (it shouldn't)
+            if QSqlDatabase.contains(MAIN_DB_CONNECTION_NAME):
+                print(
+                    f"Warning: Connection {MAIN_DB_CONNECTION_NAME} still exists after cleanup."
+                )
+                QSqlDatabase.removeDatabase(MAIN_DB_CONNECTION_NAME)
+            print("tearDownClass: DB Connection Manager cleaned up.")
+
+        if cls.db_fd:
+            try:
+                os.close(cls.db_fd)
+                cls.db_fd = None
+            except OSError as e:
+                print(f"Warning: Error closing file descriptor: {e}")
+
+        if cls.db_path and os.path.exists(cls.db_path):
+            print(f"tearDownClass: Deleting temporary database: {cls.db_path}")
+            # Add robust deletion (copied from test_connection.py)
+            for _ in range(3):  # Try a few times
+                try:
+                    os.remove(cls.db_path)
+                    print("tearDownClass: Temporary database deleted.")
+                    cls.db_path = None
+                    break
+                except PermissionError:
+                    print(
+                        f"Warning: Could not delete temp db file (retrying): {cls.db_path}"
+                    )
+                    time.sleep(0.1)
+                except Exception as e:
+                    print(f"Error deleting temp db file: {e}")
+                    break
+            else:
+                print(
+                    f"Error: Failed to delete temp db file after retries: {cls.db_path}"
+                )
+
+        # Restore original config
+        if cls._original_global_config:
+            src.config._global_config = cls._original_global_config
+            print("tearDownClass: Restored original global config.")
+        else:
+            print("Warning: Original global config was not stored.")
+
+        print("tearDownClass: Cleanup complete.")
+
+    def setUp(self):
+        """Set up for each test method (runs before each test)."""
+        # Ensure the table is empty before each test for isolation
+        print(
+            f"\nsetUp ({self._testMethodName}): Clearing {DOMAIN_RATE_LIMITS_TABLE} table..."
+        )
+        query = QSqlQuery(self.db)
+        if not query.exec(f"DELETE FROM {DOMAIN_RATE_LIMITS_TABLE}"):
+            # Use assertFailure for critical setup steps
+            self.fail(
+                f"setUp ({self._testMethodName}): Failed to clear table: {query.lastError().text()}"
+            )
+        print(f"setUp ({self._testMethodName}): Table cleared.")
+
+    # --- Helper Methods ---
+    def _get_row_count(self) -> int:
+        """Gets the current row count in the domain_rate_limits table."""
+        query = QSqlQuery(f"SELECT COUNT(*) FROM {DOMAIN_RATE_LIMITS_TABLE}", self.db)
+        if not query.exec():
+            print(f"Error executing row count query: {query.lastError().text()}")
+            return -1
+        if query.next():
+            return query.value(0)
+        return -1
+
+    # --- Test Cases ---
+    def test_01_save_and_get(self):
+        """Test saving a rate limit and reading it back."""
+        print(f"Running {self._testMethodName}...")
+        self.assertTrue(self.repo.save(*SAMPLE_LIMIT_1))
+        self.assertEqual(self._get_row_count(), 1)
+
+        row = self.repo.get(SAMPLE_LIMIT_1[0])
+        self.assertIsNotNone(row)
+        self.assertEqual(row[0], SAMPLE_LIMIT_1[0])
+        self.assertAlmostEqual(row[1], SAMPLE_LIMIT_1[1])
+        self.assertEqual(row[2], SAMPLE_LIMIT_1[2])
+
+        # Domains are case-insensitive
+        self.assertIsNotNone(self.repo.get(SAMPLE_LIMIT_1[0].upper()))
+        self.assertIsNone(self.repo.get("unknown.example.com"))
+
+    def test_02_update_existing(self):
+        """Test that saving an existing domain updates it in place."""
+        print(f"Running {self._testMethodName}...")
+        self.assertTrue(self.repo.save(*SAMPLE_LIMIT_1))
+        self.assertTrue(self.repo.save(SAMPLE_LIMIT_1[0], 1.5, 3))
+        self.assertEqual(self._get_row_count(), 1)
+
+        row = self.repo.get(SAMPLE_LIMIT_1[0])
+        self.assertAlmostEqual(row[1], 1.5)
+        self.assertEqual(row[2], 3)
+
+    def test_03_save_invalid(self):
+        """Test that non-positive rates or bursts are rejected."""
+        print(f"Running {self._testMethodName}...")
+        self.assertFalse(self.repo.save("bad.example.com", 0, 5))
+        self.assertFalse(self.repo.save("bad.example.com", 1.0, 0))
+        self.assertEqual(self._get_row_count(), 0)
+
+    def test_04_get_all(self):
+        """Test retrieving all rate limits ordered by domain."""
+        print(f"Running {self._testMethodName}...")
+        self.repo.save(*SAMPLE_LIMIT_1)
+        self.repo.save(*SAMPLE_LIMIT_2)
+
+        rows = self.repo.get_all()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([row[0] for row in rows], [SAMPLE_LIMIT_2[0], SAMPLE_LIMIT_1[0]])
+
+    def test_05_delete(self):
+        """Test deleting a rate limit."""
+        print(f"Running {self._testMethodName}...")
+        self.repo.save(*SAMPLE_LIMIT_1)
+        self.repo.save(*SAMPLE_LIMIT_2)
+
+        self.assertTrue(self.repo.delete(SAMPLE_LIMIT_1[0]))
+        self.assertEqual(self._get_row_count(), 1)
+        self.assertIsNone(self.repo.get(SAMPLE_LIMIT_1[0]))
+        self.assertFalse(self.repo.delete(SAMPLE_LIMIT_1[0]))
+
+
+if __name__ == "__main__":
+    print("Starting DomainRateLimitRepository tests...")
+    unittest.main()
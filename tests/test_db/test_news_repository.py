@@ -243,6 +243,8 @@ class TestNewsRepository(unittest.TestCase):
         query.exec(
             f"DELETE FROM sqlite_sequence WHERE name='{NEWS_TABLE}'"
         )  # Ignore errors
+        # The table was changed behind the repository; resync its url index
+        self.repo.sync_url_index()
         print(f"setUp ({self._testMethodName}): Table cleared.")
 
     # --- Helper Methods (Keep as before) ---
@@ -503,6 +505,62 @@ class TestNewsRepository(unittest.TestCase):
         self.assertTrue(cleared_again)
         self.assertEqual(self._get_row_count(), 0)
 
+    def test_15_add_batch_skips_url_variants(self):
+        """Test that add_batch treats canonical url variants as duplicates."""
+        print(f"Running {self._testMethodName}...")
+        self._add_sample_news(SAMPLE_NEWS_1)  # http://example.com/test1
+        self.assertEqual(self._get_row_count(), 1)
+
+        batch_items = [
+            {**SAMPLE_NEWS_1, "url": "https://example.com/test1/?utm_source=rss#top"},
+            {**SAMPLE_NEWS_2, "url": "https://Example.com/test2/index.html"},
+            {**SAMPLE_NEWS_2, "url": "http://example.com/test2?utm_medium=feed"},
+        ]
+
+        added_count, skipped_count = self.repo.add_batch(batch_items)
+
+        self.assertEqual(added_count, 1, "Only the first variant of test2 should be added.")
+        self.assertEqual(skipped_count, 2, "Variants of stored and batched urls are skipped.")
+        self.assertEqual(self._get_row_count(), 2)
+
+    def test_16_url_index_follows_writes(self):
+        """Test that the stored url index stays in sync with the table."""
+        print(f"Running {self._testMethodName}...")
+        id1 = self._add_sample_news(SAMPLE_NEWS_1)
+        url_index = self.repo.get_url_index()
+        loads = url_index.get_stats()["loads"]
+        self.assertIn("https://example.com/test1/?utm_source=rss", url_index)
+        self.assertNotIn(SAMPLE_NEWS_2["url"], url_index)
+        self.assertEqual(url_index.get_origin_counts()["http://example.com"], 1)
+
+        # A variant of a stored url is not added again
+        self.assertIsNone(
+            self.repo.add({**SAMPLE_NEWS_1, "url": "https://example.com/test1#top"})
+        )
+        self.assertEqual(self._get_row_count(), 1)
+
+        self.repo.add_batch([SAMPLE_NEWS_2])
+        self.assertIn(SAMPLE_NEWS_2["url"], self.repo.get_url_index())
+
+        self.assertTrue(self.repo.delete(id1))
+        self.assertNotIn(SAMPLE_NEWS_1["url"], self.repo.get_url_index())
+
+        # Writes through the repository keep the index in sync with the table
+        self.assertIs(self.repo.sync_url_index(), url_index)
+        self.assertEqual(url_index.get_stats()["loads"], loads)
+
+        # Rows written behind the repository are picked up on the next sync
+        query = QSqlQuery(self.db)
+        self.assertTrue(
+            query.exec(f"DELETE FROM {NEWS_TABLE}"), query.lastError().text()
+        )
+        self.assertNotIn(SAMPLE_NEWS_2["url"], self.repo.sync_url_index())
+        self.assertEqual(url_index.get_stats()["loads"], loads + 1)
+
+        self.repo.add(SAMPLE_NEWS_1)
+        self.repo.clear_all()
+        self.assertEqual(len(self.repo.get_url_index()), 0)
+
 
 if __name__ == "__main__":
     print("Starting NewsRepository tests...")
@@ -30,6 +30,10 @@ from src.db.connection import (
     get_db,
 )
 from src.db.repositories import NewsSourceRepository, NewsCategoryRepository
+from src.db.repositories.news_source_repository import (
+    SOURCE_LIST_COLUMNS,
+    readiness_profile_from_values,
+)
 from src.db.schema_constants import NEWS_SOURCES_TABLE, NEWS_CATEGORY_TABLE
 
 # Ensure a QApplication instance exists if QSql requires it (important for testing)
@@ -258,6 +262,11 @@ class TestSourceRepository(unittest.TestCase):
         self.assertIsInstance(new_id, int)
         return new_id
 
+    def _readiness_profiles(self):
+        """Readiness profile of every source as listed by get_all, keyed by URL."""
+        first = SOURCE_LIST_COLUMNS.index("wait_strategy")
+        return {row[2]: readiness_profile_from_values(row[first:]) for row in self.repo.get_all()}
+
     def _get_row_count(self) -> int:
         """Gets the current row count in the news_sources table."""
         query = QSqlQuery(f"SELECT COUNT(*) FROM {NEWS_SOURCES_TABLE}", self.db)
@@ -416,9 +425,10 @@ class TestSourceRepository(unittest.TestCase):
         self.assertIn(id2, source_ids)
         self.assertIn(id3, source_ids)
 
-        # Each result should have 5 elements: id, name, url, category_id, category_name
+        # Each result has id, name, url, category_id, category_name, then the fetch backend,
+        # feed and readiness profile columns
         for src in all_sources:
-            self.assertEqual(len(src), 5)
+            self.assertEqual(len(src), len(SOURCE_LIST_COLUMNS))
 
     def test_07_get_by_category(self):
         """Test retrieving sources by category."""
@@ -524,6 +534,88 @@ class TestSourceRepository(unittest.TestCase):
         empty_delete = self.repo.delete_all()
         self.assertTrue(empty_delete)
 
+    def test_11_fetch_backend(self):
+        """Test remembering and clearing the fetch backend of a source."""
+        print(f"Running {self._testMethodName}...")
+        self._add_sample_source(SAMPLE_SOURCE_1)
+        self._add_sample_source(SAMPLE_SOURCE_2)
+
+        # No backend remembered for new sources (QtSql may return NULL as "")
+        backends = {row[2]: row[5] for row in self.repo.get_all()}
+        self.assertFalse(any(backends.values()))
+
+        # get_all lists the remembered backend with each source
+        self.assertTrue(self.repo.set_fetch_backend(SAMPLE_SOURCE_1["url"], "aiohttp"))
+        self.assertTrue(self.repo.set_fetch_backend(SAMPLE_SOURCE_2["url"], "playwright"))
+        backends = {row[2]: row[5] for row in self.repo.get_all()}
+        self.assertEqual(backends[SAMPLE_SOURCE_1["url"]], "aiohttp")
+        self.assertEqual(backends[SAMPLE_SOURCE_2["url"]], "playwright")
+
+        # Clearing and unknown sources
+        self.assertTrue(self.repo.set_fetch_backend(SAMPLE_SOURCE_2["url"], None))
+        backends = {row[2]: row[5] for row in self.repo.get_all()}
+        self.assertFalse(backends[SAMPLE_SOURCE_2["url"]])
+        self.assertFalse(self.repo.set_fetch_backend("https://unknown.example.com", "aiohttp"))
+
+    def test_12_readiness_profile(self):
+        """Test storing and reading the page readiness profile of a source."""
+        print(f"Running {self._testMethodName}...")
+        self._add_sample_source(SAMPLE_SOURCE_1)
+        self._add_sample_source(SAMPLE_SOURCE_2)
+
+        # New sources use the defaults (no stored profile)
+        profiles = self._readiness_profiles()
+        self.assertEqual(profiles, {SAMPLE_SOURCE_1["url"]: None, SAMPLE_SOURCE_2["url"]: None})
+
+        profile = {
+            "wait_strategy": "quiescence",
+            "max_scrolls": 3,
+            "js_enabled": False,
+            "settle_ms": 400,
+            "expected_links": 120,
+        }
+        self.assertTrue(self.repo.set_readiness_profile(SAMPLE_SOURCE_1["url"], profile))
+        profiles = self._readiness_profiles()
+        self.assertIsNone(profiles[SAMPLE_SOURCE_2["url"]])
+        stored = profiles[SAMPLE_SOURCE_1["url"]]
+        self.assertEqual(stored["wait_strategy"], "quiescence")
+        self.assertEqual(stored["max_scrolls"], 3)
+        self.assertEqual(stored["js_enabled"], 0)
+        self.assertEqual(stored["settle_ms"], 400)
+        self.assertEqual(stored["expected_links"], 120)
+
+        # Missing keys are stored as NULL
+        self.assertTrue(
+            self.repo.set_readiness_profile(SAMPLE_SOURCE_1["url"], {"wait_strategy": "networkidle"})
+        )
+        stored = self._readiness_profiles()[SAMPLE_SOURCE_1["url"]]
+        self.assertEqual(stored["wait_strategy"], "networkidle")
+        self.assertIsNone(stored["settle_ms"])
+
+        self.assertFalse(self.repo.set_readiness_profile("https://unknown.example.com", profile))
+
+    def test_13_feed(self):
+        """Test storing the discovered feed of a source."""
+        print(f"Running {self._testMethodName}...")
+        self._add_sample_source(SAMPLE_SOURCE_1)
+        self._add_sample_source(SAMPLE_SOURCE_2)
+
+        # Sources that were never checked have no check time (QtSql may return NULL as "")
+        feeds = {row[2]: (row[6], row[7]) for row in self.repo.get_all()}
+        self.assertFalse(any(checked_at for _, checked_at in feeds.values()))
+
+        # get_all lists the feed with each source
+        feed_url = "https://example.com/feed.xml"
+        self.assertTrue(self.repo.set_feed(SAMPLE_SOURCE_1["url"], feed_url))
+        self.assertTrue(self.repo.set_feed(SAMPLE_SOURCE_2["url"], None))
+        feeds = {row[2]: (row[6], row[7]) for row in self.repo.get_all()}
+        self.assertEqual(feeds[SAMPLE_SOURCE_1["url"]][0], feed_url)
+        # Checked, but no feed found
+        self.assertFalse(feeds[SAMPLE_SOURCE_2["url"]][0])
+        self.assertGreater(int(feeds[SAMPLE_SOURCE_2["url"]][1]), 0)
+
+        self.assertFalse(self.repo.set_feed("https://unknown.example.com", feed_url))
+
 
 if __name__ == "__main__":
     print("Starting NewsSourceRepository tests...")
@@ -0,0 +1,167 @@
+# tests/test_utils/test_exclusion_matcher.py
+import unittest
+import os
+import sys
+
+from bs4 import BeautifulSoup
+
+# --- Adjust sys.path to find src ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(
+    os.path.dirname(current_dir)
+)  # Adjust based on your test dir location
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ------------------------------------
+
+from src.utils.exclusion_matcher import compile_exclusion_matcher
+from src.utils.html_utils import (
+    DEFAULT_EXCLUDE_SELECTORS,
+    DEFAULT_EXCLUDE_TAGS,
+    DEFAULT_EXCLUSION_MATCHER,
+    clean_html,
+)
+
+BASE_URL = "https://news.example.com/"
+
+PAGE = """<html><head><title>Site</title><script>var x = 1;</script></head>
+<body>
+  <header class="site-header"><a href="/">Home</a></header>
+  <nav><a href="/world">World</a></nav>
+  <div id="sidebar"><p>Trending</p></div>
+  <main>
+    <article>
+      <h1>Headline</h1>
+      <figure class="gallery"><img src="/a.jpg" alt="A"><figcaption>Caption</figcaption></figure>
+      <p>Body <span class="ad">ad</span> text</p>
+      <button>Share</button><button>Share</button>
+      <div class="Related">Kept, class names are case-sensitive</div>
+      <div data-ad-slot="top">Slot</div>
+      <section class="story body"><p>More text</p></section>
+    </article>
+  </main>
+  <aside class="ads banner">Buy now</aside>
+  <footer><p>Copyright</p></footer>
+</body></html>
+"""
+
+
+def _baseline_clean(html: str, exclude_tags, exclude_selectors) -> str:
+    """Removal by soup.find_all per tag and soup.select per selector, one rule at a time."""
+    soup = BeautifulSoup(html, "lxml")
+    elements = []
+    for tag_name in exclude_tags or ():
+        elements.extend(soup.find_all(tag_name))
+    for selector in exclude_selectors or ():
+        elements.extend(soup.select(selector))
+    for element in {id(element): element for element in elements}.values():
+        if element.parent is not None:
+            element.decompose()
+    return str(soup)
+
+
+class TestExclusionMatcher(unittest.TestCase):
+    """Per-element decisions of the compiled rules."""
+
+    def test_01_simple_selectors(self):
+        """Test tag, class, id and attribute rules."""
+        matcher = compile_exclusion_matcher([".ad", "#sidebar", "[data-ad-slot]"], ["nav"])
+        self.assertTrue(matcher.matches("nav", {}))
+        self.assertTrue(matcher.matches("span", {"class": "promo ad"}))
+        self.assertTrue(matcher.matches("span", {"class": ["promo", "ad"]}))
+        self.assertFalse(matcher.matches("span", {"class": "adverb"}))
+        self.assertTrue(matcher.matches("div", {"id": "sidebar"}))
+        self.assertFalse(matcher.matches("div", {"id": "sidebar-2"}))
+        self.assertTrue(matcher.matches("div", {"data-ad-slot": ""}))
+        self.assertFalse(matcher.matches("div", {}))
+
+    def test_02_case_rules(self):
+        """Test that tag and attribute names are case-insensitive and classes are not."""
+        matcher = compile_exclusion_matcher([".Promo", "[DATA-X]"], ["NAV"])
+        self.assertTrue(matcher.matches("nav", {}))
+        self.assertTrue(matcher.matches("div", {"data-x": "1"}))
+        self.assertTrue(matcher.matches("div", {"class": "Promo"}))
+        self.assertFalse(matcher.matches("div", {"class": "promo"}))
+
+    def test_03_complex_selectors_are_set_aside(self):
+        """Test that selectors the matcher cannot decide per element are kept for the caller."""
+        matcher = compile_exclusion_matcher(["div > p", "a[href^='javascript']", ".ad"])
+        self.assertEqual(matcher.complex_selectors, ("div > p", "a[href^='javascript']"))
+        self.assertFalse(matcher.matches("p", {}))
+
+    def test_04_compiled_matchers_are_cached(self):
+        """Test that the same rules give the same instance, whatever their spelling."""
+        first = compile_exclusion_matcher([".ad", " #x "], ["Nav", "nav"])
+        self.assertIs(first, compile_exclusion_matcher([".ad", "#x"], ["nav"]))
+        self.assertEqual(first.rules, ("nav", ".ad", "#x"))
+        self.assertIsNot(first, compile_exclusion_matcher([".ads"], ["nav"]))
+
+    def test_05_overrides(self):
+        """Test that overrides add and remove rules without touching the base matcher."""
+        matcher = DEFAULT_EXCLUSION_MATCHER.with_overrides(
+            exclude=[".story"], keep=["FOOTER", "figure", ".gallery"]
+        )
+        self.assertTrue(matcher.matches("section", {"class": "story body"}))
+        self.assertFalse(matcher.matches("footer", {}))
+        self.assertFalse(matcher.matches("figure", {"class": "gallery"}))
+        self.assertTrue(DEFAULT_EXCLUSION_MATCHER.matches("footer", {}))
+        self.assertTrue(DEFAULT_EXCLUSION_MATCHER.matches("figure", {"class": "gallery"}))
+        self.assertFalse(DEFAULT_EXCLUSION_MATCHER.matches("section", {"class": "story body"}))
+        self.assertIs(
+            matcher,
+            DEFAULT_EXCLUSION_MATCHER.with_overrides([".story"], ["footer", "figure", ".gallery"]),
+        )
+        self.assertIs(DEFAULT_EXCLUSION_MATCHER.with_overrides(), DEFAULT_EXCLUSION_MATCHER)
+
+
+class TestMatcherAgainstBaseline(unittest.TestCase):
+    """clean_html with a matcher removes what find_all / select per rule removes."""
+
+    def _assert_same_as_baseline(self, exclude_tags, exclude_selectors):
+        matcher = compile_exclusion_matcher(exclude_selectors, exclude_tags)
+        self.assertEqual(
+            clean_html(PAGE, BASE_URL, matcher=matcher),
+            _baseline_clean(PAGE, exclude_tags, exclude_selectors),
+        )
+
+    def test_01_default_rules(self):
+        """Test the default rules."""
+        self._assert_same_as_baseline(DEFAULT_EXCLUDE_TAGS, DEFAULT_EXCLUDE_SELECTORS)
+        cleaned = clean_html(PAGE, BASE_URL)
+        self.assertIn("Headline", cleaned)
+        self.assertIn("Kept", cleaned)
+        for excluded in ("Home", "World", "Trending", "Buy now", "Copyright", "var x"):
+            self.assertNotIn(excluded, cleaned)
+
+    def test_02_overrides(self):
+        """Test per-source overrides against the same rules given as lists."""
+        keep = ["footer", "header", "button", ".gallery"]
+        exclude_tags = [tag for tag in DEFAULT_EXCLUDE_TAGS if tag not in keep]
+        exclude_selectors = [s for s in DEFAULT_EXCLUDE_SELECTORS if s not in keep] + [
+            "[data-ad-slot]",
+            ".body",
+        ]
+        self._assert_same_as_baseline(exclude_tags, exclude_selectors)
+
+        matcher = DEFAULT_EXCLUSION_MATCHER.with_overrides(
+            exclude=["[data-ad-slot]", ".body"], keep=keep
+        )
+        cleaned = clean_html(PAGE, BASE_URL, matcher=matcher)
+        self.assertEqual(cleaned, _baseline_clean(PAGE, exclude_tags, exclude_selectors))
+        self.assertIn("Copyright", cleaned)
+        self.assertIn("Share", cleaned)
+        for excluded in ("Caption", "Home", "Slot", "More text"):
+            self.assertNotIn(excluded, cleaned)
+
+    def test_03_complex_selectors(self):
+        """Test that complex selectors are still applied through select()."""
+        self._assert_same_as_baseline(["script"], ["article > p", "main h1", ".ad"])
+
+    def test_04_repeated_identical_elements(self):
+        """Test that identical siblings are all removed."""
+        self._assert_same_as_baseline(["button"], [])
+        self.assertNotIn("Share", clean_html(PAGE, BASE_URL, ["button"], []))
+
+
+if __name__ == "__main__":
+    unittest.main()